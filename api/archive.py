@@ -0,0 +1,545 @@
+"""
+세션 S3 백업 대기열 (outbox)
+
+세션 원본 JSON(gzip) 백업을 archive_jobs 테이블을 거쳐 업로드합니다.
+
+- ARCHIVE_ASYNC가 켜져 있으면 요청 처리 중에는 압축된 본문을 archive_jobs에 저장만 하고,
+  `python manage.py run_archive_worker`가 제한된 동시성으로 업로드합니다.
+- 꺼져 있으면 요청 중에 바로 업로드하되, 실패하면 빈 URL로 끝내지 않고 같은 대기열에
+  재시도 작업으로 남깁니다 (워커 또는 reconcile_archives가 처리).
+- 업로드에 성공하면 Session.archived_at을 채웁니다. archived_at이 없는 세션은
+  `python manage.py reconcile_archives`가 저장소에 객체가 있는지 확인하고, 없으면 DB에서
+  재구성해 다시 업로드합니다.
+
+실패한 작업은 지수 백오프(ARCHIVE_RETRY_BASE_SECONDS × 2^(시도-1), 상한 ARCHIVE_RETRY_MAX_SECONDS,
+jitter 포함) 뒤에 다시 시도하고, ARCHIVE_MAX_ATTEMPTS번 실패하면 'failed'로 확정합니다.
+
+ARCHIVE_FORMAT이 'parquet'이면 세션별 JSON 백업은 만들지 않고, 시간 구간별 Parquet 샤드
+(api.shards, build_archive_shards)로만 백업합니다.
+"""
+
+import gzip
+import json
+import random
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from api.models import ArchiveJob, Session
+from api.streaming import ARCHIVE_SPOOL_BYTES
+from core.storage import get_storage
+
+# 백업 JSON을 원소 단위로 나눠 직렬화할 깊이 (최상위 → canvasData → strokes → 스트로크 하나씩)
+_ARCHIVE_SPLIT_DEPTH = 3
+
+# gzip에 한 번에 넘길 직렬화 문자열 크기
+_WRITE_BUFFER_CHARS = 64 * 1024
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def is_async_archive_enabled():
+    """
+    비동기 백업 모드 여부
+
+    Returns:
+        bool: settings.ARCHIVE_ASYNC (기본 False)
+    """
+    return getattr(settings, 'ARCHIVE_ASYNC', False)
+
+
+def get_archive_format():
+    """
+    세션 백업 형식
+
+    Returns:
+        str: settings.ARCHIVE_FORMAT - 'json' (세션별 JSON, 기본) | 'parquet' (구간별 샤드만) | 'both'
+    """
+    return getattr(settings, 'ARCHIVE_FORMAT', 'json')
+
+
+def is_json_archive_enabled():
+    """
+    세션별 JSON 백업(answers/*.json.gz) 사용 여부
+
+    Returns:
+        bool: ARCHIVE_FORMAT이 'json' 또는 'both'
+    """
+    return get_archive_format() in ('json', 'both')
+
+
+def get_max_attempts():
+    """
+    실패 확정 전 최대 업로드 시도 횟수
+
+    Returns:
+        int: settings.ARCHIVE_MAX_ATTEMPTS (기본 8)
+    """
+    return getattr(settings, 'ARCHIVE_MAX_ATTEMPTS', 8)
+
+
+def get_retry_delay(attempts):
+    """
+    재시도까지 대기 시간 (지수 백오프 + jitter)
+
+    Args:
+        attempts (int): 지금까지의 시도 횟수 (1 이상)
+
+    Returns:
+        float: 대기 시간(초) - 백오프 값의 50 ~ 100% 사이 임의 값
+    """
+    base = getattr(settings, 'ARCHIVE_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'ARCHIVE_RETRY_MAX_SECONDS', 3600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return random.uniform(delay / 2, delay)
+
+
+def archive_key(problem_id, session_uuid):
+    """
+    세션 백업 객체 키
+
+    Returns:
+        str: answers/{problem_id}_{session_uuid}.json.gz
+    """
+    return f"answers/{problem_id}_{session_uuid}.json.gz"
+
+
+def archive_object_metadata(problem_id, session_uuid, is_correct):
+    """S3 객체 사용자 메타데이터 (x-amz-meta-*)"""
+    return {
+        'problem-id': str(problem_id),
+        'session-id': str(session_uuid),
+        'is-correct': str(is_correct),
+    }
+
+
+def _iter_archive_json(value, depth):
+    """
+    compact JSON 문자열 조각 생성
+
+    depth 단계까지의 dict / list는 원소 단위로 나누고, 그 아래 값(스트로크 하나 등)은
+    C 인코더로 한 번에 직렬화합니다. 결과를 이어 붙이면 json.dumps(compact)와 같습니다.
+    """
+    if depth and isinstance(value, dict):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (',' if index else '') + _json_encoder.encode(str(key)) + ':'
+            yield from _iter_archive_json(item, depth - 1)
+        yield '}'
+    elif depth and isinstance(value, (list, tuple)):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ','
+            yield from _iter_archive_json(item, depth - 1)
+        yield ']'
+    else:
+        yield _json_encoder.encode(value)
+
+
+def write_archive(upload_data, fileobj):
+    """
+    백업 JSON을 직렬화하면서 바로 gzip으로 압축해 fileobj에 순차 기록
+
+    전체 JSON 문자열 / bytes / 압축 결과를 메모리에 따로 만들지 않으므로
+    추가 메모리는 스트로크 하나와 출력 버퍼 정도입니다. indent 없는 compact 형식입니다.
+
+    Args:
+        upload_data (dict): {**session_data, ...메타 정보}
+        fileobj: write()가 있는 바이너리 출력 (파일, storage.open_writer() 등)
+    """
+    with gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=6) as gz:
+        buffer, buffered = [], 0
+        for chunk in _iter_archive_json(upload_data, _ARCHIVE_SPLIT_DEPTH):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= _WRITE_BUFFER_CHARS:
+                gz.write(''.join(buffer).encode('utf-8'))
+                buffer, buffered = [], 0
+        if buffer:
+            gz.write(''.join(buffer).encode('utf-8'))
+
+
+def encode_archive(upload_data):
+    """
+    백업 JSON을 gzip으로 압축 (대기열 저장 / 재구성용)
+
+    Args:
+        upload_data (dict): {**session_data, ...메타 정보}
+
+    Returns:
+        SpooledTemporaryFile: 처음 위치로 되감은 gzip 파일 (ARCHIVE_SPOOL_BYTES를 넘으면 디스크)
+    """
+    file = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES)
+    write_archive(upload_data, file)
+    file.seek(0)
+    return file
+
+
+def _read_body(body):
+    """바이트 또는 파일 객체(처음부터)를 bytes로 읽음"""
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return bytes(body)
+    body.seek(0)
+    return body.read()
+
+
+def _storage_url(key):
+    """설정된 저장소 기준 객체 URL (저장소 설정이 잘못되었으면 빈 문자열)"""
+    try:
+        return get_storage().url(key)
+    except Exception:
+        return ""
+
+
+def enqueue_archive_job(session_uuid, key, body, metadata=None, delay=0, last_error=None, attempts=0):
+    """
+    백업 작업을 대기열에 추가
+
+    Args:
+        session_uuid (UUID): 세션 UUID
+        key (str): 객체 키
+        body (bytes | file | None): gzip 본문 (None이면 처리 시 DB에서 재구성)
+        metadata (dict, optional): S3 객체 메타데이터
+        delay (float): 첫 시도까지 대기 시간(초)
+        last_error (str, optional): 요청 중 업로드 실패 사유
+        attempts (int): 이미 시도한 횟수
+
+    Returns:
+        ArchiveJob: 생성된 작업
+    """
+    return ArchiveJob.objects.create(
+        session_uuid=session_uuid,
+        key=key,
+        body=None if body is None else _read_body(body),
+        metadata=metadata or {},
+        attempts=attempts,
+        last_error=last_error,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def mark_archived(session_uuids, archived_at=None):
+    """
+    세션 백업 완료 시각 기록
+
+    Args:
+        session_uuids (iterable): 세션 UUID 목록
+        archived_at (datetime, optional): 완료 시각 (기본: 현재)
+
+    Returns:
+        int: 갱신된 세션 수
+    """
+    session_uuids = list(session_uuids)
+    if not session_uuids:
+        return 0
+    return Session.objects.filter(session_uuid__in=session_uuids).update(
+        archived_at=archived_at or timezone.now()
+    )
+
+
+def store_session_archive(problem_id, session_uuid, compressed_body, is_correct):
+    """
+    gzip으로 압축된 세션 백업을 저장소에 올리거나 대기열에 추가
+
+    비동기 모드이면 대기열에만 넣고 업로드될 URL을 돌려줍니다.
+    동기 모드에서 업로드가 실패하면 재시도 작업을 남기고 빈 문자열을 돌려줍니다.
+    ARCHIVE_FORMAT이 'parquet'이면 아무것도 하지 않습니다 (샤드로만 백업).
+
+    Args:
+        problem_id (int): 문제 ID
+        session_uuid (UUID): 세션 UUID
+        compressed_body (bytes | file): gzip 압축된 JSON (파일 객체면 처음부터 읽음)
+        is_correct (bool): 정답 여부
+
+    Returns:
+        str: 객체 URL (동기 업로드 실패 / JSON 백업 미사용 시 빈 문자열)
+    """
+    if not is_json_archive_enabled():
+        return ""
+
+    key = archive_key(problem_id, session_uuid)
+    metadata = archive_object_metadata(problem_id, session_uuid, is_correct)
+
+    if is_async_archive_enabled():
+        enqueue_archive_job(session_uuid, key, compressed_body, metadata)
+        return _storage_url(key)
+
+    try:
+        if not isinstance(compressed_body, (bytes, bytearray, memoryview)):
+            compressed_body.seek(0)
+        s3_url = get_storage().put(
+            key,
+            compressed_body,
+            content_type='application/gzip',
+            content_encoding='gzip',
+            metadata=metadata,
+        )
+    except Exception as e:
+        _enqueue_retry(session_uuid, key, compressed_body, metadata, e)
+        return ""
+
+    mark_archived([session_uuid])
+    return s3_url
+
+
+def stream_session_archive(problem_id, session_uuid, upload_data, is_correct):
+    """
+    세션 백업 JSON을 직렬화 → gzip 압축 → 업로드까지 스트리밍으로 처리
+
+    동기 모드에서는 storage.open_writer()로 바로 올리므로 (S3는 멀티파트 업로드)
+    세션 크기와 무관하게 메모리에는 파트 하나만 남습니다. 비동기 모드이거나 업로드가
+    실패하면 압축 결과를 임시 파일에 만든 뒤 대기열에 넣습니다.
+
+    Args:
+        problem_id (int): 문제 ID
+        session_uuid (UUID): 세션 UUID
+        upload_data (dict): {**session_data, ...메타 정보}
+        is_correct (bool): 정답 여부
+
+    Returns:
+        str: 객체 URL (동기 업로드 실패 / JSON 백업 미사용 시 빈 문자열)
+    """
+    if not is_json_archive_enabled():
+        return ""
+
+    key = archive_key(problem_id, session_uuid)
+    metadata = archive_object_metadata(problem_id, session_uuid, is_correct)
+
+    if is_async_archive_enabled():
+        with encode_archive(upload_data) as body:
+            enqueue_archive_job(session_uuid, key, body, metadata)
+        return _storage_url(key)
+
+    try:
+        storage = get_storage()
+        with storage.open_writer(
+            key, content_type='application/gzip', content_encoding='gzip', metadata=metadata
+        ) as writer:
+            write_archive(upload_data, writer)
+        s3_url = storage.url(key)
+    except Exception as e:
+        with encode_archive(upload_data) as body:
+            _enqueue_retry(session_uuid, key, body, metadata, e)
+        return ""
+
+    mark_archived([session_uuid])
+    return s3_url
+
+
+def _enqueue_retry(session_uuid, key, body, metadata, error):
+    """요청 중 업로드 실패 - DB 데이터는 유지하고, 백업은 대기열에서 재시도"""
+    print(f"S3 업로드 실패 (세션 {session_uuid}): {str(error)} - 재시도 대기열에 추가")
+    enqueue_archive_job(
+        session_uuid, key, body, metadata,
+        delay=get_retry_delay(1), last_error=f"{type(error).__name__}: {error}", attempts=1,
+    )
+
+
+def build_session_archive(session_uuid):
+    """
+    DB에 저장된 세션으로 백업 JSON(gzip) 재구성 (원본 요청 본문이 없는 경우)
+
+    canvasData는 api.replay.export_canvas_data()의 결과이고, 최상위에
+    "rebuilt_from_db": true를 표시합니다.
+
+    Args:
+        session_uuid (UUID): 세션 UUID
+
+    Returns:
+        SpooledTemporaryFile: gzip 압축된 JSON (처음 위치)
+
+    Raises:
+        Session.DoesNotExist: 세션이 없는 경우
+    """
+    # views가 이 모듈을 import하므로 순환 import를 피하기 위해 지연 import
+    from core.models import Question
+    from api.replay import export_canvas_data
+
+    session = Session.objects.get(session_uuid=session_uuid)
+    question = Question.objects.select_related('category').filter(id=session.problem_id).first()
+    upload_data = {
+        "canvasData": export_canvas_data(session_uuid),
+        "db_session_id": str(session_uuid),
+        "problem_id": session.problem_id,
+        "problem_name": question.name if question else "",
+        "category_name": question.category.name if question else None,
+        "difficulty": question.difficulty if question else None,
+        "user_answer": session.answer,
+        "is_correct": session.is_correct,
+        "label": session.label,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        "rebuilt_from_db": True,
+    }
+    return encode_archive(upload_data)
+
+
+def claim_archive_jobs(batch_size=20, visibility_timeout=300):
+    """
+    업로드할 작업을 가져와 'processing' 상태로 표시
+
+    재시도 시각(next_attempt_at)이 지난 pending 작업과, 워커가 죽어 visibility_timeout(초)이
+    지나도록 끝나지 않은 processing 작업을 가져옵니다. SKIP LOCKED로 다른 워커가 잡은 행은 건너뜁니다.
+
+    Args:
+        batch_size (int): 한 번에 가져올 최대 작업 수
+        visibility_timeout (int): processing 작업을 재시도 대상으로 볼 경과 시간(초)
+
+    Returns:
+        list: ArchiveJob 배열 (재시도 시각 순)
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=visibility_timeout)
+
+    with transaction.atomic():
+        jobs = list(
+            ArchiveJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ArchiveJob.STATUS_PENDING, next_attempt_at__lte=now) |
+                Q(status=ArchiveJob.STATUS_PROCESSING, started_at__lt=stale_before)
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        for job in jobs:
+            job.status = ArchiveJob.STATUS_PROCESSING
+            job.started_at = now
+            job.attempts += 1
+        ArchiveJob.objects.bulk_update(jobs, ['status', 'started_at', 'attempts'])
+
+    return jobs
+
+
+def _upload(storage, key, body, metadata):
+    """작업 하나 업로드 (스레드 풀에서 실행 - DB 접근 없음)"""
+    return storage.put(
+        key,
+        body,
+        content_type='application/gzip',
+        content_encoding='gzip',
+        metadata=metadata,
+    )
+
+
+def process_archive_jobs(jobs, concurrency=8, max_attempts=None):
+    """
+    작업들을 최대 concurrency개씩 동시에 업로드하고 결과 기록
+
+    본문이 없는 작업(reconcile)은 메인 스레드에서 DB로 재구성한 뒤 업로드를 넘기므로
+    DB 조회와 업로드가 겹쳐서 진행됩니다. 스레드 풀은 저장소 I/O만 수행합니다.
+
+    Args:
+        jobs (list): claim_archive_jobs()로 가져온 작업
+        concurrency (int): 동시 업로드 수
+        max_attempts (int, optional): 이 횟수를 넘으면 'failed'로 확정 (None이면 설정값)
+
+    Returns:
+        tuple: (성공 수, 실패 수)
+    """
+    max_attempts = max_attempts or get_max_attempts()
+    if not jobs:
+        return 0, 0
+
+    results = {}
+    storage = None
+    try:
+        storage = get_storage()
+    except Exception as e:
+        # 저장소 설정 오류: 모든 작업을 실패로 기록하고 백오프
+        for job in jobs:
+            results[job.id] = e
+
+    if storage is not None:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {}
+            rebuilt = []
+            for job in jobs:
+                try:
+                    if job.body is not None:
+                        body = bytes(job.body)
+                    else:
+                        body = build_session_archive(job.session_uuid)
+                        rebuilt.append(body)
+                except Exception as e:
+                    results[job.id] = e
+                    continue
+                futures[job.id] = executor.submit(_upload, storage, job.key, body, job.metadata)
+            for job_id, future in futures.items():
+                try:
+                    future.result()
+                    results[job_id] = None
+                except Exception as e:
+                    results[job_id] = e
+            # 재구성한 임시 파일 정리
+            for body in rebuilt:
+                body.close()
+
+    now = timezone.now()
+    done, failed = [], []
+    for job in jobs:
+        error = results.get(job.id)
+        if error is None:
+            job.status = ArchiveJob.STATUS_DONE
+            job.finished_at = now
+            job.last_error = None
+            job.body = None  # 업로드된 본문은 보관하지 않음
+            done.append(job)
+            continue
+        job.last_error = f"{type(error).__name__}: {error}\n" + "".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        )
+        if job.attempts >= max_attempts:
+            job.status = ArchiveJob.STATUS_FAILED
+        else:
+            job.status = ArchiveJob.STATUS_PENDING
+            job.next_attempt_at = now + timedelta(seconds=get_retry_delay(job.attempts))
+        failed.append(job)
+        print(f"[archive] 작업 {job.id} 실패 (시도 {job.attempts}/{max_attempts}): {error}")
+
+    with transaction.atomic():
+        ArchiveJob.objects.bulk_update(done, ['status', 'finished_at', 'last_error', 'body'])
+        ArchiveJob.objects.bulk_update(failed, ['status', 'next_attempt_at', 'last_error'])
+        mark_archived([job.session_uuid for job in done], now)
+    return len(done), len(failed)
+
+
+def archive_stats():
+    """
+    백업 대기열 상태 지표 계산
+
+    Returns:
+        dict: {
+            "depth": 대기+처리 중 작업 수,
+            "pending": 대기 작업 수 (재시도 대기 포함),
+            "processing": 처리 중 작업 수,
+            "failed": 실패 확정 작업 수,
+            "lag_seconds": 가장 오래된 미처리 작업의 대기 시간(초, 없으면 0),
+        }
+    """
+    counts = dict(
+        ArchiveJob.objects
+        .exclude(status=ArchiveJob.STATUS_DONE)
+        .values_list('status')
+        .annotate(n=Count('id'))
+    )
+    oldest = (
+        ArchiveJob.objects
+        .filter(status__in=[ArchiveJob.STATUS_PENDING, ArchiveJob.STATUS_PROCESSING])
+        .aggregate(oldest=Min('created_at'))['oldest']
+    )
+
+    pending = counts.get(ArchiveJob.STATUS_PENDING, 0)
+    processing = counts.get(ArchiveJob.STATUS_PROCESSING, 0)
+    return {
+        "depth": pending + processing,
+        "pending": pending,
+        "processing": processing,
+        "failed": counts.get(ArchiveJob.STATUS_FAILED, 0),
+        "lag_seconds": round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0,
+    }
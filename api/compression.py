@@ -0,0 +1,143 @@
+"""
+압축된 요청 본문(Content-Encoding) 처리
+
+태블릿에서 보내는 session_data는 같은 키가 반복되는 JSON이라 압축률이 높습니다.
+클라이언트가 `Content-Encoding: gzip` 또는 `zstd`로 보내면 서버에서 풀어서 사용합니다.
+
+압축 폭탄(작은 요청이 수 GB로 풀리는 경우)을 막기 위해 해제는 스트림으로
+조금씩 읽으며, 누적 크기가 settings.INGEST_MAX_BODY_BYTES를 넘으면 즉시 중단합니다.
+"""
+
+import gzip
+import io
+import zlib
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd는 zstandard 패키지가 설치된 경우에만 지원
+    zstandard = None
+
+# 해제 스트림에서 한 번에 읽는 크기
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class RequestBodyError(Exception):
+    """
+    요청 본문을 읽을 수 없는 경우
+
+    Attributes:
+        status (int): 클라이언트에 돌려줄 HTTP 상태 코드
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def get_max_body_bytes():
+    """
+    해제 후 허용되는 최대 본문 크기(bytes)
+
+    Returns:
+        int: settings.INGEST_MAX_BODY_BYTES (기본 64MB)
+    """
+    return getattr(settings, 'INGEST_MAX_BODY_BYTES', 64 * 1024 * 1024)
+
+
+def get_content_encoding(request):
+    """
+    요청의 Content-Encoding 헤더 값 (소문자, 공백 제거)
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        str: 'gzip', 'zstd', 'identity' 등 (헤더가 없으면 'identity')
+    """
+    return (request.headers.get('Content-Encoding') or 'identity').strip().lower()
+
+
+class _LimitedReader(io.RawIOBase):
+    """
+    해제 스트림을 감싸 누적 출력 크기를 제한하는 읽기 전용 스트림
+    """
+
+    def __init__(self, source, limit):
+        self._source = source
+        self._limit = limit
+        self._total = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            data = self._source.read(len(buffer))
+        except (OSError, EOFError, zlib.error) as e:
+            raise RequestBodyError(f"압축된 요청 본문을 해제할 수 없습니다: {e}") from e
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise RequestBodyError(f"압축된 요청 본문을 해제할 수 없습니다: {e}") from e
+            raise
+
+        self._total += len(data)
+        if self._total > self._limit:
+            raise RequestBodyError(
+                f"요청 본문이 너무 큽니다 (최대 {self._limit} bytes).", status=413
+            )
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_request_body(request):
+    """
+    요청 본문을 (필요하면 해제하면서) 읽는 스트림 반환
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        io.BufferedReader: 해제된 본문 스트림
+
+    Raises:
+        RequestBodyError: 지원하지 않는 인코딩(415)인 경우
+    """
+    encoding = get_content_encoding(request)
+    limit = get_max_body_bytes()
+
+    if encoding == 'identity':
+        source = request
+    elif encoding in ('gzip', 'x-gzip'):
+        source = gzip.GzipFile(fileobj=request, mode='rb')
+    elif encoding == 'zstd':
+        if zstandard is None:
+            raise RequestBodyError("zstd 압축은 지원되지 않습니다 (zstandard 미설치).", status=415)
+        source = zstandard.ZstdDecompressor().stream_reader(request, read_size=READ_CHUNK_SIZE)
+    else:
+        raise RequestBodyError(f"지원하지 않는 Content-Encoding입니다: {encoding}", status=415)
+
+    return io.BufferedReader(_LimitedReader(source, limit), buffer_size=READ_CHUNK_SIZE)
+
+
+def read_request_body(request):
+    """
+    요청 본문 전체를 해제된 bytes로 반환
+
+    압축되지 않은 요청은 기존처럼 request.body를 그대로 사용합니다.
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        bytes: 해제된 본문
+
+    Raises:
+        RequestBodyError: 지원하지 않는 인코딩(415), 크기 초과(413), 손상된 데이터(400)
+    """
+    if get_content_encoding(request) == 'identity':
+        return request.body
+
+    with open_request_body(request) as stream:
+        return stream.read()
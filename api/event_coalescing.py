@@ -0,0 +1,152 @@
+"""
+고빈도 zoom / pan 이벤트 병합(coalescing)
+
+캔버스는 zoom / pan 한 단계마다 이벤트를 보내므로 핀치 제스처 하나가 수백 개의
+events 행이 됩니다. 적재 전에 연속된 같은 타입의 zoom / pan 이벤트를 구간(range) 이벤트
+하나로 합칩니다.
+
+    {"type": "pinch_zoom", "timestamp": 1000, "details": {"scale": 1.1}}
+    {"type": "pinch_zoom", "timestamp": 1016, "details": {"scale": 1.2}}
+    {"type": "pinch_zoom", "timestamp": 1033, "details": {"scale": 1.4}}
+        ↓
+    {"type": "pinch_zoom", "timestamp": 1000, "endTimestamp": 1033, "count": 3,
+     "details": {"start": {"scale": 1.1}, "end": {"scale": 1.4}}}
+
+- 병합 대상: settings.EVENT_COALESCE_TYPES (빈 목록이면 병합하지 않음)
+- 직전 이벤트와 간격이 settings.EVENT_COALESCE_GAP_MS를 넘으면 새 구간을 시작 (별개의 제스처)
+- 샘플이 하나뿐인 이벤트는 그대로 둡니다.
+
+원본 시퀀스는 S3 백업(요청 본문 그대로)에 남고, Session.zoom_count / pan_count는
+클라이언트 statistics 값을 그대로 쓰므로 병합과 무관합니다.
+"""
+
+from django.conf import settings
+
+DEFAULT_COALESCE_TYPES = ('zoom', 'zoom_in', 'zoom_out', 'pinch_zoom', 'pan', 'canvas_pan')
+
+
+def get_coalesce_types():
+    """
+    병합 대상 이벤트 타입
+
+    Returns:
+        frozenset: settings.EVENT_COALESCE_TYPES
+    """
+    return frozenset(getattr(settings, 'EVENT_COALESCE_TYPES', DEFAULT_COALESCE_TYPES))
+
+
+def get_coalesce_gap_ms():
+    """
+    같은 구간으로 합칠 최대 이벤트 간격(ms)
+
+    Returns:
+        int: settings.EVENT_COALESCE_GAP_MS (기본 300)
+    """
+    return getattr(settings, 'EVENT_COALESCE_GAP_MS', 300)
+
+
+def _to_range_event(samples):
+    """같은 구간의 이벤트 배열을 이벤트 하나(샘플이 여러 개면 구간 이벤트)로 변환"""
+    first, last = samples[0], samples[-1]
+    if len(samples) == 1:
+        return first
+    return {
+        "type": first.get('type'),
+        "timestamp": first.get('timestamp', 0),
+        "endTimestamp": last.get('timestamp', 0),
+        "count": len(samples),
+        "details": {
+            "start": first.get('details') or first.get('data') or {},
+            "end": last.get('details') or last.get('data') or {},
+        },
+    }
+
+
+class EventCoalescer:
+    """
+    이벤트를 여러 번에 나눠 받으면서 병합하는 상태 객체 (스트리밍 적재용)
+
+    스트리밍 경로는 이벤트를 INGEST_BATCH_SIZE개씩 받으므로 배치마다 coalesce_events()를
+    호출하면 배치 경계에 걸친 제스처가 구간 이벤트 두 개로 나뉩니다. feed()는 끝난 구간만
+    돌려주고 진행 중인 구간은 다음 배치로 넘기며, 마지막에 flush()로 남은 구간을 내보냅니다.
+
+    사용 예:
+        coalescer = EventCoalescer()
+        for batch in batches:
+            save(coalescer.feed(batch))
+        save(coalescer.flush())
+    """
+
+    def __init__(self, types=None, gap_ms=None):
+        self.types = get_coalesce_types() if types is None else frozenset(types)
+        self.gap_ms = get_coalesce_gap_ms() if gap_ms is None else gap_ms
+        self._samples = []
+
+    def feed(self, events_list):
+        """
+        이벤트 배치 추가
+
+        Args:
+            events_list (list): canvasData.events의 연속된 일부
+
+        Returns:
+            list: 확정된 이벤트 배열 (진행 중인 구간은 포함하지 않음)
+        """
+        if not self.types:
+            return list(events_list)
+
+        result = []
+        samples = self._samples
+        for event_data in events_list:
+            event_type = event_data.get('type')
+            # 이미 구간 이벤트인 것(export 결과 재전송 등)은 다시 합치지 않음
+            coalescible = event_type in self.types and 'endTimestamp' not in event_data
+            if samples:
+                prev = samples[-1]
+                same_run = (
+                    coalescible
+                    and event_type == prev.get('type')
+                    and int(event_data.get('timestamp', 0)) - int(prev.get('timestamp', 0)) <= self.gap_ms
+                )
+                if same_run:
+                    samples.append(event_data)
+                    continue
+                result.append(_to_range_event(samples))
+                samples = []
+
+            if coalescible:
+                samples.append(event_data)
+            else:
+                result.append(event_data)
+
+        self._samples = samples
+        return result
+
+    def flush(self):
+        """
+        진행 중인 구간 내보내기 (이벤트 끝)
+
+        Returns:
+            list: 남은 구간 이벤트 (없으면 빈 배열)
+        """
+        samples, self._samples = self._samples, []
+        return [_to_range_event(samples)] if samples else []
+
+
+def coalesce_events(events_list, types=None, gap_ms=None):
+    """
+    연속된 같은 타입의 zoom / pan 이벤트를 구간 이벤트로 병합
+
+    입력 순서(클라이언트 기록 순서)를 유지하며, 다른 타입의 이벤트가 끼어 있으면
+    구간이 끊어집니다.
+
+    Args:
+        events_list (list): canvasData.events 배열
+        types (iterable, optional): 병합 대상 타입 (None이면 설정값)
+        gap_ms (int, optional): 최대 간격 (None이면 설정값)
+
+    Returns:
+        list: 병합된 이벤트 배열 (구간 이벤트는 endTimestamp / count 포함)
+    """
+    coalescer = EventCoalescer(types, gap_ms)
+    return coalescer.feed(events_list) + coalescer.flush()
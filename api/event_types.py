@@ -0,0 +1,153 @@
+"""
+이벤트 타입 사전 / details 컬럼 추출
+
+events에는 타입 문자열 대신 event_types의 smallint id를 저장합니다.
+타입 종류는 수십 개 수준이므로 name ↔ id 매핑을 프로세스 메모리에 캐시하고,
+처음 보는 타입만 event_types에 INSERT합니다.
+
+캐시는 트랜잭션이 커밋된 뒤에만 채워지므로(transaction.on_commit)
+롤백된 트랜잭션에서 만든 타입 id가 캐시에 남지 않습니다.
+
+details(JSON)에서 분석에 자주 쓰는 값은 적재 시 EVENT_FIELDS에 따라
+Event의 타입이 있는 컬럼(tool_prev / tool_new / x / y / zoom)으로 추출합니다.
+details 원본은 그대로 저장하므로 export 결과는 바뀌지 않습니다.
+"""
+
+from functools import partial
+
+from django.db import transaction
+
+from api.models import EventType
+
+# details → 추출 컬럼: (Event 필드명, details 키 후보(앞에서부터 우선), 값 타입)
+# 값 타입이 맞지 않는 키는 건너뜀 (예: zoom_in의 from/to는 숫자이므로 도구 컬럼에 들어가지 않음)
+EVENT_FIELDS = (
+    ('tool_prev', ('prevTool', 'prev', 'from'), str),
+    ('tool_new', ('newTool', 'new', 'to', 'tool'), str),
+    ('x', ('x',), float),
+    ('y', ('y',), float),
+    ('zoom', ('zoom', 'newZoom', 'scale', 'to'), float),
+)
+
+EVENT_TYPE_MAX_LENGTH = 32
+TOOL_MAX_LENGTH = 16
+
+# 프로세스 캐시 (name → id, id → name)
+_ids_by_name = {}
+_names_by_id = {}
+
+
+def _remember(mapping):
+    """커밋된 name → id 매핑을 캐시에 추가"""
+    _ids_by_name.update(mapping)
+    _names_by_id.update((type_id, name) for name, type_id in mapping.items())
+
+
+def normalize_event_type(value):
+    """
+    클라이언트가 보낸 이벤트 타입을 event_types.name 형식으로 정규화
+
+    Args:
+        value: canvasData.events[].type
+
+    Returns:
+        str: 최대 32자 문자열 (비어 있으면 'unknown')
+    """
+    return str(value or 'unknown')[:EVENT_TYPE_MAX_LENGTH]
+
+
+def get_event_type_ids(names):
+    """
+    이벤트 타입 이름 → id 매핑 (없는 타입은 생성)
+
+    캐시에 없는 이름만 조회하고, 그래도 없으면 한 번의 bulk INSERT로 만듭니다.
+    동시에 같은 타입을 만드는 요청이 있어도 unique 제약 + ignore_conflicts로 한 행만 남습니다.
+
+    Args:
+        names (iterable): normalize_event_type()으로 정규화된 타입 이름
+
+    Returns:
+        dict: {name: id}
+    """
+    names = set(names)
+    missing = names - _ids_by_name.keys()
+    result = {name: _ids_by_name[name] for name in names - missing}
+    if not missing:
+        return result
+
+    found = dict(EventType.objects.filter(name__in=missing).values_list('name', 'id'))
+    new = missing - found.keys()
+    if new:
+        EventType.objects.bulk_create([EventType(name=name) for name in new], ignore_conflicts=True)
+        found.update(EventType.objects.filter(name__in=new).values_list('name', 'id'))
+
+    transaction.on_commit(partial(_remember, found))
+    result.update(found)
+    return result
+
+
+def _load_event_type_names():
+    """event_types 전체를 읽어 id → name 반환 (캐시는 커밋 후 갱신)"""
+    mapping = dict(EventType.objects.values_list('name', 'id'))
+    transaction.on_commit(partial(_remember, mapping))
+    return {type_id: name for name, type_id in mapping.items()}
+
+
+def get_event_type_names():
+    """
+    id → 이벤트 타입 이름 매핑 (export / 분석용)
+
+    다른 프로세스가 새로 만든 타입은 캐시에 없을 수 있으므로
+    id 하나씩 조회할 때는 get_event_type_name()을 사용합니다.
+
+    Returns:
+        dict: {id: name}
+    """
+    return _names_by_id or _load_event_type_names()
+
+
+def get_event_type_name(type_id):
+    """
+    id 하나의 이벤트 타입 이름 (캐시에 없으면 사전을 다시 읽음)
+
+    Args:
+        type_id (int): Event.type_id
+
+    Returns:
+        str: 타입 이름 (사전에 없으면 'unknown')
+    """
+    name = _names_by_id.get(type_id)
+    if name is None:
+        name = _load_event_type_names().get(type_id, 'unknown')
+    return name
+
+
+def _coerce(value, kind):
+    """details 값을 추출 컬럼 타입으로 변환 (타입이 맞지 않으면 None)"""
+    if kind is str:
+        return value[:TOOL_MAX_LENGTH] if isinstance(value, str) and value else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def extract_event_fields(details):
+    """
+    details에서 EVENT_FIELDS 컬럼 값 추출
+
+    Args:
+        details (dict): 이벤트 details
+
+    Returns:
+        dict: {Event 필드명: 값} (찾지 못한 컬럼은 None)
+    """
+    fields = {}
+    for field, keys, kind in EVENT_FIELDS:
+        value = None
+        if isinstance(details, dict):
+            for key in keys:
+                value = _coerce(details.get(key), kind)
+                if value is not None:
+                    break
+        fields[field] = value
+    return fields
@@ -0,0 +1,162 @@
+"""
+제출 멱등성 (재전송 안전한 세션 적재)
+
+태블릿이 타임아웃 후 같은 제출을 다시 보내면, 클라이언트 세션 UUID(metadata.sessionId)와
+해제된 요청 본문의 SHA-256 해시로 이전 제출을 찾아 저장된 응답을 그대로 돌려줍니다.
+
+- 처음 보는 세션 UUID      → 영수증(submission_receipts)을 선점하고 정상 처리
+- 같은 UUID + 같은 해시    → 저장된 응답 반환 (DB 쓰기, S3, Mathpix/OpenAI 호출 없음)
+- 같은 UUID + 같은 해시이지만 아직 처리 중 → 409 (잠시 후 재시도)
+- 같은 UUID + 다른 해시    → 409 (다른 내용으로 이미 제출됨)
+
+처리 도중 서버가 죽어 응답이 저장되지 않은 영수증은 SUBMISSION_CLAIM_TIMEOUT(초)이
+지나면 다시 선점할 수 있습니다 (세션 행이 아직 없는 경우만).
+"""
+
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.models import Session, SubmissionReceipt
+
+
+class DuplicateSubmission(Exception):
+    """
+    이미 선점된 세션 UUID로 다시 제출된 경우
+
+    Attributes:
+        receipt (SubmissionReceipt | None): 기존 영수증 (영수증 없이 세션만 있으면 None)
+        payload_hash (str): 이번 요청의 본문 해시
+    """
+
+    def __init__(self, receipt, payload_hash):
+        super().__init__(f"세션 {receipt.session_uuid if receipt else ''}은 이미 제출되었습니다.")
+        self.receipt = receipt
+        self.payload_hash = payload_hash
+
+    @property
+    def is_replay(self):
+        """같은 본문의 재전송이고 저장된 응답이 있는지 여부"""
+        return (
+            self.receipt is not None
+            and self.receipt.payload_hash == self.payload_hash
+            and self.receipt.response_data is not None
+        )
+
+    @property
+    def in_progress(self):
+        """같은 본문의 이전 요청이 아직 처리 중인지 여부"""
+        return (
+            self.receipt is not None
+            and self.receipt.payload_hash == self.payload_hash
+            and self.receipt.response_data is None
+        )
+
+
+class HashingReader:
+    """
+    읽은 바이트의 SHA-256을 함께 계산하는 읽기 스트림 래퍼 (스트리밍 파싱용)
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._hash.update(data)
+        return data
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+
+def compute_payload_hash(body):
+    """
+    요청 본문의 SHA-256 해시
+
+    Args:
+        body (bytes): 해제된 요청 본문
+
+    Returns:
+        str: 64자리 hex 문자열
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+def get_claim_timeout():
+    """
+    처리 중 영수증을 다시 선점할 수 있게 되는 시간(초)
+
+    Returns:
+        int: settings.SUBMISSION_CLAIM_TIMEOUT (기본 300)
+    """
+    return getattr(settings, 'SUBMISSION_CLAIM_TIMEOUT', 300)
+
+
+def claim_submission(session_uuid, payload_hash, allow_existing_session=False):
+    """
+    세션 UUID에 대한 제출 영수증 선점
+
+    Args:
+        session_uuid (UUID): 클라이언트 세션 UUID
+        payload_hash (str): compute_payload_hash() 결과
+        allow_existing_session (bool): 세션 행이 이미 있어도 선점 허용 (분할 업로드 finalize용)
+
+    Raises:
+        DuplicateSubmission: 이미 다른 요청이 선점했거나 처리한 경우
+    """
+    if not allow_existing_session and not SubmissionReceipt.objects.filter(session_uuid=session_uuid).exists():
+        # 영수증 도입 전에 저장된 세션
+        if Session.objects.filter(session_uuid=session_uuid).exists():
+            raise DuplicateSubmission(None, payload_hash)
+
+    try:
+        with transaction.atomic():
+            SubmissionReceipt.objects.create(session_uuid=session_uuid, payload_hash=payload_hash)
+        return
+    except IntegrityError:
+        pass
+
+    receipt = SubmissionReceipt.objects.get(session_uuid=session_uuid)
+
+    # 응답 없이 오래된 영수증은 이전 요청이 중단된 것으로 보고 다시 선점
+    stale_before = timezone.now() - timedelta(seconds=get_claim_timeout())
+    if receipt.response_data is None and receipt.created_at < stale_before and (
+        allow_existing_session or not Session.objects.filter(session_uuid=session_uuid).exists()
+    ):
+        taken = SubmissionReceipt.objects.filter(
+            session_uuid=session_uuid, response_data__isnull=True, created_at=receipt.created_at
+        ).update(payload_hash=payload_hash, created_at=timezone.now())
+        if taken:
+            return
+        receipt.refresh_from_db()
+
+    raise DuplicateSubmission(receipt, payload_hash)
+
+
+def complete_submission(session_uuid, response_data):
+    """
+    처리가 끝난 제출의 응답 저장
+
+    Args:
+        session_uuid (UUID): 세션 UUID
+        response_data (dict): 응답의 data
+    """
+    SubmissionReceipt.objects.filter(session_uuid=session_uuid).update(
+        response_data=response_data,
+        completed_at=timezone.now(),
+    )
+
+
+def release_submission(session_uuid):
+    """
+    처리에 실패한 제출의 영수증 삭제 (재시도 허용)
+
+    Args:
+        session_uuid (UUID): 세션 UUID
+    """
+    SubmissionReceipt.objects.filter(session_uuid=session_uuid, response_data__isnull=True).delete()
@@ -0,0 +1,418 @@
+"""
+세션 필기 데이터 적재(ingest) 엔진
+
+프론트엔드에서 전송된 canvasData(strokes/events)를 Stroke, StrokePoint, Event
+행으로 변환하여 한 번에 적재합니다.
+
+스트로크마다 INSERT를 반복하지 않고, 모든 행을 메모리에서 먼저 구성한 뒤
+테이블별로 bulk_create를 한 번씩 호출합니다. 따라서 DB 왕복 횟수는
+스트로크 개수와 무관하게 (테이블 수 × 배치 수)로 고정됩니다.
+
+stroke_points는 행 수가 가장 많으므로 적재 백엔드를 선택할 수 있습니다.
+- 'orm'  : StrokePoint 인스턴스를 만들어 bulk_create (SQLite 등 모든 DB)
+- 'copy' : psycopg3의 COPY ... FROM STDIN으로 튜플을 그대로 스트리밍 (PostgreSQL 전용)
+- 'auto' : PostgreSQL + psycopg3이면 'copy', 아니면 'orm' (기본값)
+
+포인트 저장 방식(settings.STROKE_POINT_STORAGE)도 선택할 수 있습니다.
+- 'rows'   : 포인트마다 stroke_points 행 1개 (기본값)
+- 'packed' : 스트로크별로 포인트를 바이너리로 묶어 Stroke.points_packed에 저장
+- 'both'   : 두 방식 모두 저장 (마이그레이션 기간용)
+"""
+
+import uuid
+from itertools import repeat
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils import timezone
+
+from api.event_coalescing import coalesce_events
+from api.event_types import extract_event_fields, get_event_type_ids, normalize_event_type
+from api.models import Session, SessionChunk, Stroke, StrokePoint, Event
+from api.packing import pack_columns
+from api.simplify import build_lods
+from api.stroke_stats import compute_stroke_stats
+from api.wire import decode_stroke_columns, quantize_pressure
+
+# stroke_points 적재 시 튜플의 컬럼 순서 (COPY 컬럼 목록과 동일해야 함)
+# COPY는 모델 default를 적용하지 않으므로 파티션 키(recorded_on)도 직접 채움
+POINT_COLUMNS = (
+    'stroke_id', 'idx', 't_ms', 'x', 'y',
+    'pressure_q', 'tilt_x', 'tilt_y', 'twist',
+    'pointer_id', 'buttons', 'width', 'height',
+    'recorded_on',
+)
+
+# smallint로 저장되는 포인트 컬럼 (범위를 벗어난 값은 잘라서 저장)
+SMALLINT_POINT_COLUMNS = frozenset(('tilt_x', 'tilt_y', 'twist', 'buttons', 'width', 'height'))
+SMALLINT_MIN, SMALLINT_MAX = -32768, 32767
+
+POINT_BACKENDS = ('auto', 'orm', 'copy')
+
+POINT_STORAGES = ('rows', 'packed', 'both')
+
+
+def get_batch_size():
+    """
+    bulk_create 한 번에 보낼 최대 행 수를 반환
+
+    Returns:
+        int: 배치 크기 (settings.INGEST_BATCH_SIZE, 기본 2000)
+    """
+    return getattr(settings, 'INGEST_BATCH_SIZE', 2000)
+
+
+def resolve_point_backend(backend=None):
+    """
+    실제로 사용할 stroke_points 적재 백엔드 결정
+
+    Args:
+        backend (str, optional): 'auto' | 'orm' | 'copy'
+            (None이면 settings.INGEST_POINT_BACKEND 사용)
+
+    Returns:
+        str: 'orm' 또는 'copy'
+
+    Raises:
+        ValueError: 알 수 없는 백엔드이거나, COPY를 쓸 수 없는 DB에서 'copy'를 지정한 경우
+    """
+    backend = backend or getattr(settings, 'INGEST_POINT_BACKEND', 'auto')
+    if backend not in POINT_BACKENDS:
+        raise ValueError(f"알 수 없는 적재 백엔드입니다: {backend}")
+
+    copy_available = connection.vendor == 'postgresql' and is_psycopg3
+    if backend == 'auto':
+        return 'copy' if copy_available else 'orm'
+    if backend == 'copy' and not copy_available:
+        raise ValueError("COPY 적재는 PostgreSQL + psycopg3 환경에서만 사용할 수 있습니다.")
+    return backend
+
+
+def get_point_storage():
+    """
+    포인트 저장 방식 반환
+
+    Returns:
+        str: 'rows' | 'packed' | 'both' (settings.STROKE_POINT_STORAGE, 기본 'rows')
+
+    Raises:
+        ValueError: 알 수 없는 저장 방식인 경우
+    """
+    storage = getattr(settings, 'STROKE_POINT_STORAGE', 'rows')
+    if storage not in POINT_STORAGES:
+        raise ValueError(f"알 수 없는 포인트 저장 방식입니다: {storage}")
+    return storage
+
+
+def _to_smallint(values):
+    """
+    값 배열을 smallint 범위의 정수로 변환 (None은 그대로)
+
+    width / height 등 PointerEvent의 실수 값도 반올림하여 COPY 경로에서 그대로 쓸 수 있게 합니다.
+    """
+    return [
+        None if v is None else max(SMALLINT_MIN, min(SMALLINT_MAX, int(round(v))))
+        for v in values
+    ]
+
+
+def point_value_columns(columns):
+    """
+    디코딩된 컬럼에서 POINT_COLUMNS의 값 컬럼(t_ms ~ height) 배열을 순서대로 생성
+
+    Args:
+        columns (dict): decode_stroke_columns()의 컬럼
+
+    Yields:
+        list: POINT_COLUMNS[2:-1] 순서의 컬럼 배열
+    """
+    for name in POINT_COLUMNS[2:-1]:
+        if name == 'pressure_q':
+            yield quantize_pressure(columns['pressure'])
+        elif name in SMALLINT_POINT_COLUMNS:
+            yield _to_smallint(columns[name])
+        else:
+            yield columns[name]
+
+
+def build_stroke_rows(session, strokes_list, storage=None):
+    """
+    스트로크 배열을 Stroke 인스턴스와 stroke_points 행 튜플로 변환 (DB 접근 없음)
+
+    Stroke의 PK(UUID)를 서버에서 미리 생성하므로, INSERT 전에도
+    포인트 행이 부모 스트로크를 참조할 수 있습니다.
+    포인트는 모델 인스턴스 대신 POINT_COLUMNS 순서의 튜플로 만들어
+    COPY 경로에서는 변환 없이 바로 스트리밍합니다.
+
+    저장 방식이 'packed'/'both'이면 스트로크별 포인트를 Stroke.points_packed에
+    바이너리로 채우고, 'packed'이면 point_rows는 비어 있습니다.
+    저장 방식과 무관하게 RDP LOD 피라미드를 Stroke.lod_packed에 채웁니다 (api.simplify).
+
+    Args:
+        session (Session): 소속 세션 객체
+        strokes_list (list): canvasData.strokes 배열 (v1 / v2 wire 형식, api.wire 참고)
+        storage (str, optional): 'rows' | 'packed' | 'both' (None이면 설정값)
+
+    Returns:
+        tuple: (stroke_objects, point_rows)
+
+    Raises:
+        ValueError: v2 스트로크의 컬럼이 올바르지 않은 경우
+    """
+    storage = storage or get_point_storage()
+    stroke_objects = []
+    point_rows = []
+    recorded_on = timezone.localdate()
+
+    # 통계 계산용으로 모든 스트로크의 포인트를 이어 붙인 컬럼
+    stat_counts, stat_t, stat_x, stat_y, stat_pressure = [], [], [], [], []
+    stroke_columns = []
+
+    for stroke_data in strokes_list:
+        count, columns = decode_stroke_columns(stroke_data)
+        stat_counts.append(count)
+        stat_t.extend(columns['t_ms'])
+        stat_x.extend(columns['x'])
+        stat_y.extend(columns['y'])
+        stat_pressure.extend(columns['pressure'])
+        stroke_columns.append(columns)
+
+        # pointer_type은 스트로크 단위로만 저장 (v1에서 스트로크 값이 없으면 첫 포인트의 값)
+        pointer_type = stroke_data.get('pointerType') or (columns['pointer_type'] or [None])[0] or 'pen'
+
+        stroke = Stroke(
+            stroke_uuid=uuid.uuid4(),
+            session=session,
+            client_id=str(stroke_data['id'])[:64] if stroke_data.get('id') else None,
+            tool=stroke_data.get('tool', 'pen'),
+            color=stroke_data.get('color', '#000000'),
+            stroke_width=int(stroke_data.get('strokeWidth', 3)),
+            start_ms=int(stroke_data.get('startTime', 0)),  # 포인트 t_ms의 기준점
+            end_ms=int(stroke_data.get('endTime', 0)),
+            pointer_type=pointer_type,
+            is_coalesced=stroke_data.get('coalesced', False),
+        )
+        stroke_objects.append(stroke)
+
+        stroke.point_count = count
+        if storage in ('packed', 'both') and count:
+            stroke.points_packed = pack_columns(columns, count)
+        if storage in ('rows', 'both'):
+            # 컬럼 배열을 POINT_COLUMNS 순서의 튜플로 묶음 (포인트 dict를 만들지 않음)
+            point_rows.extend(zip(
+                repeat(stroke.stroke_uuid, count),
+                range(count),
+                *point_value_columns(columns),
+                repeat(recorded_on, count),
+            ))
+
+    # 거리 / 속도 / 가속도 / pressure / bbox는 클라이언트 값 대신 서버에서 계산
+    for stroke, stats in zip(stroke_objects, compute_stroke_stats(
+        stat_counts, stat_t, stat_x, stat_y, stat_pressure
+    )):
+        for name, value in stats.items():
+            setattr(stroke, name, value)
+
+    # RDP LOD 피라미드도 세션 전체 포인트를 한 번에 계산
+    for stroke, lod_packed in zip(stroke_objects, build_lods(stroke_columns, stat_counts, stat_x, stat_y)):
+        stroke.lod_packed = lod_packed
+
+    return stroke_objects, point_rows
+
+
+def _write_points_orm(point_rows, batch_size):
+    """
+    포인트 튜플을 StrokePoint 인스턴스로 변환하여 bulk_create
+
+    Args:
+        point_rows (list): POINT_COLUMNS 순서의 튜플 배열
+        batch_size (int): 배치 크기
+    """
+    StrokePoint.objects.bulk_create(
+        [StrokePoint(**dict(zip(POINT_COLUMNS, row))) for row in point_rows],
+        batch_size=batch_size
+    )
+
+
+def _write_points_copy(point_rows):
+    """
+    포인트 튜플을 COPY ... FROM STDIN으로 stroke_points에 스트리밍
+
+    모델 인스턴스 생성과 SQL 문자열 조립을 건너뛰므로 대량 적재 시 가장 빠릅니다.
+    Django 커넥션의 현재 트랜잭션 안에서 실행됩니다.
+
+    Args:
+        point_rows (list): POINT_COLUMNS 순서의 튜플 배열
+    """
+    columns = ', '.join(POINT_COLUMNS)
+    sql = f"COPY {StrokePoint._meta.db_table} ({columns}) FROM STDIN"
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for row in point_rows:
+                copy.write_row(row)
+
+
+def write_point_rows(point_rows, backend=None, batch_size=None):
+    """
+    stroke_points 행을 선택된 백엔드로 적재
+
+    Args:
+        point_rows (list): POINT_COLUMNS 순서의 튜플 배열
+        backend (str, optional): 'auto' | 'orm' | 'copy'
+        batch_size (int, optional): ORM 경로의 배치 크기
+
+    Returns:
+        str: 실제로 사용한 백엔드 ('orm' 또는 'copy')
+    """
+    resolved = resolve_point_backend(backend)
+    if not point_rows:
+        return resolved
+
+    if resolved == 'copy':
+        _write_points_copy(point_rows)
+    else:
+        _write_points_orm(point_rows, batch_size or get_batch_size())
+    return resolved
+
+
+def build_event_rows(session, events_list, coalesce=True):
+    """
+    이벤트 배열을 Event 모델 인스턴스로 변환
+
+    연속된 zoom / pan 이벤트는 구간 이벤트 하나로 합치고 (api.event_coalescing),
+    타입 문자열은 event_types id로 바꾸며(처음 보는 타입만 INSERT),
+    details의 자주 쓰는 값은 추출 컬럼으로 채웁니다 (api.event_types).
+    프론트엔드(useSession.logEvent)는 details 대신 data 키로 보내므로 둘 다 받습니다.
+
+    Args:
+        session (Session): 소속 세션 객체
+        events_list (list): canvasData.events 배열
+        coalesce (bool): zoom / pan 이벤트 병합 여부
+
+    Returns:
+        list: Event 인스턴스 배열
+    """
+    if coalesce:
+        events_list = coalesce_events(events_list)
+    if not events_list:
+        return []
+    type_names = [normalize_event_type(event_data.get('type')) for event_data in events_list]
+    type_ids = get_event_type_ids(type_names)
+
+    events = []
+    for event_data, type_name in zip(events_list, type_names):
+        details = event_data.get('details') or event_data.get('data') or {}
+        end_ts = event_data.get('endTimestamp')
+        # 구간 이벤트의 추출 컬럼은 마지막 샘플 기준
+        sample_details = details.get('end') if end_ts is not None and isinstance(details, dict) else details
+        events.append(Event(
+            session=session,
+            ts_ms=int(event_data.get('timestamp', 0)),
+            type_id=type_ids[type_name],
+            details=details,
+            end_ts_ms=None if end_ts is None else int(end_ts),
+            sample_count=int(event_data.get('count', 1)),
+            **extract_event_fields(sample_details),
+        ))
+    return events
+
+
+def ingest_canvas_data(session, canvas_data, coalesce=True):
+    """
+    canvasData의 스트로크/포인트/이벤트를 테이블별 일괄 INSERT로 저장
+
+    호출하는 쪽에서 transaction.atomic() 안에서 실행해야 합니다.
+    스트로크가 먼저 INSERT되어야 포인트의 FK가 유효하므로 순서는
+    Stroke → StrokePoint → Event 입니다.
+
+    Args:
+        session (Session): 이미 저장된 세션 객체
+        canvas_data (dict): session_data['canvasData']
+        coalesce (bool): zoom / pan 이벤트 병합 여부 (원본이 S3 백업에 그대로 남는 경우에만 True)
+
+    Returns:
+        dict: 적재된 행 수 {"strokes": int, "points": int, "events": int} (events는 병합 후 행 수)
+    """
+    batch_size = get_batch_size()
+
+    stroke_objects, point_rows = build_stroke_rows(session, canvas_data.get('strokes', []))
+    event_objects = build_event_rows(session, canvas_data.get('events', []), coalesce=coalesce)
+
+    if stroke_objects:
+        Stroke.objects.bulk_create(stroke_objects, batch_size=batch_size)
+    write_point_rows(point_rows, batch_size=batch_size)
+    if event_objects:
+        Event.objects.bulk_create(event_objects, batch_size=batch_size)
+
+    return {
+        "strokes": len(stroke_objects),
+        "points": len(point_rows),
+        "events": len(event_objects),
+    }
+
+
+class SessionAlreadyFinalized(Exception):
+    """finalize된 세션에 청크를 추가하려는 경우"""
+
+
+class ChunkConflict(Exception):
+    """이미 받은 seq에 다른 내용의 청크가 온 경우"""
+
+
+def append_session_chunk(session_uuid, question, seq, strokes_list, events_list, payload_hash=None):
+    """
+    분할 업로드된 스트로크/이벤트 청크를 바로 적재
+
+    세션 행이 없으면 요약치가 비어 있는 미완료(is_finalized=False) 세션을 만들고,
+    finalize 시점에 요약치를 채웁니다. 같은 seq가 같은 본문으로 다시 오면(네트워크 재전송)
+    아무것도 쓰지 않고 이전 결과를 돌려주고, 다른 본문이면 ChunkConflict를 발생시킵니다
+    (claim_submission()과 같은 규칙 - 해시가 없는 이전 청크는 재전송으로 간주).
+
+    Args:
+        session_uuid (UUID): 프론트엔드 세션 UUID
+        question (Question): 문제 객체
+        seq (int): 청크 순번
+        strokes_list (list): 이번 청크의 스트로크 배열 (canvasData.strokes 형식)
+        events_list (list): 이번 청크의 이벤트 배열 (canvasData.events 형식)
+        payload_hash (str, optional): 요청 본문 해시 (compute_payload_hash() 결과)
+
+    Returns:
+        tuple: (SessionChunk, duplicate 여부)
+
+    Raises:
+        SessionAlreadyFinalized: 이미 finalize된 세션인 경우
+        ChunkConflict: 같은 seq로 다른 내용이 이미 저장된 경우
+    """
+    with transaction.atomic():
+        session, _ = Session.objects.select_for_update().get_or_create(
+            session_uuid=session_uuid,
+            defaults={
+                "problem_id": question.id,
+                "category": question.category_id,
+                "duration_ms": 0,
+                "stroke_count": 0,
+                "total_distance_px": 0.0,
+                "is_finalized": False,
+            }
+        )
+        if session.is_finalized:
+            raise SessionAlreadyFinalized(f"세션 {session_uuid}은 이미 제출이 완료되었습니다.")
+
+        existing = SessionChunk.objects.filter(session=session, seq=seq).first()
+        if existing:
+            if existing.payload_hash and payload_hash and existing.payload_hash != payload_hash:
+                raise ChunkConflict(f"세션 {session_uuid}의 청크 {seq}는 다른 내용으로 이미 저장되었습니다.")
+            return existing, True
+
+        # 분할 업로드 세션의 S3 백업은 finalize 때 DB에서 재구성하므로 원본 이벤트를 병합하지 않음
+        counts = ingest_canvas_data(session, {"strokes": strokes_list, "events": events_list}, coalesce=False)
+        chunk = SessionChunk.objects.create(
+            session=session,
+            seq=seq,
+            payload_hash=payload_hash,
+            stroke_count=counts["strokes"],
+            point_count=counts["points"],
+            event_count=counts["events"],
+        )
+        return chunk, False
@@ -0,0 +1,247 @@
+"""
+비동기 세션 적재 대기열 (outbox)
+
+INGEST_ASYNC가 켜져 있으면 verify_solution은 원본 요청 본문을 ingest_jobs
+테이블에 저장(커밋)만 하고 바로 응답합니다. 실제 DB 적재와 S3 백업은
+`python manage.py run_ingest_worker` 프로세스가 처리합니다.
+
+대기열은 DB 트랜잭션으로 보존되므로 웹 워커가 재시작되어도 유실되지 않으며,
+여러 워커가 SELECT ... FOR UPDATE SKIP LOCKED로 작업을 나눠 가져갑니다.
+
+- 실패한 작업은 지수 백오프(next_attempt_at) 후 다시 가져오며, max_attempts를 넘으면 'failed'
+- started_at은 워커의 lease입니다. 처리 시작 시 갱신하고, 결과 기록은 lease가 그대로일 때만 반영하므로
+  visibility_timeout이 지나 다른 워커가 다시 가져간 작업은 이전 워커가 덮어쓰지 않습니다.
+"""
+
+import json
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from api.models import IngestJob, Session
+
+
+def is_async_ingest_enabled():
+    """
+    비동기 적재 모드 여부
+
+    Returns:
+        bool: settings.INGEST_ASYNC (기본 False)
+    """
+    return getattr(settings, 'INGEST_ASYNC', False)
+
+
+def get_retry_delay(attempts):
+    """
+    재시도까지 대기 시간 (지수 백오프 + jitter)
+
+    Args:
+        attempts (int): 지금까지의 시도 횟수 (1 이상)
+
+    Returns:
+        float: 대기 시간(초) - 백오프 값의 50 ~ 100% 사이 임의 값
+    """
+    base = getattr(settings, 'INGEST_RETRY_BASE_SECONDS', 10)
+    cap = getattr(settings, 'INGEST_RETRY_MAX_SECONDS', 600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return random.uniform(delay / 2, delay)
+
+
+def enqueue_ingest_job(session_uuid, payload, params):
+    """
+    적재 작업을 대기열에 추가
+
+    Args:
+        session_uuid (UUID): 클라이언트에 먼저 돌려줄 세션 UUID
+        payload (bytes): 원본 요청 본문 (JSON)
+        params (dict): 요청 처리 중 계산된 값
+            {"question_id", "user_answer", "is_correct", "problem_name",
+             "category_id", "difficulty", "label"}
+
+    Returns:
+        IngestJob: 생성된 작업
+    """
+    return IngestJob.objects.create(
+        session_uuid=session_uuid,
+        payload=payload,
+        params=params,
+    )
+
+
+def claim_jobs(batch_size=10, visibility_timeout=300):
+    """
+    처리할 작업을 가져와 'processing' 상태로 표시
+
+    재시도 시각(next_attempt_at)이 지난 pending 작업과, 처리 도중 워커가 죽어
+    visibility_timeout(초)이 지나도록 끝나지 않은 processing 작업을 가져옵니다.
+    SKIP LOCKED로 다른 워커가 잡은 행은 건너뜁니다.
+
+    가져온 작업은 차례로 처리되므로 batch_size는 작업 하나의 처리 시간 × batch_size가
+    visibility_timeout보다 충분히 작게 잡으세요 (process_job()이 시작 시 lease를 갱신하지만,
+    그 전에 만료되면 다른 워커가 가져갈 수 있음).
+
+    Args:
+        batch_size (int): 한 번에 가져올 최대 작업 수
+        visibility_timeout (int): processing 작업을 재시도 대상으로 볼 경과 시간(초)
+
+    Returns:
+        list: IngestJob 배열 (재시도 시각 순)
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=visibility_timeout)
+
+    with transaction.atomic():
+        jobs = list(
+            IngestJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=IngestJob.STATUS_PENDING, next_attempt_at__lte=now) |
+                Q(status=IngestJob.STATUS_PROCESSING, started_at__lt=stale_before)
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        for job in jobs:
+            job.status = IngestJob.STATUS_PROCESSING
+            job.started_at = now
+            job.attempts += 1
+        IngestJob.objects.bulk_update(jobs, ['status', 'started_at', 'attempts'])
+
+    return jobs
+
+
+def _renew_lease(job):
+    """
+    처리 시작 직전에 lease(started_at) 갱신
+
+    claim 이후 다른 워커가 다시 가져갔으면(started_at이 바뀜) 갱신하지 않습니다.
+
+    Returns:
+        bool: lease를 유지했는지 여부
+    """
+    started_at = timezone.now()
+    renewed = IngestJob.objects.filter(
+        pk=job.pk, status=IngestJob.STATUS_PROCESSING, started_at=job.started_at
+    ).update(started_at=started_at)
+    if renewed:
+        job.started_at = started_at
+    return bool(renewed)
+
+
+def _record_result(job, **fields):
+    """
+    lease가 그대로인 경우에만 처리 결과 기록
+
+    Returns:
+        bool: 기록했는지 여부
+    """
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return bool(
+        IngestJob.objects.filter(
+            pk=job.pk, status=IngestJob.STATUS_PROCESSING, started_at=job.started_at
+        ).update(**fields)
+    )
+
+
+def process_job(job, max_attempts=5):
+    """
+    작업 하나를 실행하여 세션 데이터를 DB와 S3에 저장
+
+    같은 세션이 이미 저장되어 있으면(이전 시도가 커밋 직후 중단되었거나 다른 워커가 먼저 저장한 경우)
+    다시 쓰지 않고 완료 처리합니다. 세션 행은 session_uuid가 PK이므로, 두 워커가 동시에 저장해도
+    나중 쪽은 IntegrityError로 전체가 롤백됩니다.
+
+    Args:
+        job (IngestJob): claim_jobs()로 가져온 작업
+        max_attempts (int): 이 횟수를 넘으면 'failed'로 확정
+
+    Returns:
+        bool | None: 성공 여부 (다른 워커가 가져가 건너뛴 경우 None)
+    """
+    # views가 이 모듈을 import하므로 순환 import를 피하기 위해 지연 import
+    from core.models import Question
+    from api.views import save_session_to_db_and_s3
+
+    if not _renew_lease(job):
+        print(f"[ingest] 작업 {job.id}은 다른 워커가 가져갔으므로 건너뜀")
+        return None
+
+    try:
+        if not Session.objects.filter(session_uuid=job.session_uuid).exists():
+            params = job.params
+            data = json.loads(bytes(job.payload))
+            question = Question.objects.select_related('category').get(id=params['question_id'])
+            try:
+                save_session_to_db_and_s3(
+                    question=question,
+                    session_data=data.get('session_data') or {},
+                    user_answer=params.get('user_answer'),
+                    is_correct=params.get('is_correct'),
+                    problem_name=params.get('problem_name', ''),
+                    category_id=params.get('category_id'),
+                    difficulty=params.get('difficulty'),
+                    label=params.get('label'),
+                    session_uuid=job.session_uuid,
+                )
+            except IntegrityError:
+                # 다른 워커가 같은 세션을 먼저 저장한 경우만 완료로 처리
+                if not Session.objects.filter(session_uuid=job.session_uuid).exists():
+                    raise
+    except Exception as e:
+        last_error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+        if job.attempts >= max_attempts:
+            recorded = _record_result(job, status=IngestJob.STATUS_FAILED, last_error=last_error)
+        else:
+            # 재시도 횟수가 남아 있으면 백오프 후 다시 pending으로
+            recorded = _record_result(
+                job, status=IngestJob.STATUS_PENDING, last_error=last_error,
+                next_attempt_at=timezone.now() + timedelta(seconds=get_retry_delay(job.attempts)),
+            )
+        print(f"[ingest] 작업 {job.id} 실패 (시도 {job.attempts}/{max_attempts}): {e}")
+        return False if recorded else None
+
+    if not _record_result(job, status=IngestJob.STATUS_DONE, finished_at=timezone.now(), last_error=None):
+        print(f"[ingest] 작업 {job.id}은 다른 워커가 가져갔으므로 결과를 기록하지 않음")
+        return None
+    return True
+
+
+def queue_stats():
+    """
+    대기열 상태 지표 계산
+
+    Returns:
+        dict: {
+            "depth": 대기+처리 중 작업 수,
+            "pending": 대기 작업 수,
+            "processing": 처리 중 작업 수,
+            "failed": 실패 확정 작업 수,
+            "lag_seconds": 가장 오래된 미처리 작업의 대기 시간(초, 없으면 0),
+        }
+    """
+    counts = dict(
+        IngestJob.objects
+        .exclude(status=IngestJob.STATUS_DONE)
+        .values_list('status')
+        .annotate(n=Count('id'))
+    )
+    oldest = (
+        IngestJob.objects
+        .filter(status__in=[IngestJob.STATUS_PENDING, IngestJob.STATUS_PROCESSING])
+        .aggregate(oldest=Min('created_at'))['oldest']
+    )
+
+    pending = counts.get(IngestJob.STATUS_PENDING, 0)
+    processing = counts.get(IngestJob.STATUS_PROCESSING, 0)
+    return {
+        "depth": pending + processing,
+        "pending": pending,
+        "processing": processing,
+        "failed": counts.get(IngestJob.STATUS_FAILED, 0),
+        "lag_seconds": round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0,
+    }
@@ -0,0 +1,186 @@
+"""
+stroke_points / events / strokes 인덱스 구성 벤치마크
+
+0009_index_redesign 이전 인덱스 구성(legacy)과 현재 구성(current)에서
+적재 처리량과 실제 조회 쿼리(replay / 이벤트 export / 세션 요약 집계) 지연 시간을 비교합니다.
+
+측정은 구성별로 하나의 트랜잭션 안에서 인덱스를 바꾸고 데이터를 적재한 뒤 롤백하므로
+DB에 데이터나 인덱스 변경이 남지 않습니다. 다만 측정 중에는 테이블 잠금이 걸리므로
+운영 DB가 아닌 개발 / 스테이징 DB에서 실행하세요.
+
+사용법:
+    python manage.py bench_indexes
+    python manage.py bench_indexes --sessions 20 --points 20000 --events 2000 --repeat 5
+"""
+
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.ingest import ingest_canvas_data
+from api.management.commands.bench_ingest import make_strokes
+from api.models import Event, Session
+from api.replay import load_session_strokes
+from api.stroke_stats import summarize_session_strokes
+
+# 0009에서 추가된 인덱스 (legacy 측정 시 제거)
+CURRENT_ONLY_INDEXES = (
+    'events_session_ts_id',
+    'strokes_session_start_cov',
+    'stroke_points_recorded_brin',
+    'events_recorded_brin',
+)
+
+# 0009에서 제거된 인덱스 (legacy 측정 시 다시 생성): (테이블, 컬럼)
+# stroke_points.session_id 인덱스 3개는 0010에서 컬럼 자체가 제거되어 재현하지 않음
+LEGACY_INDEXES = (
+    ('stroke_points', ('stroke_id',)),
+    ('events', ('session_id', 'ts_ms')),
+    ('events', ('type_id',)),
+    ('events', ('session_id',)),
+    ('strokes', ('session_id', 'start_ms')),
+    ('strokes', ('session_id',)),
+    ('session_chunks', ('session_id',)),
+)
+
+LAYOUTS = ('legacy', 'current')
+
+
+class _Rollback(Exception):
+    """측정 후 트랜잭션을 되돌리기 위한 내부 예외"""
+
+
+def make_events(count):
+    """
+    벤치마크용 가짜 이벤트 배열 생성 (canvasData.events 형식)
+
+    Args:
+        count (int): 이벤트 수
+
+    Returns:
+        list: [{"type", "timestamp", "details"}, ...]
+    """
+    types = ('stroke_start', 'stroke_end', 'zoom', 'pan', 'undo', 'tool_change')
+    return [
+        {"type": random.choice(types), "timestamp": i * 10, "details": {"zoom": 1.0, "x": i, "y": i}}
+        for i in range(count)
+    ]
+
+
+def apply_layout(layout):
+    """
+    현재 트랜잭션 안에서 인덱스 구성을 legacy로 변경 (current는 그대로)
+
+    Args:
+        layout (str): 'legacy' | 'current'
+    """
+    if layout == 'current':
+        return
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for name in CURRENT_ONLY_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {qn(name)}")
+        for i, (table, columns) in enumerate(LEGACY_INDEXES):
+            cursor.execute(
+                f"CREATE INDEX {qn(f'bench_legacy_{i}')} ON {qn(table)} "
+                f"({', '.join(qn(c) for c in columns)})"
+            )
+
+
+def _median_ms(samples):
+    return statistics.median(samples) * 1000 if samples else 0.0
+
+
+class Command(BaseCommand):
+    help = "인덱스 구성(legacy / current)별 적재 처리량과 조회 지연 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=10, help="세션 수 (기본: 10)")
+        parser.add_argument('--points', type=int, default=20000, help="세션당 포인트 수 (기본: 20000)")
+        parser.add_argument('--events', type=int, default=2000, help="세션당 이벤트 수 (기본: 2000)")
+        parser.add_argument('--repeat', type=int, default=5, help="조회 반복 횟수 (기본: 5)")
+        parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=list(LAYOUTS), help="측정할 구성")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"세션 {options['sessions']}개 × 포인트 {options['points']:,} / 이벤트 {options['events']:,} "
+            f"({connection.vendor})"
+        )
+        self.stdout.write(
+            f"{'layout':>8} {'rows/s':>12} "
+            f"{'replay ms':>10} {'events ms':>10} {'summary ms':>11}"
+        )
+        for layout in options['layouts']:
+            result = self._measure(layout, options)
+            self.stdout.write(
+                f"{layout:>8} {result['rows_per_sec']:>12,.0f} "
+                f"{result['replay_ms']:>10.2f} {result['events_ms']:>10.2f} {result['summary_ms']:>11.2f}"
+            )
+
+    def _measure(self, layout, options):
+        """
+        구성 하나의 적재 처리량 / 조회 중앙값 측정 (측정 후 롤백)
+
+        Returns:
+            dict: {"rows_per_sec", "replay_ms", "events_ms", "summary_ms"}
+                rows_per_sec는 포인트 + 이벤트 행 수 / 적재 시간
+        """
+        result = {}
+        try:
+            with transaction.atomic():
+                apply_layout(layout)
+
+                session_ids = []
+                ingest_seconds = 0.0
+                for _ in range(options['sessions']):
+                    session = Session.objects.create(
+                        session_uuid=uuid.uuid4(), duration_ms=0, problem_id=0, category=0,
+                        stroke_count=0, total_distance_px=0.0,
+                    )
+                    canvas_data = {
+                        "strokes": make_strokes(options['points']),
+                        "events": make_events(options['events']),
+                    }
+                    started = time.perf_counter()
+                    ingest_canvas_data(session, canvas_data)
+                    ingest_seconds += time.perf_counter() - started
+                    session_ids.append(session.pk)
+
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE stroke_points, events, strokes")
+
+                replay, events, summary = [], [], []
+                for _ in range(options['repeat']):
+                    for session_id in session_ids:
+                        started = time.perf_counter()
+                        load_session_strokes(session_id)
+                        replay.append(time.perf_counter() - started)
+
+                        started = time.perf_counter()
+                        list(
+                            Event.objects.filter(session_id=session_id)
+                            .order_by('ts_ms', 'id')
+                            .values_list('type_id', 'ts_ms', 'details')
+                        )
+                        events.append(time.perf_counter() - started)
+
+                        started = time.perf_counter()
+                        summarize_session_strokes(session_id)
+                        summary.append(time.perf_counter() - started)
+
+                total_rows = options['sessions'] * (options['points'] + options['events'])
+                result = {
+                    "rows_per_sec": total_rows / ingest_seconds if ingest_seconds else 0.0,
+                    "replay_ms": _median_ms(replay),
+                    "events_ms": _median_ms(events),
+                    "summary_ms": _median_ms(summary),
+                }
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return result
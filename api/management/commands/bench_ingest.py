@@ -0,0 +1,130 @@
+"""
+stroke_points 적재 백엔드 벤치마크
+
+ORM(bulk_create) 경로와 COPY 경로의 초당 적재 행 수를 비교합니다.
+측정은 트랜잭션 안에서 수행한 뒤 롤백하므로 DB에 데이터가 남지 않습니다.
+
+사용법:
+    python manage.py bench_ingest
+    python manage.py bench_ingest --sizes 1000 10000 100000 --repeat 3
+"""
+
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.ingest import build_stroke_rows, resolve_point_backend, write_point_rows
+from api.models import Session, Stroke
+
+
+class _Rollback(Exception):
+    """측정 후 트랜잭션을 되돌리기 위한 내부 예외"""
+
+
+def make_strokes(point_count, points_per_stroke=200):
+    """
+    벤치마크용 가짜 스트로크 배열 생성 (프론트엔드 v1 형식)
+
+    Args:
+        point_count (int): 전체 포인트 수
+        points_per_stroke (int): 스트로크당 포인트 수
+
+    Returns:
+        list: canvasData.strokes 형식의 배열
+    """
+    strokes = []
+    remaining = point_count
+    t = 0
+    while remaining > 0:
+        n = min(points_per_stroke, remaining)
+        start = t
+        points = []
+        for _ in range(n):
+            t += 8
+            points.append({
+                "x": random.randint(0, 2000),
+                "y": random.randint(0, 3000),
+                "timestamp": t,
+                "pressure": round(random.random(), 3),
+                "tiltX": random.randint(-60, 60),
+                "tiltY": random.randint(-60, 60),
+                "twist": 0,
+                "pointerType": "pen",
+                "pointerId": 1,
+                "buttons": 1,
+                "width": 1,
+                "height": 1,
+            })
+        strokes.append({"tool": "pen", "startTime": start, "endTime": t, "points": points})
+        remaining -= n
+        t += 300
+    return strokes
+
+
+class Command(BaseCommand):
+    help = "stroke_points 적재 백엔드(ORM / COPY)별 초당 적재 행 수를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[1000, 10000, 100000],
+            help="측정할 포인트 수 목록 (기본: 1000 10000 100000)"
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help="크기별 반복 횟수 - 최고 기록을 사용 (기본: 3)"
+        )
+        parser.add_argument(
+            '--backends', nargs='+', default=['orm', 'copy'],
+            help="측정할 백엔드 목록 (기본: orm copy)"
+        )
+
+    def handle(self, *args, **options):
+        backends = []
+        for backend in options['backends']:
+            try:
+                backends.append(resolve_point_backend(backend))
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f"'{backend}' 건너뜀: {e}"))
+
+        self.stdout.write(f"{'points':>10} {'backend':>8} {'seconds':>10} {'rows/sec':>12}")
+        for size in options['sizes']:
+            strokes = make_strokes(size)
+            for backend in backends:
+                best = None
+                for _ in range(options['repeat']):
+                    elapsed = self._measure(strokes, backend)
+                    best = elapsed if best is None else min(best, elapsed)
+                rate = size / best if best else float('inf')
+                self.stdout.write(f"{size:>10} {backend:>8} {best:>10.4f} {rate:>12,.0f}")
+
+    def _measure(self, strokes, backend):
+        """
+        한 번의 적재 시간을 측정 (행 구성 + INSERT, 측정 후 롤백)
+
+        Returns:
+            float: 경과 시간(초)
+        """
+        elapsed = 0.0
+        try:
+            with transaction.atomic():
+                session = Session.objects.create(
+                    session_uuid=uuid.uuid4(),
+                    duration_ms=0,
+                    problem_id=0,
+                    category=0,
+                    stroke_count=len(strokes),
+                    total_distance_px=0.0,
+                )
+                stroke_objects, point_rows = build_stroke_rows(session, strokes)
+                Stroke.objects.bulk_create(stroke_objects)
+
+                started = time.perf_counter()
+                write_point_rows(point_rows, backend=backend)
+                elapsed = time.perf_counter() - started
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return elapsed
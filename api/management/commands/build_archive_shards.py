@@ -0,0 +1,67 @@
+"""
+시간 구간별 Parquet 세션 샤드 생성 (api.shards)
+
+닫힌 구간(ARCHIVE_SHARD_WINDOW_HOURS)의 finalize된 세션 중 아직 샤드에 들어가지 않은 것을
+sessions / strokes / points / events Parquet 파일과 manifest.json으로 묶어 업로드합니다.
+cron 등으로 주기적으로 실행하면 되며, 여러 번 실행해도 같은 세션이 두 번 들어가지 않습니다.
+
+사용법:
+    python manage.py build_archive_shards --dry-run
+    python manage.py build_archive_shards
+    python manage.py build_archive_shards --batch-size 500 --max-shards 24
+"""
+
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.shards import build_pending_shards, is_parquet_available, pending_sessions, window_bounds
+from core.storage import get_storage
+
+
+class Command(BaseCommand):
+    help = "닫힌 시간 구간의 세션을 Parquet 샤드로 묶어 저장소에 업로드합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help="row group 하나에 담을 세션 수 (기본: 200)")
+        parser.add_argument('--max-shards', type=int, default=None, help="이번 실행에서 만들 최대 샤드 수")
+        parser.add_argument('--dry-run', action='store_true', help="구간별 대상 세션 수만 출력")
+
+    def handle(self, *args, **options):
+        if not is_parquet_available():
+            raise CommandError("Parquet 샤드를 만들려면 pyarrow 패키지가 필요합니다.")
+
+        if options['dry_run']:
+            windows = Counter(
+                window_bounds(created_at)[0]
+                for created_at in pending_sessions().values_list('created_at', flat=True).iterator()
+            )
+            for window_start, count in sorted(windows.items()):
+                self.stdout.write(f"[shards] {window_start.isoformat()} - 세션 {count:,}개")
+            self.stdout.write(f"[shards] 대상 구간 {len(windows):,}개 / 세션 {sum(windows.values()):,}개")
+            return
+
+        try:
+            get_storage()
+        except Exception as e:
+            raise CommandError(f"저장소 설정 오류: {e}")
+
+        started = time.perf_counter()
+        shards = sessions = points = total_bytes = 0
+        for shard in build_pending_shards(batch_size=options['batch_size'], max_shards=options['max_shards']):
+            shards += 1
+            sessions += shard.session_count
+            points += shard.point_count
+            total_bytes += shard.total_bytes
+            self.stdout.write(
+                f"[shards] {shard.prefix} - 세션 {shard.session_count:,} / 스트로크 {shard.stroke_count:,} / "
+                f"포인트 {shard.point_count:,} / 이벤트 {shard.event_count:,} / {shard.total_bytes / 1024:,.1f} KiB"
+            )
+
+        elapsed = time.perf_counter() - started
+        rate = points / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"[shards] 완료: 샤드 {shards:,}개 / 세션 {sessions:,}개 / {total_bytes / 1024 / 1024:,.1f} MiB - "
+            f"{elapsed:.1f}s ({rate:,.0f} 포인트/s)"
+        ))
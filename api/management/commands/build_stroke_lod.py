@@ -0,0 +1,99 @@
+"""
+기존 스트로크의 LOD(level-of-detail) 피라미드 생성 (backfill)
+
+STROKE_LOD_TOLERANCES 도입 전에 적재되었거나 tolerance를 바꾼 뒤의 스트로크에
+RDP 단순화 포인트(Stroke.lod_packed)를 채웁니다. 세션 단위로 포인트를 한 번에 읽어
+계산하고 bulk_update합니다. 여러 번 실행해도 결과는 같습니다.
+
+사용법:
+    python manage.py build_stroke_lod                     # lod_packed가 없는 스트로크만
+    python manage.py build_stroke_lod --rebuild           # 전체 다시 생성 (tolerance 변경 후)
+    python manage.py build_stroke_lod --batch-size 200 --max-batches 10
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Stroke
+from api.packing import COLUMN_SPECS
+from api.replay import load_session_strokes
+from api.simplify import LOD_MIN_POINTS, build_lods, get_lod_tolerances
+
+
+def points_to_columns(points):
+    """
+    포인트 dict 배열을 build_lods()용 컬럼 배열로 변환
+
+    Args:
+        points (list): load_session_strokes()의 포인트 배열
+
+    Returns:
+        dict: {필드명: list}
+    """
+    return {name: [point[name] for point in points] for name, _ in COLUMN_SPECS}
+
+
+class Command(BaseCommand):
+    help = "LOD가 없는 스트로크의 RDP 단순화 피라미드(lod_packed)를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help="트랜잭션당 세션 수 (기본: 100)")
+        parser.add_argument('--max-batches', type=int, default=None, help="최대 배치 수 (기본: 제한 없음)")
+        parser.add_argument('--rebuild', action='store_true', help="이미 LOD가 있는 스트로크도 다시 생성")
+
+    def handle(self, *args, **options):
+        tolerances = get_lod_tolerances()
+        if not tolerances:
+            raise CommandError("STROKE_LOD_TOLERANCES가 비어 있습니다.")
+
+        targets = Stroke.objects.filter(point_count__gt=LOD_MIN_POINTS)
+        if not options['rebuild']:
+            targets = targets.filter(lod_packed__isnull=True)
+        session_ids = list(targets.order_by('session_id').values_list('session_id', flat=True).distinct())
+
+        self.stdout.write(f"[lod] 대상 세션 {len(session_ids):,}개 (tolerance {', '.join(map(str, tolerances))}px)")
+        started = time.perf_counter()
+        strokes_done = 0
+        batch_size = options['batch_size']
+        for batch_no, offset in enumerate(range(0, len(session_ids), batch_size), start=1):
+            if options['max_batches'] is not None and batch_no > options['max_batches']:
+                break
+            batch_started = time.perf_counter()
+            updated = []
+            for session_id in session_ids[offset:offset + batch_size]:
+                strokes, columns_list = [], []
+                for stroke, points in load_session_strokes(session_id):
+                    if len(points) <= LOD_MIN_POINTS:
+                        continue
+                    if stroke.lod_packed is not None and not options['rebuild']:
+                        continue
+                    strokes.append(stroke)
+                    columns_list.append(points_to_columns(points))
+                if not strokes:
+                    continue
+                # 세션의 스트로크를 한 번에 단순화
+                lods = build_lods(
+                    columns_list,
+                    [len(columns['x']) for columns in columns_list],
+                    [value for columns in columns_list for value in columns['x']],
+                    [value for columns in columns_list for value in columns['y']],
+                    tolerances,
+                )
+                for stroke, lod_packed in zip(strokes, lods):
+                    stroke.lod_packed = lod_packed
+                updated.extend(strokes)
+            with transaction.atomic():
+                Stroke.objects.bulk_update(updated, ['lod_packed'], batch_size=500)
+            strokes_done += len(updated)
+            self.stdout.write(
+                f"[lod] 배치 {batch_no}: 스트로크 {len(updated):,} - "
+                f"{(time.perf_counter() - batch_started) * 1000:.0f}ms"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"[lod] 완료: 스트로크 {strokes_done:,}개 / {elapsed:.1f}s "
+            f"({strokes_done / elapsed if elapsed else 0:,.0f} strokes/s)"
+        ))
@@ -0,0 +1,87 @@
+"""
+stroke_points / events 월별 파티션 관리
+
+이번 달부터 PARTITION_MONTHS_AHEAD개월 뒤까지의 파티션을 미리 만들고,
+보존 기간(PARTITION_RETENTION_MONTHS)이 지난 파티션을 분리(또는 삭제)합니다.
+cron 등으로 매일 한 번 실행하면 됩니다 (여러 번 실행해도 결과는 같음).
+
+사용법:
+    python manage.py manage_partitions                         # 파티션 생성 + 현황 출력
+    python manage.py manage_partitions --status                # 현황만 출력
+    python manage.py manage_partitions --ahead 6
+    python manage.py manage_partitions --retain-months 12      # 12개월 이전 파티션 분리
+    python manage.py manage_partitions --retain-months 12 --drop --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.partitioning import (
+    PARTITIONED_TABLES, detach_partition, ensure_partitions, expired_partitions,
+    get_months_ahead, get_retention_months, is_partitioned, is_partitioning_supported,
+    list_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "stroke_points / events 월별 파티션을 생성하고 보존 기간이 지난 파티션을 정리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', action='store_true', help="파티션 현황만 출력")
+        parser.add_argument(
+            '--ahead', type=int, default=None,
+            help="미리 만들 미래 월 수 (기본: settings.PARTITION_MONTHS_AHEAD)"
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=None,
+            help="보존 개월 수, 0이면 정리하지 않음 (기본: settings.PARTITION_RETENTION_MONTHS)"
+        )
+        parser.add_argument('--drop', action='store_true', help="분리한 파티션을 DROP TABLE까지 수행")
+        parser.add_argument('--dry-run', action='store_true', help="정리 대상만 출력하고 변경하지 않음")
+        parser.add_argument(
+            '--table', choices=sorted(PARTITIONED_TABLES), action='append',
+            help="대상 테이블 (여러 번 지정 가능, 기본: 전체)"
+        )
+
+    def handle(self, *args, **options):
+        if not is_partitioning_supported():
+            self.stdout.write("파티션 관리는 PostgreSQL에서만 지원됩니다. 건너뜁니다.")
+            return
+
+        ahead = get_months_ahead() if options['ahead'] is None else options['ahead']
+        retain = get_retention_months() if options['retain_months'] is None else options['retain_months']
+
+        for table in options['table'] or PARTITIONED_TABLES:
+            if not is_partitioned(table):
+                raise CommandError(f"{table}은 파티션 테이블이 아닙니다. migrate를 먼저 실행하세요.")
+
+            if not options['status']:
+                if not options['dry_run']:
+                    for name in ensure_partitions(table, months_ahead=ahead):
+                        self.stdout.write(self.style.SUCCESS(f"[partition] {table}: {name} 생성"))
+                if retain > 0:
+                    self._rotate(table, retain, options['drop'], options['dry_run'])
+
+            self._print_status(table)
+
+    def _rotate(self, table, retain, drop, dry_run):
+        """보존 기간이 지난 파티션 분리 / 삭제"""
+        action = "삭제" if drop else "분리"
+        for partition in expired_partitions(table, retain):
+            if dry_run:
+                self.stdout.write(f"[partition] {table}: {partition['name']} {action} 예정 (dry-run)")
+                continue
+            detach_partition(table, partition['name'], drop=drop)
+            self.stdout.write(self.style.WARNING(f"[partition] {table}: {partition['name']} {action}"))
+
+    def _print_status(self, table):
+        """파티션별 범위 / 추정 행 수 / 크기 출력"""
+        self.stdout.write(f"[partition] {table}")
+        for p in list_partitions(table):
+            if p['default']:
+                bounds = "DEFAULT"
+            else:
+                bounds = f"{p['start'] or 'MINVALUE'} ~ {p['end'] or 'MAXVALUE'}"
+            self.stdout.write(
+                f"  {p['name']:<32} {bounds:<26} rows≈{p['rows']:>12,} "
+                f"size={p['bytes'] / (1024 * 1024):,.1f}MB"
+            )
@@ -0,0 +1,99 @@
+"""
+보존 기간이 지난 세션 정리 (retention)
+
+Session.created_at이 보존 일수보다 오래된 세션의 포인트/이벤트 원본(또는 세션 전체)을
+테이블별 일괄 DELETE와 파티션 DROP으로 정리하고 처리량을 출력합니다.
+cron 등으로 매일 실행하면 됩니다.
+
+사용법:
+    python manage.py purge_sessions                        # settings.RETENTION_* 정책대로 실행
+    python manage.py purge_sessions --days 180 --dry-run   # 대상 규모만 출력
+    python manage.py purge_sessions --days 365 --no-keep-summary --partition-action detach
+"""
+
+import argparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.retention import (
+    PARTITION_ACTIONS, estimate_purge, get_cutoff, get_keep_summary, get_partition_action,
+    get_retention_days, run_retention,
+)
+
+
+class Command(BaseCommand):
+    help = "보존 기간이 지난 세션의 필기 원본(또는 세션 전체)을 일괄 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="보존 일수 (기본: settings.RETENTION_DAYS)")
+        parser.add_argument(
+            '--keep-summary', action=argparse.BooleanOptionalAction, default=None,
+            help="sessions / strokes 요약 행 유지 여부 (기본: settings.RETENTION_KEEP_SUMMARY)"
+        )
+        parser.add_argument(
+            '--partition-action', choices=PARTITION_ACTIONS, default=None,
+            help="만료 파티션 처리 방식 (기본: settings.RETENTION_PARTITION_ACTION)"
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help="트랜잭션당 세션 수 (기본: 500)")
+        parser.add_argument('--max-batches', type=int, default=None, help="최대 배치 수 (기본: 제한 없음)")
+        parser.add_argument('--dry-run', action='store_true', help="대상 규모만 출력하고 삭제하지 않음")
+
+    def handle(self, *args, **options):
+        days = get_retention_days() if options['days'] is None else options['days']
+        if days < 1:
+            raise CommandError("보존 일수가 설정되지 않았습니다. --days 또는 RETENTION_DAYS를 지정하세요.")
+        keep_summary = get_keep_summary() if options['keep_summary'] is None else options['keep_summary']
+        partition_action = options['partition_action'] or get_partition_action()
+        mode = "원본만 삭제 (요약 유지)" if keep_summary else "세션 전체 삭제"
+
+        if options['dry_run']:
+            cutoff = get_cutoff(days)
+            estimate = estimate_purge(cutoff, keep_summary)
+            self.stdout.write(
+                f"[retention] dry-run: {cutoff:%Y-%m-%d %H:%M} 이전 세션 {estimate['sessions']:,}개, "
+                f"포인트 약 {estimate['points']:,}개 - {mode}"
+            )
+            self._print_unarchived(estimate['unarchived'])
+            return
+
+        self.stdout.write(f"[retention] 보존 {days}일, {mode}, 파티션 {partition_action}")
+        report = run_retention(
+            days=days,
+            keep_summary=keep_summary,
+            partition_action=partition_action,
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            on_batch=self._print_batch,
+        )
+
+        for partition in report['partitions']:
+            self.stdout.write(
+                f"[retention] 파티션 {partition['name']} {partition_action} (행 약 {partition['rows']:,}개)"
+            )
+
+        elapsed = report['elapsed_sec']
+        deleted = sum(report['rows'].values()) + sum(p['rows'] for p in report['partitions'])
+        rows = ", ".join(f"{table}={n:,}" for table, n in report['rows'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"[retention] 완료: 세션 {report['sessions']:,}개 / 배치 {report['batches']} / "
+            f"{elapsed:.1f}s - {report['sessions'] / elapsed if elapsed else 0:,.0f} sessions/s, "
+            f"{deleted / elapsed if elapsed else 0:,.0f} rows/s"
+        ))
+        self.stdout.write(f"[retention] 행 수: {rows}")
+        self._print_unarchived(report['unarchived'])
+
+    def _print_unarchived(self, count):
+        """백업되지 않아 정리를 미룬 세션 수 경고"""
+        if count:
+            self.stdout.write(self.style.WARNING(
+                f"[retention] 백업되지 않은 만료 세션 {count:,}개는 정리하지 않았습니다 "
+                f"(reconcile_archives / build_archive_shards 확인)"
+            ))
+
+    def _print_batch(self, batch_no, session_count, counts, elapsed):
+        """배치별 처리량 출력"""
+        rows = sum(counts.values())
+        self.stdout.write(
+            f"[retention] 배치 {batch_no}: 세션 {session_count}, 행 {rows:,} - "
+            f"{elapsed * 1000:.0f}ms ({rows / elapsed if elapsed else 0:,.0f} rows/s)"
+        )
@@ -0,0 +1,149 @@
+"""
+S3 백업 누락 세션 복구 (reconcile / backfill)
+
+Session.archived_at이 비어 있고 진행 중인 백업 작업도 없는 세션을 찾아
+저장소에 객체가 있는지 병렬로 확인합니다.
+
+- 객체가 있으면 archived_at만 기록합니다 (archive_jobs 도입 전에 올라간 백업 등).
+- 없으면 DB에서 백업 JSON을 재구성하는 작업(body 없음)을 대기열에 넣고,
+  run_archive_worker와 같은 경로로 --concurrency개씩 병렬 업로드합니다.
+
+원본(stroke_points / events)이 보존 기간 정리로 삭제된 세션은 재구성할 수 없으므로 건너뜁니다.
+여러 번 실행해도 결과는 같습니다.
+
+사용법:
+    python manage.py reconcile_archives --dry-run
+    python manage.py reconcile_archives --concurrency 32
+    python manage.py reconcile_archives --retry-failed       # 실패 확정 작업도 다시 시도
+    python manage.py reconcile_archives --enqueue-only       # 대기열에만 넣고 업로드는 워커에 맡김
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.archive import (
+    archive_key, archive_object_metadata, archive_stats, claim_archive_jobs,
+    is_json_archive_enabled, mark_archived, process_archive_jobs,
+)
+from api.models import ArchiveJob, Session
+from core.storage import get_storage
+
+
+class Command(BaseCommand):
+    help = "S3 백업이 없는 세션을 찾아 DB에서 재구성하여 다시 업로드합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=10,
+            help="생성된 지 이 시간(분)이 지난 세션만 대상 - 처리 중인 요청 제외 (기본: 10)"
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help="한 번에 확인할 세션 수 (기본: 500)")
+        parser.add_argument('--concurrency', type=int, default=16, help="동시 확인 / 업로드 수 (기본: 16)")
+        parser.add_argument('--retry-failed', action='store_true', help="실패 확정(failed) 작업을 다시 대기 상태로")
+        parser.add_argument('--skip-exists-check', action='store_true', help="저장소 객체 확인 없이 모두 다시 업로드")
+        parser.add_argument('--enqueue-only', action='store_true', help="대기열에만 추가 (업로드는 run_archive_worker)")
+        parser.add_argument('--dry-run', action='store_true', help="대상 수만 출력")
+
+    def handle(self, *args, **options):
+        if not is_json_archive_enabled():
+            raise CommandError("ARCHIVE_FORMAT='parquet'에서는 세션별 백업을 만들지 않습니다. build_archive_shards를 사용하세요.")
+
+        try:
+            storage = get_storage()
+        except Exception as e:
+            raise CommandError(f"저장소 설정 오류: {e}")
+
+        started = time.perf_counter()
+        if options['retry_failed'] and not options['dry_run']:
+            retried = ArchiveJob.objects.filter(status=ArchiveJob.STATUS_FAILED).update(
+                status=ArchiveJob.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now()
+            )
+            self.stdout.write(f"[reconcile] 실패 작업 {retried:,}개 재시도 대기")
+
+        active_jobs = ArchiveJob.objects.filter(
+            status__in=[ArchiveJob.STATUS_PENDING, ArchiveJob.STATUS_PROCESSING]
+        ).values('session_uuid')
+        candidates = (
+            Session.objects
+            .filter(
+                archived_at__isnull=True,
+                is_finalized=True,
+                created_at__lt=timezone.now() - timedelta(minutes=options['older_than']),
+            )
+            .exclude(session_uuid__in=active_jobs)
+            .order_by('session_uuid')
+        )
+
+        totals = {"checked": 0, "present": 0, "enqueued": 0, "purged": 0}
+        last_uuid = None
+        while True:
+            page = candidates if last_uuid is None else candidates.filter(session_uuid__gt=last_uuid)
+            rows = list(page.values_list(
+                'session_uuid', 'problem_id', 'is_correct', 'raw_purged_at'
+            )[:options['batch_size']])
+            if not rows:
+                break
+            last_uuid = rows[-1][0]
+            self._reconcile_batch(storage, rows, totals, options)
+
+        self.stdout.write(
+            f"[reconcile] 확인 {totals['checked']:,} / 객체 있음 {totals['present']:,} / "
+            f"재업로드 대상 {totals['enqueued']:,} / 원본 삭제로 건너뜀 {totals['purged']:,}"
+        )
+        if options['dry_run'] or options['enqueue_only']:
+            return
+
+        # 지금 처리할 수 있는 작업을 모두 업로드 (실패한 작업은 백오프 후 워커가 재시도)
+        done = failed = 0
+        while True:
+            jobs = claim_archive_jobs(options['batch_size'])
+            if not jobs:
+                break
+            batch_done, batch_failed = process_archive_jobs(jobs, options['concurrency'])
+            done += batch_done
+            failed += batch_failed
+            self.stdout.write(f"[reconcile] 업로드 {len(jobs)}개: 완료 {batch_done}, 실패 {batch_failed}")
+
+        elapsed = time.perf_counter() - started
+        stats = archive_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"[reconcile] 완료: 업로드 {done:,} / 실패 {failed:,} - {elapsed:.1f}s "
+            f"(대기 {stats['pending']:,}, 실패 확정 {stats['failed']:,})"
+        ))
+
+    def _reconcile_batch(self, storage, rows, totals, options):
+        """세션 배치의 객체 존재를 확인하고 없는 세션을 대기열에 추가"""
+        totals['checked'] += len(rows)
+        keys = [archive_key(problem_id, session_uuid) for session_uuid, problem_id, _, _ in rows]
+
+        if options['skip_exists_check']:
+            exists = [False] * len(rows)
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as executor:
+                exists = list(executor.map(storage.exists, keys))
+
+        present = [row[0] for row, found in zip(rows, exists) if found]
+        missing = [
+            (row, key) for row, key, found in zip(rows, keys, exists)
+            if not found and row[3] is None
+        ]
+        totals['present'] += len(present)
+        totals['purged'] += sum(1 for row, found in zip(rows, exists) if not found and row[3] is not None)
+        totals['enqueued'] += len(missing)
+        if options['dry_run']:
+            return
+
+        mark_archived(present)
+        ArchiveJob.objects.bulk_create([
+            ArchiveJob(
+                session_uuid=session_uuid,
+                key=key,
+                body=None,  # 처리 시 DB에서 재구성
+                metadata=archive_object_metadata(problem_id, session_uuid, is_correct),
+            )
+            for (session_uuid, problem_id, is_correct, _), key in missing
+        ])
@@ -0,0 +1,74 @@
+"""
+세션 S3 백업 워커
+
+archive_jobs 대기열의 작업을 가져와 제한된 동시성(--concurrency)으로 업로드합니다.
+실패한 작업은 지수 백오프 후 다시 시도하며, 여러 프로세스를 동시에 띄워도
+작업이 중복 처리되지 않습니다.
+
+사용법:
+    python manage.py run_archive_worker
+    python manage.py run_archive_worker --once          # 지금 처리할 수 있는 작업을 비우고 종료
+    python manage.py run_archive_worker --batch 50 --concurrency 16
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.archive import archive_stats, claim_archive_jobs, get_max_attempts, process_archive_jobs
+
+
+class Command(BaseCommand):
+    help = "archive_jobs 대기열을 처리하는 S3 백업 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=20, help="한 번에 가져올 작업 수 (기본: 20)")
+        parser.add_argument('--concurrency', type=int, default=8, help="동시 업로드 수 (기본: 8)")
+        parser.add_argument('--sleep', type=float, default=1.0, help="대기열이 비었을 때 대기 시간(초) (기본: 1.0)")
+        parser.add_argument(
+            '--max-attempts', type=int, default=None,
+            help="실패 확정 전 최대 시도 횟수 (기본: ARCHIVE_MAX_ATTEMPTS)"
+        )
+        parser.add_argument(
+            '--visibility-timeout', type=int, default=300,
+            help="처리 중 작업을 다시 가져올 때까지의 시간(초) (기본: 300)"
+        )
+        parser.add_argument('--stats-interval', type=float, default=60.0, help="대기열 지표 출력 주기(초) (기본: 60)")
+        parser.add_argument('--once', action='store_true', help="지금 처리할 수 있는 작업을 비운 뒤 종료")
+
+    def handle(self, *args, **options):
+        max_attempts = options['max_attempts'] or get_max_attempts()
+        self.stdout.write(self.style.SUCCESS(f"백업 워커 시작 (동시 업로드 {options['concurrency']})"))
+        self._print_stats()
+        last_stats_at = time.monotonic()
+
+        while True:
+            # 장시간 실행되는 프로세스이므로 끊어진 DB 커넥션 정리
+            close_old_connections()
+
+            jobs = claim_archive_jobs(options['batch'], options['visibility_timeout'])
+            if jobs:
+                started = time.perf_counter()
+                done, failed = process_archive_jobs(jobs, options['concurrency'], max_attempts)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.stdout.write(f"[archive] 작업 {len(jobs)}개: 완료 {done}, 실패 {failed} - {elapsed_ms:.0f}ms")
+
+            if time.monotonic() - last_stats_at >= options['stats_interval']:
+                self._print_stats()
+                last_stats_at = time.monotonic()
+
+            if not jobs:
+                if options['once']:
+                    self._print_stats()
+                    return
+                time.sleep(options['sleep'])
+
+    def _print_stats(self):
+        """대기열 깊이와 지연 시간 출력"""
+        stats = archive_stats()
+        self.stdout.write(
+            f"[archive] depth={stats['depth']} pending={stats['pending']} "
+            f"processing={stats['processing']} failed={stats['failed']} "
+            f"lag={stats['lag_seconds']}s"
+        )
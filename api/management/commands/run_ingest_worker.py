@@ -0,0 +1,69 @@
+"""
+비동기 세션 적재 워커
+
+ingest_jobs 대기열의 작업을 가져와 Session/Stroke/StrokePoint/Event 행과
+S3 백업을 생성합니다. 여러 프로세스를 동시에 띄워도 작업이 중복 처리되지 않습니다.
+
+사용법:
+    python manage.py run_ingest_worker
+    python manage.py run_ingest_worker --once          # 대기열을 한 번 비우고 종료
+    python manage.py run_ingest_worker --batch 20 --sleep 0.5
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.ingest_queue import claim_jobs, process_job, queue_stats
+
+
+class Command(BaseCommand):
+    help = "ingest_jobs 대기열을 처리하는 비동기 적재 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=10, help="한 번에 가져올 작업 수 (기본: 10)")
+        parser.add_argument('--sleep', type=float, default=1.0, help="대기열이 비었을 때 대기 시간(초) (기본: 1.0)")
+        parser.add_argument('--max-attempts', type=int, default=5, help="실패 확정 전 최대 시도 횟수 (기본: 5)")
+        parser.add_argument(
+            '--visibility-timeout', type=int, default=300,
+            help="처리 중 작업을 다시 가져올 때까지의 시간(초) (기본: 300)"
+        )
+        parser.add_argument('--stats-interval', type=float, default=60.0, help="대기열 지표 출력 주기(초) (기본: 60)")
+        parser.add_argument('--once', action='store_true', help="대기열이 빌 때까지 처리한 뒤 종료")
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("적재 워커 시작"))
+        self._print_stats()
+        last_stats_at = time.monotonic()
+
+        while True:
+            # 장시간 실행되는 프로세스이므로 끊어진 DB 커넥션 정리
+            close_old_connections()
+
+            jobs = claim_jobs(options['batch'], options['visibility_timeout'])
+            for job in jobs:
+                started = time.perf_counter()
+                ok = process_job(job, options['max_attempts'])
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                status = {True: "완료", False: "실패", None: "건너뜀"}[ok]
+                self.stdout.write(f"[ingest] 작업 {job.id} (세션 {job.session_uuid}) {status} - {elapsed_ms:.0f}ms")
+
+            if time.monotonic() - last_stats_at >= options['stats_interval']:
+                self._print_stats()
+                last_stats_at = time.monotonic()
+
+            if not jobs:
+                if options['once']:
+                    self._print_stats()
+                    return
+                time.sleep(options['sleep'])
+
+    def _print_stats(self):
+        """대기열 깊이와 지연 시간 출력"""
+        stats = queue_stats()
+        self.stdout.write(
+            f"[ingest] depth={stats['depth']} pending={stats['pending']} "
+            f"processing={stats['processing']} failed={stats['failed']} "
+            f"lag={stats['lag_seconds']}s"
+        )
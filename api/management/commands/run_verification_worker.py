@@ -0,0 +1,81 @@
+"""
+비동기 풀이 검증 워커 (VERIFY_ASYNC)
+
+verification_jobs 대기열의 작업을 가져와 Mathpix + OpenAI 검증을 스레드 풀(--concurrency)로
+동시에 실행하고 결과를 기록합니다. 외부 API 대기는 이 프로세스에서만 일어나므로 제출이 몰려도
+웹 워커는 묶이지 않고, 대기열 깊이(lag)만 늘어납니다. 여러 프로세스를 동시에 띄워도
+작업이 중복 처리되지 않습니다.
+
+사용법:
+    python manage.py run_verification_worker
+    python manage.py run_verification_worker --once              # 대기열을 비운 뒤 종료
+    python manage.py run_verification_worker --concurrency 16
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.verification_queue import (
+    claim_verification_jobs, get_max_attempts, process_verification_jobs, verification_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "verification_jobs 대기열을 처리하는 풀이 검증 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help="동시 검증 수 (기본: 8)")
+        parser.add_argument(
+            '--batch', type=int, default=None,
+            help="한 번에 가져올 작업 수 (기본: --concurrency와 같음)"
+        )
+        parser.add_argument('--sleep', type=float, default=0.5, help="대기열이 비었을 때 대기 시간(초) (기본: 0.5)")
+        parser.add_argument(
+            '--max-attempts', type=int, default=None,
+            help="실패 확정 전 최대 시도 횟수 (기본: VERIFY_MAX_ATTEMPTS)"
+        )
+        parser.add_argument(
+            '--visibility-timeout', type=int, default=300,
+            help="처리 중 작업을 다시 가져올 때까지의 시간(초) (기본: 300)"
+        )
+        parser.add_argument('--stats-interval', type=float, default=60.0, help="대기열 지표 출력 주기(초) (기본: 60)")
+        parser.add_argument('--once', action='store_true', help="대기열이 빌 때까지 처리한 뒤 종료")
+
+    def handle(self, *args, **options):
+        max_attempts = options['max_attempts'] or get_max_attempts()
+        batch = options['batch'] or options['concurrency']
+        self.stdout.write(self.style.SUCCESS(f"검증 워커 시작 (동시 검증 {options['concurrency']})"))
+        self._print_stats()
+        last_stats_at = time.monotonic()
+
+        while True:
+            # 장시간 실행되는 프로세스이므로 끊어진 DB 커넥션 정리
+            close_old_connections()
+
+            jobs = claim_verification_jobs(batch, options['visibility_timeout'])
+            if jobs:
+                started = time.perf_counter()
+                done, failed = process_verification_jobs(jobs, options['concurrency'], max_attempts)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.stdout.write(f"[verify] 작업 {len(jobs)}개: 완료 {done}, 실패 {failed} - {elapsed_ms:.0f}ms")
+
+            if time.monotonic() - last_stats_at >= options['stats_interval']:
+                self._print_stats()
+                last_stats_at = time.monotonic()
+
+            if not jobs:
+                if options['once']:
+                    self._print_stats()
+                    return
+                time.sleep(options['sleep'])
+
+    def _print_stats(self):
+        """대기열 깊이와 지연 시간 출력"""
+        stats = verification_stats()
+        self.stdout.write(
+            f"[verify] depth={stats['depth']} pending={stats['pending']} "
+            f"processing={stats['processing']} failed={stats['failed']} "
+            f"lag={stats['lag_seconds']}s"
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stroke',
+            name='point_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stroke',
+            name='points_packed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
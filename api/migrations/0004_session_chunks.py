@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_ingest_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='is_finalized',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='stroke',
+            name='client_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.CreateModel(
+            name='SessionChunk',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('seq', models.IntegerField()),
+                ('stroke_count', models.IntegerField(default=0)),
+                ('point_count', models.IntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='api.session')),
+            ],
+            options={
+                'db_table': 'session_chunks',
+                'unique_together': {('session', 'seq')},
+            },
+        ),
+    ]
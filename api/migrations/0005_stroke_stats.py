@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_session_chunks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='average_pressure',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='average_speed_pxps',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='point_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stroke',
+            name='average_acceleration_pxps2',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stroke',
+            name='max_speed_pxps',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stroke',
+            name='pressure_std',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_stroke_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionReceipt',
+            fields=[
+                ('session_uuid', models.UUIDField(primary_key=True, serialize=False)),
+                ('payload_hash', models.CharField(max_length=64)),
+                ('response_data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'submission_receipts',
+            },
+        ),
+    ]
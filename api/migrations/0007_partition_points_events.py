@@ -0,0 +1,417 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:28
+
+import re
+from datetime import date
+
+import django.utils.timezone
+from django.db import migrations, models, transaction
+from django.db.migrations.state import ProjectState
+from django.utils import timezone
+
+# 마이그레이션은 앱 코드 변경에 영향받지 않도록 전환 SQL과 보조 함수를 이 파일에 고정
+# (api.partitioning의 PARTITIONED_TABLES / partition_name / PARTITION_MONTHS_AHEAD 기본값 기준)
+
+# 테이블 → (파티션 키, unique 제약 교체 (기존 컬럼, 새 컬럼) 또는 None)
+PARTITIONED_TABLES = {
+    'stroke_points': ('recorded_on', (('stroke_id', 'idx'), ('stroke_id', 'idx', 'recorded_on'))),
+    'events': ('recorded_on', None),
+}
+
+# 전환 직후 미리 만들어 둘 미래 월 파티션 수
+MONTHS_AHEAD = 3
+
+UNIQUE_TOGETHER_OPERATIONS = [
+    migrations.AlterUniqueTogether(
+        name='strokepoint',
+        unique_together=set(),
+    ),
+    migrations.AlterUniqueTogether(
+        name='strokepoint',
+        unique_together={('stroke', 'idx', 'recorded_on')},
+    ),
+]
+
+_CHECK_UPPER_RE = re.compile(r"< '(\d{4}-\d{2}-\d{2})'::date")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def conversion_index_name(table):
+    """전환 전에 미리 만드는 (id, 파티션 키) unique 인덱스 이름 (전환 후 legacy 파티션의 PK 인덱스)"""
+    return f"{table}_legacy_pkey"
+
+
+def conversion_check_name(table):
+    """전환 전에 추가하는 파티션 범위 CHECK 제약 이름"""
+    return f"{table}_partition_check"
+
+
+def conversion_unique_name(schema_editor, table):
+    """파티션 키를 포함한 새 unique 제약 이름 (AlterUniqueTogether가 만드는 이름과 같게), 교체 대상이 없으면 None"""
+    unique = PARTITIONED_TABLES[table][1]
+    if unique is None:
+        return None
+    return schema_editor._create_index_name(table, list(unique[1]), suffix='_uniq')
+
+
+def _is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def _valid_index_exists(cursor, table, name):
+    """table에 유효한(CONCURRENTLY 생성이 끝난) 인덱스 name이 있는지 확인 (없으면 None)"""
+    cursor.execute(
+        "SELECT i.indisvalid FROM pg_index i JOIN pg_class ci ON ci.oid = i.indexrelid "
+        "WHERE i.indrelid = %s::regclass AND ci.relname = %s",
+        [table, name],
+    )
+    row = cursor.fetchone()
+    return None if row is None else row[0]
+
+
+def _constraint_exists(cursor, table, name):
+    cursor.execute("SELECT 1 FROM pg_constraint WHERE conrelid = %s::regclass AND conname = %s", [table, name])
+    return cursor.fetchone() is not None
+
+
+def _unique_constraint_names(cursor, table, columns):
+    """columns와 정확히 같은 컬럼(순서 포함)의 unique 제약 이름 목록"""
+    cursor.execute(
+        "SELECT c.conname FROM pg_constraint c "
+        "WHERE c.conrelid = %s::regclass AND c.contype = 'u' AND ("
+        "  SELECT array_agg(a.attname::text ORDER BY k.ord) "
+        "  FROM unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord) "
+        "  JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum"
+        ") = %s::text[]",
+        [table, list(columns)],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _validated_check_upper(cursor, table):
+    """검증이 끝난 파티션 범위 CHECK 제약의 상한 (없거나 NOT VALID 상태면 None)"""
+    cursor.execute(
+        "SELECT convalidated, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND conname = %s",
+        [table, conversion_check_name(table)],
+    )
+    row = cursor.fetchone()
+    if row is None or not row[0]:
+        return None
+    match = _CHECK_UPPER_RE.search(row[1])
+    return date.fromisoformat(match.group(1)) if match else None
+
+
+def _create_unique_index_concurrently(cursor, qn, table, name, columns):
+    """unique 인덱스를 CONCURRENTLY로 생성 (이미 유효한 인덱스가 있으면 그대로, INVALID면 다시 생성)"""
+    valid = _valid_index_exists(cursor, table, name)
+    if valid is False:
+        # 중단된 CONCURRENTLY 생성이 남긴 INVALID 인덱스
+        cursor.execute(f"DROP INDEX CONCURRENTLY {qn(name)}")
+    if not valid:
+        cursor.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY {qn(name)} ON {qn(table)} ({', '.join(qn(c) for c in columns)})"
+        )
+
+
+def prepare_partition_conversion(schema_editor, table):
+    """
+    파티션 전환 준비 - 적재를 막지 않고 전환 트랜잭션의 잠금 시간을 줄임 (트랜잭션 밖에서 실행)
+
+    1. legacy 파티션의 PK로 쓸 (id, 파티션 키) unique 인덱스와, 교체할 unique 제약의 새 인덱스
+       (stroke_points: stroke_id, idx, recorded_on)를 CREATE INDEX CONCURRENTLY로 생성
+       (전환 트랜잭션은 이 인덱스를 제약으로 연결만 하고, attach 시 PostgreSQL이 그대로 사용)
+    2. 파티션 범위와 같은 CHECK (key IS NOT NULL AND key < 상한)을 NOT VALID로 추가한 뒤
+       VALIDATE CONSTRAINT (SHARE UPDATE EXCLUSIVE 잠금이므로 INSERT / UPDATE와 동시에 실행)
+       → attach 시 전체 테이블 검증 스캔을 건너뜀
+
+    상한은 (최대 적재일, 오늘) 중 늦은 날의 다음 달 1일입니다. 준비 후 전환 전에 달이 바뀌면
+    새 행이 CHECK에 걸리므로 월말에는 실행하지 마세요.
+
+    Args:
+        schema_editor: 마이그레이션 schema editor (atomic=False)
+        table (str): 테이블명 (PARTITIONED_TABLES의 키)
+
+    Returns:
+        date | None: legacy 파티션 상한 (전환 대상이 아니면 None)
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return None
+
+    key, unique = PARTITIONED_TABLES[table]
+    check = conversion_check_name(table)
+    qn = schema_editor.quote_name
+
+    with schema_editor.connection.cursor() as cursor:
+        if _is_partitioned(cursor, table):
+            return None
+
+        _create_unique_index_concurrently(cursor, qn, table, conversion_index_name(table), ('id', key))
+        if unique is not None:
+            _create_unique_index_concurrently(
+                cursor, qn, table, conversion_unique_name(schema_editor, table), unique[1]
+            )
+
+        upper = _validated_check_upper(cursor, table)
+        if upper is None:
+            cursor.execute(f"SELECT max({qn(key)}) FROM {qn(table)}")
+            max_key = cursor.fetchone()[0]
+            today = timezone.localdate()
+            upper = add_months(month_start(max(max_key or today, today)), 1)
+            cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT IF EXISTS {qn(check)}")
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(check)} "
+                f"CHECK ({qn(key)} IS NOT NULL AND {qn(key)} < %s::date) NOT VALID",
+                [upper],
+            )
+            cursor.execute(f"ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(check)}")
+    return upper
+
+
+def convert_to_partitioned(schema_editor, table):
+    """
+    기존 일반 테이블을 월별 RANGE 파티션 테이블로 전환
+
+    데이터를 복사하지 않고 기존 테이블을 {table}_legacy 파티션으로 붙입니다.
+
+    1. unique 제약을 파티션 키가 포함된 새 제약으로 교체 (준비한 인덱스를 USING INDEX로 연결)
+    2. 기존 테이블의 인덱스 / 제약 정의를 읽고 테이블과 인덱스 이름을 *_legacy로 변경
+    3. 같은 컬럼의 파티션 부모 테이블을 원래 이름으로 생성하고 인덱스 / 제약을 원래 이름으로 재생성
+       (PRIMARY KEY에는 파티션 키를 추가, id 시퀀스는 부모 테이블 소유로 이전)
+    4. legacy 테이블을 MINVALUE ~ 상한 파티션으로 붙임
+       (같은 정의의 인덱스 / FK는 PostgreSQL이 그대로 연결)
+    5. default 파티션과 이후 월 파티션 생성
+
+    전체가 한 트랜잭션이며 테이블에 ACCESS EXCLUSIVE 잠금이 걸립니다.
+    prepare_partition_conversion()을 먼저 실행했다면 인덱스는 미리 만든 것을 연결하고
+    범위 검증은 CHECK 제약으로 대신하므로 카탈로그 변경만 남아 잠금은 짧습니다.
+    준비 없이 실행하면 같은 CHECK 검증과 인덱스 생성을 이 트랜잭션 안에서 하므로,
+    그동안(테이블 크기에 비례) 적재와 조회가 모두 대기합니다.
+
+    Args:
+        schema_editor: 마이그레이션 schema editor
+        table (str): 테이블명 (PARTITIONED_TABLES의 키)
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    key, unique = PARTITIONED_TABLES[table]
+    legacy = f"{table}_legacy"
+    index = conversion_index_name(table)
+    check = conversion_check_name(table)
+    qn = schema_editor.quote_name
+
+    def legacy_name(name):
+        return f"{name[:56]}_legacy"
+
+    with transaction.atomic(using=schema_editor.connection.alias), schema_editor.connection.cursor() as cursor:
+        if _is_partitioned(cursor, table):
+            return
+
+        # 잠금 시작 - max(id) 조회 후 시퀀스를 넘기기 전까지 적재가 끼어들지 않도록
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+
+        # 1. unique 제약 교체 (AlterUniqueTogether 대신 - 준비 단계에서 만든 인덱스를 그대로 사용)
+        if unique is not None:
+            old_columns, new_columns = unique
+            unique_name = conversion_unique_name(schema_editor, table)
+            for name in _unique_constraint_names(cursor, table, old_columns):
+                cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(name)}")
+            if not _constraint_exists(cursor, table, unique_name):
+                if _valid_index_exists(cursor, table, unique_name):
+                    cursor.execute(
+                        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(unique_name)} UNIQUE USING INDEX {qn(unique_name)}"
+                    )
+                else:
+                    # 준비 단계 없이 실행된 경우 - 잠금을 잡은 채로 인덱스 생성
+                    cursor.execute(
+                        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(unique_name)} "
+                        f"UNIQUE ({', '.join(qn(c) for c in new_columns)})"
+                    )
+
+        # 2. 기존 정의 수집 (이름 변경 전 - 정의가 원래 테이블명을 가리키도록)
+        #    전환 준비용 인덱스 / CHECK는 legacy 파티션에만 두므로 제외
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c') AND conname <> %s "
+            "ORDER BY contype = 'f', conname",
+            [table, check],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT ci.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "JOIN pg_class ci ON ci.oid = i.indexrelid "
+            "WHERE i.indrelid = %s::regclass AND ci.relname <> %s "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+            [table, index],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        sequence = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT attidentity FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'",
+            [table],
+        )
+        row = cursor.fetchone()
+        is_identity = bool(row and row[0])
+        has_index = bool(_valid_index_exists(cursor, table, index))
+        upper = _validated_check_upper(cursor, table)
+        cursor.execute(f"SELECT max(id) FROM {qn(table)}")
+        max_id = cursor.fetchone()[0]
+
+        if upper is None:
+            # 준비 단계 없이 실행된 경우 - 잠금을 잡은 채로 CHECK 검증 (전체 스캔)
+            cursor.execute(f"SELECT max({qn(key)}) FROM {qn(table)}")
+            max_key = cursor.fetchone()[0]
+            upper = add_months(month_start(max_key or timezone.localdate()), 1)
+            cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT IF EXISTS {qn(check)}")
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(check)} "
+                f"CHECK ({qn(key)} IS NOT NULL AND {qn(key)} < %s::date) NOT VALID",
+                [upper],
+            )
+            cursor.execute(f"ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(check)}")
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        for name, contype, _ in constraints:
+            if contype == 'p':
+                # 파티션 키가 포함된 새 PK로 교체 (미리 만든 인덱스가 있으면 그대로 사용, 없으면 attach 시 생성)
+                cursor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(name)}")
+                if has_index:
+                    cursor.execute(
+                        f"ALTER TABLE {qn(legacy)} ADD CONSTRAINT {qn(index)} PRIMARY KEY USING INDEX {qn(index)}"
+                    )
+            elif contype == 'u':
+                # 인덱스 이름은 스키마 전체에서 유일해야 하므로 변경 (FK / CHECK 이름은 테이블 단위)
+                cursor.execute(f"ALTER TABLE {qn(legacy)} RENAME CONSTRAINT {qn(name)} TO {qn(legacy_name(name))}")
+        for name, _ in indexes:
+            cursor.execute(f"ALTER INDEX {qn(name)} RENAME TO {qn(legacy_name(name))}")
+
+        # 3. 파티션 부모 테이블
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING STORAGE) "
+            f"PARTITION BY RANGE ({qn(key)})"
+        )
+        new_sequence = f"{table}_id_seq"
+        if is_identity:
+            # PostgreSQL 16 이하는 파티션 테이블에 IDENTITY 컬럼을 둘 수 없으므로 시퀀스 DEFAULT로 대체
+            cursor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+            cursor.execute(f"CREATE SEQUENCE {qn(new_sequence)} AS bigint OWNED BY {qn(table)}.id")
+            cursor.execute("SELECT setval(%s, %s, false)", [new_sequence, (max_id or 0) + 1])
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)",
+                [new_sequence],
+            )
+        elif sequence:
+            # serial 컬럼: LIKE로 DEFAULT가 복사되었으므로 시퀀스 소유권만 이전
+            cursor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN id DROP DEFAULT")
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.id")
+
+        for name, contype, definition in constraints:
+            if contype in ('p', 'u') and key not in definition:
+                # 파티션 테이블의 PK / unique 제약에는 파티션 키가 포함되어야 함
+                definition = re.sub(r"\(([^)]*)\)", rf"(\1, {key})", definition, count=1)
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+        # 4. 기존 테이블을 legacy 파티션으로 연결 (검증된 CHECK가 범위를 보장하므로 스캔 없음)
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [upper],
+        )
+        # 파티션 범위와 중복되는 CHECK 제거
+        cursor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(check)}")
+
+        # 5. default / 월 파티션 (새 부모 테이블이므로 legacy 범위 뒤로 겹치지 않음)
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+        for offset in range(MONTHS_AHEAD + 1):
+            start = add_months(upper, offset)
+            cursor.execute(
+                f"CREATE TABLE {qn(f'{table}_p{start:%Y%m}')} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, add_months(start, 1)],
+            )
+
+
+def _apply_operations(operations, state, schema_editor, backwards=False):
+    states = [state]
+    for operation in operations:
+        new_state = states[-1].clone()
+        operation.state_forwards('api', new_state)
+        states.append(new_state)
+    steps = list(zip(operations, states, states[1:]))
+    for operation, from_state, to_state in (reversed(steps) if backwards else steps):
+        if backwards:
+            operation.database_backwards('api', schema_editor, to_state, from_state)
+        else:
+            operation.database_forwards('api', schema_editor, from_state, to_state)
+
+
+def alter_unique_together(apps, schema_editor):
+    # PostgreSQL: 새 unique 인덱스는 준비 단계에서 CONCURRENTLY로 만들고 전환 트랜잭션에서 제약으로 교체
+    # (AlterUniqueTogether는 인덱스를 잠금 상태로 만들고, atomic = False라 그동안 기존 제약도 없음)
+    if schema_editor.connection.vendor != 'postgresql':
+        _apply_operations(UNIQUE_TOGETHER_OPERATIONS, ProjectState.from_apps(apps), schema_editor)
+
+
+def unalter_unique_together(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        # SeparateDatabaseAndState는 되돌릴 때도 교체 전 상태의 apps를 넘겨줌
+        _apply_operations(UNIQUE_TOGETHER_OPERATIONS, ProjectState.from_apps(apps), schema_editor, backwards=True)
+
+
+def partition_tables(apps, schema_editor):
+    # PostgreSQL에서만 stroke_points / events를 월별 RANGE 파티션 테이블로 전환
+    # 준비(CONCURRENTLY 인덱스 / CHECK 검증)는 트랜잭션 밖에서, 전환은 테이블별 짧은 트랜잭션으로 실행
+    for table in PARTITIONED_TABLES:
+        prepare_partition_conversion(schema_editor, table)
+        convert_to_partitioned(schema_editor, table)
+
+
+def unpartition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        raise migrations.exceptions.IrreversibleError(
+            "파티션 테이블은 일반 테이블로 되돌릴 수 없습니다. 데이터를 옮긴 뒤 수동으로 전환하세요."
+        )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음 (prepare_partition_conversion)
+    atomic = False
+
+    dependencies = [
+        ('api', '0006_submission_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='recorded_on',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AddField(
+            model_name='strokepoint',
+            name='recorded_on',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=UNIQUE_TOGETHER_OPERATIONS,
+            database_operations=[
+                migrations.RunPython(alter_unique_together, unalter_unique_together),
+            ],
+        ),
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
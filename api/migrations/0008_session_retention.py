@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:05
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_created_at(apps, schema_editor):
+    # 기존 세션은 클라이언트 시작 시각을 수신 시각으로 사용 (미래 시각은 제외)
+    Session = apps.get_model('api', 'Session')
+    Session.objects.filter(start_time__lt=django.utils.timezone.now()).update(created_at=F('start_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_partition_points_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='raw_purged_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 적재 순서(recorded_on)로 접근하는 시간 구간 스캔용 BRIN (PostgreSQL 전용)
+BRIN_INDEXES = (
+    ('stroke_points', 'stroke_points_recorded_brin'),
+    ('events', 'events_recorded_brin'),
+)
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, name in BRIN_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} "
+            f"ON {schema_editor.quote_name(table)} USING brin (recorded_on) WITH (pages_per_range = 32)"
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _, name in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_session_retention'),
+    ]
+
+    operations = [
+        # 새 인덱스를 먼저 만든 뒤 중복 인덱스 제거
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['session', 'ts_ms', 'id'], name='events_session_ts_id'),
+        ),
+        migrations.AddIndex(
+            model_name='stroke',
+            index=models.Index(fields=['session', 'start_ms'], include=('point_count', 'total_distance_px', 'average_speed_pxps', 'average_pressure'), name='strokes_session_start_cov'),
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_session_2134ed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_type_671f92_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='stroke',
+            name='strokes_session_48b226_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='strokepoint',
+            name='stroke_poin_session_670a4a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='strokepoint',
+            name='stroke_poin_session_532fe3_idx',
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='api.session'),
+        ),
+        migrations.AlterField(
+            model_name='sessionchunk',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='api.session'),
+        ),
+        migrations.AlterField(
+            model_name='stroke',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='strokes', to='api.session'),
+        ),
+        migrations.AlterField(
+            model_name='strokepoint',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='points', to='api.session'),
+        ),
+        migrations.AlterField(
+            model_name='strokepoint',
+            name='stroke',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='points', to='api.stroke'),
+        ),
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:37
+
+from django.db import migrations, models
+from django.db.migrations.state import ProjectState
+
+# api.wire.PRESSURE_SCALE (마이그레이션은 앱 코드 변경에 영향받지 않도록 값을 고정)
+PRESSURE_SCALE = 1024
+
+SMALLINT_COLUMNS = ('tilt_x', 'tilt_y', 'twist', 'buttons', 'width', 'height')
+
+ADD_PRESSURE_Q = migrations.AddField(
+    model_name='strokepoint',
+    name='pressure_q',
+    field=models.SmallIntegerField(blank=True, null=True),
+)
+
+SCHEMA_OPERATIONS = [
+    ADD_PRESSURE_Q,
+    migrations.RemoveField(
+        model_name='strokepoint',
+        name='pressure',
+    ),
+    migrations.RemoveField(
+        model_name='strokepoint',
+        name='pointer_type',
+    ),
+    migrations.RemoveField(
+        model_name='strokepoint',
+        name='session',
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='buttons',
+        field=models.SmallIntegerField(default=0),
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='height',
+        field=models.SmallIntegerField(blank=True, null=True),
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='tilt_x',
+        field=models.SmallIntegerField(blank=True, null=True),
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='tilt_y',
+        field=models.SmallIntegerField(blank=True, null=True),
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='twist',
+        field=models.SmallIntegerField(blank=True, null=True),
+    ),
+    migrations.AlterField(
+        model_name='strokepoint',
+        name='width',
+        field=models.SmallIntegerField(blank=True, null=True),
+    ),
+]
+
+
+def _apply_operations(operations, state, schema_editor):
+    for operation in operations:
+        new_state = state.clone()
+        operation.state_forwards('api', new_state)
+        operation.database_forwards('api', schema_editor, state, new_state)
+        state = new_state
+    return state
+
+
+def compact_stroke_points(apps, schema_editor):
+    """
+    stroke_points 컬럼 축소 + pressure 양자화
+
+    PostgreSQL에서는 AlterField마다 테이블(모든 파티션)을 다시 쓰지 않도록
+    ALTER TABLE 한 문장으로 묶어 재작성을 한 번만 수행합니다.
+    """
+    qn = schema_editor.quote_name
+    if schema_editor.connection.vendor == 'postgresql':
+        clamp = "LEAST(GREATEST({expr}, -32768), 32767)::smallint"
+        actions = [
+            "DROP COLUMN session_id",
+            "DROP COLUMN pointer_type",
+            f"ALTER COLUMN pressure TYPE smallint USING {clamp.format(expr=f'round(pressure * {PRESSURE_SCALE})')}",
+        ] + [
+            f"ALTER COLUMN {qn(name)} TYPE smallint USING {clamp.format(expr=qn(name))}"
+            for name in SMALLINT_COLUMNS
+        ]
+        schema_editor.execute(f"ALTER TABLE stroke_points {', '.join(actions)}")
+        schema_editor.execute("ALTER TABLE stroke_points RENAME COLUMN pressure TO pressure_q")
+        return
+
+    # 그 외 DB: 일반 마이그레이션 작업을 순서대로 적용하되 pressure 컬럼을 지우기 전에 값 이전
+    state = _apply_operations([ADD_PRESSURE_Q], ProjectState.from_apps(apps), schema_editor)
+    schema_editor.execute(
+        f"UPDATE stroke_points SET pressure_q = CAST(ROUND(pressure * {PRESSURE_SCALE}) AS INTEGER) "
+        f"WHERE pressure IS NOT NULL"
+    )
+    _apply_operations(SCHEMA_OPERATIONS[1:], state, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_index_redesign'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=SCHEMA_OPERATIONS,
+            database_operations=[
+                # 되돌리기는 지원하지 않음 (양자화 / 컬럼 삭제는 손실 변환)
+                migrations.RunPython(compact_stroke_points),
+            ],
+        ),
+    ]
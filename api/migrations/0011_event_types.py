@@ -0,0 +1,197 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.migrations.state import ProjectState
+
+# api.event_types.EVENT_FIELDS (마이그레이션은 앱 코드 변경에 영향받지 않도록 복사해 고정)
+EVENT_FIELDS = (
+    ('tool_prev', ('prevTool', 'prev', 'from'), str),
+    ('tool_new', ('newTool', 'new', 'to', 'tool'), str),
+    ('x', ('x',), float),
+    ('y', ('y',), float),
+    ('zoom', ('zoom', 'newZoom', 'scale', 'to'), float),
+)
+TOOL_MAX_LENGTH = 16
+BATCH_SIZE = 2000
+
+CREATE_EVENT_TYPE = migrations.CreateModel(
+    name='EventType',
+    fields=[
+        ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+        ('name', models.CharField(max_length=32, unique=True)),
+    ],
+    options={
+        'db_table': 'event_types',
+    },
+)
+
+ADD_EXTRACTED_FIELDS = [
+    migrations.AddField(
+        model_name='event',
+        name='tool_prev',
+        field=models.CharField(blank=True, max_length=16, null=True),
+    ),
+    migrations.AddField(
+        model_name='event',
+        name='tool_new',
+        field=models.CharField(blank=True, max_length=16, null=True),
+    ),
+    migrations.AddField(
+        model_name='event',
+        name='x',
+        field=models.FloatField(blank=True, null=True),
+    ),
+    migrations.AddField(
+        model_name='event',
+        name='y',
+        field=models.FloatField(blank=True, null=True),
+    ),
+    migrations.AddField(
+        model_name='event',
+        name='zoom',
+        field=models.FloatField(blank=True, null=True),
+    ),
+]
+
+STATE_OPERATIONS = [
+    CREATE_EVENT_TYPE,
+    migrations.AlterField(
+        model_name='event',
+        name='type',
+        field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.eventtype'),
+    ),
+    *ADD_EXTRACTED_FIELDS,
+]
+
+
+def _apply_operations(operations, state, schema_editor):
+    for operation in operations:
+        new_state = state.clone()
+        operation.state_forwards('api', new_state)
+        operation.database_forwards('api', schema_editor, state, new_state)
+        state = new_state
+    return state
+
+
+def _extract_sql(keys, kind):
+    """details에서 EVENT_FIELDS 값을 꺼내는 SQL (PostgreSQL jsonb)"""
+    if kind is str:
+        cases = [
+            f"CASE WHEN jsonb_typeof(details->'{key}') = 'string' AND details->>'{key}' <> '' "
+            f"THEN left(details->>'{key}', {TOOL_MAX_LENGTH}) END"
+            for key in keys
+        ]
+    else:
+        cases = [
+            f"CASE WHEN jsonb_typeof(details->'{key}') = 'number' THEN (details->>'{key}')::float8 END"
+            for key in keys
+        ]
+    return f"COALESCE({', '.join(cases)})" if len(cases) > 1 else cases[0]
+
+
+def _extract_python(details):
+    fields = {}
+    for field, keys, kind in EVENT_FIELDS:
+        value = None
+        if isinstance(details, dict):
+            for key in keys:
+                candidate = details.get(key)
+                if kind is str and isinstance(candidate, str) and candidate:
+                    value = candidate[:TOOL_MAX_LENGTH]
+                elif kind is float and isinstance(candidate, (int, float)) and not isinstance(candidate, bool):
+                    value = float(candidate)
+                if value is not None:
+                    break
+        fields[field] = value
+    return fields
+
+
+def intern_event_types(apps, schema_editor):
+    """
+    events.type 문자열 → event_types smallint FK 전환 + details 추출 컬럼 채우기
+
+    PostgreSQL에서는 컬럼 추가(메타데이터만 변경) 후 UPDATE 한 번으로 타입 id와 추출 컬럼을
+    함께 채우고, details에 GIN(jsonb_path_ops) 인덱스를 만듭니다.
+    """
+    state = _apply_operations([CREATE_EVENT_TYPE], ProjectState.from_apps(apps), schema_editor)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "INSERT INTO event_types (name) SELECT DISTINCT type FROM events ON CONFLICT (name) DO NOTHING"
+        )
+        schema_editor.execute(
+            "ALTER TABLE events ADD COLUMN type_id smallint, "
+            f"ADD COLUMN tool_prev varchar({TOOL_MAX_LENGTH}), ADD COLUMN tool_new varchar({TOOL_MAX_LENGTH}), "
+            "ADD COLUMN x double precision, ADD COLUMN y double precision, ADD COLUMN zoom double precision"
+        )
+        assignments = ", ".join(
+            f"{field} = {_extract_sql(keys, kind)}" for field, keys, kind in EVENT_FIELDS
+        )
+        schema_editor.execute(
+            f"UPDATE events SET type_id = t.id, {assignments} "
+            f"FROM event_types t WHERE t.name = events.type"
+        )
+        schema_editor.execute(
+            "ALTER TABLE events DROP COLUMN type, ALTER COLUMN type_id SET NOT NULL, "
+            "ADD CONSTRAINT events_type_id_fk_event_types_id FOREIGN KEY (type_id) "
+            "REFERENCES event_types (id) DEFERRABLE INITIALLY DEFERRED"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS events_details_gin ON events USING gin (details jsonb_path_ops)"
+        )
+        return
+
+    # 그 외 DB: 임시 FK 컬럼을 채운 뒤 기존 type 컬럼을 대체
+    add_type_ref = migrations.AddField(
+        model_name='event',
+        name='type_ref',
+        field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.eventtype'),
+    )
+    state = _apply_operations([*ADD_EXTRACTED_FIELDS, add_type_ref], state, schema_editor)
+
+    EventType = state.apps.get_model('api', 'EventType')
+    Event = state.apps.get_model('api', 'Event')
+    names = Event.objects.values_list('type', flat=True).distinct()
+    EventType.objects.bulk_create([EventType(name=name) for name in names], ignore_conflicts=True)
+    type_ids = dict(EventType.objects.values_list('name', 'id'))
+
+    field_names = ['type_ref'] + [field for field, _, _ in EVENT_FIELDS]
+    batch = []
+    for event in Event.objects.only('id', 'type', 'details').iterator(chunk_size=BATCH_SIZE):
+        event.type_ref_id = type_ids[event.type]
+        for field, value in _extract_python(event.details).items():
+            setattr(event, field, value)
+        batch.append(event)
+        if len(batch) >= BATCH_SIZE:
+            Event.objects.bulk_update(batch, field_names)
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, field_names)
+
+    _apply_operations([
+        migrations.RemoveField(model_name='event', name='type'),
+        migrations.RenameField(model_name='event', old_name='type_ref', new_name='type'),
+        migrations.AlterField(
+            model_name='event',
+            name='type',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.eventtype'),
+        ),
+    ], state, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_compact_stroke_points'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=STATE_OPERATIONS,
+            database_operations=[
+                # 되돌리기는 지원하지 않음
+                migrations.RunPython(intern_event_types),
+            ],
+        ),
+    ]
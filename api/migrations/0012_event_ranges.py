@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_event_types'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='end_ts_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='sample_count',
+            field=models.IntegerField(default=1),
+        ),
+    ]
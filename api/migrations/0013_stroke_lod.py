@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_event_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stroke',
+            name='lod_packed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
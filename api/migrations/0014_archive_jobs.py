@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_stroke_lod'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchiveJob',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('session_uuid', models.UUIDField(db_index=True)),
+                ('key', models.CharField(max_length=255)),
+                ('body', models.BinaryField(blank=True, null=True)),
+                ('metadata', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'archive_jobs',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='archive_job_status_c03b32_idx')],
+            },
+        ),
+    ]
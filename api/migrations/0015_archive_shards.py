@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_archive_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveShard',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField()),
+                ('part', models.SmallIntegerField()),
+                ('prefix', models.CharField(max_length=255)),
+                ('session_count', models.IntegerField()),
+                ('stroke_count', models.IntegerField()),
+                ('point_count', models.BigIntegerField()),
+                ('event_count', models.BigIntegerField()),
+                ('total_bytes', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'archive_shards',
+                'unique_together': {('window_start', 'part')},
+            },
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='shard',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='api.archiveshard'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('is_finalized', True), ('shard__isnull', True)), fields=['created_at'], name='sessions_unsharded_created'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:09
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_archive_shards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('session_uuid', models.UUIDField(db_index=True)),
+                ('question_id', models.IntegerField()),
+                ('strokes', models.JSONField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'verification_jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='verificatio_status_ab7d2f_idx')],
+            },
+        ),
+    ]
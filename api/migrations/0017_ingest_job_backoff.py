@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_verification_jobs'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ingestjob',
+            name='ingest_jobs_status_f1435a_idx',
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='ingestjob',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='ingest_jobs_status_7af4d9_idx'),
+        ),
+    ]
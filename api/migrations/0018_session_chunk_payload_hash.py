@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_ingest_job_backoff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionchunk',
+            name='payload_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -1,5 +1,8 @@
 # api/models.py
+import uuid
+
 from django.db import models
+from django.utils import timezone
 
 class Session(models.Model):
     # 세션/문항 메타 + 요약치(학습/대시보드 캐시)
@@ -46,6 +49,11 @@ class Session(models.Model):
     pan_count    = models.IntegerField(default=0)
     tool_change_count = models.IntegerField(default=0)  # 도구 변경 횟수
 
+    # 스트로크 통계 집계 (서버 계산 — api.stroke_stats.summarize_session_strokes)
+    point_count = models.IntegerField(default=0)
+    average_speed_pxps = models.FloatField(null=True, blank=True)  # 스트로크 평균 속도의 평균
+    average_pressure   = models.FloatField(null=True, blank=True)  # 스트로크 평균 pressure의 평균
+
     # 사용자 답안 (선택적)
     answer = models.CharField(max_length=255, null=True, blank=True)  # 사용자가 제출한 답
     is_correct = models.BooleanField(null=True, blank=True)  # 정답 여부
@@ -53,14 +61,37 @@ class Session(models.Model):
     # 지도학습 라벨(운영 수집 시 NULL)
     label = models.SmallIntegerField(null=True, blank=True)  # 0=정상,1=치팅
 
+    # 분할 업로드 상태 (청크로 받는 중이면 False, finalize 또는 단일 제출 시 True)
+    is_finalized = models.BooleanField(default=True)
+
+    # 보존 기간 관리 (api.retention)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 서버 수신 시각
+    raw_purged_at = models.DateTimeField(null=True, blank=True)  # 포인트/이벤트 원본 삭제 시각 (요약만 남은 세션)
+
+    # S3 백업 완료 시각 (api.archive) - NULL이면 reconcile_archives 대상
+    archived_at = models.DateTimeField(null=True, blank=True)
+    # Parquet 샤드 (api.shards) - NULL이면 build_archive_shards 대상
+    shard = models.ForeignKey(
+        "ArchiveShard", on_delete=models.SET_NULL, null=True, blank=True, related_name="sessions", db_index=False
+    )
+
     class Meta:
         db_table = "sessions"
+        indexes = [
+            # 샤드 대기 세션 조회 (api.shards.pending_sessions) - 샤드에 들어간 세션은 인덱스에서 빠짐
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(shard__isnull=True, is_finalized=True),
+                name="sessions_unsharded_created",
+            ),
+        ]
 
 
 class Stroke(models.Model):
     # 스트로크 메타
     stroke_uuid = models.UUIDField(primary_key=True)  # 클라 생성 or 서버에서 uuid4
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="strokes")
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="strokes", db_index=False)
+    client_id = models.CharField(max_length=64, null=True, blank=True)  # 프론트엔드 stroke.id (가시 스트로크 식별용)
     tool = models.CharField(max_length=16)            # 'pen' | 'eraser'
     color = models.CharField(max_length=16)           # '#RRGGBB'
     stroke_width = models.IntegerField()              # px (항상 숫자형으로)
@@ -71,10 +102,13 @@ class Stroke(models.Model):
     pointer_type = models.CharField(max_length=16, default='pen')  # 'pen'|'touch'|'mouse'
     is_coalesced = models.BooleanField(default=False)  # 고주파수 이벤트 여부
 
-    # 요약치
+    # 요약치 (서버에서 포인트로 계산 — api.stroke_stats 참고)
     total_distance_px = models.FloatField()
     average_speed_pxps = models.FloatField(null=True, blank=True)
+    max_speed_pxps     = models.FloatField(null=True, blank=True)
+    average_acceleration_pxps2 = models.FloatField(null=True, blank=True)
     average_pressure   = models.FloatField(null=True, blank=True)
+    pressure_std       = models.FloatField(null=True, blank=True)
 
     # bbox
     bbox_min_x = models.IntegerField()
@@ -82,52 +116,241 @@ class Stroke(models.Model):
     bbox_max_x = models.IntegerField()
     bbox_max_y = models.IntegerField()
 
+    # packed 포인트 저장 (STROKE_POINT_STORAGE가 'packed'/'both'일 때 사용)
+    # 스트로크 한 개의 포인트 전체를 컬럼별 배열로 묶은 바이너리 — api.packing 참고
+    point_count = models.IntegerField(default=0)
+    points_packed = models.BinaryField(null=True, blank=True)
+    # RDP 단순화 LOD 피라미드 (STROKE_LOD_TOLERANCES별 packed 포인트) — api.simplify 참고
+    # 포인트가 적은 스트로크는 NULL (조회 시 원본 사용)
+    lod_packed = models.BinaryField(null=True, blank=True)
+
     class Meta:
         db_table = "strokes"
         indexes = [
-            models.Index(fields=["session", "start_ms"]),
+            # 세션별 스트로크 조회(replay, start_ms 순) + 세션 요약 집계(summarize_session_strokes)를
+            # 인덱스만으로 처리하도록 집계 컬럼 포함 (PostgreSQL - VACUUM 후 Index Only Scan)
+            models.Index(
+                fields=["session", "start_ms"],
+                include=["point_count", "total_distance_px", "average_speed_pxps", "average_pressure"],
+                name="strokes_session_start_cov",
+            ),
         ]
 
 
 class StrokePoint(models.Model):
-    # 대용량: 파티셔닝 권장(월/수집일 기준) — raw SQL migration에서 분할
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="points")
-    stroke  = models.ForeignKey(Stroke, on_delete=models.CASCADE, related_name="points")
+    # 대용량: PostgreSQL에서는 recorded_on 기준 월별 RANGE 파티션 테이블 (api.partitioning,
+    # 0007_partition_points_events 참고). 파티션 생성/회전은 `manage.py manage_partitions`
+    # 인덱스: PK + unique(stroke, idx, recorded_on) B-tree 두 개만 유지 (FK 인덱스 없음)
+    # 세션 단위 접근은 strokes를 거쳐 stroke_id로 조회. PostgreSQL에는 recorded_on BRIN 추가 (0009)
+    # 행 폭 축소 (0010): session FK / pointer_type은 스트로크 단위(Stroke)로만 저장하고,
+    # 값 범위가 작은 컬럼은 smallint, pressure는 × PRESSURE_SCALE 정수로 양자화
+    stroke  = models.ForeignKey(Stroke, on_delete=models.CASCADE, related_name="points", db_index=False)
     idx     = models.IntegerField()        # 스트로크 내 순번 (0..N-1)
     t_ms    = models.IntegerField()        # 스트로크 시작 기준 ms
     x       = models.IntegerField()
     y       = models.IntegerField()
-    pressure = models.FloatField(null=True, blank=True)  # 마우스는 NULL
-    tilt_x   = models.IntegerField(null=True, blank=True)
-    tilt_y   = models.IntegerField(null=True, blank=True)
-    twist    = models.IntegerField(null=True, blank=True)
-    pointer_type = models.CharField(max_length=16)  # 'pen'|'touch'|'mouse'
+    pressure_q = models.SmallIntegerField(null=True, blank=True)  # pressure × 1024 (api.wire.PRESSURE_SCALE), 마우스는 NULL
+    tilt_x   = models.SmallIntegerField(null=True, blank=True)  # -90 ~ 90
+    tilt_y   = models.SmallIntegerField(null=True, blank=True)
+    twist    = models.SmallIntegerField(null=True, blank=True)  # 0 ~ 359
     pointer_id   = models.IntegerField(null=True, blank=True)
-    buttons      = models.IntegerField(default=0)
-    width        = models.IntegerField(null=True, blank=True)
-    height       = models.IntegerField(null=True, blank=True)
+    buttons      = models.SmallIntegerField(default=0)
+    width        = models.SmallIntegerField(null=True, blank=True)
+    height       = models.SmallIntegerField(null=True, blank=True)
+    recorded_on  = models.DateField(default=timezone.localdate)  # 파티션 키 (적재일, UTC)
 
     class Meta:
         db_table = "stroke_points"
-        unique_together = ("stroke", "idx")
-        indexes = [
-            models.Index(fields=["session", "stroke", "idx"]),
-            models.Index(fields=["session", "t_ms"]),
-        ]
+        # 파티션 테이블의 unique 제약에는 파티션 키가 포함되어야 함
+        unique_together = ("stroke", "idx", "recorded_on")
+
+
+class EventType(models.Model):
+    # 이벤트 타입 사전 ('undo','redo','stroke_start','stroke_end',... 등)
+    # events에는 문자열 대신 smallint id만 저장 — 조회/생성은 api.event_types 참고
+    id   = models.SmallAutoField(primary_key=True)
+    name = models.CharField(max_length=32, unique=True)
+
+    class Meta:
+        db_table = "event_types"
 
 
 class Event(models.Model):
     # 이벤트 고유 ID (동일 시각에 여러 이벤트 허용)
     id = models.BigAutoField(primary_key=True)
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="events")
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="events", db_index=False)
     ts_ms   = models.IntegerField()  # 세션 시작 기준 ms
-    type    = models.CharField(max_length=32)  # 'undo','redo','stroke_start','stroke_end',... 등
-    details = models.JSONField(null=True, blank=True)  # prev/new, 위치 정보 등
+    type    = models.ForeignKey(EventType, on_delete=models.PROTECT, related_name="+", db_index=False)
+    details = models.JSONField(null=True, blank=True)  # 원본 그대로 (PostgreSQL은 GIN 인덱스, 0011)
+    # 분석에 자주 쓰는 details 값은 적재 시 타입이 있는 컬럼으로 추출 (api.event_types.EVENT_FIELDS)
+    tool_prev = models.CharField(max_length=16, null=True, blank=True)  # tool_change 이전 도구
+    tool_new  = models.CharField(max_length=16, null=True, blank=True)  # 변경 후 / 사용 도구
+    x    = models.FloatField(null=True, blank=True)
+    y    = models.FloatField(null=True, blank=True)
+    zoom = models.FloatField(null=True, blank=True)  # 변경 후 zoom 배율
+    # 연속된 zoom / pan 이벤트를 합친 구간 이벤트 (api.event_coalescing)
+    # ts_ms ~ end_ts_ms 동안 sample_count개, details = {"start": 첫 details, "end": 마지막 details}
+    end_ts_ms    = models.IntegerField(null=True, blank=True)  # 단일 이벤트는 NULL
+    sample_count = models.IntegerField(default=1)
+    recorded_on = models.DateField(default=timezone.localdate)  # 파티션 키 (적재일, UTC)
 
     class Meta:
         db_table = "events"
         # unique_together 제거 (동일 시각 동일 타입 이벤트 허용)
         indexes = [
-            models.Index(fields=["session", "ts_ms"]),
-            models.Index(fields=["type"]),
+            # export의 ORDER BY ts_ms, id와 같은 순서 (정렬 없이 인덱스 순서대로 읽음)
+            models.Index(fields=["session", "ts_ms", "id"], name="events_session_ts_id"),
+        ]
+
+
+class SessionChunk(models.Model):
+    # 분할 업로드된 청크 기록 (같은 seq 재전송 시 중복 적재 방지)
+    id = models.BigAutoField(primary_key=True)
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="chunks", db_index=False)
+    seq = models.IntegerField()                  # 클라이언트가 매기는 청크 순번 (0부터)
+    payload_hash = models.CharField(max_length=64, null=True, blank=True)  # 요청 본문 SHA-256 (같은 seq 재전송 비교)
+    stroke_count = models.IntegerField(default=0)
+    point_count = models.IntegerField(default=0)
+    event_count = models.IntegerField(default=0)
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "session_chunks"
+        unique_together = ("session", "seq")
+
+
+class IngestJob(models.Model):
+    # 비동기 적재 대기열 (PostgreSQL outbox 테이블)
+    # verify_solution은 원본 요청 본문만 저장하고 즉시 응답하며,
+    # run_ingest_worker 명령이 Session/Stroke/StrokePoint/Event 행과 S3 백업을 생성
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_PROCESSING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    session_uuid = models.UUIDField(db_index=True)  # 응답으로 먼저 돌려준 세션 UUID
+    payload = models.BinaryField()                  # 원본 요청 본문 (JSON bytes)
+    params = models.JSONField(default=dict)         # 채점 결과 등 요청 처리 중 계산된 값
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # 재시도 시각 (백오프)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)   # 마지막 처리 시작 시각 (워커 lease)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "ingest_jobs"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
         ]
+
+
+class ArchiveJob(models.Model):
+    # 세션 S3 백업 대기열 (outbox 테이블, api.archive)
+    # 요청 처리 중에는 gzip 본문만 저장하고, run_archive_worker가 제한된 동시성으로 업로드
+    # body가 NULL이면 처리 시 DB에서 재구성 (reconcile_archives)
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_PROCESSING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    session_uuid = models.UUIDField(db_index=True)
+    key = models.CharField(max_length=255)                     # 저장소 객체 키
+    body = models.BinaryField(null=True, blank=True)           # gzip 본문 (업로드 후 NULL)
+    metadata = models.JSONField(default=dict)                  # S3 객체 메타데이터
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # 재시도 시각 (백오프)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)   # 마지막 처리 시작 시각
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "archive_jobs"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+
+class ArchiveShard(models.Model):
+    # 시간 구간별 Parquet 세션 샤드 (api.shards, build_archive_shards)
+    # 같은 구간에 늦게 들어온 세션은 다음 part로 추가
+    id = models.BigAutoField(primary_key=True)
+    window_start = models.DateTimeField()       # 구간 시작 (UTC 정렬)
+    window_end = models.DateTimeField()         # 구간 끝 (포함하지 않음)
+    part = models.SmallIntegerField()           # 구간 내 순번 (1부터)
+    prefix = models.CharField(max_length=255)   # 저장소 키 접두사 (shards/YYYY/MM/DD/part-NNNN/)
+    session_count = models.IntegerField()
+    stroke_count = models.IntegerField()
+    point_count = models.BigIntegerField()
+    event_count = models.BigIntegerField()
+    total_bytes = models.BigIntegerField()      # Parquet 파일 크기 합계
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "archive_shards"
+        unique_together = ("window_start", "part")
+
+
+class VerificationJob(models.Model):
+    # 비동기 풀이 검증 대기열 (api.verification_queue, VERIFY_ASYNC)
+    # 제출 응답은 채점 결과와 작업 id만 먼저 돌려주고, run_verification_worker가 Mathpix + OpenAI 검증 후 result 기록
+    # 클라이언트는 /api/verifications/<id>/ 폴링 또는 /events/ SSE(VERIFY_SSE_ENABLED)로 결과 수신
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_PROCESSING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)  # 클라이언트에 돌려주는 작업 id (추측 불가)
+    session_uuid = models.UUIDField(db_index=True)
+    question_id = models.IntegerField()
+    strokes = models.JSONField(null=True, blank=True)   # Mathpix로 보낼 가시 스트로크 (처리 후 NULL)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)    # 응답 data (verify-solution 응답과 같은 형태)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "verification_jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+
+class SubmissionReceipt(models.Model):
+    # 제출 멱등성 기록 (클라이언트 세션 UUID + 요청 본문 해시)
+    # 타임아웃 후 같은 제출을 재전송하면 DB 적재 / S3 / Mathpix / OpenAI를 다시 실행하지 않고
+    # 저장된 응답을 그대로 반환 — api.idempotency 참고
+    session_uuid = models.UUIDField(primary_key=True)
+    payload_hash = models.CharField(max_length=64)             # 해제된 요청 본문의 SHA-256 (hex)
+    response_data = models.JSONField(null=True, blank=True)    # 응답의 data (처리 중이면 NULL)
+    created_at = models.DateTimeField(auto_now_add=True)       # 처리 시작(선점) 시각
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "submission_receipts"
@@ -0,0 +1,157 @@
+"""
+Mathpix 필기 변환 결과 캐시 (content-addressed)
+
+정답 제출마다 convert_strokes_to_text()가 스트로크 x/y 배열을 Mathpix Strokes API로 보내므로,
+재전송 / 재채점 / 같은 필기의 재제출도 매번 외부 호출 지연과 비용이 발생합니다.
+Mathpix로 실제로 보내는 값(지우개를 제외한 가시 스트로크의 x/y 배열)의 정규화 해시를 키로
+변환 텍스트를 Django 캐시(CACHES['mathpix'])에 저장합니다.
+
+- 키: sha256(버전 + 스트로크별 포인트 수 + float64 x/y 배열) - 1과 1.0은 같은 키
+- TTL / 크기 제한: MATHPIX_CACHE_TTL_SECONDS / MATHPIX_CACHE_MAX_ENTRIES (캐시 백엔드가 정리)
+- 저장소: MATHPIX_CACHE_URL (기본 프로세스 메모리, dbcache://로 DB 테이블)
+- 적중 / 미스 횟수는 같은 캐시에 카운터로 기록하여 워커 간에 합산됩니다 (/api/ingest/stats/)
+  카운터도 캐시 항목이므로 MAX_ENTRIES 정리나 재시작(locmem)으로 초기화될 수 있는 근사치입니다.
+
+캐시 오류(DB / Redis 장애 등)는 로그만 남기고 Mathpix를 그대로 호출합니다.
+"""
+
+import hashlib
+import struct
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+
+OCR_CACHE_ALIAS = 'mathpix'
+
+# Mathpix 요청 형식(x/y만 전송, formats)이 바뀌면 올려서 기존 항목을 무효화
+KEY_VERSION = b'mathpix-strokes-v1'
+
+_STATS_KEYS = {"hits": "ocr:stats:hits", "misses": "ocr:stats:misses", "stores": "ocr:stats:stores"}
+
+
+def is_ocr_cache_enabled():
+    """
+    Mathpix 변환 결과 캐시 사용 여부
+
+    Returns:
+        bool: settings.MATHPIX_CACHE_ENABLED이고 CACHES['mathpix']가 설정된 경우
+    """
+    return getattr(settings, 'MATHPIX_CACHE_ENABLED', False) and OCR_CACHE_ALIAS in settings.CACHES
+
+
+def strokes_fingerprint(x_arrays, y_arrays):
+    """
+    Mathpix로 보낼 x/y 배열의 정규화 해시
+
+    Args:
+        x_arrays (list): 스트로크별 x 좌표 배열
+        y_arrays (list): 스트로크별 y 좌표 배열
+
+    Returns:
+        str: sha256 hex
+    """
+    digest = hashlib.sha256(KEY_VERSION)
+    for x_coords, y_coords in zip(x_arrays, y_arrays):
+        digest.update(struct.pack('<I', len(x_coords)))
+        digest.update(np.asarray(x_coords, dtype='<f8').tobytes())
+        digest.update(np.asarray(y_coords, dtype='<f8').tobytes())
+    return digest.hexdigest()
+
+
+def _cache_key(fingerprint):
+    return f"ocr:{fingerprint}"
+
+
+def record_cache_stat(alias, key):
+    """
+    캐시 통계 카운터 증가 (실패해도 무시, api.verdict_cache에서도 사용)
+
+    Args:
+        alias (str): CACHES 별칭
+        key (str): 카운터 키
+    """
+    try:
+        cache = caches[alias]
+        # 카운터는 만료되지 않도록 timeout=None
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except Exception as e:
+        print(f"[캐시 {alias}] 통계 기록 실패: {e}")
+
+
+def read_cache_stats(alias, stats_keys):
+    """
+    적중 / 미스 / 저장 카운터와 적중률 조회
+
+    Args:
+        alias (str): CACHES 별칭
+        stats_keys (dict): {"hits": 키, "misses": 키, "stores": 키}
+
+    Returns:
+        dict: {"enabled", "backend", "hits", "misses", "stores", "hit_rate"}
+    """
+    try:
+        values = caches[alias].get_many(list(stats_keys.values()))
+    except Exception as e:
+        print(f"[캐시 {alias}] 통계 조회 실패: {e}")
+        values = {}
+    stats = {name: values.get(key, 0) for name, key in stats_keys.items()}
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "enabled": True,
+        "backend": settings.CACHES[alias]['BACKEND'].rsplit('.', 1)[-1],
+        **stats,
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0,
+    }
+
+
+def get_cached_text(fingerprint):
+    """
+    캐시된 변환 텍스트 조회 (적중 / 미스 기록)
+
+    Args:
+        fingerprint (str): strokes_fingerprint() 결과
+
+    Returns:
+        str | None: 변환 텍스트 (없거나 캐시를 쓰지 않으면 None)
+    """
+    if not is_ocr_cache_enabled():
+        return None
+    try:
+        text = caches[OCR_CACHE_ALIAS].get(_cache_key(fingerprint))
+    except Exception as e:
+        print(f"[Mathpix 캐시] 조회 실패: {e}")
+        return None
+    record_cache_stat(OCR_CACHE_ALIAS, _STATS_KEYS["hits" if text is not None else "misses"])
+    return text
+
+
+def store_text(fingerprint, text):
+    """
+    변환 텍스트 저장 (TTL은 CACHES['mathpix']['TIMEOUT'])
+
+    Args:
+        fingerprint (str): strokes_fingerprint() 결과
+        text (str): Mathpix 변환 텍스트
+    """
+    if not is_ocr_cache_enabled():
+        return
+    try:
+        caches[OCR_CACHE_ALIAS].set(_cache_key(fingerprint), text)
+    except Exception as e:
+        print(f"[Mathpix 캐시] 저장 실패: {e}")
+        return
+    record_cache_stat(OCR_CACHE_ALIAS, _STATS_KEYS["stores"])
+
+
+def ocr_cache_stats():
+    """
+    캐시 적중률 지표
+
+    Returns:
+        dict: {"enabled", "backend", "hits", "misses", "stores", "hit_rate"}
+    """
+    if not is_ocr_cache_enabled():
+        return {"enabled": False}
+    return read_cache_stats(OCR_CACHE_ALIAS, _STATS_KEYS)
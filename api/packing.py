@@ -0,0 +1,275 @@
+"""
+스트로크 포인트 packed 바이너리 코덱
+
+스트로크 한 개의 포인트 전체를 컬럼별 배열(struct-of-arrays)로 묶어
+Stroke.points_packed 한 칸에 저장합니다. 포인트마다 행을 만드는
+stroke_points 대비 행 헤더 / FK / 인덱스 비용이 사라집니다.
+
+바이너리 레이아웃 (리틀 엔디언):
+    magic(2B 'SP') | version(1B) | flags(2B) | count(4B)
+    | pointer_type 문자열 테이블 길이(2B) + UTF-8 (','로 구분)
+    | 컬럼 배열들 (COLUMN_SPECS 순서, flags에 표시된 컬럼만)
+
+- flags의 비트 i가 1이면 COLUMN_SPECS[i] 컬럼이 존재합니다.
+  값이 전부 NULL인 선택 컬럼(예: 마우스의 pressure)은 아예 저장하지 않습니다.
+- 컬럼 안의 NULL은 정수형은 NULL_INT 센티넬, 실수형은 NaN으로 표현합니다.
+- pressure는 float32로 저장합니다. PointerEvent.pressure 자체가 float이므로 손실이 없습니다.
+"""
+
+import math
+import struct
+import sys
+from array import array
+
+MAGIC = b'SP'
+VERSION = 1
+
+# 정수 컬럼의 NULL 센티넬 (int32 최솟값)
+NULL_INT = -2 ** 31
+
+# (필드명, array typecode) - 비트 순서이므로 순서 변경 금지
+COLUMN_SPECS = (
+    ('t_ms', 'i'),
+    ('x', 'i'),
+    ('y', 'i'),
+    ('pressure', 'f'),
+    ('tilt_x', 'i'),
+    ('tilt_y', 'i'),
+    ('twist', 'i'),
+    ('pointer_type', 'B'),  # pointer_type 문자열 테이블의 인덱스
+    ('pointer_id', 'i'),
+    ('buttons', 'i'),
+    ('width', 'i'),
+    ('height', 'i'),
+)
+
+# 항상 저장하는 필수 컬럼
+REQUIRED_COLUMNS = {'t_ms', 'x', 'y', 'pointer_type', 'buttons'}
+
+_HEADER = struct.Struct('<2sBHI')
+_STR_LEN = struct.Struct('<H')
+
+
+def _to_le_bytes(values, typecode):
+    """
+    값 배열을 리틀 엔디언 바이트로 변환
+
+    Args:
+        values (list): 숫자 배열
+        typecode (str): array typecode
+
+    Returns:
+        bytes: 직렬화된 바이트
+    """
+    arr = array(typecode, values)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le_bytes(data, typecode):
+    """
+    리틀 엔디언 바이트를 array로 복원
+
+    Args:
+        data (bytes | memoryview): 직렬화된 바이트
+        typecode (str): array typecode
+
+    Returns:
+        array: 복원된 배열
+    """
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+def pack_columns(columns, count):
+    """
+    컬럼별 값 배열을 packed 바이너리로 직렬화
+
+    Args:
+        columns (dict): {필드명: 길이 count의 시퀀스} - 없는 필드는 전부 NULL로 간주
+        count (int): 포인트 수
+
+    Returns:
+        bytes: packed 바이너리
+    """
+    # pointer_type 문자열 테이블 (보통 'pen' 하나)
+    type_table = []
+    type_index = {}
+    type_codes = []
+    for pointer_type in columns.get('pointer_type') or [None] * count:
+        pointer_type = pointer_type or 'pen'
+        if pointer_type not in type_index:
+            type_index[pointer_type] = len(type_table)
+            type_table.append(pointer_type)
+        type_codes.append(type_index[pointer_type])
+
+    flags = 0
+    body = []
+    for bit, (name, typecode) in enumerate(COLUMN_SPECS):
+        if name == 'pointer_type':
+            values = type_codes
+        else:
+            raw = columns.get(name) or [None] * count
+            # 전부 NULL인 선택 컬럼은 저장하지 않음
+            if name not in REQUIRED_COLUMNS and all(v is None for v in raw):
+                continue
+            if typecode == 'f':
+                values = [math.nan if v is None else float(v) for v in raw]
+            else:
+                values = [NULL_INT if v is None else int(v) for v in raw]
+        flags |= 1 << bit
+        body.append(_to_le_bytes(values, typecode))
+
+    type_bytes = ','.join(type_table).encode('utf-8')
+    return b''.join([
+        _HEADER.pack(MAGIC, VERSION, flags, count),
+        _STR_LEN.pack(len(type_bytes)),
+        type_bytes,
+        *body,
+    ])
+
+
+def pack_points(points):
+    """
+    포인트 dict 배열을 packed 바이너리로 직렬화
+
+    Args:
+        points (list): 포인트 dict 배열 (StrokePoint 필드명 사용)
+            [{"t_ms": 0, "x": 10, "y": 20, "pressure": 0.5, "pointer_type": "pen", ...}, ...]
+
+    Returns:
+        bytes: packed 바이너리
+    """
+    columns = {
+        name: [point.get(name) for point in points]
+        for name, _ in COLUMN_SPECS
+    }
+    return pack_columns(columns, len(points))
+
+
+def unpack_columns(blob):
+    """
+    packed 바이너리를 컬럼별 배열 dict로 복원
+
+    Args:
+        blob (bytes | memoryview): pack_points()로 만든 바이너리
+
+    Returns:
+        dict: {필드명: list} - 저장되지 않은 선택 컬럼은 None으로 채운 리스트
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    view = memoryview(blob)
+    magic, version, flags, count = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("지원하지 않는 packed 포인트 형식입니다.")
+
+    offset = _HEADER.size
+    (type_len,) = _STR_LEN.unpack_from(view, offset)
+    offset += _STR_LEN.size
+    type_table = bytes(view[offset:offset + type_len]).decode('utf-8').split(',')
+    offset += type_len
+
+    columns = {}
+    for bit, (name, typecode) in enumerate(COLUMN_SPECS):
+        if not flags & (1 << bit):
+            columns[name] = [None] * count
+            continue
+
+        size = array(typecode).itemsize * count
+        arr = _from_le_bytes(view[offset:offset + size], typecode)
+        offset += size
+
+        if name == 'pointer_type':
+            columns[name] = [type_table[code] for code in arr]
+        elif typecode == 'f':
+            columns[name] = [None if math.isnan(v) else v for v in arr]
+        else:
+            columns[name] = [None if v == NULL_INT else v for v in arr]
+
+    return columns
+
+
+def unpack_points(blob):
+    """
+    packed 바이너리를 포인트 dict 배열로 복원 (StrokePoint 행과 같은 형태)
+
+    Args:
+        blob (bytes | memoryview): pack_points()로 만든 바이너리
+
+    Returns:
+        list: [{"idx": 0, "t_ms": 0, "x": 10, "y": 20, ...}, ...]
+    """
+    columns = unpack_columns(blob)
+    names = [name for name, _ in COLUMN_SPECS]
+    count = len(columns['t_ms'])
+    return [
+        {'idx': idx, **{name: columns[name][idx] for name in names}}
+        for idx in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# LOD(level-of-detail) 컨테이너 - Stroke.lod_packed
+#
+#   magic(2B 'LD') | version(1B) | level 수(1B) | level별 길이(4B × level 수)
+#   | level 1 packed 바이너리 | level 2 ... (tolerance가 작은 순 = 세밀한 순)
+#
+# 각 level은 단순화된 포인트만 담은 pack_columns() 바이너리입니다 (api.simplify 참고).
+# ---------------------------------------------------------------------------
+
+LOD_MAGIC = b'LD'
+LOD_VERSION = 1
+
+_LOD_HEADER = struct.Struct('<2sBB')
+_LOD_LEN = struct.Struct('<I')
+
+
+def pack_lod(levels):
+    """
+    level별 packed 바이너리를 LOD 컨테이너 하나로 직렬화
+
+    Args:
+        levels (list): pack_columns() 바이너리 배열 (세밀한 level부터)
+
+    Returns:
+        bytes: LOD 컨테이너
+    """
+    return b''.join([
+        _LOD_HEADER.pack(LOD_MAGIC, LOD_VERSION, len(levels)),
+        *(_LOD_LEN.pack(len(level)) for level in levels),
+        *levels,
+    ])
+
+
+def unpack_lod_points(blob, lod):
+    """
+    LOD 컨테이너에서 한 level의 포인트 dict 배열 복원
+
+    Args:
+        blob (bytes | memoryview): pack_lod()로 만든 바이너리
+        lod (int): 1부터 시작하는 level (저장된 level 수보다 크면 가장 거친 level)
+
+    Returns:
+        list: unpack_points()와 같은 형태의 포인트 dict 배열
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    view = memoryview(blob)
+    magic, version, level_count = _LOD_HEADER.unpack_from(view, 0)
+    if magic != LOD_MAGIC or version != LOD_VERSION or level_count == 0:
+        raise ValueError("지원하지 않는 LOD 형식입니다.")
+
+    lengths = [
+        _LOD_LEN.unpack_from(view, _LOD_HEADER.size + i * _LOD_LEN.size)[0]
+        for i in range(level_count)
+    ]
+    level = min(max(lod, 1), level_count)
+    offset = _LOD_HEADER.size + level_count * _LOD_LEN.size + sum(lengths[:level - 1])
+    return unpack_points(view[offset:offset + lengths[level - 1]])
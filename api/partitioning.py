@@ -0,0 +1,312 @@
+"""
+stroke_points / events 월별 파티션 관리 (PostgreSQL 전용)
+
+두 테이블은 recorded_on(적재일, DATE) 기준 RANGE 파티션 테이블입니다.
+
+    stroke_points                  (부모, 데이터 없음)
+    ├── stroke_points_legacy       MINVALUE ~ 파티션 전환 다음 달 1일 (전환 전 데이터)
+    ├── stroke_points_p202611      2026-11-01 ~ 2026-12-01
+    ├── stroke_points_p202612      ...
+    └── stroke_points_default      범위 밖 행 (미리 만든 파티션이 없을 때의 안전망)
+
+- ORM / COPY 적재는 부모 테이블에 그대로 INSERT하며 PostgreSQL이 파티션으로 보냅니다.
+- 세션 단위 조회는 파티션 키를 모르므로 파티션별 인덱스를 각각 탐색합니다
+  (파티션 수 = 보존 개월 수 정도로 유지).
+- 오래된 달은 DELETE 대신 파티션을 DETACH / DROP하여 즉시 정리합니다.
+  세션(sessions)과 스트로크(strokes) 요약 행은 남고 포인트/이벤트 원본만 지워지며,
+  원본은 S3 백업에 남아 있습니다.
+
+SQLite 등 다른 DB에서는 일반 테이블이며 이 모듈의 함수는 아무것도 하지 않습니다.
+"""
+
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+# 파티션 테이블 → 파티션 키 컬럼
+PARTITIONED_TABLES = {
+    'stroke_points': 'recorded_on',
+    'events': 'recorded_on',
+}
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def is_partitioning_supported():
+    """
+    파티션 관리 가능 여부 (PostgreSQL인 경우만)
+
+    Returns:
+        bool
+    """
+    return connection.vendor == 'postgresql'
+
+
+def get_months_ahead():
+    """
+    미리 만들어 둘 미래 월 파티션 수
+
+    Returns:
+        int: settings.PARTITION_MONTHS_AHEAD (기본 3)
+    """
+    return getattr(settings, 'PARTITION_MONTHS_AHEAD', 3)
+
+
+def get_retention_months():
+    """
+    파티션을 보존할 개월 수
+
+    Returns:
+        int: settings.PARTITION_RETENTION_MONTHS (기본 0 = 정리하지 않음)
+    """
+    return getattr(settings, 'PARTITION_RETENTION_MONTHS', 0)
+
+
+def month_start(day):
+    """해당 날짜가 속한 달의 1일"""
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    """
+    월 단위 덧셈 (1일 기준)
+
+    Args:
+        day (date): 기준 날짜
+        months (int): 더할 개월 수 (음수 가능)
+
+    Returns:
+        date: 결과 달의 1일
+    """
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, start):
+    """
+    월 파티션 테이블 이름
+
+    Args:
+        table (str): 부모 테이블명
+        start (date): 파티션 시작일 (1일)
+
+    Returns:
+        str: 예) stroke_points_p202611
+    """
+    return f"{table}_p{start:%Y%m}"
+
+
+def _parse_bound(value):
+    """파티션 경계 표현식의 값 하나를 date로 변환 (MINVALUE/MAXVALUE는 None)"""
+    value = value.strip()
+    if value in ('MINVALUE', 'MAXVALUE'):
+        return None
+    return date.fromisoformat(value.strip("'"))
+
+
+def is_partitioned(table):
+    """
+    테이블이 파티션 테이블인지 확인
+
+    Args:
+        table (str): 테이블명
+
+    Returns:
+        bool
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table):
+    """
+    파티션 목록과 범위 / 크기 조회
+
+    Args:
+        table (str): 부모 테이블명
+
+    Returns:
+        list: [{"name", "default", "start", "end", "bytes", "rows"}] (start 순)
+            start / end는 date (MINVALUE/MAXVALUE면 None), rows는 통계 기반 추정치
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+                   pg_total_relation_size(c.oid), c.reltuples::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s AND pg_table_is_visible(p.oid)
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound, size, tuples in rows:
+        match = _BOUND_RE.search(bound or '')
+        partitions.append({
+            "name": name,
+            "default": bound == 'DEFAULT',
+            "start": _parse_bound(match.group(1)) if match else None,
+            "end": _parse_bound(match.group(2)) if match else None,
+            "bytes": size,
+            "rows": max(tuples, 0),
+        })
+    partitions.sort(key=lambda p: (p["default"], p["start"] or date.min))
+    return partitions
+
+
+def _covers(partitions, start, end):
+    """[start, end) 범위와 겹치는 (default가 아닌) 파티션이 있는지 확인"""
+    for p in partitions:
+        if p["default"]:
+            continue
+        p_start = p["start"] or date.min
+        p_end = p["end"] or date.max
+        if p_start < end and start < p_end:
+            return True
+    return False
+
+
+def create_month_partition(table, start):
+    """
+    월 파티션 하나 생성
+
+    default 파티션에 이미 해당 달의 행이 있으면 (미리 만들지 못한 경우)
+    같은 트랜잭션 안에서 새 파티션으로 옮긴 뒤 붙입니다.
+
+    Args:
+        table (str): 부모 테이블명
+        start (date): 파티션 시작일 (1일)
+
+    Returns:
+        str: 생성한 파티션 이름
+    """
+    key = PARTITIONED_TABLES[table]
+    end = add_months(start, 1)
+    name = partition_name(table, start)
+    default_name = f"{table}_default"
+    qn = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {qn(default_name)} WHERE {qn(key)} >= %s AND {qn(key)} < %s)",
+            [start, end],
+        )
+        if cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {qn(default_name)} "
+                f"WHERE {qn(key)} >= %s AND {qn(key)} < %s RETURNING *) "
+                f"INSERT INTO {qn(name)} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+        else:
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+    return name
+
+
+def ensure_partitions(table, months_ahead=None, today=None):
+    """
+    이번 달부터 months_ahead개월 뒤까지의 월 파티션과 default 파티션 생성
+
+    이미 다른 파티션(legacy 등)이 덮고 있는 달은 건너뜁니다.
+
+    Args:
+        table (str): 부모 테이블명
+        months_ahead (int, optional): 미리 만들 미래 월 수 (None이면 설정값)
+        today (date, optional): 기준 날짜 (None이면 오늘)
+
+    Returns:
+        list: 새로 만든 파티션 이름 배열
+    """
+    months_ahead = get_months_ahead() if months_ahead is None else months_ahead
+    today = today or timezone.localdate()
+    qn = connection.ops.quote_name
+
+    created = []
+    partitions = list_partitions(table)
+    if not any(p["default"] for p in partitions):
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+        created.append(f"{table}_default")
+
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if _covers(partitions, start, add_months(start, 1)):
+            continue
+        created.append(create_month_partition(table, start))
+    return created
+
+
+def expired_partitions(table, retention_months, today=None):
+    """
+    보존 기간이 지난 파티션 목록 (범위 끝이 기준 월 이전인 것)
+
+    Args:
+        table (str): 부모 테이블명
+        retention_months (int): 보존 개월 수 (이번 달 포함)
+        today (date, optional): 기준 날짜 (None이면 오늘)
+
+    Returns:
+        list: list_partitions() 항목 배열
+    """
+    today = today or timezone.localdate()
+    return partitions_ending_by(table, add_months(month_start(today), -(retention_months - 1)))
+
+
+def partitions_ending_by(table, cutoff):
+    """
+    범위 끝이 cutoff 이전인 파티션 목록 (모든 행의 recorded_on < cutoff)
+
+    Args:
+        table (str): 부모 테이블명
+        cutoff (date): 기준 날짜
+
+    Returns:
+        list: list_partitions() 항목 배열
+    """
+    return [
+        p for p in list_partitions(table)
+        if not p["default"] and p["end"] is not None and p["end"] <= cutoff
+    ]
+
+
+def detach_partition(table, name, drop=False):
+    """
+    파티션을 부모 테이블에서 분리 (drop=True면 삭제까지)
+
+    분리된 테이블은 일반 테이블로 남으므로 보관/덤프 후 직접 DROP할 수 있습니다.
+
+    Args:
+        table (str): 부모 테이블명
+        name (str): 파티션 이름
+        drop (bool): 분리 후 DROP TABLE 여부
+    """
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+
@@ -0,0 +1,226 @@
+"""
+저장된 스트로크 포인트 조회(replay) API
+
+포인트가 stroke_points 행으로 저장되었든 Stroke.points_packed 바이너리로
+저장되었든, 호출하는 쪽은 항상 같은 포인트 dict 형태를 받습니다.
+
+lod(level-of-detail)를 1 이상으로 지정하면 Stroke.lod_packed의 RDP 단순화 포인트를
+스트로크 행에서 바로 복원하므로 stroke_points를 읽지 않습니다 (api.simplify).
+LOD가 없는 스트로크(포인트가 적거나 LOD 도입 전 적재)는 원본을 돌려줍니다.
+"""
+
+from api.event_types import get_event_type_name
+from api.models import Event, Stroke, StrokePoint
+from api.packing import unpack_lod_points, unpack_points
+from api.wire import dequantize_pressure
+
+# 포인트 하나를 표현하는 dict의 키 (decode_stroke_columns() / packed 컬럼명과 동일)
+POINT_FIELDS = (
+    'idx', 't_ms', 'x', 'y', 'pressure', 'tilt_x', 'tilt_y', 'twist',
+    'pointer_type', 'pointer_id', 'buttons', 'width', 'height',
+)
+
+# stroke_points에서 읽는 컬럼 (pressure는 양자화 정수, pointer_type은 스트로크 단위로 저장)
+ROW_FIELDS = (
+    'idx', 't_ms', 'x', 'y', 'pressure_q', 'tilt_x', 'tilt_y', 'twist',
+    'pointer_id', 'buttons', 'width', 'height',
+)
+
+
+def _row_to_point(row, pointer_type):
+    """
+    stroke_points 행(values_list 튜플)을 POINT_FIELDS 형태의 dict로 변환
+
+    Args:
+        row (tuple): ROW_FIELDS 순서의 값
+        pointer_type (str): 소속 스트로크의 pointer_type
+
+    Returns:
+        dict: 포인트 dict
+    """
+    idx, t_ms, x, y, pressure_q, tilt_x, tilt_y, twist, pointer_id, buttons, width, height = row
+    return {
+        'idx': idx, 't_ms': t_ms, 'x': x, 'y': y,
+        'pressure': dequantize_pressure(pressure_q),
+        'tilt_x': tilt_x, 'tilt_y': tilt_y, 'twist': twist,
+        'pointer_type': pointer_type, 'pointer_id': pointer_id,
+        'buttons': buttons, 'width': width, 'height': height,
+    }
+
+
+def load_stroke_points(stroke, lod=0):
+    """
+    스트로크 한 개의 포인트 배열 조회
+
+    packed 바이너리가 있으면 스트로크 행 하나만으로 복원하고,
+    없으면 stroke_points에서 idx 순으로 읽습니다.
+
+    Args:
+        stroke (Stroke): 스트로크 객체
+        lod (int): 0이면 원본, 1 이상이면 해당 LOD level
+
+    Returns:
+        list: [{"idx": 0, "t_ms": 0, "x": 10, "y": 20, ...}, ...] (idx 오름차순)
+    """
+    if lod and stroke.lod_packed is not None:
+        return unpack_lod_points(stroke.lod_packed, lod)
+    if stroke.points_packed is not None:
+        return unpack_points(stroke.points_packed)
+
+    rows = (
+        StrokePoint.objects
+        .filter(stroke_id=stroke.pk)
+        .order_by('idx')
+        .values_list(*ROW_FIELDS)
+    )
+    return [_row_to_point(row, stroke.pointer_type) for row in rows]
+
+
+def load_session_strokes(session_id, lod=0):
+    """
+    세션의 모든 스트로크와 포인트 조회 (시작 시각 순)
+
+    행으로 저장된 스트로크의 포인트는 스트로크마다 쿼리하지 않고
+    한 번의 쿼리로 가져와 스트로크별로 나눕니다.
+    lod를 지정하면 사용하지 않는 원본 packed 컬럼은 읽지 않습니다 (반대도 마찬가지).
+
+    Args:
+        session_id (UUID): 세션 UUID
+        lod (int): 0이면 원본, 1 이상이면 해당 LOD level
+
+    Returns:
+        list: [(stroke, points), ...] - points는 load_stroke_points()와 같은 형태
+    """
+    strokes = Stroke.objects.filter(session_id=session_id).order_by('start_ms')
+    strokes = list(strokes.defer('points_packed') if lod else strokes.defer('lod_packed'))
+
+    points_by_stroke = {}
+    if lod:
+        for stroke in strokes:
+            if stroke.lod_packed is not None:
+                points_by_stroke[stroke.pk] = unpack_lod_points(stroke.lod_packed, lod)
+        # LOD가 없는 스트로크만 원본 packed를 한 번에 조회
+        remaining = [stroke for stroke in strokes if stroke.pk not in points_by_stroke]
+        packed = dict(
+            Stroke.objects
+            .filter(pk__in=[stroke.pk for stroke in remaining], points_packed__isnull=False)
+            .values_list('pk', 'points_packed')
+        ) if remaining else {}
+    else:
+        remaining = strokes
+        packed = {stroke.pk: stroke.points_packed for stroke in strokes if stroke.points_packed is not None}
+    for stroke_id, blob in packed.items():
+        points_by_stroke[stroke_id] = unpack_points(blob)
+
+    # packed도 없는 스트로크의 포인트만 stroke_points에서 한 번에 조회
+    pointer_types = {stroke.pk: stroke.pointer_type for stroke in remaining if stroke.pk not in packed}
+    if pointer_types:
+        for stroke_id in pointer_types:
+            points_by_stroke[stroke_id] = []
+        rows = (
+            StrokePoint.objects
+            .filter(stroke_id__in=list(pointer_types))
+            .order_by('stroke_id', 'idx')
+            .values_list('stroke_id', *ROW_FIELDS)
+        )
+        for stroke_id, *row in rows:
+            points_by_stroke[stroke_id].append(_row_to_point(row, pointer_types[stroke_id]))
+
+    return [(stroke, points_by_stroke.get(stroke.pk, [])) for stroke in strokes]
+
+
+def stroke_to_payload(stroke, points):
+    """
+    저장된 스트로크를 프론트엔드 canvasData.strokes 형식(v1)으로 변환
+
+    포인트 timestamp는 저장 시 뺀 스트로크 시작 시각을 다시 더해
+    세션 기준 ms로 되돌립니다.
+
+    Args:
+        stroke (Stroke): 스트로크 객체
+        points (list): load_stroke_points() 형태의 포인트 배열
+
+    Returns:
+        dict: {"id", "tool", "color", "strokeWidth", "startTime", "endTime", "points": [...], ...}
+    """
+    return {
+        "id": stroke.client_id or str(stroke.stroke_uuid),
+        "tool": stroke.tool,
+        "color": stroke.color,
+        "strokeWidth": stroke.stroke_width,
+        "startTime": stroke.start_ms,
+        "endTime": stroke.end_ms,
+        "pointerType": stroke.pointer_type,
+        "coalesced": stroke.is_coalesced,
+        "totalDistance": stroke.total_distance_px,
+        "averageSpeed": stroke.average_speed_pxps,
+        "averagePressure": stroke.average_pressure,
+        "points": [
+            {
+                "x": p['x'],
+                "y": p['y'],
+                "timestamp": p['t_ms'] + stroke.start_ms,
+                "pressure": p['pressure'],
+                "tiltX": p['tilt_x'],
+                "tiltY": p['tilt_y'],
+                "twist": p['twist'],
+                "pointerType": p['pointer_type'],
+                "pointerId": p['pointer_id'],
+                "buttons": p['buttons'],
+                "width": p['width'],
+                "height": p['height'],
+            }
+            for p in points
+        ],
+    }
+
+
+def export_canvas_data(session_id, lod=0):
+    """
+    DB에 저장된 세션을 프론트엔드 canvasData 형식으로 재구성
+
+    분할 업로드된 세션의 S3 백업 / Mathpix 변환 / 세션 replay API에 사용합니다.
+
+    Args:
+        session_id (UUID): 세션 UUID
+        lod (int): 0이면 원본, 1 이상이면 해당 LOD level (S3 백업은 항상 0)
+
+    Returns:
+        dict: {"strokes": [...], "events": [...]}
+    """
+    strokes = [
+        stroke_to_payload(stroke, points) for stroke, points in load_session_strokes(session_id, lod)
+    ]
+    events = []
+    for type_id, ts_ms, details, end_ts_ms, sample_count in (
+        Event.objects.filter(session_id=session_id)
+        .order_by('ts_ms', 'id')
+        .values_list('type_id', 'ts_ms', 'details', 'end_ts_ms', 'sample_count')
+    ):
+        event = {"type": get_event_type_name(type_id), "timestamp": ts_ms, "details": details}
+        if end_ts_ms is not None:
+            # 병합된 zoom / pan 구간 이벤트 (api.event_coalescing)
+            event["endTimestamp"] = end_ts_ms
+            event["count"] = sample_count
+        events.append(event)
+    return {"strokes": strokes, "events": events}
+
+
+def export_visible_strokes(session_id, stroke_ids=None):
+    """
+    세션의 스트로크 중 지정한 id만 프론트엔드 형식으로 재구성 (Mathpix 전송용)
+
+    Args:
+        session_id (UUID): 세션 UUID
+        stroke_ids (iterable, optional): 포함할 stroke id (None이면 전체)
+
+    Returns:
+        list: canvasData.strokes 형식의 배열 (시작 시각 순)
+    """
+    if stroke_ids is not None:
+        stroke_ids = {str(stroke_id) for stroke_id in stroke_ids}
+    return [
+        stroke_to_payload(stroke, points)
+        for stroke, points in load_session_strokes(session_id)
+        if stroke_ids is None or (stroke.client_id or str(stroke.stroke_uuid)) in stroke_ids
+    ]
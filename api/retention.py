@@ -0,0 +1,328 @@
+"""
+세션 보존 기간(retention) 관리
+
+Session.delete()는 Django의 on_delete=CASCADE collector를 거치므로 스트로크/포인트/이벤트를
+파이썬으로 읽어 들인 뒤 지웁니다. 이 모듈은 만료된 세션을 배치로 골라
+테이블마다 DELETE ... WHERE session_id IN (...) 한 번씩만 실행합니다.
+
+- 보존 기간: Session.created_at(서버 수신 시각)이 RETENTION_DAYS일보다 오래된 세션
+- 요약 유지(RETENTION_KEEP_SUMMARY=True, 기본값):
+    stroke_points / events 원본과 strokes.points_packed / lod_packed만 지우고 sessions / strokes 요약 행은
+    남긴 뒤 Session.raw_purged_at을 기록합니다.
+- 요약 미유지: 세션과 모든 하위 행(strokes, session_chunks, submission_receipts)까지 삭제합니다.
+- PostgreSQL 파티션(api.partitioning): 범위 전체가 기준일 이전인 stroke_points / events 파티션은
+  행 단위 삭제 대신 통째로 DROP(또는 DETACH하여 보관)합니다. 세션의 created_at은 항상 그 세션의
+  포인트/이벤트 적재 이전 시각이므로(recorded_on >= created_at - 세션 행을 마지막에 만드는 스트리밍 경로도
+  created_at은 수신 시각으로 기록) 이 파티션의 행은 모두 만료 세션의 것입니다.
+
+백업이 확인된 세션만 정리합니다. 세션별 JSON 백업(ARCHIVE_FORMAT 'json' / 'both')은 archived_at,
+Parquet 샤드만 쓰는 경우('parquet')는 shard가 채워진 세션이 대상이며, 백업되지 않은 만료 세션은
+reconcile_archives / build_archive_shards가 백업할 때까지 원본을 남겨 둡니다. 파티션도 범위 안에
+백업되지 않은 세션이 있으면 DROP / DETACH하지 않습니다. 실패 확정된 백업 / 적재 작업은 원본의
+유일한 사본(gzip 본문, 요청 본문)일 수 있으므로 운영자가 처리할 때까지 삭제하지 않습니다.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from api.archive import is_json_archive_enabled
+from api.models import (
+    ArchiveJob, Event, IngestJob, Session, SessionChunk, Stroke, StrokePoint, SubmissionReceipt, VerificationJob,
+)
+from api.partitioning import (
+    PARTITIONED_TABLES, detach_partition, is_partitioned, is_partitioning_supported,
+    partitions_ending_by,
+)
+
+PARTITION_ACTIONS = ('drop', 'detach', 'none')
+
+
+def get_retention_days():
+    """
+    세션 보존 일수
+
+    Returns:
+        int: settings.RETENTION_DAYS (기본 0 = 정리하지 않음)
+    """
+    return getattr(settings, 'RETENTION_DAYS', 0)
+
+
+def get_keep_summary():
+    """
+    만료 세션의 요약 행(sessions / strokes) 유지 여부
+
+    Returns:
+        bool: settings.RETENTION_KEEP_SUMMARY (기본 True)
+    """
+    return getattr(settings, 'RETENTION_KEEP_SUMMARY', True)
+
+
+def get_partition_action():
+    """
+    만료된 파티션 처리 방식
+
+    Returns:
+        str: 'drop' | 'detach' | 'none' (settings.RETENTION_PARTITION_ACTION, 기본 'drop')
+
+    Raises:
+        ValueError: 알 수 없는 처리 방식인 경우
+    """
+    action = getattr(settings, 'RETENTION_PARTITION_ACTION', 'drop')
+    if action not in PARTITION_ACTIONS:
+        raise ValueError(f"알 수 없는 파티션 처리 방식입니다: {action}")
+    return action
+
+
+def get_cutoff(days, now=None):
+    """
+    보존 기준 시각 (이 시각 이전에 수신된 세션이 만료 대상)
+
+    Args:
+        days (int): 보존 일수
+        now (datetime, optional): 현재 시각
+
+    Returns:
+        datetime
+    """
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def archived_condition():
+    """
+    백업이 확인된 세션 조건
+
+    Returns:
+        Q: 세션별 JSON 백업을 쓰면 archived_at, Parquet 샤드만 쓰면 shard가 있는 세션
+    """
+    if is_json_archive_enabled():
+        return Q(archived_at__isnull=False)
+    return Q(shard__isnull=False)
+
+
+def expired_sessions(cutoff, keep_summary):
+    """
+    만료 세션 QuerySet (백업이 확인된 세션만)
+
+    Args:
+        cutoff (datetime): 이 시각 이전에 수신된 세션이 대상
+        keep_summary (bool): True면 원본을 아직 지우지 않은 세션만
+
+    Returns:
+        QuerySet: Session
+    """
+    sessions = Session.objects.filter(archived_condition(), created_at__lt=cutoff)
+    if keep_summary:
+        sessions = sessions.filter(raw_purged_at__isnull=True)
+    return sessions
+
+
+def unarchived_sessions(cutoff):
+    """
+    백업되지 않아 정리를 미룬 세션 (원본이 남아 있는 것만)
+
+    Args:
+        cutoff (datetime): 이 시각 이전에 수신된 세션이 대상
+
+    Returns:
+        QuerySet: Session
+    """
+    return Session.objects.filter(created_at__lt=cutoff, raw_purged_at__isnull=True).exclude(archived_condition())
+
+
+def _delete_where_in(model, field, values):
+    """
+    DELETE FROM <table> WHERE <field> IN (values) 한 번 실행 (collector / 시그널 없이)
+
+    values에는 값 배열 또는 서브쿼리(QuerySet.values('pk'))를 넘길 수 있습니다.
+
+    Returns:
+        int: 삭제된 행 수
+    """
+    queryset = model.objects.filter(**{f"{field}__in": values})
+    return queryset._raw_delete(queryset.db)
+
+
+def purge_session_batch(session_ids, keep_summary):
+    """
+    세션 한 배치의 원본(또는 전체) 행을 테이블별 일괄 DELETE로 삭제
+
+    Args:
+        session_ids (list): 세션 UUID 배열
+        keep_summary (bool): True면 sessions / strokes 행은 남김
+
+    Returns:
+        dict: 테이블명 → 삭제(요약 유지 시 갱신 포함)된 행 수
+    """
+    counts = {}
+    with transaction.atomic():
+        # stroke_points에는 session 인덱스가 없으므로 스트로크 id로 삭제
+        counts['stroke_points'] = _delete_where_in(
+            StrokePoint, 'stroke_id', Stroke.objects.filter(session_id__in=session_ids).values('pk')
+        )
+        counts['events'] = _delete_where_in(Event, 'session_id', session_ids)
+        if keep_summary:
+            Stroke.objects.filter(
+                Q(points_packed__isnull=False) | Q(lod_packed__isnull=False), session_id__in=session_ids
+            ).update(points_packed=None, lod_packed=None)
+            counts['sessions'] = Session.objects.filter(pk__in=session_ids).update(raw_purged_at=timezone.now())
+        else:
+            counts['strokes'] = _delete_where_in(Stroke, 'session_id', session_ids)
+            counts['session_chunks'] = _delete_where_in(SessionChunk, 'session_id', session_ids)
+            counts['submission_receipts'] = _delete_where_in(SubmissionReceipt, 'session_uuid', session_ids)
+            counts['sessions'] = _delete_where_in(Session, 'session_uuid', session_ids)
+    return counts
+
+
+def drop_expired_partitions(cutoff, action):
+    """
+    범위 전체가 기준일 이전인 stroke_points / events 파티션 DROP / DETACH
+
+    파티션 범위 끝 이전에 수신된 세션 중 백업되지 않은 세션이 있으면 그 파티션은 남겨 둡니다
+    (세션의 포인트/이벤트가 어느 파티션에 있는지는 recorded_on >= created_at만 알 수 있으므로
+    범위 끝 이전의 모든 세션을 확인). DETACH도 부모 테이블에서 행이 빠져 reconcile_archives가
+    원본 없이 백업을 재구성하게 되므로 같은 기준을 적용합니다.
+
+    Args:
+        cutoff (datetime): 보존 기준 시각
+        action (str): 'drop' | 'detach' | 'none'
+
+    Returns:
+        list: [{"table", "name", "rows"}] (rows는 통계 기반 추정치)
+    """
+    if action == 'none' or not is_partitioning_supported():
+        return []
+
+    removed = []
+    cutoff_date = timezone.localdate(cutoff)
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table):
+            continue
+        for partition in partitions_ending_by(table, cutoff_date):
+            # recorded_on은 적재 시각의 로컬 날짜이므로 범위 끝도 로컬 자정으로 비교
+            end = timezone.make_aware(datetime.combine(partition['end'], datetime.min.time()))
+            pending = unarchived_sessions(end).count()
+            if pending:
+                print(
+                    f"[retention] 파티션 {partition['name']} 유지 - 범위 안에 백업되지 않은 세션 {pending}개 "
+                    f"(reconcile_archives / build_archive_shards 후 다시 실행)"
+                )
+                continue
+            detach_partition(table, partition['name'], drop=(action == 'drop'))
+            removed.append({"table": table, "name": partition['name'], "rows": partition['rows']})
+    return removed
+
+
+def purge_stale_records(cutoff):
+    """
+    기준 시각 이전의 처리 완료된 적재 / 백업 / 검증 작업(원본 본문 포함)과 제출 영수증 삭제
+
+    실패 확정된 적재 / 백업 작업은 요청 본문 / gzip 백업의 유일한 사본일 수 있으므로 남겨 둡니다
+    (reconcile_archives --retry-failed로 다시 시도하거나 운영자가 확인 후 직접 삭제).
+
+    Args:
+        cutoff (datetime): 보존 기준 시각
+
+    Returns:
+        dict: 테이블명 → 삭제된 행 수
+    """
+    finished = IngestJob.objects.filter(status=IngestJob.STATUS_DONE, created_at__lt=cutoff)
+    archived = ArchiveJob.objects.filter(status=ArchiveJob.STATUS_DONE, created_at__lt=cutoff)
+    verified = VerificationJob.objects.filter(
+        Q(status=VerificationJob.STATUS_DONE) | Q(status=VerificationJob.STATUS_FAILED),
+        created_at__lt=cutoff,
+    )
+    receipts = SubmissionReceipt.objects.filter(created_at__lt=cutoff)
+    return {
+        'ingest_jobs': finished._raw_delete(finished.db),
+        'archive_jobs': archived._raw_delete(archived.db),
+        'verification_jobs': verified._raw_delete(verified.db),
+        'submission_receipts': receipts._raw_delete(receipts.db),
+    }
+
+
+def estimate_purge(cutoff, keep_summary):
+    """
+    정리 대상 규모 (dry-run용)
+
+    Returns:
+        dict: {"sessions", "points", "unarchived"} - points는 Session.point_count 합계,
+            unarchived는 백업되지 않아 이번에 정리하지 않을 세션 수
+    """
+    agg = expired_sessions(cutoff, keep_summary).aggregate(points=Sum('point_count'))
+    return {
+        "sessions": expired_sessions(cutoff, keep_summary).count(),
+        "points": agg['points'] or 0,
+        "unarchived": unarchived_sessions(cutoff).count(),
+    }
+
+
+def run_retention(days=None, keep_summary=None, partition_action=None,
+                  batch_size=500, max_batches=None, on_batch=None, now=None):
+    """
+    보존 기간이 지난 세션 정리 실행
+
+    1. 범위 전체가 만료되고 백업되지 않은 세션이 없는 파티션 DROP / DETACH (PostgreSQL)
+    2. 백업이 확인된 만료 세션을 batch_size개씩 골라 purge_session_batch()
+    3. 오래된 적재 작업 / 제출 영수증 삭제
+
+    Args:
+        days (int, optional): 보존 일수 (None이면 settings.RETENTION_DAYS)
+        keep_summary (bool, optional): 요약 행 유지 여부 (None이면 설정값)
+        partition_action (str, optional): 'drop' | 'detach' | 'none' (None이면 설정값)
+        batch_size (int): 한 트랜잭션에서 정리할 세션 수
+        max_batches (int, optional): 최대 배치 수 (None이면 대상이 없을 때까지)
+        on_batch (callable, optional): on_batch(batch_no, session_count, counts, elapsed_sec)
+        now (datetime, optional): 기준 현재 시각
+
+    Returns:
+        dict: {"cutoff", "sessions", "batches", "rows": {테이블: 행 수}, "partitions", "unarchived", "elapsed_sec"}
+            unarchived는 백업되지 않아 정리하지 않은 만료 세션 수
+
+    Raises:
+        ValueError: 보존 일수가 1 미만인 경우
+    """
+    days = get_retention_days() if days is None else days
+    if days < 1:
+        raise ValueError("보존 일수(RETENTION_DAYS)가 설정되지 않았습니다.")
+    keep_summary = get_keep_summary() if keep_summary is None else keep_summary
+    partition_action = partition_action or get_partition_action()
+    cutoff = get_cutoff(days, now)
+
+    started = time.perf_counter()
+    report = {
+        "cutoff": cutoff,
+        "sessions": 0,
+        "batches": 0,
+        "rows": {},
+        "partitions": drop_expired_partitions(cutoff, partition_action),
+    }
+
+    while max_batches is None or report["batches"] < max_batches:
+        session_ids = list(
+            expired_sessions(cutoff, keep_summary)
+            .order_by('created_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not session_ids:
+            break
+
+        batch_started = time.perf_counter()
+        counts = purge_session_batch(session_ids, keep_summary)
+        report["batches"] += 1
+        report["sessions"] += len(session_ids)
+        for table, n in counts.items():
+            report["rows"][table] = report["rows"].get(table, 0) + n
+        if on_batch:
+            on_batch(report["batches"], len(session_ids), counts, time.perf_counter() - batch_started)
+
+    for table, n in purge_stale_records(cutoff).items():
+        report["rows"][table] = report["rows"].get(table, 0) + n
+    report["unarchived"] = unarchived_sessions(cutoff).count()
+
+    report["elapsed_sec"] = time.perf_counter() - started
+    return report
@@ -0,0 +1,435 @@
+"""
+시간 구간별 Parquet 세션 샤드 (학습 파이프라인용 컬럼 저장소 백업)
+
+세션마다 answers/{problem_id}_{session_uuid}.json.gz 객체를 하나씩 만들면 객체 수가 수백만 개가 되어
+목록 조회와 학습용 로딩(세션당 GET 1회)이 느립니다. 이 모듈은 닫힌 시간 구간
+(ARCHIVE_SHARD_WINDOW_HOURS, UTC 기준)의 세션을 테이블별 Parquet 파일로 묶어 올립니다.
+
+    shards/2026/10/17/part-0001/sessions.parquet
+                                strokes.parquet
+                                points.parquet
+                                events.parquet
+                                manifest.json      ← 행 수 / 크기 / sha256 / 컬럼 / 세션 UUID 목록
+
+- 대상: is_finalized이고 아직 샤드에 들어가지 않은(Session.shard가 NULL) 세션 중, 구간이 끝난 지
+  ARCHIVE_SHARD_DELAY_MINUTES가 지난 것. 샤드를 만든 뒤 늦게 들어온 세션(분할 업로드 finalize 등)은
+  같은 구간의 다음 part로 들어갑니다.
+- 포인트는 저장 방식(stroke_points 행 / points_packed)과 무관하게 같은 컬럼으로 내보내며,
+  pressure는 0.0 ~ 1.0 실수로 복원합니다.
+- 세션 배치(--batch-size)마다 row group 하나씩 임시 파일에 쓰므로 구간 크기와 무관하게 메모리 사용량이 일정합니다.
+
+pyarrow가 설치된 경우에만 사용할 수 있습니다 (is_parquet_available()).
+"""
+
+import hashlib
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.event_types import get_event_type_name, get_event_type_names
+from api.models import ArchiveShard, Event, Session, Stroke, StrokePoint
+from api.packing import unpack_columns
+from api.wire import dequantize_pressure
+from core.storage import get_storage
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 샤드는 pyarrow 패키지가 설치된 경우에만 지원
+    pa = pq = None
+
+MANIFEST_VERSION = 1
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+
+# 테이블별 (컬럼명, 타입) - sessions / strokes는 모델 필드명과 같음
+SESSION_COLUMNS = (
+    ('session_uuid', 'string'), ('created_at', 'timestamp'),
+    ('start_time', 'timestamp'), ('end_time', 'timestamp'), ('duration_ms', 'int32'),
+    ('problem_id', 'int32'), ('category', 'int32'),
+    ('user_agent', 'string'), ('platform', 'string'), ('pixel_ratio', 'float64'),
+    ('screen_width', 'int32'), ('screen_height', 'int32'),
+    ('logical_width', 'int32'), ('logical_height', 'int32'), ('css_width', 'int32'), ('css_height', 'int32'),
+    ('zoom', 'float64'), ('pan_x', 'int32'), ('pan_y', 'int32'),
+    ('supports_pressure', 'bool'), ('supports_tilt', 'bool'),
+    ('supports_twist', 'bool'), ('supports_coalesced', 'bool'),
+    ('stroke_count', 'int32'), ('point_count', 'int32'),
+    ('total_distance_px', 'float64'), ('average_stroke_length_px', 'float64'),
+    ('average_speed_pxps', 'float64'), ('average_pressure', 'float64'),
+    ('undo_count', 'int32'), ('redo_count', 'int32'), ('eraser_count', 'int32'),
+    ('zoom_count', 'int32'), ('pan_count', 'int32'), ('tool_change_count', 'int32'),
+    ('answer', 'string'), ('is_correct', 'bool'), ('label', 'int16'),
+)
+
+STROKE_COLUMNS = (
+    ('stroke_uuid', 'string'), ('session_id', 'string'), ('client_id', 'string'),
+    ('tool', 'string'), ('color', 'string'), ('stroke_width', 'int32'),
+    ('start_ms', 'int32'), ('end_ms', 'int32'), ('pointer_type', 'string'), ('is_coalesced', 'bool'),
+    ('point_count', 'int32'), ('total_distance_px', 'float64'),
+    ('average_speed_pxps', 'float64'), ('max_speed_pxps', 'float64'),
+    ('average_acceleration_pxps2', 'float64'), ('average_pressure', 'float64'), ('pressure_std', 'float64'),
+    ('bbox_min_x', 'int32'), ('bbox_min_y', 'int32'), ('bbox_max_x', 'int32'), ('bbox_max_y', 'int32'),
+)
+
+POINT_COLUMNS = (
+    ('session_id', 'string'), ('stroke_id', 'string'), ('idx', 'int32'),
+    ('t_ms', 'int32'), ('x', 'int32'), ('y', 'int32'), ('pressure', 'float32'),
+    ('tilt_x', 'int32'), ('tilt_y', 'int32'), ('twist', 'int32'),
+    ('pointer_id', 'int32'), ('buttons', 'int32'), ('width', 'int32'), ('height', 'int32'),
+)
+
+EVENT_COLUMNS = (
+    ('session_id', 'string'), ('id', 'int64'), ('ts_ms', 'int32'), ('end_ts_ms', 'int32'),
+    ('sample_count', 'int32'), ('type', 'string'),
+    ('tool_prev', 'string'), ('tool_new', 'string'), ('x', 'float64'), ('y', 'float64'), ('zoom', 'float64'),
+    ('details', 'string'),  # 원본 details JSON 문자열
+)
+
+# stroke_points에서 읽는 컬럼 (POINT_COLUMNS의 stroke_id 이후, pressure는 양자화 정수)
+_POINT_ROW_FIELDS = (
+    'stroke_id', 'idx', 't_ms', 'x', 'y', 'pressure_q', 'tilt_x', 'tilt_y', 'twist',
+    'pointer_id', 'buttons', 'width', 'height',
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def is_parquet_available():
+    """
+    Parquet 샤드 사용 가능 여부
+
+    Returns:
+        bool: pyarrow 설치 여부
+    """
+    return pa is not None
+
+
+def get_window_hours():
+    """
+    샤드 시간 구간 길이(시간)
+
+    Returns:
+        int: settings.ARCHIVE_SHARD_WINDOW_HOURS (기본 24)
+    """
+    return getattr(settings, 'ARCHIVE_SHARD_WINDOW_HOURS', 24)
+
+
+def get_shard_delay():
+    """
+    구간이 끝난 뒤 샤드를 만들기까지 기다릴 시간 (처리 중인 제출 / 비동기 적재 대기)
+
+    Returns:
+        timedelta: settings.ARCHIVE_SHARD_DELAY_MINUTES (기본 30분)
+    """
+    return timedelta(minutes=getattr(settings, 'ARCHIVE_SHARD_DELAY_MINUTES', 30))
+
+
+def window_bounds(moment, window_hours=None):
+    """
+    시각이 속한 샤드 구간 (UTC epoch 기준으로 정렬)
+
+    Args:
+        moment (datetime): 시각 (timezone-aware)
+        window_hours (int, optional): 구간 길이 (None이면 설정값)
+
+    Returns:
+        tuple: (구간 시작, 구간 끝) - 끝은 포함하지 않음
+    """
+    window = timedelta(hours=window_hours or get_window_hours())
+    start = _EPOCH + ((moment - _EPOCH) // window) * window
+    return start, start + window
+
+
+def shard_prefix(window_start, part, window_hours=None):
+    """
+    샤드 객체 키 접두사
+
+    Returns:
+        str: shards/YYYY/MM/DD/[HH/]part-NNNN/ (구간이 하루보다 짧으면 시 단위 디렉터리 추가)
+    """
+    path = window_start.strftime('%Y/%m/%d')
+    if (window_hours or get_window_hours()) < 24:
+        path += window_start.strftime('/%H')
+    return f"shards/{path}/part-{part:04d}/"
+
+
+def pending_sessions(now=None):
+    """
+    샤드에 넣을 세션 (닫힌 구간의 finalize된 세션 중 아직 샤드에 없는 것)
+
+    Returns:
+        QuerySet: Session
+    """
+    now = now or timezone.now()
+    _, current_end = window_bounds(now - get_shard_delay())
+    return Session.objects.filter(
+        shard__isnull=True,
+        is_finalized=True,
+        created_at__lt=current_end - timedelta(hours=get_window_hours()),
+    )
+
+
+def _arrow_type(kind):
+    """컬럼 타입 이름 → pyarrow 타입"""
+    if kind == 'timestamp':
+        return pa.timestamp('ms', tz='UTC')
+    if kind == 'bool':
+        return pa.bool_()
+    return getattr(pa, kind)()
+
+
+def _schema(columns):
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in columns])
+
+
+class _TableWriter:
+    """테이블 하나를 임시 파일에 row group 단위로 쓰는 Parquet writer"""
+
+    def __init__(self, name, columns, compression):
+        self.name = name
+        self.columns = columns
+        self.schema = _schema(columns)
+        self.file = tempfile.TemporaryFile()
+        self.writer = pq.ParquetWriter(self.file, self.schema, compression=compression)
+        self.rows = 0
+
+    def write(self, data):
+        """
+        컬럼 dict 하나를 row group으로 추가
+
+        Args:
+            data (dict): {컬럼명: list} - columns의 모든 컬럼
+        """
+        count = len(data[self.columns[0][0]])
+        if not count:
+            return
+        self.writer.write_table(pa.Table.from_pydict(data, schema=self.schema))
+        self.rows += count
+
+    def finish(self):
+        """
+        파일을 닫고 크기 / sha256 계산
+
+        Returns:
+            dict: {"rows", "bytes", "sha256"}
+        """
+        self.writer.close()
+        digest = hashlib.sha256()
+        self.file.seek(0)
+        for block in iter(lambda: self.file.read(1024 * 1024), b''):
+            digest.update(block)
+        size = self.file.tell()
+        self.file.seek(0)
+        return {"rows": self.rows, "bytes": size, "sha256": digest.hexdigest()}
+
+    def close(self):
+        self.file.close()
+
+
+def _values(rows, columns, uuid_columns=()):
+    """values_list 튜플 배열 → 컬럼 dict (UUID 컬럼은 문자열로)"""
+    data = {name: list(values) for (name, _), values in zip(columns, zip(*rows))} if rows else {
+        name: [] for name, _ in columns
+    }
+    for name in uuid_columns:
+        data[name] = [None if value is None else str(value) for value in data[name]]
+    return data
+
+
+def _session_batch_tables(session_uuids):
+    """
+    세션 배치의 sessions / strokes / points / events 컬럼 dict
+
+    Returns:
+        tuple: (sessions, strokes, points, events) 컬럼 dict
+    """
+    session_rows = list(
+        Session.objects.filter(session_uuid__in=session_uuids)
+        .order_by('created_at', 'session_uuid')
+        .values_list(*[name for name, _ in SESSION_COLUMNS])
+    )
+    sessions = _values(session_rows, SESSION_COLUMNS, uuid_columns=('session_uuid',))
+
+    stroke_rows = list(
+        Stroke.objects.filter(session_id__in=session_uuids)
+        .order_by('session_id', 'start_ms')
+        .values_list(*[name for name, _ in STROKE_COLUMNS], 'points_packed')
+    )
+    strokes = _values([row[:-1] for row in stroke_rows], STROKE_COLUMNS, uuid_columns=('stroke_uuid', 'session_id'))
+
+    # 포인트: packed 바이너리가 있으면 복원, 없으면 stroke_points에서 한 번에 조회
+    points = {name: [] for name, _ in POINT_COLUMNS}
+    session_of = {}
+    row_strokes = []
+    for stroke_uuid, session_id, packed in zip(strokes['stroke_uuid'], strokes['session_id'], (row[-1] for row in stroke_rows)):
+        session_of[stroke_uuid] = session_id
+        if packed is None:
+            row_strokes.append(stroke_uuid)
+            continue
+        columns = unpack_columns(packed)
+        count = len(columns['t_ms'])
+        points['session_id'].extend([session_id] * count)
+        points['stroke_id'].extend([stroke_uuid] * count)
+        points['idx'].extend(range(count))
+        for name, _ in POINT_COLUMNS[3:]:
+            points[name].extend(columns[name])
+    if row_strokes:
+        rows = (
+            StrokePoint.objects.filter(stroke_id__in=row_strokes)
+            .order_by('stroke_id', 'idx')
+            .values_list(*_POINT_ROW_FIELDS)
+        )
+        # 행 단위 append 대신 컬럼 단위로 전치하여 추가
+        columns = list(zip(*rows.iterator(chunk_size=10000)))
+        if columns:
+            stroke_ids = [str(stroke_id) for stroke_id in columns[0]]
+            points['session_id'].extend(session_of[stroke_id] for stroke_id in stroke_ids)
+            points['stroke_id'].extend(stroke_ids)
+            for name, values in zip(_POINT_ROW_FIELDS[1:], columns[1:]):
+                if name == 'pressure_q':
+                    points['pressure'].extend(dequantize_pressure(value) for value in values)
+                else:
+                    points[name].extend(values)
+
+    event_rows = list(
+        Event.objects.filter(session_id__in=session_uuids)
+        .order_by('session_id', 'ts_ms', 'id')
+        .values_list(
+            'session_id', 'id', 'ts_ms', 'end_ts_ms', 'sample_count', 'type_id',
+            'tool_prev', 'tool_new', 'x', 'y', 'zoom', 'details',
+        )
+    )
+    events = _values(event_rows, EVENT_COLUMNS, uuid_columns=('session_id',))
+    names = get_event_type_names()
+    events['type'] = [names.get(type_id) or get_event_type_name(type_id) for type_id in events['type']]
+    events['details'] = [
+        None if details is None else json.dumps(details, ensure_ascii=False, separators=(',', ':'))
+        for details in events['details']
+    ]
+    return sessions, strokes, points, events
+
+
+def build_shard(window_start, window_end, batch_size=200, compression=None, now=None):
+    """
+    구간 하나의 대기 세션을 Parquet 샤드(part 하나)로 만들어 업로드
+
+    업로드가 모두 끝난 뒤에 ArchiveShard 행을 만들고 세션에 샤드를 기록하므로,
+    중간에 실패하면 다음 실행에서 같은 part를 다시 만듭니다.
+
+    Args:
+        window_start (datetime): 구간 시작
+        window_end (datetime): 구간 끝 (포함하지 않음)
+        batch_size (int): row group 하나에 담을 세션 수
+        compression (str, optional): Parquet 압축 코덱 (None이면 ARCHIVE_SHARD_COMPRESSION)
+        now (datetime, optional): 기준 시각
+
+    Returns:
+        ArchiveShard: 생성된 샤드 (대상 세션이 없으면 None)
+
+    Raises:
+        RuntimeError: pyarrow가 설치되지 않은 경우
+    """
+    if not is_parquet_available():
+        raise RuntimeError("Parquet 샤드를 만들려면 pyarrow 패키지가 필요합니다.")
+    compression = compression or getattr(settings, 'ARCHIVE_SHARD_COMPRESSION', 'zstd')
+
+    session_uuids = list(
+        pending_sessions(now)
+        .filter(created_at__gte=window_start, created_at__lt=window_end)
+        .order_by('created_at', 'session_uuid')
+        .values_list('session_uuid', flat=True)
+    )
+    if not session_uuids:
+        return None
+
+    part = ArchiveShard.objects.filter(window_start=window_start).count() + 1
+    prefix = shard_prefix(window_start, part)
+    writers = {
+        'sessions': _TableWriter('sessions', SESSION_COLUMNS, compression),
+        'strokes': _TableWriter('strokes', STROKE_COLUMNS, compression),
+        'points': _TableWriter('points', POINT_COLUMNS, compression),
+        'events': _TableWriter('events', EVENT_COLUMNS, compression),
+    }
+    try:
+        for offset in range(0, len(session_uuids), batch_size):
+            tables = _session_batch_tables(session_uuids[offset:offset + batch_size])
+            for writer, data in zip(writers.values(), tables):
+                writer.write(data)
+
+        storage = get_storage()
+        manifest_tables = {}
+        for name, writer in writers.items():
+            info = writer.finish()
+            key = f"{prefix}{name}.parquet"
+            storage.upload_file(key, writer.file, content_type=PARQUET_CONTENT_TYPE)
+            manifest_tables[name] = {
+                "key": key,
+                **info,
+                "columns": [{"name": column, "type": kind} for column, kind in writer.columns],
+            }
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    created_at = timezone.now()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "window_start": window_start.isoformat(),
+        "window_end": window_end.isoformat(),
+        "part": part,
+        "created_at": created_at.isoformat(),
+        "compression": compression,
+        "session_count": len(session_uuids),
+        "tables": manifest_tables,
+        "session_uuids": [str(session_uuid) for session_uuid in session_uuids],
+    }
+    manifest_key = f"{prefix}manifest.json"
+    storage.put(
+        manifest_key,
+        json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+        content_type='application/json',
+    )
+
+    with transaction.atomic():
+        shard = ArchiveShard.objects.create(
+            window_start=window_start,
+            window_end=window_end,
+            part=part,
+            prefix=prefix,
+            session_count=len(session_uuids),
+            stroke_count=manifest_tables['strokes']['rows'],
+            point_count=manifest_tables['points']['rows'],
+            event_count=manifest_tables['events']['rows'],
+            total_bytes=sum(table['bytes'] for table in manifest_tables.values()),
+        )
+        for offset in range(0, len(session_uuids), 1000):
+            Session.objects.filter(session_uuid__in=session_uuids[offset:offset + 1000]).update(shard=shard)
+    return shard
+
+
+def build_pending_shards(batch_size=200, max_shards=None, now=None):
+    """
+    대기 세션이 있는 닫힌 구간마다 샤드를 만듦 (오래된 구간부터)
+
+    Args:
+        batch_size (int): row group 하나에 담을 세션 수
+        max_shards (int, optional): 최대 생성 샤드 수
+        now (datetime, optional): 기준 시각
+
+    Yields:
+        ArchiveShard: 생성된 샤드
+    """
+    built = 0
+    while max_shards is None or built < max_shards:
+        oldest = pending_sessions(now).order_by('created_at').values_list('created_at', flat=True).first()
+        if oldest is None:
+            return
+        window_start, window_end = window_bounds(oldest)
+        shard = build_shard(window_start, window_end, batch_size=batch_size, now=now)
+        if shard is None:
+            return
+        built += 1
+        yield shard
@@ -0,0 +1,185 @@
+"""
+스트로크 단순화(Ramer–Douglas–Peucker)와 LOD(level-of-detail) 피라미드
+
+썸네일 렌더링이나 대략적인 분석에는 모든 포인트가 필요하지 않습니다.
+적재 시 스트로크마다 STROKE_LOD_TOLERANCES(px)별로 RDP 단순화한 포인트를 만들어
+Stroke.lod_packed 한 칸에 저장하고(api.packing.pack_lod), 조회 API는 lod 파라미터로
+level을 고릅니다 (api.replay).
+
+    lod=0  원본 (stroke_points / points_packed)
+    lod=1  tolerance[0] (기본 1px)
+    lod=2  tolerance[1] (기본 4px)
+    lod=3  tolerance[2] (기본 16px)
+
+각 level은 바로 앞 level의 포인트를 다시 단순화하므로 level이 올라갈수록 포인트가
+부분집합이 됩니다 (피라미드). 포인트가 LOD_MIN_POINTS개 이하인 스트로크는
+원본이 이미 작으므로 LOD를 만들지 않고, 조회 시 원본을 그대로 씁니다.
+"""
+
+import numpy as np
+from django.conf import settings
+
+from api.packing import COLUMN_SPECS, pack_columns, pack_lod
+
+DEFAULT_LOD_TOLERANCES = (1.0, 4.0, 16.0)
+
+# 이 개수 이하의 포인트를 가진 스트로크는 LOD를 만들지 않음
+LOD_MIN_POINTS = 16
+
+
+def get_lod_tolerances():
+    """
+    LOD level별 RDP tolerance(px)
+
+    Returns:
+        tuple: settings.STROKE_LOD_TOLERANCES (오름차순, 빈 값이면 LOD 미사용)
+    """
+    tolerances = getattr(settings, 'STROKE_LOD_TOLERANCES', DEFAULT_LOD_TOLERANCES)
+    return tuple(sorted(float(t) for t in tolerances))
+
+
+def rdp_keep_mask(x, y, anchors, tolerance):
+    """
+    Ramer–Douglas–Peucker 단순화 후 남길 포인트 마스크 (여러 스트로크를 한 번에)
+
+    재귀 대신 깊이 단위로 진행합니다. 매 단계에서 아직 확정되지 않은 모든 구간에 대해
+    선분까지의 거리를 NumPy로 한 번에 계산하고, 구간별 최대 거리가 tolerance를 넘는
+    포인트를 추가합니다. 스트로크 경계를 anchors로 넘기면 세션 전체 포인트를 한 번에
+    처리할 수 있어 구간마다 NumPy를 호출하는 비용이 없습니다 (반복 횟수 = 재귀 깊이).
+
+    Args:
+        x (array-like): x 좌표
+        y (array-like): y 좌표
+        anchors (numpy.ndarray): 항상 남길 포인트(bool) - 스트로크별 첫 / 마지막 포인트
+        tolerance (float): 허용 오차(px) - 이보다 멀리 떨어진 포인트만 남김
+
+    Returns:
+        numpy.ndarray: 남길 포인트 마스크(bool)
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    keep = np.array(anchors, dtype=bool, copy=True)
+    if not len(xs):
+        return keep
+    keep[0] = keep[-1] = True
+
+    # 아직 확정되지 않은 구간의 포인트만 다음 단계에서 다시 계산
+    active = np.flatnonzero(~keep)
+    while len(active):
+        kept = np.flatnonzero(keep)
+        # 포인트별 소속 구간: [kept[seg], kept[seg + 1]]
+        seg = np.searchsorted(kept, active) - 1
+        start = kept[seg]
+        end = kept[seg + 1]
+
+        dx = xs[end] - xs[start]
+        dy = ys[end] - ys[start]
+        px = xs[active] - xs[start]
+        py = ys[active] - ys[start]
+        norm = np.hypot(dx, dy)
+        degenerate = norm == 0
+        dist = np.where(
+            degenerate,
+            np.hypot(px, py),
+            np.abs(dy * px - dx * py) / np.where(degenerate, 1.0, norm),
+        )
+
+        # 구간별 최대 거리 포인트 하나씩 (거리가 같으면 앞쪽 포인트)
+        over = dist > tolerance
+        if not over.any():
+            break
+        candidates = np.flatnonzero(over)
+        order = np.lexsort((-dist[candidates], seg[candidates]))
+        candidates = candidates[order]
+        first = np.r_[True, seg[candidates][1:] != seg[candidates][:-1]]
+        split_segments = seg[candidates[first]]
+        keep[active[candidates[first]]] = True
+
+        # 나뉜 구간의 나머지 포인트만 남김 (최대 거리가 tolerance 이하인 구간은 확정)
+        remaining = np.isin(seg, split_segments) & ~keep[active]
+        active = active[remaining]
+    return keep
+
+
+def stroke_anchors(counts):
+    """
+    스트로크별 포인트 수 → 첫 / 마지막 포인트 마스크 (rdp_keep_mask()의 anchors)
+
+    Args:
+        counts (numpy.ndarray): 스트로크별 포인트 수
+
+    Returns:
+        numpy.ndarray: 이어붙인 포인트 배열 기준 bool 마스크
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    anchors = np.zeros(int(counts.sum()), dtype=bool)
+    ends = np.cumsum(counts)
+    nonempty = counts > 0
+    anchors[(ends - counts)[nonempty]] = True
+    anchors[ends[nonempty] - 1] = True
+    return anchors
+
+
+def build_lods(columns_list, counts, x, y, tolerances=None):
+    """
+    여러 스트로크의 LOD 피라미드를 한 번에 생성
+
+    Args:
+        columns_list (list): 스트로크별 decode_stroke_columns() / unpack_columns() 형태의 컬럼 배열
+        counts (list): 스트로크별 포인트 수
+        x (array-like): 모든 스트로크의 x 좌표를 순서대로 이어붙인 배열
+        y (array-like): 모든 스트로크의 y 좌표를 순서대로 이어붙인 배열
+        tolerances (tuple, optional): level별 tolerance (None이면 설정값)
+
+    Returns:
+        list: 스트로크별 Stroke.lod_packed 값 (LOD를 만들지 않는 스트로크는 None)
+    """
+    tolerances = get_lod_tolerances() if tolerances is None else tolerances
+    counts = np.asarray(counts, dtype=np.int64)
+    eligible = counts > LOD_MIN_POINTS
+    if not tolerances or not eligible.any():
+        return [None] * len(counts)
+
+    # LOD 대상 스트로크의 포인트만 모아서 계산
+    owner = np.repeat(np.arange(len(counts)), counts)
+    selected = np.flatnonzero(eligible[owner])
+    xs = np.asarray(x, dtype=np.float64)[selected]
+    ys = np.asarray(y, dtype=np.float64)[selected]
+    owner = owner[selected]
+    offsets = np.cumsum(counts) - counts
+    local = selected - offsets[owner]
+
+    strokes = np.flatnonzero(eligible)
+    anchors = stroke_anchors(counts[strokes])
+    levels = {stroke_no: [] for stroke_no in strokes.tolist()}
+    indices = np.arange(len(selected))
+    for tolerance in tolerances:
+        # 앞 level에서 남은 포인트만 다시 단순화 (스트로크 첫 / 마지막 포인트는 항상 남음)
+        indices = indices[rdp_keep_mask(xs[indices], ys[indices], anchors[indices], tolerance)]
+        bounds = np.searchsorted(owner[indices], strokes, side='left').tolist() + [len(indices)]
+        for i, stroke_no in enumerate(strokes.tolist()):
+            picked = local[indices[bounds[i]:bounds[i + 1]]].tolist()
+            columns = columns_list[stroke_no]
+            level_columns = {
+                name: [values[j] for j in picked]
+                for name, _ in COLUMN_SPECS
+                if (values := columns.get(name)) is not None
+            }
+            levels[stroke_no].append(pack_columns(level_columns, len(picked)))
+
+    return [pack_lod(levels[i]) if eligible[i] else None for i in range(len(counts))]
+
+
+def build_lod(columns, count, tolerances=None):
+    """
+    스트로크 한 개의 LOD 피라미드를 LOD 컨테이너 바이너리로 생성 (build_lods()의 단일 버전)
+
+    Args:
+        columns (dict): decode_stroke_columns() / unpack_columns() 형태의 컬럼 배열
+        count (int): 포인트 수
+        tolerances (tuple, optional): level별 tolerance (None이면 설정값)
+
+    Returns:
+        bytes: Stroke.lod_packed 값 (LOD를 만들지 않는 경우 None)
+    """
+    return build_lods([columns], [count], columns['x'], columns['y'], tolerances)[0]
@@ -0,0 +1,316 @@
+"""
+대용량 세션 제출 본문의 스트리밍 파싱
+
+json.loads(request.body)는 원본 bytes, 디코딩된 str, 전체 dict 트리를 동시에
+메모리에 올립니다. 이 모듈은 요청 스트림을 ijson으로 조금씩 읽으면서
+
+- canvasData.strokes / canvasData.events 원소를 하나씩 완성하는 즉시 배치로 모아
+  콜백(적재 writer)에 넘기고 버리며,
+- canvasData.visibleStrokes는 stroke id만 기록하고 (id가 없는 스트로크만 원본 보관),
+- session_data 서브트리 전체는 S3 백업용 gzip 파일(SpooledTemporaryFile)에 그대로 다시 씁니다.
+
+따라서 요청당 메모리 사용량은 세션 크기와 무관하게 (배치 크기 + 작은 메타데이터)로 제한됩니다.
+ijson이 설치되지 않은 환경에서는 is_streaming_available()이 False이며 기존 경로를 사용합니다.
+"""
+
+import gzip
+import json
+import tempfile
+
+from django.conf import settings
+
+try:
+    import ijson
+except ImportError:  # 스트리밍 파싱은 ijson 패키지가 설치된 경우에만 사용
+    ijson = None
+
+# 스트리밍으로 처리(적재 후 폐기)하는 배열의 원소 prefix
+STROKES_PREFIX = 'session_data.canvasData.strokes.item'
+EVENTS_PREFIX = 'session_data.canvasData.events.item'
+VISIBLE_STROKES_PREFIX = 'session_data.canvasData.visibleStrokes.item'
+
+# S3 백업으로 다시 쓰는 서브트리
+ARCHIVE_PREFIX = 'session_data'
+
+# 백업 gzip 파일이 이 크기를 넘으면 메모리 대신 디스크에 저장
+ARCHIVE_SPOOL_BYTES = 8 * 1024 * 1024
+
+# 백업 writer의 출력 버퍼 크기
+_WRITE_BUFFER_CHARS = 64 * 1024
+
+_CONTAINER_START = ('start_map', 'start_array')
+_CONTAINER_END = ('end_map', 'end_array')
+
+
+def is_streaming_available():
+    """
+    스트리밍 파싱 사용 가능 여부 (ijson 설치 여부)
+
+    Returns:
+        bool
+    """
+    return ijson is not None
+
+
+def get_streaming_min_bytes():
+    """
+    스트리밍 경로를 사용할 최소 요청 크기(bytes)
+
+    Returns:
+        int: settings.INGEST_STREAMING_MIN_BYTES (기본 1MB, 0이면 사용 안 함)
+    """
+    return getattr(settings, 'INGEST_STREAMING_MIN_BYTES', 1024 * 1024)
+
+
+def should_stream_request(request):
+    """
+    요청을 스트리밍 경로로 처리할지 결정
+
+    Content-Length(압축된 경우 압축 크기)가 INGEST_STREAMING_MIN_BYTES 이상이면
+    스트리밍으로 처리합니다.
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        bool
+    """
+    min_bytes = get_streaming_min_bytes()
+    if not min_bytes or not is_streaming_available():
+        return False
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return False
+    return content_length >= min_bytes
+
+
+def count_stroke_points(stroke):
+    """
+    스트로크의 포인트 수 (v1 / v2 wire 형식 모두)
+
+    Args:
+        stroke: canvasData.strokes의 원소
+
+    Returns:
+        int: 포인트 수 (형식이 잘못된 스트로크는 0 - 적재 전에 validate_stroke()가 거부)
+    """
+    if not isinstance(stroke, dict):
+        return 0
+    columns = stroke.get('columns')
+    values = columns.get('t') if isinstance(columns, dict) else stroke.get('points')
+    return len(values) if isinstance(values, list) else 0
+
+
+class ArchiveWriter:
+    """
+    ijson 이벤트를 compact JSON으로 다시 써서 gzip 임시 파일에 저장
+
+    session_data 객체를 그대로 쓰되 마지막 '}'는 보류해 두었다가
+    finish(extra)에서 백업용 메타 정보를 덧붙인 뒤 닫습니다.
+    결과는 upload_session_archive()의 {**session_data, ...메타 정보} 와 같은 구조입니다.
+    """
+
+    def __init__(self):
+        self.file = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES)
+        self._gzip = gzip.GzipFile(fileobj=self.file, mode='wb', compresslevel=6)
+        self._buffer = []
+        self._buffered = 0
+        # 열린 컨테이너마다 "아직 원소가 없음" 여부
+        self._first = []
+        self._after_key = False
+        self._has_root_key = False
+
+    def _write(self, text):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= _WRITE_BUFFER_CHARS:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._gzip.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer = []
+            self._buffered = 0
+
+    def _begin_value(self):
+        """값 앞에 필요한 ',' 출력"""
+        if self._after_key:
+            self._after_key = False
+        elif self._first:
+            if self._first[-1]:
+                self._first[-1] = False
+            else:
+                self._write(',')
+
+    def event(self, event, value):
+        """
+        ijson 이벤트 하나를 기록
+
+        Args:
+            event (str): ijson 이벤트 이름
+            value: 이벤트 값
+        """
+        if event == 'map_key':
+            if len(self._first) == 1:
+                self._has_root_key = True
+            if self._first[-1]:
+                self._first[-1] = False
+            else:
+                self._write(',')
+            self._write(json.dumps(value, ensure_ascii=False))
+            self._write(':')
+            self._after_key = True
+        elif event in _CONTAINER_START:
+            self._begin_value()
+            self._write('{' if event == 'start_map' else '[')
+            self._first.append(True)
+        elif event in _CONTAINER_END:
+            self._first.pop()
+            # 최상위 객체의 '}'는 finish()에서 출력
+            if self._first:
+                self._write('}' if event == 'end_map' else ']')
+        else:
+            self.value(value)
+
+    def value(self, value):
+        """
+        완성된 값 하나(스칼라 또는 조립된 dict/list)를 기록
+
+        Args:
+            value: JSON으로 직렬화할 값
+        """
+        self._begin_value()
+        self._write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+
+    def finish(self, extra):
+        """
+        메타 정보를 덧붙여 JSON 객체를 닫고 gzip 스트림 종료
+
+        Args:
+            extra (dict): 백업 JSON 최상위에 추가할 키/값
+
+        Returns:
+            SpooledTemporaryFile: 처음 위치로 되감은 gzip 파일
+        """
+        for key, value in extra.items():
+            self._write(',' if self._has_root_key else '')
+            self._has_root_key = True
+            self._write(json.dumps(key, ensure_ascii=False))
+            self._write(':')
+            self._write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+        self._write('}')
+        self._flush()
+        self._gzip.close()
+        self.file.seek(0)
+        return self.file
+
+    def close(self):
+        """임시 파일 정리"""
+        self.file.close()
+
+
+def _is_within(prefix, root):
+    return prefix == root or prefix.startswith(root + '.')
+
+
+def parse_submission_stream(stream, on_strokes, on_events, batch_size, archive=None):
+    """
+    제출 본문 스트림을 파싱하며 스트로크/이벤트를 배치 단위로 콜백에 전달
+
+    Args:
+        stream: read()를 지원하는 (해제된) 요청 본문 스트림
+        on_strokes (callable): on_strokes(strokes_list) - 스트로크 배치 적재
+        on_events (callable): on_events(events_list) - 이벤트 배치 적재
+        batch_size (int): 배치에 모을 최대 포인트/이벤트 수
+        archive (ArchiveWriter, optional): session_data 서브트리를 다시 쓸 writer
+
+    Returns:
+        tuple: (data, visible)
+            data: strokes / events / visibleStrokes를 빈 배열로 비운 요청 본문 dict
+            visible: visibleStrokes 요약 (visibleStrokes가 없으면 None)
+                {"ids": [stroke id, ...], "strokes": [id가 없는 스트로크 원본, ...]}
+
+    Raises:
+        ijson.JSONError: JSON 형식이 올바르지 않은 경우
+    """
+    builder = ijson.ObjectBuilder()
+    item_builder = None
+    item_prefix = None
+
+    stroke_batch = []
+    batch_points = 0
+    event_batch = []
+    visible = None
+
+    def flush_strokes():
+        nonlocal stroke_batch, batch_points
+        if stroke_batch:
+            on_strokes(stroke_batch)
+            stroke_batch = []
+            batch_points = 0
+
+    def flush_events():
+        nonlocal event_batch
+        if event_batch:
+            on_events(event_batch)
+            event_batch = []
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        # 스트리밍 배열 원소 안의 이벤트는 원소 단위로 따로 조립
+        if item_prefix is None:
+            for candidate in (STROKES_PREFIX, EVENTS_PREFIX, VISIBLE_STROKES_PREFIX):
+                if prefix == candidate:
+                    item_prefix = candidate
+                    item_builder = ijson.ObjectBuilder()
+                    break
+        if item_prefix is None:
+            builder.event(event, value)
+            if archive is not None and _is_within(prefix, ARCHIVE_PREFIX):
+                archive.event(event, value)
+            continue
+
+        item_builder.event(event, value)
+        if prefix != item_prefix or event in _CONTAINER_START or event == 'map_key':
+            continue
+
+        # 원소 하나 완성 - 백업에는 원소 단위로 한 번에 기록
+        item = item_builder.value
+        finished_prefix = item_prefix
+        item_prefix = None
+        item_builder = None
+        if archive is not None:
+            archive.value(item)
+
+        # 객체가 아닌 원소도 그대로 넘겨 콜백의 형식 검증(api.wire)에서 거부되도록 함
+        if finished_prefix == STROKES_PREFIX:
+            stroke_batch.append(item)
+            batch_points += count_stroke_points(item) or 1
+            if batch_points >= batch_size:
+                flush_strokes()
+        elif finished_prefix == EVENTS_PREFIX:
+            event_batch.append(item)
+            if len(event_batch) >= batch_size:
+                flush_events()
+        else:
+            # 가시 스트로크는 적재된 스트로크와 id로 대조하므로 id만 기록
+            # (id가 없는 스트로크는 대조할 수 없으므로 원본을 보관)
+            if visible is None:
+                visible = {"ids": [], "strokes": []}
+            if isinstance(item, dict) and item.get('id') is not None:
+                visible["ids"].append(str(item['id']))
+            else:
+                visible["strokes"].append(item)
+
+    flush_strokes()
+    flush_events()
+
+    data = getattr(builder, 'value', None)
+    if not isinstance(data, dict):
+        raise ijson.JSONError("요청 본문은 JSON 객체여야 합니다.")
+
+    session_data = data.get('session_data')
+    canvas_data = session_data.get('canvasData') if isinstance(session_data, dict) else None
+    if isinstance(canvas_data, dict) and 'visibleStrokes' in canvas_data and visible is None:
+        visible = {"ids": [], "strokes": []}
+    return data, visible
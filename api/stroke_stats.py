@@ -0,0 +1,169 @@
+"""
+스트로크 / 세션 요약 통계 (서버 계산)
+
+클라이언트가 보낸 totalDistance / averageSpeed / averagePressure 대신
+포인트 컬럼 배열로부터 직접 계산합니다. 세션의 모든 스트로크 포인트를
+하나의 NumPy 배열로 이어 붙인 뒤 스트로크 경계를 마스킹하여 한 번에 계산하므로
+포인트 수만큼의 Python 루프가 없습니다.
+
+스트로크별 지표:
+    total_distance_px           인접 포인트 간 유클리드 거리의 합
+    average_speed_pxps          total_distance_px / (마지막 t - 첫 t) (시간 차가 0이면 None)
+    max_speed_pxps              구간 속도(거리 / 시간 차)의 최댓값
+    average_acceleration_pxps2  인접 구간 속도 변화량 / 구간 중점 간 시간의 절댓값 평균
+    average_pressure            NULL을 제외한 pressure 평균
+    pressure_std                NULL을 제외한 pressure 표준편차
+    bbox_min_x ... bbox_max_y   좌표 bounding box
+"""
+
+import numpy as np
+from django.db.models import Avg, Count, Sum
+
+from api.models import Stroke
+
+def _none_if_nan(value):
+    """NaN을 None으로 변환 (DB NULL 저장용)"""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def compute_stroke_stats(counts, t_ms, x, y, pressure):
+    """
+    여러 스트로크의 포인트 배열로 스트로크별 통계를 한 번에 계산
+
+    Args:
+        counts (list): 스트로크별 포인트 수 (배열들은 이 순서대로 이어 붙인 것)
+        t_ms (list): 시간(ms) - 스트로크 안에서만 비교하므로 기준점은 상관없음
+        x (list): x 좌표
+        y (list): y 좌표
+        pressure (list): pressure (None 허용)
+
+    Returns:
+        list: 스트로크별 {Stroke 필드명: 값} dict 배열 (모듈 docstring의 지표)
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    n_strokes = len(counts)
+    if n_strokes == 0:
+        return []
+
+    t = np.asarray(t_ms, dtype=np.float64)
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    ps = np.asarray(pressure, dtype=np.float64)  # None → NaN
+
+    # 포인트별 소속 스트로크 번호
+    owner = np.repeat(np.arange(n_strokes), counts)
+
+    # --- 구간(인접 포인트 쌍) 단위: 스트로크 경계를 넘는 구간은 제외 ---
+    same = owner[1:] == owner[:-1]
+    seg_owner = owner[1:]
+    seg_len = np.hypot(np.diff(xs), np.diff(ys))
+    seg_dt = np.diff(t)
+
+    distance = np.bincount(seg_owner[same], weights=seg_len[same], minlength=n_strokes)
+
+    # 속도: 시간 차가 있는 구간만 (coalesced 이벤트는 같은 timestamp일 수 있음)
+    moving = same & (seg_dt > 0)
+    seg_speed = np.full(seg_len.shape, np.nan)
+    seg_speed[moving] = seg_len[moving] / seg_dt[moving] * 1000.0
+    max_speed = np.full(n_strokes, np.nan)
+    np.fmax.at(max_speed, seg_owner[moving], seg_speed[moving])
+
+    # 가속도: 같은 스트로크 안에서 연속된 두 속도 구간
+    both = moving[1:] & moving[:-1] & (seg_owner[1:] == seg_owner[:-1])
+    mid_dt = (seg_dt[1:] + seg_dt[:-1]) / 2.0
+    accel = np.abs(np.diff(seg_speed)[both]) / mid_dt[both] * 1000.0
+    accel_owner = seg_owner[1:][both]
+    accel_sum = np.bincount(accel_owner, weights=accel, minlength=n_strokes)
+    accel_count = np.bincount(accel_owner, minlength=n_strokes)
+
+    # --- 스트로크 단위: 시간 / bbox (포인트가 있는 스트로크만) ---
+    nonempty = counts > 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+    ends = starts + counts[nonempty] - 1
+
+    duration = np.zeros(n_strokes)
+    duration[nonempty] = t[ends] - t[starts]
+    bbox = np.zeros((4, n_strokes))
+    if len(starts):
+        bbox[0, nonempty] = np.minimum.reduceat(xs, starts)
+        bbox[1, nonempty] = np.minimum.reduceat(ys, starts)
+        bbox[2, nonempty] = np.maximum.reduceat(xs, starts)
+        bbox[3, nonempty] = np.maximum.reduceat(ys, starts)
+
+    # --- pressure: NULL(NaN) 제외 ---
+    has_pressure = ~np.isnan(ps)
+    p_owner = owner[has_pressure]
+    p_values = ps[has_pressure]
+    p_count = np.bincount(p_owner, minlength=n_strokes)
+    p_sum = np.bincount(p_owner, weights=p_values, minlength=n_strokes)
+    p_sq_sum = np.bincount(p_owner, weights=p_values * p_values, minlength=n_strokes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_speed = np.where(duration > 0, distance / duration * 1000.0, np.nan)
+        avg_accel = np.where(accel_count > 0, accel_sum / accel_count, np.nan)
+        avg_pressure = np.where(p_count > 0, p_sum / p_count, np.nan)
+        pressure_var = np.where(p_count > 0, p_sq_sum / p_count - avg_pressure ** 2, np.nan)
+    pressure_std = np.sqrt(np.clip(pressure_var, 0.0, None))
+
+    return [
+        {
+            'total_distance_px': float(distance[i]),
+            'average_speed_pxps': _none_if_nan(avg_speed[i]),
+            'max_speed_pxps': _none_if_nan(max_speed[i]),
+            'average_acceleration_pxps2': _none_if_nan(avg_accel[i]),
+            'average_pressure': _none_if_nan(avg_pressure[i]),
+            'pressure_std': _none_if_nan(pressure_std[i]),
+            'bbox_min_x': int(bbox[0, i]),
+            'bbox_min_y': int(bbox[1, i]),
+            'bbox_max_x': int(bbox[2, i]),
+            'bbox_max_y': int(bbox[3, i]),
+        }
+        for i in range(n_strokes)
+    ]
+
+
+def summarize_session_strokes(session_id):
+    """
+    저장된 스트로크 통계를 세션 요약치로 집계 (쿼리 1회)
+
+    단일 제출 / 스트리밍 / 분할 업로드 모두 적재가 끝난 뒤 같은 방식으로 집계합니다.
+
+    Args:
+        session_id (UUID): 세션 UUID
+
+    Returns:
+        dict: Session 필드명 → 값
+            {"stroke_count", "point_count", "total_distance_px", "average_stroke_length_px",
+             "average_speed_pxps", "average_pressure"}
+    """
+    # 별칭이 필드명과 같으면 다른 집계에서 필드를 참조할 수 없으므로 접두사를 붙임
+    # COUNT(*) - pk(stroke_uuid)는 strokes_session_start_cov에 없으므로 Count('pk')는 index-only scan을 막음
+    agg = Stroke.objects.filter(session_id=session_id).aggregate(
+        n_strokes=Count('*'),
+        n_points=Sum('point_count'),
+        sum_distance=Sum('total_distance_px'),
+        avg_distance=Avg('total_distance_px'),
+        avg_speed=Avg('average_speed_pxps'),
+        avg_pressure=Avg('average_pressure'),
+    )
+    return {
+        "stroke_count": agg['n_strokes'],
+        "point_count": agg['n_points'] or 0,
+        "total_distance_px": agg['sum_distance'] or 0.0,
+        "average_stroke_length_px": agg['avg_distance'],
+        "average_speed_pxps": agg['avg_speed'],
+        "average_pressure": agg['avg_pressure'],
+    }
+
+def refresh_session_summary(session):
+    """
+    세션 요약치를 저장된 스트로크 기준으로 다시 계산하여 저장
+
+    Args:
+        session (Session): 이미 저장된 세션 객체
+    """
+    summary = summarize_session_strokes(session.pk)
+    for name, value in summary.items():
+        setattr(session, name, value)
+    session.save(update_fields=list(summary))
@@ -0,0 +1,140 @@
+"""
+api 테스트 공용 헬퍼 (문제 / 세션 / 제출 본문 생성, 로컬 저장소)
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+import uuid
+
+from django.test import override_settings
+
+from api.models import Session
+from core.models import Category, Question
+from core.storage import reset_storage
+
+
+def make_question(answer='2', name=None):
+    """객관식 문제 생성 (정답 번호 answer)"""
+    category, _ = Category.objects.get_or_create(name='테스트')
+    return Question.objects.create(
+        name=name or f"문제 {uuid.uuid4().hex[:8]}",
+        category=category,
+        difficulty=50,
+        problem='1 + 1 = ?',
+        choices=['1', '2', '3'],
+        description=['더한다'],
+        answer=answer,
+    )
+
+
+def make_session(created_at=None, **fields):
+    """
+    요약 필드만 채운 세션 생성
+
+    created_at은 auto_now_add이므로 생성 후 UPDATE로 바꿉니다.
+    """
+    values = {
+        'session_uuid': uuid.uuid4(), 'duration_ms': 1000, 'problem_id': 1, 'category': 1,
+        'stroke_count': 0, 'total_distance_px': 0.0,
+    }
+    values.update(fields)
+    session = Session.objects.create(**values)
+    if created_at is not None:
+        Session.objects.filter(pk=session.pk).update(created_at=created_at)
+        session.created_at = created_at
+    return session
+
+
+def v1_stroke(stroke_id, count=5, start=1000, x0=10, tool='pen'):
+    """v1 스트로크 (포인트 dict 배열)"""
+    return {
+        'id': stroke_id,
+        'tool': tool,
+        'color': '#000000',
+        'strokeWidth': 3,
+        'startTime': start,
+        'endTime': start + 8 * (count - 1),
+        'points': [
+            {'x': x0 + i, 'y': 20 + 2 * i, 'timestamp': start + 8 * i, 'pressure': 0.5, 'pointerType': 'pen'}
+            for i in range(count)
+        ],
+    }
+
+
+def v2_stroke(stroke_id, count=5, start=1000, x0=10):
+    """v2 스트로크 (delta 인코딩 컬럼) - v1_stroke()와 같은 포인트"""
+    return {
+        'id': stroke_id,
+        'tool': 'pen',
+        'color': '#000000',
+        'strokeWidth': 3,
+        'startTime': start,
+        'endTime': start + 8 * (count - 1),
+        'pointerType': 'pen',
+        'columns': {
+            't': [0] + [8] * (count - 1),
+            'x': [x0] + [1] * (count - 1),
+            'y': [20] + [2] * (count - 1),
+            'p': [512] * count,
+        },
+    }
+
+
+def make_submission(question, strokes=(), events=(), visible_strokes=None, session_id=None, correct=False, **extra):
+    """verify-solution 요청 본문 dict (correct=False면 Mathpix / OpenAI 검증을 건너뜀)"""
+    canvas_data = {'strokes': list(strokes), 'events': list(events)}
+    if visible_strokes is not None:
+        canvas_data['visibleStrokes'] = visible_strokes
+    metadata = {'sessionId': str(session_id)} if session_id else {}
+    selected = int(question.answer) - 1 if correct else int(question.answer)
+    return {
+        'question_id': question.id,
+        'user_answer': {'type': 'multiple_choice', 'selectedIndex': selected, 'selectedValue': str(selected + 1)},
+        'session_data': {
+            'metadata': metadata,
+            'deviceCapabilities': {},
+            'canvasData': canvas_data,
+            'statistics': {'totalStrokes': len(canvas_data['strokes'])},
+        },
+        **extra,
+    }
+
+
+def post_json(client, url, payload, **headers):
+    """JSON 본문 POST"""
+    return client.post(url, data=json.dumps(payload), content_type='application/json', **headers)
+
+
+def post_compressed(client, url, payload, encoding='gzip', body=None):
+    """
+    Content-Encoding으로 압축한 JSON 본문 POST
+
+    body를 주면 payload 대신 그 bytes를 그대로 보냅니다 (손상된 본문 등).
+    """
+    if body is None:
+        raw = json.dumps(payload).encode()
+        if encoding == 'zstd':
+            import zstandard
+            body = zstandard.ZstdCompressor().compress(raw)
+        else:
+            body = gzip.compress(raw)
+    return client.post(url, data=body, content_type='application/json', headers={'Content-Encoding': encoding})
+
+
+class LocalStorageMixin:
+    """세션 백업을 임시 디렉터리의 로컬 저장소에 쓰도록 설정"""
+
+    def setUp(self):
+        super().setUp()
+        self.storage_root = tempfile.mkdtemp(prefix='api-tests-')
+        self._storage_override = override_settings(STORAGE_BACKEND='local', STORAGE_LOCAL_ROOT=self.storage_root)
+        self._storage_override.enable()
+        reset_storage()
+
+    def tearDown(self):
+        self._storage_override.disable()
+        reset_storage()
+        shutil.rmtree(self.storage_root, ignore_errors=True)
+        super().tearDown()
@@ -0,0 +1,130 @@
+"""
+압축된 요청 본문(Content-Encoding: gzip / zstd) 처리 테스트
+
+해제한 본문은 압축하지 않은 요청과 같게 적재되어야 하고, 해제 후 크기가
+INGEST_MAX_BODY_BYTES를 넘으면 413, 모르는 인코딩은 415, 손상된 본문은 400이어야 합니다.
+"""
+
+import gzip
+import json
+import uuid
+from unittest import mock, skipIf
+
+from django.test import TestCase, override_settings
+
+from api import compression, views
+from api.models import Session, SessionChunk, Stroke
+from api.tests.helpers import (
+    LocalStorageMixin, make_question, make_submission, post_compressed, post_json, v1_stroke, v2_stroke,
+)
+
+VERIFY_URL = '/api/verify-solution/'
+
+
+class CompressedRequestTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+        self.payload = make_submission(self.question, strokes=[v1_stroke('a'), v2_stroke('b', start=2000)])
+
+    def assert_saved(self, response, strokes=2):
+        self.assertEqual(response.status_code, 200, response.content)
+        session_id = response.json()['data']['session_id']
+        self.assertEqual(Stroke.objects.filter(session_id=session_id).count(), strokes)
+
+    def assert_rejected(self, response, status):
+        self.assertEqual(response.status_code, status, response.content)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Session.objects.count(), 0)
+        self.assertEqual(Stroke.objects.count(), 0)
+
+    def test_gzip_body_matches_plain_body(self):
+        plain = post_json(self.client, VERIFY_URL, self.payload)
+        compressed = post_compressed(self.client, VERIFY_URL, self.payload, 'gzip')
+
+        self.assert_saved(plain)
+        self.assert_saved(compressed)
+        for response in (plain, compressed):
+            self.assertEqual(
+                sorted(Stroke.objects.filter(session_id=response.json()['data']['session_id'])
+                       .values_list('client_id', 'point_count')),
+                [('a', 5), ('b', 5)],
+            )
+
+    def test_encoding_header_is_case_and_space_insensitive(self):
+        for encoding in ('x-gzip', ' GZIP '):
+            with self.subTest(encoding=encoding):
+                response = self.client.post(
+                    VERIFY_URL, data=gzip.compress(json.dumps(self.payload).encode()),
+                    content_type='application/json', headers={'Content-Encoding': encoding},
+                )
+                self.assert_saved(response)
+
+    @skipIf(compression.zstandard is None, "zstandard 미설치")
+    def test_zstd_body(self):
+        self.assert_saved(post_compressed(self.client, VERIFY_URL, self.payload, 'zstd'))
+
+    @override_settings(INGEST_STREAMING_MIN_BYTES=1)
+    def test_compressed_body_on_streaming_path(self):
+        encodings = ['gzip'] + (['zstd'] if compression.zstandard is not None else [])
+        for encoding in encodings:
+            with self.subTest(encoding=encoding), \
+                    mock.patch('api.views.save_streamed_submission', wraps=views.save_streamed_submission) as spy:
+                self.assert_saved(post_compressed(self.client, VERIFY_URL, self.payload, encoding))
+                spy.assert_called_once()
+
+    def test_decompressed_size_limit_returns_413(self):
+        # 약 1MB로 풀리는 1KB 남짓한 본문 (압축 폭탄)
+        payload = make_submission(self.question, problem_name=' ' * (1024 * 1024))
+        self.assertLess(len(gzip.compress(json.dumps(payload).encode())), 8 * 1024)
+
+        with override_settings(INGEST_MAX_BODY_BYTES=64 * 1024):
+            self.assert_rejected(post_compressed(self.client, VERIFY_URL, payload, 'gzip'), 413)
+            with override_settings(INGEST_STREAMING_MIN_BYTES=1):
+                self.assert_rejected(post_compressed(self.client, VERIFY_URL, payload, 'gzip'), 413)
+            if compression.zstandard is not None:
+                self.assert_rejected(post_compressed(self.client, VERIFY_URL, payload, 'zstd'), 413)
+
+    def test_limit_allows_body_just_under(self):
+        body = json.dumps(self.payload).encode()
+        with override_settings(INGEST_MAX_BODY_BYTES=len(body)):
+            self.assert_saved(post_compressed(self.client, VERIFY_URL, self.payload, 'gzip'))
+        with override_settings(INGEST_MAX_BODY_BYTES=len(body) - 1):
+            self.assertEqual(post_compressed(self.client, VERIFY_URL, self.payload, 'gzip').status_code, 413)
+
+    def test_unknown_encoding_returns_415(self):
+        for encoding in ('br', 'deflate, gzip'):
+            with self.subTest(encoding=encoding):
+                self.assert_rejected(post_compressed(self.client, VERIFY_URL, self.payload, encoding), 415)
+        with override_settings(INGEST_STREAMING_MIN_BYTES=1):
+            self.assert_rejected(post_compressed(self.client, VERIFY_URL, self.payload, 'br'), 415)
+
+    def test_zstd_without_zstandard_returns_415(self):
+        with mock.patch.object(compression, 'zstandard', None):
+            response = post_compressed(self.client, VERIFY_URL, None, 'zstd', body=b'\x28\xb5\x2f\xfd')
+
+        self.assert_rejected(response, 415)
+
+    def test_corrupt_body_returns_400(self):
+        truncated = gzip.compress(json.dumps(self.payload).encode())[:-12]
+        cases = [('gzip', b'not gzip at all'), ('gzip', truncated)]
+        if compression.zstandard is not None:
+            cases.append(('zstd', b'not zstd at all'))
+        for encoding, body in cases:
+            with self.subTest(encoding=encoding, body=body[:8]):
+                self.assert_rejected(post_compressed(self.client, VERIFY_URL, None, encoding, body=body), 400)
+
+    def test_chunk_upload_accepts_gzip_and_enforces_limit(self):
+        url = f'/api/sessions/{uuid.uuid4()}/chunks/'
+        chunk = {'question_id': self.question.id, 'seq': 0, 'strokes': [v1_stroke('a')], 'events': []}
+
+        response = post_compressed(self.client, url, chunk, 'gzip')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(SessionChunk.objects.get().stroke_count, 1)
+
+        chunk['seq'] = 1
+        chunk['padding'] = ' ' * (256 * 1024)
+        with override_settings(INGEST_MAX_BODY_BYTES=64 * 1024):
+            self.assertEqual(post_compressed(self.client, url, chunk, 'gzip').status_code, 413)
+        self.assertEqual(post_compressed(self.client, url, chunk, 'br').status_code, 415)
+        self.assertEqual(SessionChunk.objects.count(), 1)
@@ -0,0 +1,96 @@
+"""
+zoom / pan 이벤트 병합 테스트 (배치로 나눠 받는 스트리밍 경로 포함)
+"""
+
+import random
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.event_coalescing import EventCoalescer, coalesce_events
+from api.models import Event
+from api.tests.helpers import LocalStorageMixin, make_question, make_submission, post_json
+
+TYPES = ('pinch_zoom', 'pan', 'undo')
+
+
+def gesture(event_type, start, count, step=16):
+    return [
+        {'type': event_type, 'timestamp': start + i * step, 'details': {'scale': 1 + i / 10}}
+        for i in range(count)
+    ]
+
+
+def random_events(rng, count):
+    events, timestamp = [], 1000
+    for _ in range(count):
+        timestamp += rng.choice((8, 16, 40, 500))
+        events.append({'type': rng.choice(TYPES), 'timestamp': timestamp, 'details': {'n': timestamp}})
+    return events
+
+
+class EventCoalescerTests(SimpleTestCase):
+    def feed_in_batches(self, events, size):
+        coalescer = EventCoalescer(types=('pinch_zoom', 'pan'), gap_ms=300)
+        result = []
+        for i in range(0, len(events), size):
+            result += coalescer.feed(events[i:i + size])
+        return result + coalescer.flush()
+
+    def test_gesture_across_batches_is_one_range(self):
+        events = gesture('pinch_zoom', 1000, 10)
+
+        for size in (1, 3, 4, 10):
+            with self.subTest(size=size):
+                result = self.feed_in_batches(events, size)
+                self.assertEqual(len(result), 1)
+                self.assertEqual(result[0]['count'], 10)
+                self.assertEqual((result[0]['timestamp'], result[0]['endTimestamp']), (1000, 1144))
+
+    def test_range_is_flushed_on_type_change_only(self):
+        events = gesture('pinch_zoom', 1000, 5) + gesture('pan', 1100, 4) + [{'type': 'undo', 'timestamp': 1200}]
+        coalescer = EventCoalescer(types=('pinch_zoom', 'pan'), gap_ms=300)
+
+        # 배치 끝에서는 진행 중인 구간을 내보내지 않음
+        self.assertEqual(coalescer.feed(events[:3]), [])
+        self.assertEqual([e['count'] for e in coalescer.feed(events[3:7])], [5])
+        self.assertEqual([(e['type'], e.get('count')) for e in coalescer.feed(events[7:])], [('pan', 4), ('undo', None)])
+        self.assertEqual(coalescer.flush(), [])
+
+    def test_batched_matches_whole_list(self):
+        rng = random.Random(16)
+        for _ in range(30):
+            events = random_events(rng, rng.randint(0, 80))
+            expected = coalesce_events(events, types=('pinch_zoom', 'pan'), gap_ms=300)
+            for size in (1, 2, 7, 50):
+                self.assertEqual(self.feed_in_batches(events, size), expected)
+
+    def test_disabled_types_pass_through(self):
+        events = gesture('pan', 0, 3)
+        coalescer = EventCoalescer(types=(), gap_ms=300)
+
+        self.assertEqual(coalescer.feed(events) + coalescer.flush(), events)
+
+
+class StreamedEventCoalescingTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+
+    def event_rows(self, events, streaming):
+        min_bytes = 1 if streaming else 0
+        with override_settings(INGEST_STREAMING_MIN_BYTES=min_bytes, INGEST_BATCH_SIZE=4):
+            response = post_json(self.client, '/api/verify-solution/', make_submission(self.question, events=events))
+        self.assertEqual(response.status_code, 200, response.content)
+        session_id = response.json()['data']['session_id']
+        return list(
+            Event.objects.filter(session_id=session_id).order_by('ts_ms', 'id')
+            .values_list('ts_ms', 'end_ts_ms', 'sample_count', 'details')
+        )
+
+    def test_streaming_keeps_gesture_split_by_batches_as_one_range(self):
+        events = gesture('pinch_zoom', 1000, 10) + [{'type': 'undo', 'timestamp': 1300}] + gesture('pan', 1400, 6)
+
+        streamed = self.event_rows(events, streaming=True)
+
+        self.assertEqual([(ts, end, n) for ts, end, n, _ in streamed], [(1000, 1144, 10), (1300, None, 1), (1400, 1480, 6)])
+        self.assertEqual(streamed, self.event_rows(events, streaming=False))
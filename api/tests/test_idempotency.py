@@ -0,0 +1,237 @@
+"""
+제출 멱등성 테스트 (claim_submission / verify_solution 재전송 처리)
+
+같은 세션 UUID는 한 요청만 선점하고, 재전송은 저장된 응답을, 처리 중 / 다른 본문은 409를
+받아야 합니다. 처리에 실패하면 영수증을 풀어 재시도할 수 있어야 합니다.
+"""
+
+import json
+import threading
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from api.idempotency import (
+    DuplicateSubmission, claim_submission, complete_submission, compute_payload_hash, release_submission,
+)
+from api.models import Session, Stroke, SubmissionReceipt
+from api.tests.helpers import LocalStorageMixin, make_question, make_session, make_submission, post_json, v1_stroke
+
+VERIFY_URL = '/api/verify-solution/'
+
+
+def age_receipt(session_uuid, seconds):
+    """영수증 선점 시각을 seconds초 전으로 이동"""
+    SubmissionReceipt.objects.filter(session_uuid=session_uuid).update(
+        created_at=timezone.now() - timedelta(seconds=seconds)
+    )
+
+
+class ClaimSubmissionTests(TestCase):
+    def setUp(self):
+        self.session_uuid = uuid.uuid4()
+
+    def claim_error(self, payload_hash, **kwargs):
+        with self.assertRaises(DuplicateSubmission) as ctx:
+            claim_submission(self.session_uuid, payload_hash, **kwargs)
+        return ctx.exception
+
+    def test_first_claim_creates_receipt(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+
+        receipt = SubmissionReceipt.objects.get(session_uuid=self.session_uuid)
+        self.assertEqual(receipt.payload_hash, 'a' * 64)
+        self.assertIsNone(receipt.response_data)
+
+    def test_same_hash_in_progress_then_replay(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+
+        error = self.claim_error('a' * 64)
+        self.assertTrue(error.in_progress)
+        self.assertFalse(error.is_replay)
+
+        complete_submission(self.session_uuid, {'session_id': str(self.session_uuid)})
+        error = self.claim_error('a' * 64)
+        self.assertTrue(error.is_replay)
+        self.assertFalse(error.in_progress)
+        self.assertEqual(error.receipt.response_data, {'session_id': str(self.session_uuid)})
+
+    def test_different_hash_is_neither_replay_nor_in_progress(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+
+        error = self.claim_error('b' * 64)
+        self.assertFalse(error.in_progress)
+        self.assertFalse(error.is_replay)
+
+    def test_legacy_session_without_receipt_is_duplicate(self):
+        make_session(session_uuid=self.session_uuid)
+
+        error = self.claim_error('a' * 64)
+        self.assertIsNone(error.receipt)
+        self.assertFalse(SubmissionReceipt.objects.exists())
+
+        # 분할 업로드 finalize는 청크로 먼저 만든 세션 행을 허용
+        claim_submission(self.session_uuid, 'a' * 64, allow_existing_session=True)
+
+    @override_settings(SUBMISSION_CLAIM_TIMEOUT=60)
+    def test_stale_claim_is_taken_over(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+        age_receipt(self.session_uuid, 61)
+
+        claim_submission(self.session_uuid, 'b' * 64)
+
+        receipt = SubmissionReceipt.objects.get(session_uuid=self.session_uuid)
+        self.assertEqual(receipt.payload_hash, 'b' * 64)
+        self.assertGreater(receipt.created_at, timezone.now() - timedelta(seconds=60))
+
+    @override_settings(SUBMISSION_CLAIM_TIMEOUT=60)
+    def test_fresh_claim_is_not_taken_over(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+        age_receipt(self.session_uuid, 30)
+
+        self.assertTrue(self.claim_error('a' * 64).in_progress)
+
+    @override_settings(SUBMISSION_CLAIM_TIMEOUT=60)
+    def test_stale_claim_with_saved_session_is_not_taken_over(self):
+        # 세션은 저장되었지만 응답 저장 전에 중단된 경우 → 다시 적재하면 중복
+        claim_submission(self.session_uuid, 'a' * 64)
+        make_session(session_uuid=self.session_uuid)
+        age_receipt(self.session_uuid, 61)
+
+        self.assertTrue(self.claim_error('a' * 64).in_progress)
+        # finalize는 세션 행이 있어도 다시 선점
+        claim_submission(self.session_uuid, 'a' * 64, allow_existing_session=True)
+
+    @override_settings(SUBMISSION_CLAIM_TIMEOUT=60)
+    def test_completed_claim_is_never_taken_over(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+        complete_submission(self.session_uuid, {'ok': True})
+        age_receipt(self.session_uuid, 3600)
+
+        self.assertTrue(self.claim_error('a' * 64).is_replay)
+
+    def test_release_deletes_only_unfinished_receipt(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+        release_submission(self.session_uuid)
+        self.assertFalse(SubmissionReceipt.objects.exists())
+
+        claim_submission(self.session_uuid, 'a' * 64)
+        complete_submission(self.session_uuid, {'ok': True})
+        release_submission(self.session_uuid)
+        self.assertTrue(SubmissionReceipt.objects.exists())
+
+
+class ConcurrentClaimTests(TransactionTestCase):
+    """여러 요청이 동시에 같은 세션 UUID를 선점 (스레드마다 별도 DB 연결)"""
+
+    WORKERS = 8
+
+    def race(self, payload_hash):
+        barrier = threading.Barrier(self.WORKERS)
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                barrier.wait()
+                try:
+                    claim_submission(self.session_uuid, payload_hash)
+                    outcome = 'claimed'
+                except DuplicateSubmission as e:
+                    outcome = 'in_progress' if e.in_progress else 'conflict'
+                with lock:
+                    results.append(outcome)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(results)
+
+    def setUp(self):
+        self.session_uuid = uuid.uuid4()
+
+    def test_only_one_request_claims(self):
+        results = self.race('a' * 64)
+
+        self.assertEqual(results, ['claimed'] + ['in_progress'] * (self.WORKERS - 1))
+        self.assertEqual(SubmissionReceipt.objects.count(), 1)
+
+    @override_settings(SUBMISSION_CLAIM_TIMEOUT=60)
+    def test_only_one_request_takes_over_stale_claim(self):
+        claim_submission(self.session_uuid, 'a' * 64)
+        age_receipt(self.session_uuid, 61)
+
+        results = self.race('a' * 64)
+
+        self.assertEqual(results, ['claimed'] + ['in_progress'] * (self.WORKERS - 1))
+
+
+class VerifySolutionIdempotencyTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+        self.session_uuid = uuid.uuid4()
+        self.payload = make_submission(self.question, strokes=[v1_stroke('a')], session_id=self.session_uuid)
+
+    def post(self, payload=None):
+        return post_json(self.client, VERIFY_URL, payload or self.payload)
+
+    def test_replay_returns_stored_response_without_saving_again(self):
+        first = self.post()
+        self.assertEqual(first.status_code, 200, first.content)
+
+        with mock.patch('api.views.save_session_to_db_and_s3') as save:
+            replay = self.post()
+
+        save.assert_not_called()
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(Session.objects.count(), 1)
+        self.assertEqual(Stroke.objects.count(), 1)
+
+    def test_in_progress_returns_409_with_retry_after(self):
+        claim_submission(self.session_uuid, compute_payload_hash(json.dumps(self.payload).encode()))
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(Session.objects.count(), 0)
+
+    def test_different_body_returns_409(self):
+        self.assertEqual(self.post().status_code, 200)
+
+        changed = make_submission(self.question, strokes=[v1_stroke('b')], session_id=self.session_uuid)
+        response = self.post(changed)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.has_header('Retry-After'))
+        self.assertEqual(Stroke.objects.count(), 1)
+
+    def test_save_failure_releases_claim_for_retry(self):
+        with mock.patch('api.views.save_session_to_db_and_s3', side_effect=RuntimeError('db down')):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(SubmissionReceipt.objects.exists())
+
+        retry = self.post()
+        self.assertEqual(retry.status_code, 200, retry.content)
+        self.assertIsNotNone(SubmissionReceipt.objects.get(session_uuid=self.session_uuid).response_data)
+
+    def test_unexpected_error_after_save_releases_claim(self):
+        with mock.patch('api.views.build_verification_response', side_effect=RuntimeError('boom')):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(SubmissionReceipt.objects.exists())
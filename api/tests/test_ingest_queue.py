@@ -0,0 +1,174 @@
+"""
+비동기 적재 대기열 테스트 (INGEST_ASYNC / claim_jobs / process_job / run_ingest_worker)
+
+실패한 작업은 백오프 후에만 다시 가져오고, 다른 워커가 다시 가져간 작업은 이전 워커가
+결과를 덮어쓰지 않아야 합니다.
+"""
+
+import io
+import json
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import views
+from api.ingest_queue import claim_jobs, enqueue_ingest_job, get_retry_delay, process_job, queue_stats
+from api.models import IngestJob, Session, Stroke
+from api.tests.helpers import LocalStorageMixin, make_question, make_session, make_submission, post_json, v1_stroke
+
+VERIFY_URL = '/api/verify-solution/'
+
+# mock.patch 전에 잡아 둔 실제 저장 함수
+save_session_to_db_and_s3 = views.save_session_to_db_and_s3
+
+
+class IngestQueueTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+
+    def enqueue(self, strokes=None):
+        session_uuid = uuid.uuid4()
+        payload = make_submission(self.question, strokes=strokes or [v1_stroke('a'), v1_stroke('b', start=2000)])
+        return enqueue_ingest_job(session_uuid, json.dumps(payload).encode(), {
+            'question_id': self.question.id, 'user_answer': '3', 'is_correct': False,
+            'problem_name': '', 'category_id': None, 'difficulty': None, 'label': None,
+        })
+
+    def claim_one(self, **kwargs):
+        jobs = claim_jobs(**kwargs)
+        self.assertEqual(len(jobs), 1)
+        return jobs[0]
+
+    @override_settings(INGEST_ASYNC=True)
+    def test_async_submission_is_queued_then_ingested(self):
+        response = post_json(self.client, VERIFY_URL, make_submission(self.question, strokes=[v1_stroke('a')]))
+
+        self.assertEqual(response.status_code, 200, response.content)
+        session_id = response.json()['data']['session_id']
+        job = IngestJob.objects.get()
+        self.assertEqual(str(job.session_uuid), session_id)
+        self.assertEqual(job.status, IngestJob.STATUS_PENDING)
+        self.assertFalse(Session.objects.exists())
+
+        self.assertTrue(process_job(self.claim_one()))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(Stroke.objects.filter(session_id=session_id).count(), 1)
+
+    def test_worker_command_drains_queue(self):
+        self.enqueue()
+        self.enqueue()
+
+        # 테스트 트랜잭션의 커넥션을 닫지 않도록
+        with mock.patch('api.management.commands.run_ingest_worker.close_old_connections'):
+            call_command('run_ingest_worker', '--once', stdout=io.StringIO())
+
+        self.assertEqual(IngestJob.objects.filter(status=IngestJob.STATUS_DONE).count(), 2)
+        self.assertEqual(Session.objects.count(), 2)
+        self.assertEqual(queue_stats()['depth'], 0)
+
+    @override_settings(INGEST_RETRY_BASE_SECONDS=10, INGEST_RETRY_MAX_SECONDS=600)
+    def test_failed_job_backs_off_before_retry(self):
+        job = self.enqueue()
+
+        with mock.patch('api.views.save_session_to_db_and_s3', side_effect=RuntimeError('db down')):
+            before = timezone.now()
+            self.assertFalse(process_job(self.claim_one(), max_attempts=3))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.STATUS_PENDING)
+        self.assertIn('db down', job.last_error)
+        self.assertGreaterEqual(job.next_attempt_at, before + timedelta(seconds=5))
+        # 재시도 시각 전에는 가져오지 않음
+        self.assertEqual(claim_jobs(), [])
+
+        IngestJob.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+        self.assertTrue(process_job(self.claim_one(), max_attempts=3))
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_fails_after_max_attempts(self):
+        job = self.enqueue()
+
+        with mock.patch('api.views.save_session_to_db_and_s3', side_effect=RuntimeError('bad payload')):
+            for _ in range(2):
+                IngestJob.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+                self.assertFalse(process_job(self.claim_one(), max_attempts=2))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.STATUS_FAILED)
+        self.assertEqual(queue_stats()['failed'], 1)
+        self.assertEqual(claim_jobs(), [])
+
+    @override_settings(INGEST_RETRY_BASE_SECONDS=10, INGEST_RETRY_MAX_SECONDS=60)
+    def test_retry_delay_grows_and_is_capped(self):
+        for attempts, upper in ((1, 10), (2, 20), (3, 40), (4, 60), (10, 60)):
+            with self.subTest(attempts=attempts):
+                delay = get_retry_delay(attempts)
+                self.assertGreaterEqual(delay, upper / 2)
+                self.assertLessEqual(delay, upper)
+
+    def test_stale_processing_job_is_reclaimed(self):
+        self.enqueue()
+        job = self.claim_one(visibility_timeout=300)
+        self.assertEqual(claim_jobs(visibility_timeout=300), [])
+
+        IngestJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(seconds=301))
+        reclaimed = self.claim_one(visibility_timeout=300)
+
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_job_reclaimed_before_start_is_skipped(self):
+        self.enqueue()
+        job = self.claim_one()
+        # 배치 뒤쪽 작업이 시작 전에 만료되어 다른 워커가 다시 가져간 경우
+        IngestJob.objects.filter(pk=job.pk).update(started_at=timezone.now() + timedelta(seconds=1))
+
+        with mock.patch('api.views.save_session_to_db_and_s3') as save:
+            self.assertIsNone(process_job(job))
+
+        save.assert_not_called()
+        self.assertEqual(IngestJob.objects.get(pk=job.pk).status, IngestJob.STATUS_PROCESSING)
+
+    def test_result_is_not_written_after_lease_is_lost(self):
+        self.enqueue()
+        job = self.claim_one()
+        other_lease = timezone.now() + timedelta(seconds=5)
+
+        def reclaimed_during_save(**kwargs):
+            IngestJob.objects.filter(pk=job.pk).update(started_at=other_lease)
+            raise RuntimeError('slow and failed')
+
+        with mock.patch('api.views.save_session_to_db_and_s3', side_effect=reclaimed_during_save):
+            self.assertIsNone(process_job(job))
+
+        job = IngestJob.objects.get(pk=job.pk)
+        self.assertEqual(job.status, IngestJob.STATUS_PROCESSING)
+        self.assertEqual(job.started_at, other_lease)
+        self.assertIsNone(job.last_error)
+
+    def test_concurrent_save_of_same_session_counts_as_done(self):
+        job = self.enqueue()
+
+        def other_worker_saves_first(**kwargs):
+            # 존재 확인 이후 다른 워커가 같은 세션을 먼저 커밋 → 세션 PK 충돌
+            make_session(session_uuid=kwargs['session_uuid'])
+            return save_session_to_db_and_s3(**kwargs)
+
+        with mock.patch('api.views.save_session_to_db_and_s3', side_effect=other_worker_saves_first):
+            self.assertTrue(process_job(self.claim_one()))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.STATUS_DONE)
+        self.assertEqual(Session.objects.count(), 1)
+        # 충돌한 쪽의 스트로크는 함께 롤백
+        self.assertEqual(Stroke.objects.count(), 0)
@@ -0,0 +1,146 @@
+"""
+api.packing 바이너리 코덱 왕복 테스트
+"""
+
+from django.test import SimpleTestCase
+
+from api.packing import (
+    COLUMN_SPECS, NULL_INT, pack_columns, pack_lod, pack_points, unpack_columns, unpack_lod_points,
+    unpack_points,
+)
+
+FIELD_NAMES = [name for name, _ in COLUMN_SPECS]
+
+
+def make_points(count, **overrides):
+    """테스트용 포인트 dict 배열 (모든 컬럼 포함)"""
+    points = []
+    for i in range(count):
+        point = {
+            't_ms': i * 8,
+            'x': 100 + i,
+            'y': -50 + 2 * i,
+            'pressure': (i % 4) * 0.25,  # float32로 정확히 표현되는 값
+            'tilt_x': i - 3,
+            'tilt_y': 3 - i,
+            'twist': i * 10,
+            'pointer_type': 'pen' if i % 3 else 'touch',
+            'pointer_id': 7,
+            'buttons': 1,
+            'width': 2,
+            'height': 3,
+        }
+        point.update(overrides)
+        points.append(point)
+    return points
+
+
+class PackColumnsRoundTripTests(SimpleTestCase):
+    def test_all_columns_round_trip(self):
+        points = make_points(25)
+        columns = {name: [p[name] for p in points] for name in FIELD_NAMES}
+
+        self.assertEqual(unpack_columns(pack_columns(columns, len(points))), columns)
+
+    def test_missing_optional_columns_are_omitted_and_restored_as_none(self):
+        count = 5
+        columns = {
+            't_ms': [0, 10, 20, 30, 40],
+            'x': [1, 2, 3, 4, 5],
+            'y': [5, 4, 3, 2, 1],
+            'pointer_type': ['mouse'] * count,
+            'buttons': [0] * count,
+        }
+        blob = pack_columns(columns, count)
+        restored = unpack_columns(blob)
+
+        for name in FIELD_NAMES:
+            expected = columns.get(name, [None] * count)
+            self.assertEqual(restored[name], expected, name)
+
+        # 선택 컬럼을 저장하지 않으므로 전체 컬럼 버전보다 작음
+        full = pack_columns({**columns, 'pressure': [0.5] * count, 'twist': [0] * count}, count)
+        self.assertLess(len(blob), len(full))
+
+    def test_all_null_optional_column_is_not_stored(self):
+        count = 3
+        base = {'t_ms': [0, 1, 2], 'x': [0, 0, 0], 'y': [0, 0, 0], 'buttons': [1, 1, 1]}
+
+        self.assertEqual(
+            pack_columns({**base, 'pressure': [None] * count}, count),
+            pack_columns(base, count),
+        )
+
+    def test_partial_nulls_round_trip(self):
+        count = 4
+        columns = {
+            't_ms': [0, 1, 2, 3],
+            'x': [0, None, 2, 3],
+            'y': [0, 1, 2, 3],
+            'pressure': [0.5, None, 0.75, None],
+            'tilt_x': [None, 5, None, None],
+            'buttons': [1, 1, 1, 1],
+        }
+        restored = unpack_columns(pack_columns(columns, count))
+
+        self.assertEqual(restored['x'], [0, None, 2, 3])
+        self.assertEqual(restored['pressure'], [0.5, None, 0.75, None])
+        self.assertEqual(restored['tilt_x'], [None, 5, None, None])
+        self.assertEqual(restored['pointer_type'], ['pen'] * count)
+
+    def test_missing_required_column_round_trips_as_none(self):
+        count = 2
+        restored = unpack_columns(pack_columns({'t_ms': [0, 1], 'x': [1, 2], 'y': [3, 4]}, count))
+
+        self.assertEqual(restored['buttons'], [None, None])
+        self.assertEqual(restored['pointer_type'], ['pen', 'pen'])
+
+    def test_int32_extremes_round_trip(self):
+        count = 2
+        columns = {
+            't_ms': [0, 2 ** 31 - 1],
+            'x': [NULL_INT + 1, 2 ** 31 - 1],
+            'y': [0, 0],
+            'buttons': [0, 0],
+        }
+        restored = unpack_columns(pack_columns(columns, count))
+
+        self.assertEqual(restored['t_ms'], columns['t_ms'])
+        self.assertEqual(restored['x'], columns['x'])
+
+    def test_empty_stroke_round_trip(self):
+        restored = unpack_columns(pack_columns({}, 0))
+
+        self.assertEqual({name: restored[name] for name in FIELD_NAMES}, {name: [] for name in FIELD_NAMES})
+
+    def test_pack_points_round_trip_adds_idx(self):
+        points = make_points(6)
+        restored = unpack_points(pack_points(points))
+
+        self.assertEqual(restored, [{'idx': i, **point} for i, point in enumerate(points)])
+
+    def test_invalid_magic_raises_value_error(self):
+        blob = bytearray(pack_points(make_points(2)))
+        blob[:2] = b'XX'
+
+        with self.assertRaises(ValueError):
+            unpack_columns(bytes(blob))
+
+
+class PackLodRoundTripTests(SimpleTestCase):
+    def test_levels_round_trip_and_clamp(self):
+        levels_points = [make_points(10), make_points(5), make_points(2, pressure=None)]
+        blob = pack_lod([pack_points(points) for points in levels_points])
+
+        for lod, points in enumerate(levels_points, start=1):
+            restored = unpack_lod_points(blob, lod)
+            self.assertEqual([p['x'] for p in restored], [p['x'] for p in points])
+
+        # 범위를 벗어난 level은 가장 가까운 level로
+        self.assertEqual(len(unpack_lod_points(blob, 0)), 10)
+        self.assertEqual(len(unpack_lod_points(blob, 99)), 2)
+        self.assertEqual(unpack_lod_points(blob, 3)[0]['pressure'], None)
+
+    def test_empty_container_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            unpack_lod_points(pack_lod([]), 1)
@@ -0,0 +1,192 @@
+"""
+0007 마이그레이션의 일반 테이블 → 파티션 테이블 전환 테스트 (PostgreSQL 전용)
+
+미리 준비한 경우 전환 트랜잭션은 준비한 PK / unique 인덱스를 연결하고 CHECK 제약으로 범위 검증
+스캔을 건너뛰어야 하며, 준비 없이 실행해도 같은 결과가 되어야 합니다.
+"""
+
+from datetime import timedelta
+from importlib import import_module
+from unittest import mock, skipUnless
+
+from django.db import IntegrityError, connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.partitioning import add_months, is_partitioned, list_partitions, month_start
+
+conversion = import_module('api.migrations.0007_partition_points_events')
+
+TABLE = 'partition_convert_demo'
+UNIQUE = (('stroke', 'idx'), ('stroke', 'idx', 'recorded_on'))
+INDEX = conversion.conversion_index_name(TABLE)
+CHECK = conversion.conversion_check_name(TABLE)
+
+
+@skipUnless(connection.vendor == 'postgresql', "파티션 전환은 PostgreSQL 전용")
+class ConvertToPartitionedTests(TransactionTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(conversion.PARTITIONED_TABLES, {TABLE: ('recorded_on', UNIQUE)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.drop_tables)
+
+        self.today = timezone.localdate()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {TABLE} ("
+                f"id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, "
+                f"recorded_on date NOT NULL, stroke integer NOT NULL, idx integer NOT NULL, "
+                f"CONSTRAINT {TABLE}_stroke_idx_uniq UNIQUE (stroke, idx))"
+            )
+            cursor.execute(f"CREATE INDEX {TABLE}_stroke ON {TABLE} (stroke)")
+            cursor.execute(
+                f"INSERT INTO {TABLE} (recorded_on, stroke, idx) "
+                f"SELECT %s::date - (g %% 60), g / 10, g %% 10 FROM generate_series(1, 500) g",
+                [self.today],
+            )
+
+    def drop_tables(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE} CASCADE")
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}_legacy CASCADE")
+
+    def schema_editor(self):
+        return connection.schema_editor(atomic=False)
+
+    def fetch(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def pk_index(self, table):
+        return self.fetch(
+            "SELECT conindid, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [table],
+        )[0]
+
+    def unique_constraints(self, table):
+        return self.fetch(
+            "SELECT conindid, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'u'",
+            [table],
+        )
+
+    def unique_name(self):
+        with self.schema_editor() as editor:
+            return conversion.conversion_unique_name(editor, TABLE)
+
+    def assert_converted(self, upper):
+        self.assertTrue(is_partitioned(TABLE))
+        legacy = next(p for p in list_partitions(TABLE) if p['name'] == f"{TABLE}_legacy")
+        self.assertIsNone(legacy['start'])
+        self.assertEqual(legacy['end'], upper)
+        self.assertTrue(any(p['default'] for p in list_partitions(TABLE)))
+
+        self.assertEqual(self.pk_index(TABLE)[1], 'PRIMARY KEY (id, recorded_on)')
+        # (stroke, idx) unique는 파티션 키를 포함한 제약으로 교체
+        for table in (TABLE, f"{TABLE}_legacy"):
+            self.assertEqual(
+                [definition for _, definition in self.unique_constraints(table)], ['UNIQUE (stroke, idx, recorded_on)']
+            )
+        self.assertEqual(self.fetch(f"SELECT count(*) FROM {TABLE}")[0][0], 500)
+        # 범위 CHECK는 attach 후 제거
+        self.assertEqual(
+            self.fetch("SELECT count(*) FROM pg_constraint WHERE conname = %s", [CHECK])[0][0], 0
+        )
+
+        # 부모 테이블로 INSERT하면 id가 이어지고 이번 달 행은 legacy 파티션으로
+        new_id, partition = self.fetch(
+            f"INSERT INTO {TABLE} (recorded_on, stroke, idx) VALUES (%s, 999, 0) RETURNING id, tableoid::regclass::text",
+            [self.today],
+        )[0]
+        self.assertEqual(new_id, 501)
+        self.assertEqual(partition, f"{TABLE}_legacy")
+
+    def test_prepared_conversion_reuses_index_and_skips_scan(self):
+        with self.schema_editor() as editor:
+            upper = conversion.prepare_partition_conversion(editor, TABLE)
+
+        self.assertEqual(upper, add_months(month_start(self.today), 1))
+        index_oid = self.fetch("SELECT %s::regclass::oid", [INDEX])[0][0]
+        unique_oid = self.fetch("SELECT %s::regclass::oid", [self.unique_name()])[0][0]
+        # 새 unique 인덱스는 준비 단계에서 만들고 기존 제약은 전환 트랜잭션까지 유지
+        self.assertEqual(self.unique_constraints(TABLE), [(mock.ANY, 'UNIQUE (stroke, idx)')])
+        self.assertEqual(
+            self.fetch("SELECT convalidated FROM pg_constraint WHERE conname = %s", [CHECK]),
+            [(True,)],
+        )
+        # 다시 실행해도 같은 인덱스 / 상한 유지
+        with self.schema_editor() as editor:
+            self.assertEqual(conversion.prepare_partition_conversion(editor, TABLE), upper)
+        self.assertEqual(self.fetch("SELECT %s::regclass::oid", [INDEX])[0][0], index_oid)
+
+        notices = []
+        raw = connection.connection
+        if hasattr(raw, 'add_notice_handler'):
+            handler = lambda diag: notices.append(diag.message_primary)  # noqa: E731
+            raw.add_notice_handler(handler)
+            self.addCleanup(raw.remove_notice_handler, handler)
+        with connection.cursor() as cursor:
+            cursor.execute("SET client_min_messages = debug1")
+        try:
+            with self.schema_editor() as editor, CaptureQueriesContext(connection) as queries:
+                conversion.convert_to_partitioned(editor, TABLE)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET client_min_messages")
+
+        self.assert_converted(upper)
+        # PK 인덱스를 새로 만들지 않고 준비한 인덱스를 연결
+        self.assertEqual(self.pk_index(f"{TABLE}_legacy")[0], index_oid)
+        self.assertEqual(self.unique_constraints(f"{TABLE}_legacy")[0][0], unique_oid)
+        statements = [q['sql'] for q in queries.captured_queries]
+        self.assertFalse(any('VALIDATE CONSTRAINT' in sql for sql in statements))
+        # 잠금 중에는 기존 테이블에 인덱스를 새로 만들지 않음 (USING INDEX로 연결만)
+        rename = next(i for i, sql in enumerate(statements) if 'RENAME TO' in sql)
+        self.assertFalse(any(
+            'UNIQUE (' in sql or 'CREATE UNIQUE INDEX' in sql or 'PRIMARY KEY (' in sql for sql in statements[:rename]
+        ))
+        lock = next(i for i, sql in enumerate(statements) if sql.startswith(f'LOCK TABLE "{TABLE}"'))
+        max_id = next(i for i, sql in enumerate(statements) if sql.startswith('SELECT max(id)'))
+        self.assertLess(lock, max_id)
+        if hasattr(raw, 'add_notice_handler'):
+            self.assertIn(f'partition constraint for table "{TABLE}_legacy" is implied by existing constraints', notices)
+
+    def test_unprepared_conversion_validates_in_transaction(self):
+        with self.schema_editor() as editor, CaptureQueriesContext(connection) as queries:
+            conversion.convert_to_partitioned(editor, TABLE)
+
+        self.assert_converted(add_months(month_start(self.today), 1))
+        statements = [q['sql'] for q in queries.captured_queries]
+        self.assertTrue(any('UNIQUE ("stroke", "idx", "recorded_on")' in sql for sql in statements))
+        validate = next(i for i, sql in enumerate(statements) if 'VALIDATE CONSTRAINT' in sql)
+        attach = next(i for i, sql in enumerate(statements) if 'ATTACH PARTITION' in sql)
+        self.assertLess(validate, attach)
+
+    def test_prepare_rebuilds_invalid_index(self):
+        # CONCURRENTLY 생성이 중단되어 INVALID로 남은 인덱스
+        names = [INDEX, self.unique_name()]
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE UNIQUE INDEX {names[0]} ON {TABLE} (id, recorded_on)")
+            cursor.execute(f"CREATE UNIQUE INDEX {names[1]} ON {TABLE} (stroke, idx, recorded_on)")
+            cursor.execute("UPDATE pg_index SET indisvalid = false WHERE indexrelid = ANY(%s::regclass[])", [names])
+
+        with self.schema_editor() as editor:
+            conversion.prepare_partition_conversion(editor, TABLE)
+
+        for name in names:
+            self.assertEqual(
+                self.fetch("SELECT indisvalid FROM pg_index WHERE indexrelid = %s::regclass", [name]), [(True,)]
+            )
+
+    def test_check_rejects_rows_past_upper_until_converted(self):
+        with self.schema_editor() as editor:
+            upper = conversion.prepare_partition_conversion(editor, TABLE)
+
+        with self.assertRaises(IntegrityError), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TABLE} (recorded_on, stroke, idx) VALUES (%s, 1000, 0)", [upper + timedelta(days=1)]
+            )
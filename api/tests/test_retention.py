@@ -0,0 +1,271 @@
+"""
+api.retention 세션 정리 테스트
+
+요약 유지 / 전체 삭제 배치, 배치 수 제한, 오래된 작업 정리를 확인하고,
+백업이 확인되지 않은 세션의 원본은 정리 대상에서 빠지는지 확인합니다.
+"""
+
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.ingest import ingest_canvas_data
+from api.models import (
+    ArchiveJob, ArchiveShard, Event, IngestJob, Session, SessionChunk, Stroke, StrokePoint, SubmissionReceipt,
+    VerificationJob,
+)
+from api.partitioning import add_months, create_month_partition, is_partitioned, list_partitions
+from api.retention import (
+    drop_expired_partitions, estimate_purge, expired_sessions, purge_session_batch, purge_stale_records, run_retention,
+)
+from api.tests.helpers import make_session, v1_stroke, v2_stroke
+
+
+def days_ago(days):
+    return timezone.now() - timedelta(days=days)
+
+
+def local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def make_session_with_data(created_at=None, archived=True):
+    """스트로크 2개(포인트 행 + packed) / 이벤트 2개 / 청크 / 제출 영수증이 있는 세션"""
+    session = make_session(created_at=created_at, archived_at=timezone.now() if archived else None, point_count=80)
+    canvas_data = {
+        'strokes': [v1_stroke('a', count=40), v2_stroke('b', count=40, start=2000)],
+        'events': [{'type': 'undo', 'timestamp': 1500}, {'type': 'tool_change', 'timestamp': 1600}],
+    }
+    with transaction.atomic():
+        ingest_canvas_data(session, canvas_data)
+    SessionChunk.objects.create(session=session, seq=0, stroke_count=2, point_count=80, event_count=2)
+    SubmissionReceipt.objects.create(session_uuid=session.pk, payload_hash='0' * 64)
+    return session
+
+
+def raw_counts(session):
+    """세션의 원본 행 수 (포인트 행 / 이벤트 / packed 스트로크)"""
+    strokes = Stroke.objects.filter(session=session)
+    return {
+        'stroke_points': StrokePoint.objects.filter(stroke__in=strokes).count(),
+        'events': Event.objects.filter(session=session).count(),
+        'packed': strokes.filter(points_packed__isnull=False).count(),
+    }
+
+
+@override_settings(STROKE_POINT_STORAGE='both')
+class PurgeSessionBatchTests(TestCase):
+    def setUp(self):
+        self.target = make_session_with_data()
+        self.other = make_session_with_data()
+
+    def test_keep_summary_removes_raw_rows_only(self):
+        self.assertEqual(raw_counts(self.target), {'stroke_points': 80, 'events': 2, 'packed': 2})
+
+        counts = purge_session_batch([self.target.pk], keep_summary=True)
+
+        self.assertEqual(counts, {'stroke_points': 80, 'events': 2, 'sessions': 1})
+        self.assertEqual(raw_counts(self.target), {'stroke_points': 0, 'events': 0, 'packed': 0})
+        self.assertEqual(Stroke.objects.filter(session=self.target, lod_packed__isnull=False).count(), 0)
+        # 요약 행은 유지
+        session = Session.objects.get(pk=self.target.pk)
+        self.assertIsNotNone(session.raw_purged_at)
+        self.assertEqual(Stroke.objects.filter(session=self.target).count(), 2)
+        self.assertTrue(SessionChunk.objects.filter(session=self.target).exists())
+        # 다른 세션은 그대로
+        self.assertEqual(raw_counts(self.other), {'stroke_points': 80, 'events': 2, 'packed': 2})
+
+    def test_full_purge_removes_session_and_children(self):
+        counts = purge_session_batch([self.target.pk], keep_summary=False)
+
+        self.assertEqual(counts, {
+            'stroke_points': 80, 'events': 2, 'strokes': 2, 'session_chunks': 1, 'submission_receipts': 1,
+            'sessions': 1,
+        })
+        self.assertFalse(Session.objects.filter(pk=self.target.pk).exists())
+        self.assertFalse(Stroke.objects.filter(session_id=self.target.pk).exists())
+        self.assertFalse(SubmissionReceipt.objects.filter(session_uuid=self.target.pk).exists())
+        self.assertEqual(raw_counts(self.other), {'stroke_points': 80, 'events': 2, 'packed': 2})
+
+
+@override_settings(STROKE_POINT_STORAGE='both')
+class RunRetentionTests(TestCase):
+    def setUp(self):
+        self.expired = [make_session_with_data(created_at=days_ago(400 - i)) for i in range(5)]
+        self.recent = make_session_with_data(created_at=days_ago(10))
+
+    def run_retention(self, **kwargs):
+        options = {'days': 365, 'keep_summary': True, 'partition_action': 'none'}
+        options.update(kwargs)
+        return run_retention(**options)
+
+    def test_keep_summary_in_batches(self):
+        batches = []
+        report = self.run_retention(batch_size=2, on_batch=lambda no, n, counts, elapsed: batches.append(n))
+
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual((report['sessions'], report['batches'], report['unarchived']), (5, 3, 0))
+        self.assertEqual(report['rows']['stroke_points'], 5 * 80)
+        self.assertEqual(report['rows']['events'], 5 * 2)
+        self.assertEqual(Session.objects.filter(raw_purged_at__isnull=False).count(), 5)
+        self.assertIsNone(Session.objects.get(pk=self.recent.pk).raw_purged_at)
+        self.assertEqual(raw_counts(self.recent), {'stroke_points': 80, 'events': 2, 'packed': 2})
+
+        # 이미 원본을 지운 세션은 다시 대상이 되지 않음
+        self.assertEqual(self.run_retention()['sessions'], 0)
+
+    def test_full_purge_deletes_sessions(self):
+        report = self.run_retention(keep_summary=False, batch_size=10)
+
+        self.assertEqual((report['sessions'], report['batches']), (5, 1))
+        self.assertEqual(list(Session.objects.values_list('pk', flat=True)), [self.recent.pk])
+        self.assertEqual(Stroke.objects.count(), 2)
+        # 요약만 남은 세션도 전체 삭제 대상
+        purged = make_session(created_at=days_ago(400), archived_at=days_ago(400), raw_purged_at=days_ago(30))
+        self.assertEqual(list(expired_sessions(days_ago(365), keep_summary=False)), [purged])
+
+    def test_max_batches_limits_work(self):
+        report = self.run_retention(batch_size=2, max_batches=1)
+
+        self.assertEqual((report['sessions'], report['batches']), (2, 1))
+        # 오래된 세션부터 처리
+        purged = set(Session.objects.filter(raw_purged_at__isnull=False).values_list('pk', flat=True))
+        self.assertEqual(purged, {self.expired[0].pk, self.expired[1].pk})
+
+    def test_estimate_matches_run(self):
+        make_session_with_data(created_at=days_ago(400), archived=False)
+
+        estimate = estimate_purge(days_ago(365), keep_summary=True)
+
+        self.assertEqual(estimate, {'sessions': 5, 'points': 5 * 80, 'unarchived': 1})
+        self.assertEqual(self.run_retention()['sessions'], 5)
+
+    def test_requires_retention_days(self):
+        with self.assertRaises(ValueError):
+            run_retention(days=0)
+
+
+class PurgeStaleRecordsTests(TestCase):
+    def test_deletes_only_old_finished_records(self):
+        old, recent = days_ago(400), days_ago(10)
+        for created_at in (old, recent):
+            for status in (IngestJob.STATUS_PENDING, IngestJob.STATUS_PROCESSING, IngestJob.STATUS_DONE):
+                IngestJob.objects.create(session_uuid=make_session().pk, payload=b'{}', status=status)
+                ArchiveJob.objects.create(session_uuid=make_session().pk, key='answers/x.json.gz', status=status)
+            for status in (VerificationJob.STATUS_PENDING, VerificationJob.STATUS_DONE, VerificationJob.STATUS_FAILED):
+                VerificationJob.objects.create(session_uuid=make_session().pk, question_id=1, status=status)
+            SubmissionReceipt.objects.create(session_uuid=make_session().pk, payload_hash='0' * 64)
+            for model in (IngestJob, ArchiveJob, VerificationJob, SubmissionReceipt):
+                model.objects.filter(created_at__gt=days_ago(1)).update(created_at=created_at)
+
+        counts = purge_stale_records(days_ago(365))
+
+        self.assertEqual(counts, {
+            'ingest_jobs': 1, 'archive_jobs': 1, 'verification_jobs': 2, 'submission_receipts': 1,
+        })
+        self.assertEqual(IngestJob.objects.count(), 5)
+        self.assertEqual(ArchiveJob.objects.count(), 5)
+        self.assertEqual(VerificationJob.objects.count(), 4)
+        self.assertEqual(SubmissionReceipt.objects.count(), 1)
+
+
+class RetentionArchiveGuardTests(TestCase):
+    def setUp(self):
+        self.old = days_ago(400)
+
+    def run_retention(self, **kwargs):
+        options = {'days': 365, 'keep_summary': True, 'partition_action': 'none'}
+        options.update(kwargs)
+        return run_retention(**options)
+
+    def test_unarchived_sessions_are_skipped_in_json_mode(self):
+        archived = make_session(created_at=self.old, archived_at=self.old)
+        unarchived = make_session(created_at=self.old)
+
+        report = self.run_retention()
+
+        self.assertEqual(report['sessions'], 1)
+        self.assertEqual(report['unarchived'], 1)
+        self.assertIsNotNone(Session.objects.get(pk=archived.pk).raw_purged_at)
+        self.assertIsNone(Session.objects.get(pk=unarchived.pk).raw_purged_at)
+
+    def test_full_purge_keeps_unarchived_sessions(self):
+        make_session(created_at=self.old, archived_at=self.old)
+        unarchived = make_session(created_at=self.old)
+
+        self.run_retention(keep_summary=False)
+
+        self.assertEqual(list(Session.objects.values_list('pk', flat=True)), [unarchived.pk])
+
+    @override_settings(ARCHIVE_FORMAT='parquet')
+    def test_parquet_mode_requires_shard(self):
+        shard = ArchiveShard.objects.create(
+            window_start=self.old, window_end=self.old + timedelta(hours=1), part=1, prefix='shards/x/',
+            session_count=1, stroke_count=0, point_count=0, event_count=0, total_bytes=0,
+        )
+        sharded = make_session(created_at=self.old, shard=shard)
+        # JSON 백업만 있고 샤드가 없는 세션은 parquet 모드에서 백업된 것으로 보지 않음
+        json_only = make_session(created_at=self.old, archived_at=self.old)
+
+        report = self.run_retention()
+
+        self.assertEqual(report['sessions'], 1)
+        self.assertIsNotNone(Session.objects.get(pk=sharded.pk).raw_purged_at)
+        self.assertIsNone(Session.objects.get(pk=json_only.pk).raw_purged_at)
+
+    def test_failed_jobs_are_kept(self):
+        for status in (ArchiveJob.STATUS_DONE, ArchiveJob.STATUS_FAILED):
+            ArchiveJob.objects.create(session_uuid=make_session().pk, key=f'answers/{status}.json.gz',
+                                      body=b'gzip', status=status)
+            IngestJob.objects.create(session_uuid=make_session().pk, payload=b'{}', status=status)
+        ArchiveJob.objects.update(created_at=self.old)
+        IngestJob.objects.update(created_at=self.old)
+
+        counts = purge_stale_records(days_ago(365))
+
+        self.assertEqual((counts['archive_jobs'], counts['ingest_jobs']), (1, 1))
+        self.assertEqual(list(ArchiveJob.objects.values_list('status', flat=True)), [ArchiveJob.STATUS_FAILED])
+        self.assertEqual(list(IngestJob.objects.values_list('status', flat=True)), [IngestJob.STATUS_FAILED])
+
+
+class DropExpiredPartitionsTests(TestCase):
+    def setUp(self):
+        if not is_partitioned('events'):
+            self.skipTest("events가 파티션 테이블이 아님")
+        # 기존 파티션(legacy / 미리 만든 달) 뒤의 달에 파티션을 만들고, 그 범위 안에 수신된 세션 생성
+        month = max(p['end'] for p in list_partitions('events') if not p['default'] and p['end'])
+        self.name = create_month_partition('events', month)
+        self.session = make_session(created_at=local_midnight(month) + timedelta(days=14))
+        self.cutoff = local_midnight(add_months(month, 1)) + timedelta(days=1)
+
+    def partition_names(self):
+        return {p['name'] for p in list_partitions('events')}
+
+    def test_refuses_when_range_has_unarchived_session(self):
+        removed = drop_expired_partitions(self.cutoff, 'drop')
+
+        self.assertNotIn(self.name, [p['name'] for p in removed])
+        self.assertIn(self.name, self.partition_names())
+
+    def test_refuses_detach_too(self):
+        drop_expired_partitions(self.cutoff, 'detach')
+
+        self.assertIn(self.name, self.partition_names())
+
+    def test_drops_when_every_session_is_archived(self):
+        Session.objects.filter(pk=self.session.pk).update(archived_at=timezone.now())
+
+        removed = drop_expired_partitions(self.cutoff, 'drop')
+
+        self.assertIn(self.name, [p['name'] for p in removed])
+        self.assertNotIn(self.name, self.partition_names())
+
+    def test_purged_sessions_do_not_block(self):
+        # 원본을 이미 지운 세션(raw_purged_at)은 파티션에 행이 없음
+        Session.objects.filter(pk=self.session.pk).update(raw_purged_at=timezone.now())
+
+        removed = drop_expired_partitions(self.cutoff, 'drop')
+
+        self.assertIn(self.name, [p['name'] for p in removed])
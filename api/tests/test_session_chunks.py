@@ -0,0 +1,144 @@
+"""
+분할 업로드 테스트 (청크 추가 / finalize)
+
+같은 seq의 재전송은 중복 적재 없이 이전 결과를, 다른 내용은 409를 받아야 하며,
+finalize는 청크로 적재된 스트로크로 세션 요약치와 백업을 만들어야 합니다.
+"""
+
+import gzip
+import json
+import os
+import uuid
+
+from django.test import TestCase, override_settings
+
+from api.models import Session, SessionChunk, Stroke, VerificationJob
+from api.tests.helpers import LocalStorageMixin, make_question, make_submission, post_json, v1_stroke, v2_stroke
+
+
+class SessionChunkTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+        self.session_uuid = uuid.uuid4()
+        self.chunks_url = f'/api/sessions/{self.session_uuid}/chunks/'
+        self.finalize_url = f'/api/sessions/{self.session_uuid}/finalize/'
+
+    def chunk(self, seq, strokes=(), events=()):
+        return {'question_id': self.question.id, 'seq': seq, 'strokes': list(strokes), 'events': list(events)}
+
+    def post_chunk(self, seq, strokes=(), events=()):
+        return post_json(self.client, self.chunks_url, self.chunk(seq, strokes, events))
+
+    def finalize_body(self, correct=False, visible_ids=None):
+        body = make_submission(self.question, correct=correct, session_id=self.session_uuid)
+        canvas = body['session_data']['canvasData']
+        canvas.pop('strokes')
+        canvas.pop('events')
+        if visible_ids is not None:
+            canvas['visibleStrokeIds'] = visible_ids
+        return body
+
+    def test_chunks_are_ingested_incrementally(self):
+        response = self.post_chunk(0, [v1_stroke('a'), v2_stroke('b', start=2000)], [{'type': 'undo', 'timestamp': 1500}])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()['data']
+        self.assertEqual((data['stroke_count'], data['point_count'], data['event_count']), (2, 10, 1))
+        self.assertFalse(data['duplicate'])
+        session = Session.objects.get(session_uuid=self.session_uuid)
+        self.assertFalse(session.is_finalized)
+
+        self.assertEqual(self.post_chunk(1, [v1_stroke('c', start=3000)]).status_code, 200)
+        self.assertEqual(Stroke.objects.filter(session=session).count(), 3)
+
+    def test_same_seq_same_content_is_duplicate(self):
+        first = self.post_chunk(0, [v1_stroke('a')])
+        retry = self.post_chunk(0, [v1_stroke('a')])
+
+        self.assertEqual(retry.status_code, 200)
+        self.assertTrue(retry.json()['data']['duplicate'])
+        self.assertEqual(retry.json()['data']['stroke_count'], first.json()['data']['stroke_count'])
+        self.assertEqual(Stroke.objects.count(), 1)
+        self.assertEqual(SessionChunk.objects.count(), 1)
+
+    def test_same_seq_different_content_is_conflict(self):
+        self.post_chunk(0, [v1_stroke('a')])
+        response = self.post_chunk(0, [v1_stroke('a'), v1_stroke('b', start=2000)])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Stroke.objects.count(), 1)
+
+    def test_chunk_without_stored_hash_is_treated_as_retry(self):
+        # payload_hash 도입 전에 저장된 청크
+        self.post_chunk(0, [v1_stroke('a')])
+        SessionChunk.objects.update(payload_hash=None)
+
+        response = self.post_chunk(0, [v1_stroke('b')])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['data']['duplicate'])
+
+    def test_chunk_rejects_bad_seq_and_unknown_question(self):
+        for seq in (-1, '0', True, None):
+            with self.subTest(seq=seq):
+                self.assertEqual(self.post_chunk(seq).status_code, 400)
+        body = self.chunk(0)
+        body['question_id'] = self.question.id + 1000
+        self.assertEqual(post_json(self.client, self.chunks_url, body).status_code, 404)
+        self.assertFalse(Session.objects.exists())
+
+    def test_finalize_summarizes_chunks_and_writes_archive(self):
+        self.post_chunk(0, [v1_stroke('a', count=4)], [{'type': 'undo', 'timestamp': 1100}])
+        self.post_chunk(1, [v2_stroke('b', count=6, start=2000)])
+
+        response = post_json(self.client, self.finalize_url, self.finalize_body())
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['data']['session_id'], str(self.session_uuid))
+        session = Session.objects.get(session_uuid=self.session_uuid)
+        self.assertTrue(session.is_finalized)
+        self.assertEqual(session.stroke_count, 2)
+        self.assertFalse(session.is_correct)
+
+        path = os.path.join(self.storage_root, 'answers', f'{self.question.id}_{self.session_uuid}.json.gz')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            archive = json.load(f)
+        self.assertEqual([s['id'] for s in archive['canvasData']['strokes']], ['a', 'b'])
+        self.assertEqual(len(archive['canvasData']['events']), 1)
+
+    def test_finalize_replay_and_chunk_after_finalize(self):
+        self.post_chunk(0, [v1_stroke('a')])
+        body = self.finalize_body()
+        first = post_json(self.client, self.finalize_url, body)
+
+        replay = post_json(self.client, self.finalize_url, body)
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.json(), first.json())
+
+        changed = self.finalize_body()
+        changed['label'] = 1
+        self.assertEqual(post_json(self.client, self.finalize_url, changed).status_code, 409)
+        self.assertEqual(self.post_chunk(1, [v1_stroke('b')]).status_code, 409)
+        self.assertEqual(Stroke.objects.count(), 1)
+
+    def test_finalize_without_chunks_is_404_and_releases_claim(self):
+        response = post_json(self.client, self.finalize_url, self.finalize_body())
+
+        self.assertEqual(response.status_code, 404)
+        # 영수증을 풀었으므로 청크 업로드 후 같은 본문으로 다시 finalize 가능
+        self.post_chunk(0, [v1_stroke('a')])
+        self.assertEqual(post_json(self.client, self.finalize_url, self.finalize_body()).status_code, 200)
+
+    @override_settings(VERIFY_ASYNC=True)
+    def test_finalize_sends_only_visible_strokes(self):
+        self.post_chunk(0, [v1_stroke('a'), v1_stroke('b', start=2000)])
+        self.post_chunk(1, [v2_stroke('c', start=3000)])
+
+        response = post_json(self.client, self.finalize_url, self.finalize_body(correct=True, visible_ids=['c', 'a']))
+
+        self.assertEqual(response.status_code, 200, response.content)
+        job = VerificationJob.objects.get(session_uuid=self.session_uuid)
+        self.assertEqual(sorted(s['id'] for s in job.strokes), ['a', 'c'])
@@ -0,0 +1,215 @@
+"""
+api.simplify RDP 단순화 / LOD 피라미드 테스트
+
+벡터화된 rdp_keep_mask()를 재귀로 구현한 기준 RDP와 비교합니다.
+"""
+
+import math
+import random
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.packing import unpack_lod_points
+from api.simplify import LOD_MIN_POINTS, build_lod, build_lods, rdp_keep_mask, stroke_anchors
+
+
+def reference_rdp(points, tolerance):
+    """
+    재귀 RDP (기준 구현) - 남길 포인트의 인덱스 집합
+
+    구간 양 끝이 같은 점이면 끝점까지의 거리를 쓰고, 최대 거리가 같은 포인트가 여럿이면
+    앞쪽 포인트에서 나눕니다 (rdp_keep_mask()와 같은 규칙).
+    """
+    keep = {0, len(points) - 1} if points else set()
+
+    def distance(point, start, end):
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        px, py = point[0] - start[0], point[1] - start[1]
+        norm = math.hypot(dx, dy)
+        if norm == 0:
+            return math.hypot(px, py)
+        return abs(dy * px - dx * py) / norm
+
+    def simplify(first, last):
+        best, best_dist = None, tolerance
+        for i in range(first + 1, last):
+            d = distance(points[i], points[first], points[last])
+            if d > best_dist:
+                best, best_dist = i, d
+        if best is not None:
+            keep.add(best)
+            simplify(first, best)
+            simplify(best, last)
+
+    if len(points) > 2:
+        simplify(0, len(points) - 1)
+    return keep
+
+
+def random_walk(rng, count, step=6.0):
+    """손글씨와 비슷한 무작위 경로"""
+    x, y = rng.uniform(0, 500), rng.uniform(0, 500)
+    points = []
+    for _ in range(count):
+        x += rng.gauss(0, step)
+        y += rng.gauss(0, step)
+        points.append((round(x, 2), round(y, 2)))
+    return points
+
+
+def mask_indices(mask):
+    return set(np.flatnonzero(mask).tolist())
+
+
+class RdpKeepMaskTests(SimpleTestCase):
+    def assert_matches_reference(self, points, tolerance):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        mask = rdp_keep_mask(xs, ys, stroke_anchors([len(points)]), tolerance)
+        self.assertEqual(mask_indices(mask), reference_rdp(points, tolerance))
+
+    def test_matches_recursive_reference_on_random_strokes(self):
+        rng = random.Random(20240501)
+        for _ in range(60):
+            points = random_walk(rng, rng.randint(3, 300))
+            for tolerance in (0.5, 1.0, 4.0, 16.0):
+                self.assert_matches_reference(points, tolerance)
+
+    def test_integer_coordinates_match_reference(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            points = [(int(x), int(y)) for x, y in random_walk(rng, rng.randint(3, 120), step=4.0)]
+            for tolerance in (1.0, 4.0):
+                self.assert_matches_reference(points, tolerance)
+
+    def test_closed_stroke_uses_distance_to_endpoint(self):
+        # 시작점과 끝점이 같은 원 - 구간 길이가 0이므로 점까지의 거리로 판단
+        points = [(100 + 50 * math.cos(a), 100 + 50 * math.sin(a))
+                  for a in np.linspace(0, 2 * math.pi, 40)]
+        points[-1] = points[0]
+        self.assert_matches_reference(points, 4.0)
+        mask = rdp_keep_mask([p[0] for p in points], [p[1] for p in points], stroke_anchors([40]), 4.0)
+        self.assertGreater(mask.sum(), 2)
+
+    def test_all_points_identical(self):
+        points = [(5.0, 5.0)] * 20
+        self.assert_matches_reference(points, 1.0)
+        self.assertEqual(mask_indices(rdp_keep_mask([5.0] * 20, [5.0] * 20, stroke_anchors([20]), 1.0)), {0, 19})
+
+    def test_collinear_points_reduce_to_endpoints(self):
+        xs = list(range(50))
+        ys = [2 * x + 1 for x in xs]
+
+        self.assertEqual(mask_indices(rdp_keep_mask(xs, ys, stroke_anchors([50]), 0.1)), {0, 49})
+
+    def test_repeated_points_inside_segment(self):
+        points = [(0, 0), (10, 10), (10, 10), (10, 10), (20, 0), (20, 0), (30, 30)]
+        for tolerance in (0.5, 5.0, 20.0):
+            self.assert_matches_reference(points, tolerance)
+
+    def test_zero_tolerance_keeps_every_off_line_point(self):
+        points = [(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)]
+        self.assert_matches_reference(points, 0.0)
+
+    def test_short_strokes(self):
+        self.assertEqual(mask_indices(rdp_keep_mask([], [], np.zeros(0, dtype=bool), 1.0)), set())
+        self.assertEqual(mask_indices(rdp_keep_mask([1.0], [2.0], stroke_anchors([1]), 1.0)), {0})
+        self.assertEqual(mask_indices(rdp_keep_mask([1.0, 9.0], [2.0, 3.0], stroke_anchors([2]), 1.0)), {0, 1})
+
+    def test_multiple_strokes_at_once_match_per_stroke_reference(self):
+        rng = random.Random(99)
+        strokes = [random_walk(rng, n) for n in (3, 17, 1, 64, 2, 200)]
+        xs = [p[0] for stroke in strokes for p in stroke]
+        ys = [p[1] for stroke in strokes for p in stroke]
+        counts = [len(stroke) for stroke in strokes]
+        mask = rdp_keep_mask(xs, ys, stroke_anchors(counts), 4.0)
+
+        offset = 0
+        for stroke, count in zip(strokes, counts):
+            self.assertEqual(
+                mask_indices(mask[offset:offset + count]), reference_rdp(stroke, 4.0), f"포인트 {count}개 스트로크"
+            )
+            offset += count
+
+
+class StrokeAnchorsTests(SimpleTestCase):
+    def test_marks_first_and_last_point_of_each_stroke(self):
+        anchors = stroke_anchors([3, 0, 1, 4])
+
+        self.assertEqual(mask_indices(anchors), {0, 2, 3, 4, 7})
+
+
+class BuildLodTests(SimpleTestCase):
+    def columns_for(self, points):
+        count = len(points)
+        return {
+            't_ms': list(range(count)),
+            'x': [p[0] for p in points],
+            'y': [p[1] for p in points],
+            'pointer_type': ['pen'] * count,
+            'buttons': [1] * count,
+        }
+
+    def test_no_lod_at_min_points_threshold(self):
+        rng = random.Random(3)
+        at_threshold = [(int(x), int(y)) for x, y in random_walk(rng, LOD_MIN_POINTS)]
+        above = [(int(x), int(y)) for x, y in random_walk(rng, LOD_MIN_POINTS + 1)]
+
+        self.assertIsNone(build_lod(self.columns_for(at_threshold), LOD_MIN_POINTS, (1.0, 4.0)))
+        self.assertIsNotNone(build_lod(self.columns_for(above), LOD_MIN_POINTS + 1, (1.0, 4.0)))
+
+    def test_empty_tolerances_disable_lod(self):
+        points = [(i, i % 7) for i in range(40)]
+
+        self.assertIsNone(build_lod(self.columns_for(points), len(points), ()))
+
+    def test_levels_form_a_pyramid_matching_reference(self):
+        rng = random.Random(11)
+        points = [(int(x), int(y)) for x, y in random_walk(rng, 150)]
+        tolerances = (1.0, 4.0, 16.0)
+        blob = build_lod(self.columns_for(points), len(points), tolerances)
+
+        previous = list(range(len(points)))
+        for lod, tolerance in enumerate(tolerances, start=1):
+            level = unpack_lod_points(blob, lod)
+            t_values = [p['t_ms'] for p in level]
+            # 앞 level의 부분집합이고, 첫 / 마지막 포인트는 항상 남음
+            self.assertTrue(set(t_values) <= set(previous))
+            self.assertEqual((t_values[0], t_values[-1]), (0, len(points) - 1))
+            # 앞 level의 포인트를 기준 RDP로 다시 단순화한 결과와 같음
+            expected = reference_rdp([points[i] for i in previous], tolerance)
+            self.assertEqual(t_values, [previous[i] for i in sorted(expected)])
+            self.assertEqual([(p['x'], p['y']) for p in level], [points[t] for t in t_values])
+            previous = t_values
+
+    def test_build_lods_mixes_eligible_and_small_strokes(self):
+        rng = random.Random(5)
+        strokes = [
+            [(int(x), int(y)) for x, y in random_walk(rng, n)]
+            for n in (LOD_MIN_POINTS + 10, 4, LOD_MIN_POINTS, 90)
+        ]
+        columns_list = [self.columns_for(stroke) for stroke in strokes]
+        counts = [len(stroke) for stroke in strokes]
+        xs = [p[0] for stroke in strokes for p in stroke]
+        ys = [p[1] for stroke in strokes for p in stroke]
+        blobs = build_lods(columns_list, counts, xs, ys, (2.0,))
+
+        self.assertIsNone(blobs[1])
+        self.assertIsNone(blobs[2])
+        for i in (0, 3):
+            # 여러 스트로크를 한 번에 처리한 결과가 스트로크 하나씩 처리한 결과와 같음
+            self.assertEqual(blobs[i], build_lod(columns_list[i], counts[i], (2.0,)))
+            level = unpack_lod_points(blobs[i], 1)
+            self.assertEqual(
+                [p['t_ms'] for p in level], sorted(reference_rdp(strokes[i], 2.0))
+            )
+
+    def test_level_keeps_optional_columns(self):
+        points = [(i, (i * 37) % 23) for i in range(30)]
+        columns = {**self.columns_for(points), 'pressure': [0.5] * 30}
+        level_blob = build_lod(columns, 30, (1.0,))
+        level = unpack_lod_points(level_blob, 1)
+
+        self.assertTrue(all(p['pressure'] == 0.5 for p in level))
+        self.assertTrue(all(p['tilt_x'] is None for p in level))
@@ -0,0 +1,237 @@
+"""
+스트리밍 적재 경로(ijson) 테스트
+
+같은 제출을 json.loads 경로와 스트리밍 경로로 보냈을 때 DB 행과 백업 JSON이 같아야 합니다.
+"""
+
+import gzip
+import io
+import json
+import os
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from api import views
+from api.models import Event, Session, Stroke, StrokePoint, VerificationJob
+from api.streaming import parse_submission_stream
+from api.tests.helpers import LocalStorageMixin, make_question, make_submission, post_json, v1_stroke, v2_stroke
+from api.wire import decode_stroke_xyt
+
+VERIFY_URL = '/api/verify-solution/'
+
+# 세션마다 달라지는 값 (UUID / 수신 시각)
+SESSION_VOLATILE = {'session_uuid', 'created_at', 'archived_at'}
+ARCHIVE_VOLATILE = {'db_session_id', 'uploaded_at'}
+
+
+def sample_strokes():
+    """포인트 수가 다른 v1 / v2 스트로크 (배치 경계가 스트로크 중간에 걸리도록)"""
+    return [
+        v1_stroke('s1', count=1, start=1000),
+        v2_stroke('s2', count=5, start=1100, x0=40),
+        v1_stroke('s3', count=40, start=1200, x0=80),
+        v2_stroke('s4', count=7, start=1500, x0=120),
+        v1_stroke('s5', count=3, start=1600, x0=160, tool='eraser'),
+        v2_stroke('s6', count=12, start=1700, x0=200),
+    ]
+
+
+def sample_events():
+    return [
+        {'type': 'tool_change', 'timestamp': 1050, 'details': {'prevTool': 'pen', 'newTool': 'eraser'}},
+        {'type': 'undo', 'timestamp': 1300},
+        {'type': 'pan', 'timestamp': 1400, 'details': {'x': 1.5, 'y': -2.25}},
+        {'type': 'redo', 'timestamp': 1900, 'data': {'count': 1}},
+    ]
+
+
+class StreamingParityTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+
+    def submit(self, payload, streaming, batch_size=2000, **settings):
+        """제출 후 세션 UUID 반환 (streaming이면 스트리밍 경로를 거쳤는지 확인)"""
+        with override_settings(INGEST_STREAMING_MIN_BYTES=1 if streaming else 0, INGEST_BATCH_SIZE=batch_size,
+                               **settings), \
+                mock.patch('api.views.save_streamed_submission', wraps=views.save_streamed_submission) as spy:
+            response = post_json(self.client, VERIFY_URL, payload)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(spy.called, streaming)
+        return response.json()['data']['session_id']
+
+    def snapshot(self, session_id):
+        """세션의 DB 행 (UUID / 시각 제외)"""
+        session = Session.objects.filter(pk=session_id).values().get()
+        strokes = list(
+            Stroke.objects.filter(session_id=session_id).order_by('start_ms', 'client_id')
+            .values(*[f.attname for f in Stroke._meta.concrete_fields if f.name not in ('stroke_uuid', 'session')])
+        )
+        points = list(
+            StrokePoint.objects.filter(stroke__session_id=session_id)
+            .order_by('stroke__start_ms', 'stroke__client_id', 'idx')
+            .values_list('stroke__client_id', 'idx', 't_ms', 'x', 'y', 'pressure_q', 'buttons')
+        )
+        events = list(
+            Event.objects.filter(session_id=session_id).order_by('ts_ms', 'id')
+            .values('ts_ms', 'type_id', 'details', 'tool_prev', 'tool_new', 'x', 'y', 'end_ts_ms', 'sample_count')
+        )
+        return {
+            'session': {k: v for k, v in session.items() if k not in SESSION_VOLATILE},
+            'strokes': strokes,
+            'points': points,
+            'events': events,
+        }
+
+    def archive(self, session_id):
+        """저장된 백업 JSON (세션별 값 제외)"""
+        path = os.path.join(self.storage_root, 'answers', f'{self.question.id}_{session_id}.json.gz')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        return {k: v for k, v in data.items() if k not in ARCHIVE_VOLATILE}
+
+    def assert_parity(self, payload, batch_sizes=(1, 6, 41, 2000), **settings):
+        expected_id = self.submit(payload, streaming=False, **settings)
+        expected = self.snapshot(expected_id)
+        expected_archive = self.archive(expected_id)
+        self.assertTrue(expected['points'])
+
+        for batch_size in batch_sizes:
+            with self.subTest(batch_size=batch_size):
+                session_id = self.submit(payload, streaming=True, batch_size=batch_size, **settings)
+                self.assertEqual(self.snapshot(session_id), expected)
+                self.assertEqual(self.archive(session_id), expected_archive)
+
+    def test_v1_submission_matches_json_path(self):
+        strokes = [s for s in sample_strokes() if 'points' in s]
+        self.assert_parity(make_submission(self.question, strokes=strokes, events=sample_events()))
+
+    def test_v2_submission_matches_json_path(self):
+        strokes = [s for s in sample_strokes() if 'columns' in s]
+        self.assert_parity(make_submission(self.question, strokes=strokes, events=sample_events()))
+
+    def test_mixed_submission_with_visible_strokes_matches_json_path(self):
+        strokes = sample_strokes()
+        payload = make_submission(
+            self.question, strokes=strokes, events=sample_events(), visible_strokes=strokes[2:], label=1,
+            problem_name='스트리밍 테스트', difficulty=40,
+        )
+        payload['session_data']['statistics'].update({'undoCount': 1, 'redoCount': 1})
+        self.assert_parity(payload)
+
+    def test_packed_point_storage_matches_json_path(self):
+        payload = make_submission(self.question, strokes=sample_strokes(), events=sample_events())
+        self.assert_parity(payload, batch_sizes=(6, 2000), STROKE_POINT_STORAGE='both')
+
+    @override_settings(VERIFY_ASYNC=True)
+    def test_visible_strokes_sent_to_mathpix_match(self):
+        strokes = sample_strokes()
+        # id가 없는 가시 스트로크는 DB와 대조할 수 없으므로 원본 그대로 전송
+        anonymous = v2_stroke(None, count=4, start=2500, x0=300)
+        del anonymous['id']
+        payload = make_submission(
+            self.question, strokes=strokes, visible_strokes=[strokes[1], strokes[3], anonymous], correct=True
+        )
+
+        def mathpix_input(session_id):
+            job = VerificationJob.objects.get(session_uuid=session_id)
+            return sorted(tuple(map(tuple, decode_stroke_xyt(stroke))) for stroke in job.strokes)
+
+        expected = mathpix_input(self.submit(payload, streaming=False))
+        self.assertEqual(len(expected), 3)
+        for batch_size in (1, 2000):
+            with self.subTest(batch_size=batch_size):
+                self.assertEqual(mathpix_input(self.submit(payload, streaming=True, batch_size=batch_size)), expected)
+
+    def test_session_created_at_is_receive_time(self):
+        # 세션 행은 마지막에 만들지만 created_at은 적재한 행의 recorded_on보다 늦으면 안 됨
+        # (본문을 읽는 도중 자정이 지난 경우 - 파티션 정리가 세션을 놓침)
+        received_at = timezone.now() - timedelta(days=1)
+        with mock.patch('api.views.timezone') as views_timezone:
+            views_timezone.now.return_value = received_at
+            session_id = self.submit(make_submission(self.question, strokes=sample_strokes()), streaming=True)
+
+        session = Session.objects.get(pk=session_id)
+        self.assertEqual(session.created_at, received_at)
+        recorded_on = StrokePoint.objects.filter(stroke__session_id=session_id).values_list('recorded_on', flat=True)
+        self.assertLessEqual(timezone.localdate(session.created_at), min(recorded_on))
+
+
+@override_settings(INGEST_STREAMING_MIN_BYTES=1)
+class StreamingRejectTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+
+    def post_raw(self, body):
+        with mock.patch('api.views.save_streamed_submission', wraps=views.save_streamed_submission) as spy:
+            response = self.client.post(VERIFY_URL, data=body, content_type='application/json')
+        spy.assert_called_once()
+        return response
+
+    def assert_rejected(self, response):
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Session.objects.count(), 0)
+        self.assertEqual(Stroke.objects.count(), 0)
+        self.assertEqual(Event.objects.count(), 0)
+
+    @override_settings(INGEST_BATCH_SIZE=5)
+    def test_truncated_body_rolls_back_ingested_batches(self):
+        body = json.dumps(make_submission(self.question, strokes=sample_strokes(), events=sample_events()))
+        # 스트로크 배치 몇 개가 적재된 뒤 끊긴 본문
+        cut = body.index('"s5"')
+
+        self.assert_rejected(self.post_raw(body[:cut]))
+
+    def test_invalid_json(self):
+        for body in ('{"question_id": 1,, }', '{"question_id": 1} trailing', 'not json', '{"question_id'):
+            with self.subTest(body=body):
+                self.assert_rejected(self.post_raw(body))
+
+    def test_non_object_body(self):
+        for body in ('[1, 2, 3]', '"text"', '42'):
+            with self.subTest(body=body):
+                self.assert_rejected(self.post_raw(body))
+
+
+class ParseSubmissionStreamTests(SimpleTestCase):
+    def parse(self, payload, batch_size=3):
+        stroke_batches, event_batches = [], []
+        data, visible = parse_submission_stream(
+            io.BytesIO(json.dumps(payload).encode()), stroke_batches.append, event_batches.append, batch_size
+        )
+        return data, visible, stroke_batches, event_batches
+
+    def test_arrays_are_emptied_and_visible_strokes_reduced_to_ids(self):
+        strokes = [v1_stroke('a', count=2), v2_stroke('b', count=2), v1_stroke(7, count=2)]
+        anonymous = {'points': [{'x': 1, 'y': 2, 'timestamp': 3}]}
+        payload = {
+            'question_id': 1,
+            'session_data': {
+                'metadata': {'sessionId': 'x'},
+                'canvasData': {'strokes': strokes, 'events': [{'type': 'undo'}], 'visibleStrokes': [strokes[0], strokes[2], anonymous]},
+            },
+        }
+        data, visible, stroke_batches, event_batches = self.parse(payload)
+
+        self.assertEqual(visible, {'ids': ['a', '7'], 'strokes': [anonymous]})
+        self.assertEqual(data['session_data']['canvasData'], {'strokes': [], 'events': [], 'visibleStrokes': []})
+        self.assertEqual(data['session_data']['metadata'], {'sessionId': 'x'})
+        self.assertEqual([s for batch in stroke_batches for s in batch], strokes)
+        self.assertEqual(event_batches, [[{'type': 'undo'}]])
+
+    def test_batches_split_on_point_count(self):
+        strokes = [v1_stroke('a', count=2), v1_stroke('b', count=2), v2_stroke('c', count=5), v1_stroke('d', count=1)]
+        _, visible, stroke_batches, _ = self.parse({'session_data': {'canvasData': {'strokes': strokes}}}, batch_size=4)
+
+        self.assertIsNone(visible)
+        self.assertEqual([[s['id'] for s in batch] for batch in stroke_batches], [['a', 'b'], ['c'], ['d']])
+
+    def test_empty_visible_strokes_is_not_none(self):
+        _, visible, _, _ = self.parse({'session_data': {'canvasData': {'strokes': [], 'visibleStrokes': []}}})
+
+        self.assertEqual(visible, {'ids': [], 'strokes': []})
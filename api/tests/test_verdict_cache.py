@@ -0,0 +1,84 @@
+"""
+api.verdict_cache 풀이 텍스트 정규화 / 캐시 키 테스트
+
+표기만 다른 풀이는 같은 키가 되고, 수식의 의미가 다른 풀이는 다른 키가 되어야 합니다.
+"""
+
+import unicodedata
+
+from django.test import SimpleTestCase
+
+from api.verdict_cache import normalize_solution_text, verdict_cache_key
+from core.models import Question
+
+
+class NormalizeSolutionTextTests(SimpleTestCase):
+    def assert_equivalent(self, a, b):
+        self.assertEqual(normalize_solution_text(a), normalize_solution_text(b), f"{a!r} / {b!r}")
+
+    def assert_distinct(self, a, b):
+        self.assertNotEqual(normalize_solution_text(a), normalize_solution_text(b), f"{a!r} / {b!r}")
+
+    def test_equivalent_spellings(self):
+        cases = [
+            ('x + 1 = 2', 'x+1=2'),
+            ('  x+1\n=\t2 ', 'x+1=2'),
+            (r'\dfrac{1}{2}', r'\frac{1}{2}'),
+            (r'\tfrac{a}{b}', r'\frac{a}{b}'),
+            (r'\left( x + 1 \right)', '(x+1)'),
+            (r'\displaystyle \sum_{i=1}^{n} i', r'\sum_{i=1}^{n}i'),
+            (r'a\,b', 'a b'),
+            (r'\Big[ x \Big]', '[x]'),
+            (unicodedata.normalize('NFD', '값은 é'), unicodedata.normalize('NFC', '값은 é')),
+        ]
+        for a, b in cases:
+            with self.subTest(a=a):
+                self.assert_equivalent(a, b)
+
+    def test_meaning_changing_differences_are_kept(self):
+        cases = [
+            ('x²', 'x2'),
+            ('½', '1/2'),
+            ('½', '1⁄2'),
+            ('x₁', 'x1'),
+            ('ﬁ', 'fi'),
+            ('12', '1 2'),
+            (r'\sin x', r'\sinx'),
+            (r'\frac{1}{2}', r'\frac{2}{1}'),
+            (r'\left(x\right)', r'\leftarrow x'),
+            (r'\dfrac12', r'\dfracs12'),
+        ]
+        for a, b in cases:
+            with self.subTest(a=a):
+                self.assert_distinct(a, b)
+
+    def test_superscript_survives_normalization(self):
+        self.assertEqual(normalize_solution_text('x² + ½'), 'x²+½')
+
+    def test_empty_and_none(self):
+        self.assertEqual(normalize_solution_text(None), '')
+        self.assertEqual(normalize_solution_text('   '), '')
+
+
+class VerdictCacheKeyTests(SimpleTestCase):
+    def make_question(self, **overrides):
+        fields = {'id': 7, 'problem': '식을 간단히 하시오.', 'answer': '3', 'choices': ['1', '2', '3'], 'description': []}
+        fields.update(overrides)
+        return Question(**fields)
+
+    def test_equivalent_solutions_share_key(self):
+        question = self.make_question()
+
+        self.assertEqual(
+            verdict_cache_key(question, r'\dfrac{x}{2} = 1'),
+            verdict_cache_key(question, r'\frac{x}{2}=1'),
+        )
+
+    def test_key_changes_with_solution_meaning_and_question(self):
+        question = self.make_question()
+
+        self.assertNotEqual(verdict_cache_key(question, 'x²=4'), verdict_cache_key(question, 'x2=4'))
+        self.assertNotEqual(
+            verdict_cache_key(question, 'x=2'),
+            verdict_cache_key(self.make_question(answer='2'), 'x=2'),
+        )
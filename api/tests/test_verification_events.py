@@ -0,0 +1,56 @@
+"""
+비동기 풀이 검증 결과 수신 경로 테스트 (폴링 기본, SSE는 VERIFY_SSE_ENABLED일 때만)
+"""
+
+import uuid
+
+from django.test import TestCase, override_settings
+
+from api.models import VerificationJob
+from api.verification_queue import describe_verification_job
+
+
+class VerificationEventsTests(TestCase):
+    def setUp(self):
+        self.job = VerificationJob.objects.create(session_uuid=uuid.uuid4(), question_id=1, strokes=[])
+
+    def test_polling_by_default(self):
+        description = describe_verification_job(self.job)
+
+        self.assertNotIn('events_url', description)
+        self.assertEqual(description['status_url'], f'/api/verifications/{self.job.id}/')
+        self.assertEqual(description['poll_interval'], 2)
+
+    @override_settings(VERIFY_SSE_ENABLED=True, VERIFY_POLL_INTERVAL_SECONDS=5)
+    def test_events_url_only_when_sse_enabled(self):
+        description = describe_verification_job(self.job)
+
+        self.assertEqual(description['events_url'], f'/api/verifications/{self.job.id}/events/')
+        self.assertEqual(description['poll_interval'], 5)
+
+    def test_events_endpoint_disabled_by_default(self):
+        response = self.client.get(f'/api/verifications/{self.job.id}/events/')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.json()['success'])
+
+    @override_settings(VERIFY_SSE_ENABLED=True)
+    def test_events_endpoint_streams_result_when_enabled(self):
+        self.job.status = VerificationJob.STATUS_DONE
+        self.job.result = {'total_score': 90}
+        self.job.save()
+
+        response = self.client.get(f'/api/verifications/{self.job.id}/events/')
+        body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn('event: result', body)
+        self.assertIn('"verification":{"total_score":90}', body)
+
+    @override_settings(VERIFY_POLL_INTERVAL_SECONDS=7)
+    def test_status_retry_after_uses_poll_interval(self):
+        response = self.client.get(f'/api/verifications/{self.job.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertEqual(response.json()['data']['status'], VerificationJob.STATUS_PENDING)
@@ -0,0 +1,173 @@
+"""
+스트로크 wire 형식 / session_data 요청 시점 검증 테스트
+
+형식이 잘못된 제출은 적재(동기), 대기열(INGEST_ASYNC), 청크 업로드, 스트리밍 경로 모두에서
+저장 전에 400으로 거부되어야 합니다.
+"""
+
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api import views
+from api.models import IngestJob, Session, SessionChunk, Stroke
+from api.tests.helpers import LocalStorageMixin, make_question, make_submission, post_json, v1_stroke, v2_stroke
+from api.wire import INT32_MAX, validate_events, validate_stroke, validate_strokes
+
+VERIFY_URL = '/api/verify-solution/'
+
+
+def bad_v2_stroke(stroke_id='bad'):
+    """x 컬럼 길이가 t와 다른 v2 스트로크"""
+    stroke = v2_stroke(stroke_id)
+    stroke['columns']['x'] = stroke['columns']['x'][:-1]
+    return stroke
+
+
+class ValidateStrokeTests(SimpleTestCase):
+    def test_valid_v1_and_v2_strokes(self):
+        validate_stroke(v1_stroke('a'))
+        validate_stroke(v2_stroke('b'))
+        validate_stroke({'id': 'empty', 'points': []})
+        self.assertIsNone(validate_strokes([v1_stroke('a'), v2_stroke('b')]))
+
+    def test_integral_float_deltas_are_accepted(self):
+        validate_stroke({'columns': {'t': [0.0, 8.0], 'x': [10.0, 1.0], 'y': [20, 2]}})
+
+    def test_optional_value_columns_may_hold_null(self):
+        stroke = v2_stroke('a', count=3)
+        stroke['columns']['tx'] = [None, 5, None]
+        validate_stroke(stroke)
+
+    def test_rejects_malformed_strokes(self):
+        cases = {
+            'not a dict': 'stroke',
+            'v2 length mismatch': bad_v2_stroke(),
+            'v2 columns not a dict': {'columns': [1, 2, 3]},
+            'v2 column not a list': {'columns': {'t': 0, 'x': [1], 'y': [1]}},
+            'v2 null delta': {'columns': {'t': [0, None], 'x': [1, 2], 'y': [1, 2]}},
+            'v2 string delta': {'columns': {'t': [0, '8'], 'x': [1, 2], 'y': [1, 2]}},
+            'v2 fractional x delta': {'columns': {'t': [0, 8, 8], 'x': [10.4, 0.6, 0.6], 'y': [1, 2, 2]}},
+            'v2 fractional t delta': {'columns': {'t': [0, 7.5], 'x': [1, 2], 'y': [1, 2]}},
+            'v2 decoded x overflow': {'columns': {'t': [0, 1], 'x': [INT32_MAX, 1], 'y': [0, 0]}},
+            'v2 string pressure': {'columns': {'t': [0], 'x': [1], 'y': [1], 'p': ['hi']}},
+            'v1 points not a list': {'points': {'x': 1}},
+            'v1 point not a dict': {'points': [[1, 2]]},
+            'v1 null x': {'points': [{'x': None, 'y': 1, 'timestamp': 0}]},
+            'v1 string pressure': {'points': [{'x': 1, 'y': 1, 'timestamp': 0, 'pressure': 'hard'}]},
+            'v1 timestamp overflow': {'startTime': 0, 'points': [{'x': 1, 'y': 1, 'timestamp': 2 ** 40}]},
+            'startTime not a number': {'startTime': '1000', 'points': []},
+            'pointerType not a string': {'pointerType': 3, 'points': []},
+        }
+        for name, stroke in cases.items():
+            with self.subTest(name), self.assertRaises(ValueError):
+                validate_stroke(stroke)
+
+    def test_list_validation_reports_label_and_index(self):
+        message = validate_strokes([v1_stroke('a'), bad_v2_stroke()], 'canvasData.strokes', start=10)
+
+        self.assertTrue(message.startswith('canvasData.strokes[11]: '))
+        self.assertIsNotNone(validate_strokes({'a': 1}))
+
+    def test_validate_events(self):
+        self.assertIsNone(validate_events([{'type': 'zoom', 'timestamp': 1000, 'count': 3}]))
+        self.assertTrue(validate_events([{'type': 'zoom'}, 'pan'], 'events').startswith('events[1]: '))
+        self.assertIsNotNone(validate_events([{'type': 'zoom', 'timestamp': 'now'}]))
+        self.assertIsNotNone(validate_events('zoom'))
+
+
+class SubmissionValidationTests(LocalStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question()
+
+    def post_streamed(self, payload):
+        """스트리밍 경로로 처리되었는지 확인하며 POST"""
+        with mock.patch('api.views.save_streamed_submission', wraps=views.save_streamed_submission) as spy:
+            response = post_json(self.client, VERIFY_URL, payload)
+        spy.assert_called_once()
+        return response
+
+    def assert_rejected(self, response):
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Session.objects.count(), 0)
+        self.assertEqual(Stroke.objects.count(), 0)
+
+    def test_sync_rejects_v2_length_mismatch(self):
+        payload = make_submission(self.question, strokes=[v2_stroke('ok'), bad_v2_stroke()])
+        response = post_json(self.client, VERIFY_URL, payload)
+
+        self.assert_rejected(response)
+        self.assertIn('canvasData.strokes[1]', response.json()['error'])
+
+    @override_settings(INGEST_ASYNC=True)
+    def test_async_rejects_before_enqueueing(self):
+        payload = make_submission(self.question, strokes=[bad_v2_stroke()], session_id=uuid.uuid4())
+        response = post_json(self.client, VERIFY_URL, payload)
+
+        self.assert_rejected(response)
+        self.assertEqual(IngestJob.objects.count(), 0)
+
+    def test_rejects_bad_visible_strokes_and_events(self):
+        for canvas in ({'visible_strokes': [bad_v2_stroke()]}, {'events': ['zoom']}):
+            with self.subTest(canvas):
+                payload = make_submission(self.question, strokes=[v1_stroke('a')])
+                if 'visible_strokes' in canvas:
+                    payload['session_data']['canvasData']['visibleStrokes'] = canvas['visible_strokes']
+                else:
+                    payload['session_data']['canvasData']['events'] = canvas['events']
+                self.assert_rejected(post_json(self.client, VERIFY_URL, payload))
+
+    def test_rejects_non_object_session_data_and_body(self):
+        payload = make_submission(self.question)
+        for session_data in ('session', [1, 2], {'canvasData': []}):
+            with self.subTest(session_data):
+                payload['session_data'] = session_data
+                self.assert_rejected(post_json(self.client, VERIFY_URL, payload))
+        self.assert_rejected(post_json(self.client, VERIFY_URL, [payload]))
+
+    def test_valid_submission_is_saved(self):
+        payload = make_submission(self.question, strokes=[v1_stroke('a'), v2_stroke('b')])
+        response = post_json(self.client, VERIFY_URL, payload)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Stroke.objects.count(), 2)
+
+    def test_chunk_upload_rejects_bad_stroke(self):
+        session_uuid = uuid.uuid4()
+        url = f'/api/sessions/{session_uuid}/chunks/'
+        body = {'question_id': self.question.id, 'seq': 0, 'strokes': [bad_v2_stroke()], 'events': []}
+
+        response = post_json(self.client, url, body)
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(SessionChunk.objects.count(), 0)
+        self.assertEqual(Stroke.objects.count(), 0)
+
+        response = post_json(self.client, url, [body])
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(INGEST_STREAMING_MIN_BYTES=1, INGEST_BATCH_SIZE=2)
+    def test_streaming_rejects_bad_stroke_and_rolls_back(self):
+        # 앞 배치는 이미 INSERT된 뒤 세 번째 스트로크에서 거부 → 트랜잭션 롤백
+        strokes = [v1_stroke('a'), v1_stroke('b'), bad_v2_stroke('c')]
+        response = self.post_streamed(make_submission(self.question, strokes=strokes))
+
+        self.assert_rejected(response)
+        self.assertIn('canvasData.strokes[2]', response.json()['error'])
+
+    def test_rejects_fractional_delta_columns(self):
+        stroke = v2_stroke('drift', count=4)
+        stroke['columns']['x'] = [10.4, 0.6, 0.6, 0.6]
+        response = post_json(self.client, VERIFY_URL, make_submission(self.question, strokes=[stroke]))
+
+        self.assert_rejected(response)
+        self.assertIn('canvasData.strokes[0]', response.json()['error'])
+
+    @override_settings(INGEST_STREAMING_MIN_BYTES=1)
+    def test_streaming_rejects_non_object_session_data(self):
+        payload = make_submission(self.question)
+        payload['session_data'] = ['not', 'an', 'object']
+
+        self.assert_rejected(self.post_streamed(payload))
@@ -26,4 +26,28 @@ urlpatterns = [
     # 문제 풀이 검증 (필기 인식 + AI 평가)
     # POST  
     path('verify-solution/', views.verify_solution, name='verify_solution'),
+
+    # 풀이 중 스트로크/이벤트 청크 업로드
+    # POST /api/sessions/<session_uuid>/chunks/
+    path('sessions/<uuid:session_uuid>/chunks/', views.upload_session_chunk, name='upload_session_chunk'),
+
+    # 청크 업로드한 세션 제출 (메타데이터 + 답안만 전송, 응답은 verify-solution과 동일)
+    # POST /api/sessions/<session_uuid>/finalize/
+    path('sessions/<uuid:session_uuid>/finalize/', views.finalize_session, name='finalize_session'),
+
+    # 저장된 세션 필기 데이터 조회 (lod로 단순화 level 선택)
+    # GET /api/sessions/<session_uuid>/replay/?lod=2
+    path('sessions/<uuid:session_uuid>/replay/', views.get_session_replay, name='get_session_replay'),
+
+    # 비동기 풀이 검증 결과 조회 (VERIFY_ASYNC, 폴링)
+    # GET /api/verifications/<job_id>/
+    path('verifications/<uuid:job_id>/', views.get_verification_status, name='get_verification_status'),
+
+    # 비동기 풀이 검증 결과 구독 (Server-Sent Events)
+    # GET /api/verifications/<job_id>/events/
+    path('verifications/<uuid:job_id>/events/', views.stream_verification_events, name='stream_verification_events'),
+
+    # 비동기 적재 대기열 지표 (깊이, 지연 시간)
+    # GET /api/ingest/stats/
+    path('ingest/stats/', views.ingest_stats, name='ingest_stats'),
 ]
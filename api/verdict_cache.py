@@ -0,0 +1,163 @@
+"""
+OpenAI 풀이 채점 결과 캐시
+
+verify_solution_with_openai()는 제출마다 문제 + 학생 풀이(Mathpix 변환 텍스트)로 프롬프트를 만들어
+OpenAI를 호출합니다. 같은 문제에 같은 모범 풀이를 쓰는 학생이 많으므로, 채점 결과(SolutionVerification)를
+Django 캐시(CACHES['verdicts'])에 저장하여 같은 풀이는 다시 채점하지 않습니다.
+
+키 구성:
+- question.id, question.updated_at
+- 프롬프트에 들어가는 문제 내용(문제 / 정답 / 선택지 / 모범 풀이)의 해시
+  (updated_at은 save()에서만 갱신되므로 QuerySet.update()나 SQL로 직접 고친 경우도 무효화)
+- 정규화한 풀이 텍스트 (공백 / 유니코드 조합 방식 / 같은 의미의 LaTeX 명령 차이 제거)
+
+TTL / 크기 제한은 VERDICT_CACHE_TTL_SECONDS / VERDICT_CACHE_MAX_ENTRIES이며,
+적중률은 /api/ingest/stats/의 verdict_cache에서 확인합니다.
+캐시 오류는 로그만 남기고 OpenAI를 그대로 호출합니다.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import caches
+
+from api.ocr_cache import read_cache_stats, record_cache_stat
+
+VERDICT_CACHE_ALIAS = 'verdicts'
+
+# 채점 프롬프트 / 모델(gpt-5-nano) / SolutionVerification 스키마 / 풀이 정규화 규칙이 바뀌면 올려서 기존 결과를 무효화
+# (v2: NFKC → NFC - NFKC로 만든 키는 "x²"와 "x2"가 같은 키였음)
+KEY_VERSION = 'verdict-v2'
+
+_STATS_KEYS = {"hits": "verdict:stats:hits", "misses": "verdict:stats:misses", "stores": "verdict:stats:stores"}
+
+# 채점 결과가 달라지지 않는 LaTeX 표기 차이
+_LATEX_ALIASES = (
+    (re.compile(r'\\[dt]frac(?![a-zA-Z])'), r'\\frac'),
+    (re.compile(r'\\(?:left|right|big|Big|bigg|Bigg)(?![a-zA-Z])'), ''),
+    (re.compile(r'\\displaystyle(?![a-zA-Z])'), ''),
+    (re.compile(r'\\[,;:! ]'), ' '),  # 수식 안의 간격 명령
+)
+_WHITESPACE = re.compile(r'\s+')
+# 영숫자 / LaTeX 명령 사이가 아닌 공백 (예: "x + 1" → "x+1", "\sin x"는 유지)
+_INSIGNIFICANT_SPACE = re.compile(r'(?<=[^\w\s]) | (?=[^\w\s\\])')
+
+
+def is_verdict_cache_enabled():
+    """
+    채점 결과 캐시 사용 여부
+
+    Returns:
+        bool: settings.VERDICT_CACHE_ENABLED이고 CACHES['verdicts']가 설정된 경우
+    """
+    return getattr(settings, 'VERDICT_CACHE_ENABLED', False) and VERDICT_CACHE_ALIAS in settings.CACHES
+
+
+def normalize_solution_text(text):
+    """
+    캐시 키용 풀이 텍스트 정규화
+
+    NFKC는 "x²" → "x2", "½" → "1⁄2"처럼 수식의 의미를 바꾸므로 NFC(조합 방식 차이만 통일)를 씁니다.
+
+    Args:
+        text (str): Mathpix 변환 텍스트 (LaTeX 포함)
+
+    Returns:
+        str: 정규화된 텍스트
+    """
+    text = unicodedata.normalize('NFC', text or '')
+    for pattern, replacement in _LATEX_ALIASES:
+        text = pattern.sub(replacement, text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    return _INSIGNIFICANT_SPACE.sub('', text)
+
+
+def question_fingerprint(question):
+    """
+    채점 프롬프트에 들어가는 문제 내용의 해시
+
+    Args:
+        question (Question): 문제 객체
+
+    Returns:
+        str: sha256 hex
+    """
+    content = json.dumps(
+        [question.problem, question.answer, list(question.choices or []), list(question.description or [])],
+        ensure_ascii=False, separators=(',', ':'),
+    )
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def verdict_cache_key(question, user_solution):
+    """
+    (문제, 문제 수정 시각, 문제 내용, 정규화 풀이)의 캐시 키
+
+    Args:
+        question (Question): 문제 객체
+        user_solution (str): 학생 풀이 텍스트
+
+    Returns:
+        str: 캐시 키
+    """
+    updated_at = question.updated_at.isoformat() if question.updated_at else ''
+    digest = hashlib.sha256()
+    for part in (KEY_VERSION, str(question.id), updated_at, question_fingerprint(question),
+                 normalize_solution_text(user_solution)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return f"verdict:{question.id}:{digest.hexdigest()}"
+
+
+def get_cached_verdict(key):
+    """
+    캐시된 채점 결과 조회 (적중 / 미스 기록)
+
+    Args:
+        key (str): verdict_cache_key() 결과
+
+    Returns:
+        dict | None: SolutionVerification.model_dump() 결과 (없거나 캐시를 쓰지 않으면 None)
+    """
+    if not is_verdict_cache_enabled():
+        return None
+    try:
+        verdict = caches[VERDICT_CACHE_ALIAS].get(key)
+    except Exception as e:
+        print(f"[채점 캐시] 조회 실패: {e}")
+        return None
+    record_cache_stat(VERDICT_CACHE_ALIAS, _STATS_KEYS["hits" if verdict is not None else "misses"])
+    return verdict
+
+
+def store_verdict(key, verdict):
+    """
+    채점 결과 저장 (TTL은 CACHES['verdicts']['TIMEOUT'])
+
+    Args:
+        key (str): verdict_cache_key() 결과
+        verdict (dict): SolutionVerification.model_dump() 결과
+    """
+    if not is_verdict_cache_enabled():
+        return
+    try:
+        caches[VERDICT_CACHE_ALIAS].set(key, verdict)
+    except Exception as e:
+        print(f"[채점 캐시] 저장 실패: {e}")
+        return
+    record_cache_stat(VERDICT_CACHE_ALIAS, _STATS_KEYS["stores"])
+
+
+def verdict_cache_stats():
+    """
+    채점 캐시 적중률 지표
+
+    Returns:
+        dict: {"enabled", "backend", "hits", "misses", "stores", "hit_rate"}
+    """
+    if not is_verdict_cache_enabled():
+        return {"enabled": False}
+    return read_cache_stats(VERDICT_CACHE_ALIAS, _STATS_KEYS)
@@ -0,0 +1,313 @@
+"""
+비동기 풀이 검증 대기열
+
+정답 제출의 Mathpix(필기 → 텍스트) + OpenAI(풀이 평가) 검증은 수~수십 초가 걸려
+요청 처리 중에 실행하면 그동안 동기 웹 워커 하나가 묶입니다. 반 전체가 동시에 제출하면
+워커가 모두 외부 API 대기에 묶여 다른 요청까지 밀립니다.
+
+VERIFY_ASYNC가 켜져 있으면 제출 응답은 정답 여부와 검증 작업 id만 바로 돌려주고,
+검증은 verification_jobs 테이블을 거쳐 `python manage.py run_verification_worker`가
+스레드 풀(--concurrency)로 처리합니다. 클라이언트는 결과를
+
+    GET /api/verifications/<id>/          폴링 (VERIFY_POLL_INTERVAL_SECONDS 간격)
+    GET /api/verifications/<id>/events/   Server-Sent Events (VERIFY_SSE_ENABLED일 때만, 완료 시 result 이벤트)
+
+로 받습니다. SSE 연결은 끝날 때까지 웹 워커 하나를 차지하므로 기본으로 꺼져 있습니다. 처리 도중 워커가 죽은 작업은 visibility_timeout이 지나면 다른 워커가 다시 가져갑니다.
+"""
+
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from api.models import VerificationJob
+
+FINISHED_STATUSES = (VerificationJob.STATUS_DONE, VerificationJob.STATUS_FAILED)
+
+
+def is_async_verification_enabled():
+    """
+    비동기 풀이 검증 모드 여부
+
+    Returns:
+        bool: settings.VERIFY_ASYNC (기본 False)
+    """
+    return getattr(settings, 'VERIFY_ASYNC', False)
+
+
+def is_sse_enabled():
+    """
+    SSE 결과 구독 사용 여부
+
+    Returns:
+        bool: settings.VERIFY_SSE_ENABLED (기본 False)
+    """
+    return getattr(settings, 'VERIFY_SSE_ENABLED', False)
+
+
+def get_poll_interval():
+    """
+    클라이언트 폴링 간격(초)
+
+    Returns:
+        int: settings.VERIFY_POLL_INTERVAL_SECONDS (기본 2)
+    """
+    return getattr(settings, 'VERIFY_POLL_INTERVAL_SECONDS', 2)
+
+
+def get_max_attempts():
+    """
+    실패 확정 전 최대 검증 시도 횟수 (워커 비정상 종료로 다시 가져간 경우 포함)
+
+    Returns:
+        int: settings.VERIFY_MAX_ATTEMPTS (기본 3)
+    """
+    return getattr(settings, 'VERIFY_MAX_ATTEMPTS', 3)
+
+
+def enqueue_verification_job(session_uuid, question_id, strokes):
+    """
+    검증 작업을 대기열에 추가
+
+    Args:
+        session_uuid (UUID): 세션 UUID
+        question_id (int): 문제 ID
+        strokes (list): Mathpix로 보낼 가시 스트로크 배열
+
+    Returns:
+        VerificationJob: 생성된 작업
+    """
+    return VerificationJob.objects.create(
+        session_uuid=session_uuid,
+        question_id=question_id,
+        strokes=strokes,
+    )
+
+
+def describe_verification_job(job):
+    """
+    제출 응답에 넣을 검증 작업 정보
+
+    events_url은 SSE가 켜져 있을 때만 넣습니다 (없으면 poll_interval초마다 status_url 폴링).
+
+    Returns:
+        dict: {"id", "status", "status_url", "poll_interval"} (+ "events_url")
+    """
+    description = {
+        "id": str(job.id),
+        "status": job.status,
+        "status_url": reverse('api:get_verification_status', args=[job.id]),
+        "poll_interval": get_poll_interval(),
+    }
+    if is_sse_enabled():
+        description["events_url"] = reverse('api:stream_verification_events', args=[job.id])
+    return description
+
+
+def serialize_verification_job(job):
+    """
+    조회 API / SSE 이벤트의 작업 상태
+
+    Returns:
+        dict: {"id", "session_id", "status", "verification", "error"}
+            verification은 완료 전이면 None, error는 실패 확정 시에만 값이 있음
+    """
+    return {
+        "id": str(job.id),
+        "session_id": str(job.session_uuid),
+        "status": job.status,
+        "verification": job.result,
+        "error": "풀이 검증에 실패했습니다." if job.status == VerificationJob.STATUS_FAILED else None,
+    }
+
+
+def claim_verification_jobs(batch_size=8, visibility_timeout=300):
+    """
+    처리할 작업을 가져와 'processing' 상태로 표시
+
+    pending 작업과, 워커가 죽어 visibility_timeout(초)이 지나도록 끝나지 않은 processing 작업을
+    오래된 순으로 가져옵니다. SKIP LOCKED로 다른 워커가 잡은 행은 건너뜁니다.
+
+    Args:
+        batch_size (int): 한 번에 가져올 최대 작업 수
+        visibility_timeout (int): processing 작업을 재시도 대상으로 볼 경과 시간(초)
+
+    Returns:
+        list: VerificationJob 배열 (오래된 순)
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=visibility_timeout)
+
+    with transaction.atomic():
+        jobs = list(
+            VerificationJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=VerificationJob.STATUS_PENDING) |
+                Q(status=VerificationJob.STATUS_PROCESSING, started_at__lt=stale_before)
+            )
+            .order_by('created_at')[:batch_size]
+        )
+        for job in jobs:
+            job.status = VerificationJob.STATUS_PROCESSING
+            job.started_at = now
+            job.attempts += 1
+        VerificationJob.objects.bulk_update(jobs, ['status', 'started_at', 'attempts'])
+
+    return jobs
+
+
+def process_verification_jobs(jobs, concurrency=8, max_attempts=None):
+    """
+    작업들을 최대 concurrency개씩 동시에 검증하고 결과 기록
+
+    문제 조회와 결과 기록은 메인 스레드에서 하고, 스레드 풀은 Mathpix / OpenAI 호출만 수행합니다.
+    run_solution_verification()은 외부 API 오류를 0점 결과로 바꿔 돌려주므로 (동기 모드와 같은 응답)
+    여기서 실패로 남는 것은 문제가 삭제된 경우 등 예상치 못한 오류뿐입니다.
+
+    Args:
+        jobs (list): claim_verification_jobs()로 가져온 작업
+        concurrency (int): 동시 검증 수
+        max_attempts (int, optional): 이 횟수를 넘으면 'failed'로 확정 (None이면 설정값)
+
+    Returns:
+        tuple: (성공 수, 실패 수)
+    """
+    # views가 이 모듈을 import하므로 순환 import를 피하기 위해 지연 import
+    from core.models import Question
+    from api.views import build_verification_data, run_solution_verification
+
+    max_attempts = max_attempts or get_max_attempts()
+    if not jobs:
+        return 0, 0
+
+    questions = Question.objects.select_related('category').in_bulk({job.question_id for job in jobs})
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {}
+        for job in jobs:
+            question = questions.get(job.question_id)
+            if question is None:
+                results[job.id] = Question.DoesNotExist(f"ID {job.question_id}에 해당하는 문제를 찾을 수 없습니다.")
+                continue
+            futures[job.id] = executor.submit(
+                run_solution_verification, question, job.strokes or [], True, job.session_uuid
+            )
+        for job_id, future in futures.items():
+            try:
+                results[job_id] = future.result()
+            except Exception as e:
+                results[job_id] = e
+
+    now = timezone.now()
+    done, failed = [], []
+    for job in jobs:
+        result = results.get(job.id)
+        if not isinstance(result, Exception):
+            job.status = VerificationJob.STATUS_DONE
+            job.result = build_verification_data(job.session_uuid, True, result)["verification"]
+            job.strokes = None  # 검증이 끝난 스트로크는 보관하지 않음
+            job.finished_at = now
+            job.last_error = None
+            done.append(job)
+            continue
+        job.last_error = f"{type(result).__name__}: {result}\n" + "".join(
+            traceback.format_exception(type(result), result, result.__traceback__)
+        )
+        if job.attempts >= max_attempts:
+            job.status = VerificationJob.STATUS_FAILED
+            job.finished_at = now
+        else:
+            job.status = VerificationJob.STATUS_PENDING
+        failed.append(job)
+        print(f"[verify] 작업 {job.id} 실패 (시도 {job.attempts}/{max_attempts}): {result}")
+
+    with transaction.atomic():
+        VerificationJob.objects.bulk_update(done, ['status', 'result', 'strokes', 'finished_at', 'last_error'])
+        VerificationJob.objects.bulk_update(failed, ['status', 'finished_at', 'last_error'])
+    return len(done), len(failed)
+
+
+def _sse_event(event, data):
+    """Server-Sent Events 메시지 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+def iter_verification_events(job_id, timeout=None, interval=None):
+    """
+    검증 작업 상태를 SSE 메시지로 생성 (상태가 바뀔 때 status, 끝나면 result 이벤트)
+
+    작업 행을 interval초마다 다시 읽습니다. timeout초 안에 끝나지 않으면 timeout 이벤트를 보내고
+    종료하며, 클라이언트는 다시 연결하거나 폴링으로 전환합니다.
+
+    Args:
+        job_id (UUID): 검증 작업 id
+        timeout (float, optional): 최대 연결 유지 시간(초) (None이면 VERIFY_SSE_TIMEOUT_SECONDS)
+        interval (float, optional): 상태 확인 주기(초) (None이면 VERIFY_SSE_POLL_SECONDS)
+
+    Yields:
+        str: SSE 메시지
+    """
+    timeout = timeout if timeout is not None else getattr(settings, 'VERIFY_SSE_TIMEOUT_SECONDS', 60)
+    interval = interval if interval is not None else getattr(settings, 'VERIFY_SSE_POLL_SECONDS', 1.0)
+    deadline = time.monotonic() + timeout
+
+    # 연결이 끊기면 브라우저 EventSource가 이 간격(ms) 뒤에 다시 연결
+    yield f"retry: {int(interval * 1000)}\n\n"
+    last_status = None
+    while True:
+        job = VerificationJob.objects.filter(id=job_id).first()
+        if job is None:
+            yield _sse_event('error', {"id": str(job_id), "error": "검증 작업을 찾을 수 없습니다."})
+            return
+        data = serialize_verification_job(job)
+        if job.status in FINISHED_STATUSES:
+            yield _sse_event('result', data)
+            return
+        if job.status != last_status:
+            last_status = job.status
+            yield _sse_event('status', data)
+        else:
+            # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+            yield ": keep-alive\n\n"
+        if time.monotonic() >= deadline:
+            yield _sse_event('timeout', data)
+            return
+        time.sleep(interval)
+
+
+def verification_stats():
+    """
+    검증 대기열 상태 지표 계산
+
+    Returns:
+        dict: {"depth", "pending", "processing", "failed", "lag_seconds"}
+    """
+    counts = dict(
+        VerificationJob.objects
+        .exclude(status=VerificationJob.STATUS_DONE)
+        .values_list('status')
+        .annotate(n=Count('id'))
+    )
+    oldest = (
+        VerificationJob.objects
+        .filter(status__in=[VerificationJob.STATUS_PENDING, VerificationJob.STATUS_PROCESSING])
+        .aggregate(oldest=Min('created_at'))['oldest']
+    )
+
+    pending = counts.get(VerificationJob.STATUS_PENDING, 0)
+    processing = counts.get(VerificationJob.STATUS_PROCESSING, 0)
+    return {
+        "depth": pending + processing,
+        "pending": pending,
+        "processing": processing,
+        "failed": counts.get(VerificationJob.STATUS_FAILED, 0),
+        "lag_seconds": round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0,
+    }
@@ -7,21 +7,41 @@ API 뷰 모듈
 
 import os
 import json
-import requests
 import uuid
-import gzip
 from datetime import datetime
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
+from django.utils import timezone
 from openai import OpenAI
 from pydantic import BaseModel
 from typing import List, Optional
 from core.models import Question, Category
-from api.models import Session, Stroke, StrokePoint, Event
-import boto3
-from botocore.exceptions import ClientError
+from core.mathpix_client import get_mathpix_client
+from api.models import Session, Stroke, Event, VerificationJob
+from api.ingest import get_batch_size, ingest_canvas_data, append_session_chunk, ChunkConflict, SessionAlreadyFinalized
+from api.event_coalescing import EventCoalescer
+from api.replay import export_canvas_data, export_visible_strokes
+from api.wire import decode_stroke_xyt, validate_events, validate_strokes
+from api.stroke_stats import refresh_session_summary, summarize_session_strokes
+from api.compression import open_request_body, read_request_body, RequestBodyError
+from api.streaming import ArchiveWriter, ijson, parse_submission_stream, should_stream_request
+from api.ingest_queue import is_async_ingest_enabled, enqueue_ingest_job, queue_stats
+from api.archive import (
+    archive_stats, get_archive_format, is_async_archive_enabled, is_json_archive_enabled,
+    store_session_archive, stream_session_archive,
+)
+from api.verification_queue import (
+    describe_verification_job, enqueue_verification_job, get_poll_interval, is_async_verification_enabled,
+    is_sse_enabled, iter_verification_events, serialize_verification_job, verification_stats,
+)
+from api.ocr_cache import get_cached_text, ocr_cache_stats, store_text, strokes_fingerprint
+from api.verdict_cache import get_cached_verdict, store_verdict, verdict_cache_key, verdict_cache_stats
+from api.idempotency import (
+    DuplicateSubmission, HashingReader, claim_submission, complete_submission,
+    compute_payload_hash, release_submission,
+)
 
 # OpenAI 클라이언트 초기화 (.env 파일에서 API 키 로드)
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -252,34 +272,56 @@ def get_question_detail(request, question_id):
         }, status=500, json_dumps_params={'ensure_ascii': False})
 
 
-def save_session_to_db_and_s3(question, session_data, user_answer, is_correct, problem_name, category_id, difficulty, label=None):
+def get_client_session_uuid(session_data):
     """
-    세션 데이터를 DB에 저장하고 원본 JSON을 S3에 업로드
+    프론트엔드가 생성한 세션 UUID (metadata.sessionId)
+
+    Args:
+        session_data (dict): 프론트엔드에서 전송된 세션 데이터
+
+    Returns:
+        UUID | None: metadata.sessionId가 없으면 None
+    """
+    session_id = session_data.get('metadata', {}).get('sessionId')
+    return uuid.UUID(session_id) if session_id else None
+
+
+def resolve_session_uuid(session_data):
+    """
+    세션 데이터에서 세션 UUID 결정
+
+    Args:
+        session_data (dict): 프론트엔드에서 전송된 세션 데이터
+
+    Returns:
+        UUID: metadata.sessionId가 있으면 그 값, 없으면 새 uuid4
+    """
+    return get_client_session_uuid(session_data) or uuid.uuid4()
+
+
+def build_session_fields(question, session_data, user_answer, is_correct, category_id, label=None):
+    """
+    세션 데이터로부터 Session 행의 필드 값 구성 (UUID 제외)
+
+    단일 제출(save_session_to_db_and_s3)과 분할 업로드 finalize가 같은 매핑을 사용합니다.
 
     Args:
         question (Question): 문제 객체
-        session_data (dict): 프론트엔드에서 전송된 전체 세션 데이터
+        session_data (dict): 프론트엔드에서 전송된 세션 데이터
         user_answer (str): 사용자가 입력한 답안
         is_correct (bool): 정답 여부
-        problem_name (str): 문제 이름
         category_id (int): 카테고리 ID
-        difficulty (int): 난이도
         label (int, optional): 치팅 여부 라벨 (0: 정상, 1: 치팅, None: 미분류)
 
     Returns:
-        tuple: (session_uuid, s3_url)
-
-    Raises:
-        Exception: DB 저장 또는 S3 업로드 실패 시
+        dict: Session 필드명 → 값
     """
-    # 1. 세션 메타데이터 추출
     metadata = session_data.get('metadata', {})
     device_caps = session_data.get('deviceCapabilities', {})
     canvas_data = session_data.get('canvasData', {})
     statistics = session_data.get('statistics', {})
-
-    # 세션 UUID (프론트엔드에서 생성한 것 사용 또는 새로 생성)
-    session_uuid = uuid.UUID(metadata.get('sessionId')) if metadata.get('sessionId') else uuid.uuid4()
+    device_info = session_data.get('deviceInfo', {})
+    canvas_info = session_data.get('canvasInfo', {})
 
     # 시작/종료 시간 파싱
     start_time = None
@@ -295,230 +337,1075 @@ def save_session_to_db_and_s3(question, session_data, user_answer, is_correct, p
         except:
             pass
 
+    return dict(
+        start_time=start_time,
+        end_time=end_time,
+        duration_ms=metadata.get('duration', 0),
+
+        # 문제 메타데이터
+        problem_id=question.id,
+        category=category_id or question.category.id,
+
+        # 기기/환경 정보
+        user_agent=device_info.get('userAgent', ''),
+        platform=device_info.get('platform', ''),
+        pixel_ratio=device_info.get('pixelRatio'),
+        screen_width=device_info.get('screenSize', {}).get('width'),
+        screen_height=device_info.get('screenSize', {}).get('height'),
+
+        # 캔버스 상태
+        logical_width=canvas_info.get('logicalSize', {}).get('width'),
+        logical_height=canvas_info.get('logicalSize', {}).get('height'),
+        css_width=canvas_info.get('cssSize', {}).get('width'),
+        css_height=canvas_info.get('cssSize', {}).get('height'),
+        zoom=canvas_info.get('transform', {}).get('zoom', 1.0),
+        pan_x=canvas_info.get('transform', {}).get('panX', 0),
+        pan_y=canvas_info.get('transform', {}).get('panY', 0),
+
+        # 포인터 기능 지원
+        supports_pressure=device_caps.get('pressure', False),
+        supports_tilt=device_caps.get('tilt', False),
+        supports_twist=device_caps.get('twist', False),
+        supports_coalesced=device_caps.get('coalesced', False),
+
+        # 요약 통계
+        stroke_count=statistics.get('strokeCount', 0) or len(canvas_data.get('strokes', [])),
+        total_distance_px=statistics.get('totalDistance', 0.0),
+        average_stroke_length_px=statistics.get('averageStrokeLength'),
+        undo_count=statistics.get('undoCount', 0),
+        redo_count=statistics.get('redoCount', 0),
+        eraser_count=statistics.get('eraserCount', 0),
+        zoom_count=statistics.get('zoomCount', 0),
+        pan_count=statistics.get('panCount', 0),
+        tool_change_count=statistics.get('toolChanges', 0),
+
+        # 사용자 답안
+        answer=str(user_answer) if user_answer else None,
+        is_correct=is_correct,
+
+        # 지도학습 라벨 (사용자 입력 또는 None)
+        # 0: 정상 풀이, 1: 참고자료 사용(치팅), None: 미분류
+        label=label
+    )
+
+
+def build_archive_metadata(question, session_uuid, user_answer, is_correct, problem_name, difficulty, label=None):
+    """
+    S3 백업 JSON 최상위에 추가할 메타 정보 구성
+
+    Returns:
+        dict: db_session_id, problem_id, problem_name, ... uploaded_at
+    """
+    return {
+        "db_session_id": str(session_uuid),
+        "problem_id": question.id,
+        "problem_name": problem_name,
+        "category_name": question.category.name,
+        "difficulty": difficulty,
+        "user_answer": user_answer,
+        "is_correct": is_correct,
+        "label": label,  # 치팅 여부 라벨 추가
+        "uploaded_at": datetime.utcnow().isoformat()
+    }
+
+
+def put_session_archive(question, session_uuid, compressed_body, is_correct):
+    """
+    gzip으로 압축된 세션 백업을 S3에 업로드 (api.archive)
+
+    ARCHIVE_ASYNC이면 archive_jobs 대기열에만 넣고, 동기 업로드가 실패하면
+    재시도 작업으로 남깁니다 (run_archive_worker / reconcile_archives가 처리).
+
+    Args:
+        question (Question): 문제 객체
+        session_uuid (UUID): 세션 UUID
+        compressed_body (bytes | file): gzip 압축된 JSON (파일 객체면 처음부터 읽음)
+        is_correct (bool): 정답 여부
+
+    Returns:
+        str: S3 URL (동기 업로드 실패 시 빈 문자열)
+    """
+    s3_url = store_session_archive(question.id, session_uuid, compressed_body, is_correct)
+    print_archive_result(session_uuid, s3_url)
+    return s3_url
+
+
+def print_archive_result(session_uuid, s3_url):
+    """세션 백업 결과 로그 (백업 형식 / 업로드 방식별)"""
+    if not is_json_archive_enabled():
+        print(f"세션 {session_uuid} 저장 완료 - Parquet 샤드로 백업 예정")
+    elif is_async_archive_enabled():
+        print(f"세션 {session_uuid} 백업 대기열에 추가 - S3: {s3_url}")
+    elif s3_url:
+        print(f"세션 {session_uuid} 저장 완료 - S3: {s3_url}")
+
+
+def upload_session_archive(question, session_uuid, session_data, user_answer, is_correct, problem_name, difficulty, label=None):
+    """
+    원본 세션 JSON을 gzip으로 압축하여 S3에 업로드
+
+    직렬화 / 압축 / 업로드를 스트리밍으로 처리하므로 session_data 외에 전체 JSON 사본을 만들지 않습니다.
+
+    Args:
+        question (Question): 문제 객체
+        session_uuid (UUID): 세션 UUID
+        session_data (dict): 백업할 전체 세션 데이터
+        user_answer (str): 사용자가 입력한 답안
+        is_correct (bool): 정답 여부
+        problem_name (str): 문제 이름
+        difficulty (int): 난이도
+        label (int, optional): 치팅 여부 라벨
+
+    Returns:
+        str: S3 URL (업로드 실패 / ARCHIVE_FORMAT='parquet'이면 빈 문자열)
+    """
+    # 전체 세션 데이터에 메타 정보 추가 (최상위 dict만 얕게 복사)
+    upload_data = {
+        **session_data,
+        **build_archive_metadata(question, session_uuid, user_answer, is_correct, problem_name, difficulty, label)
+    }
+
+    s3_url = stream_session_archive(question.id, session_uuid, upload_data, is_correct)
+    print_archive_result(session_uuid, s3_url)
+    return s3_url
+
+
+def save_session_to_db_and_s3(question, session_data, user_answer, is_correct, problem_name, category_id, difficulty, label=None, session_uuid=None):
+    """
+    세션 데이터를 DB에 저장하고 원본 JSON을 S3에 업로드
+
+    Args:
+        question (Question): 문제 객체
+        session_data (dict): 프론트엔드에서 전송된 전체 세션 데이터
+        user_answer (str): 사용자가 입력한 답안
+        is_correct (bool): 정답 여부
+        problem_name (str): 문제 이름
+        category_id (int): 카테고리 ID
+        difficulty (int): 난이도
+        label (int, optional): 치팅 여부 라벨 (0: 정상, 1: 치팅, None: 미분류)
+        session_uuid (UUID, optional): 미리 정해진 세션 UUID (비동기 적재 시 사용)
+
+    Returns:
+        tuple: (session_uuid, s3_url)
+
+    Raises:
+        Exception: DB 저장 실패 시
+    """
+    # 1. 세션 UUID (미리 정해진 값 > 프론트엔드에서 생성한 것 > 새로 생성)
+    if session_uuid is None:
+        session_uuid = resolve_session_uuid(session_data)
+
     # 2. DB에 데이터 저장 (트랜잭션 사용)
     with transaction.atomic():
         # 2-1. Session 테이블에 메인 레코드 저장
         session = Session.objects.create(
             session_uuid=session_uuid,
-            start_time=start_time,
-            end_time=end_time,
-            duration_ms=metadata.get('duration', 0),
-
-            # 문제 메타데이터
-            problem_id=question.id,
-            category=category_id or question.category.id,
-
-            # 기기/환경 정보
-            user_agent=session_data.get('deviceInfo', {}).get('userAgent', ''),
-            platform=session_data.get('deviceInfo', {}).get('platform', ''),
-            pixel_ratio=session_data.get('deviceInfo', {}).get('pixelRatio'),
-            screen_width=session_data.get('deviceInfo', {}).get('screenSize', {}).get('width'),
-            screen_height=session_data.get('deviceInfo', {}).get('screenSize', {}).get('height'),
-
-            # 캔버스 상태
-            logical_width=session_data.get('canvasInfo', {}).get('logicalSize', {}).get('width'),
-            logical_height=session_data.get('canvasInfo', {}).get('logicalSize', {}).get('height'),
-            css_width=session_data.get('canvasInfo', {}).get('cssSize', {}).get('width'),
-            css_height=session_data.get('canvasInfo', {}).get('cssSize', {}).get('height'),
-            zoom=session_data.get('canvasInfo', {}).get('transform', {}).get('zoom', 1.0),
-            pan_x=session_data.get('canvasInfo', {}).get('transform', {}).get('panX', 0),
-            pan_y=session_data.get('canvasInfo', {}).get('transform', {}).get('panY', 0),
-
-            # 포인터 기능 지원
-            supports_pressure=device_caps.get('pressure', False),
-            supports_tilt=device_caps.get('tilt', False),
-            supports_twist=device_caps.get('twist', False),
-            supports_coalesced=device_caps.get('coalesced', False),
-
-            # 요약 통계
-            stroke_count=statistics.get('strokeCount', 0) or len(canvas_data.get('strokes', [])),
-            total_distance_px=statistics.get('totalDistance', 0.0),
-            average_stroke_length_px=statistics.get('averageStrokeLength'),
-            undo_count=statistics.get('undoCount', 0),
-            redo_count=statistics.get('redoCount', 0),
-            eraser_count=statistics.get('eraserCount', 0),
-            zoom_count=statistics.get('zoomCount', 0),
-            pan_count=statistics.get('panCount', 0),
-            tool_change_count=statistics.get('toolChanges', 0),
-
-            # 사용자 답안
-            answer=str(user_answer) if user_answer else None,
-            is_correct=is_correct,
-
-            # 지도학습 라벨 (사용자 입력 또는 None)
-            # 0: 정상 풀이, 1: 참고자료 사용(치팅), None: 미분류
-            label=label
+            **build_session_fields(question, session_data, user_answer, is_correct, category_id, label)
+        )
+
+        # 2-2. Stroke / StrokePoint / Event 데이터 저장
+        # 모든 행을 먼저 구성한 뒤 테이블별 bulk_create로 일괄 INSERT
+        # (스트로크 개수와 무관하게 DB 왕복 횟수가 고정됨)
+        ingest_canvas_data(session, session_data.get('canvasData', {}))
+
+        # 2-3. 스트로크 수 / 거리 / 속도 / pressure 요약치를 서버 계산값으로 갱신
+        refresh_session_summary(session)
+
+    # 3. S3에 원본 JSON 업로드 (gzip 압축)
+    s3_url = upload_session_archive(
+        question, session_uuid, session_data, user_answer, is_correct, problem_name, difficulty, label
+    )
+    return session_uuid, s3_url
+
+
+def finalize_chunked_session(question, session_uuid, session_data, user_answer, is_correct, problem_name, category_id, difficulty, label=None):
+    """
+    분할 업로드된 세션의 요약치를 채우고 제출 완료 처리
+
+    스트로크/이벤트는 청크 업로드 시 이미 저장되어 있으므로 Session 행만 갱신하고,
+    S3 백업용 canvasData는 DB에서 재구성합니다.
+
+    Args:
+        question (Question): 문제 객체
+        session_uuid (UUID): 세션 UUID
+        session_data (dict): metadata / statistics 등 (canvasData.strokes 없음)
+        user_answer (str): 사용자가 입력한 답안
+        is_correct (bool): 정답 여부
+        problem_name (str): 문제 이름
+        category_id (int): 카테고리 ID
+        difficulty (int): 난이도
+        label (int, optional): 치팅 여부 라벨
+
+    Returns:
+        tuple: (s3_url, canvas_data) - canvas_data는 DB에서 재구성한 {"strokes", "events"}
+
+    Raises:
+        Session.DoesNotExist: 청크가 한 번도 업로드되지 않은 경우
+        SessionAlreadyFinalized: 이미 finalize된 경우
+    """
+    with transaction.atomic():
+        session = Session.objects.select_for_update().get(session_uuid=session_uuid)
+        if session.is_finalized:
+            raise SessionAlreadyFinalized(f"세션 {session_uuid}은 이미 제출이 완료되었습니다.")
+
+        fields = build_session_fields(question, session_data, user_answer, is_correct, category_id, label)
+        # 스트로크 요약치는 청크로 저장된 스트로크 기준으로 서버에서 집계
+        fields.update(summarize_session_strokes(session_uuid))
+        for name, value in fields.items():
+            setattr(session, name, value)
+        session.is_finalized = True
+        session.save()
+
+    # S3 백업: 요청의 메타데이터 + DB에서 재구성한 스트로크/이벤트
+    canvas_data = export_canvas_data(session_uuid)
+    archive_data = {
+        **session_data,
+        "canvasData": {**session_data.get('canvasData', {}), **canvas_data},
+    }
+    s3_url = upload_session_archive(
+        question, session_uuid, archive_data, user_answer, is_correct, problem_name, difficulty, label
+    )
+    return s3_url, canvas_data
+
+
+class SubmissionRejected(Exception):
+    """
+    스트리밍 제출 처리 중 요청을 거부해야 하는 경우 (트랜잭션 롤백용)
+
+    Attributes:
+        status (int): 클라이언트에 돌려줄 HTTP 상태 코드
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def save_streamed_submission(request):
+    """
+    대용량 제출 본문을 스트리밍으로 파싱하면서 DB에 적재하고 S3 백업 생성
+
+    스트로크/이벤트는 파싱되는 대로 배치 단위(INGEST_BATCH_SIZE)로 INSERT하고 버립니다.
+    Session 행은 본문을 끝까지 읽어 메타데이터와 답안이 모두 모인 뒤에 만들며,
+    FK 제약이 DEFERRABLE INITIALLY DEFERRED이므로 같은 트랜잭션 안에서는 순서가 상관없습니다.
+    단 created_at은 본문을 읽기 시작한 시각으로 기록하여, 다른 경로처럼 적재한 행의 recorded_on보다
+    늦지 않게 합니다 (자정을 넘겨 적재해도 api.retention.drop_expired_partitions가 세션을 놓치지 않도록).
+
+    metadata.sessionId는 본문 뒤쪽에 있을 수 있으므로 적재 중에는 임시 UUID를 쓰고,
+    값이 있으면 커밋 전에 해당 UUID로 바꿉니다. 본문 해시도 끝까지 읽어야 알 수 있으므로
+    제출 영수증은 같은 트랜잭션 안에서 마지막에 선점하며, 중복이면 적재한 행은 롤백됩니다.
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        dict: {"question", "is_correct", "session_uuid", "s3_url", "visible", "claimed"}
+            visible은 parse_submission_stream()의 visibleStrokes 요약 (없으면 None)
+            claimed는 제출 영수증 선점 여부 (metadata.sessionId가 있는 경우)
+
+    Raises:
+        RequestBodyError: 본문을 읽을 수 없는 경우 (크기 초과, 손상 등)
+        SubmissionRejected: JSON 형식 오류, 필수 파라미터 누락, 문제 없음
+        DuplicateSubmission: 같은 세션 UUID로 이미 제출된 경우
+    """
+    received_at = timezone.now()
+    batch_size = get_batch_size()
+    session = Session(session_uuid=uuid.uuid4())
+    counts = {"strokes": 0, "points": 0, "events": 0, "events_seen": 0}
+
+    def on_strokes(strokes_list):
+        error_message = validate_strokes(strokes_list, "canvasData.strokes", start=counts["strokes"])
+        if error_message:
+            raise SubmissionRejected(error_message)
+        result = ingest_canvas_data(session, {"strokes": strokes_list, "events": []})
+        counts["strokes"] += result["strokes"]
+        counts["points"] += result["points"]
+
+    # 배치 경계에 걸친 zoom / pan 제스처가 나뉘지 않도록 진행 중인 구간은 다음 배치로 넘김
+    coalescer = EventCoalescer()
+
+    def save_events(events_list):
+        if events_list:
+            counts["events"] += ingest_canvas_data(
+                session, {"strokes": [], "events": events_list}, coalesce=False
+            )["events"]
+
+    def on_events(events_list):
+        error_message = validate_events(events_list, "canvasData.events", start=counts["events_seen"])
+        if error_message:
+            raise SubmissionRejected(error_message)
+        counts["events_seen"] += len(events_list)
+        save_events(coalescer.feed(events_list))
+
+    # 세션별 JSON 백업을 쓰지 않으면(ARCHIVE_FORMAT='parquet') session_data를 다시 쓰지 않음
+    archive = ArchiveWriter() if is_json_archive_enabled() else None
+    try:
+        with transaction.atomic():
+            try:
+                with open_request_body(request) as stream:
+                    hashing_stream = HashingReader(stream)
+                    data, visible = parse_submission_stream(
+                        hashing_stream, on_strokes, on_events, batch_size, archive=archive
+                    )
+                    # JSON 뒤에 남은 바이트(공백 등)까지 해시에 포함
+                    while hashing_stream.read(64 * 1024):
+                        pass
+            except ijson.JSONError:
+                raise SubmissionRejected("유효하지 않은 JSON 형식입니다.")
+            save_events(coalescer.flush())
+
+            error_message = validate_submission(data)
+            if not error_message and visible is not None:
+                # id가 없어 원본을 보관한 가시 스트로크 (Mathpix로 그대로 전송)
+                error_message = validate_strokes(visible["strokes"], "canvasData.visibleStrokes")
+            if error_message:
+                raise SubmissionRejected(error_message)
+
+            question_id = data.get('question_id')
+            session_data = data.get('session_data')
+            label = data.get('label')
+            try:
+                question = Question.objects.select_related('category').get(id=question_id)
+            except Question.DoesNotExist:
+                raise SubmissionRejected(f"ID {question_id}에 해당하는 문제를 찾을 수 없습니다.", status=404)
+
+            is_correct, user_answer_value = grade_answer(question, data.get('user_answer'))
+
+            # 프론트엔드 세션 UUID가 있으면 적재된 행의 임시 UUID를 교체
+            session_uuid = session.session_uuid
+            client_session_uuid = get_client_session_uuid(session_data)
+            if client_session_uuid:
+                claim_submission(client_session_uuid, hashing_stream.hexdigest())
+                session_uuid = client_session_uuid
+                # stroke_points는 세션을 직접 참조하지 않으므로 strokes / events만 변경
+                for model in (Stroke, Event):
+                    model.objects.filter(session_id=session.session_uuid).update(session_id=session_uuid)
+
+            fields = build_session_fields(
+                question, session_data, user_answer_value, is_correct, data.get('category_id'), label
+            )
+            fields.update(summarize_session_strokes(session_uuid))
+            Session.objects.create(session_uuid=session_uuid, **fields)
+            # auto_now_add는 저장 시각을 쓰므로 수신 시각으로 교체
+            Session.objects.filter(session_uuid=session_uuid).update(created_at=received_at)
+
+        print(
+            f"[스트리밍 적재] 세션 {session_uuid} - 스트로크 {counts['strokes']}, "
+            f"포인트 {counts['points']}, 이벤트 {counts['events']}"
+        )
+
+        compressed_body = archive and archive.finish(build_archive_metadata(
+            question, session_uuid, user_answer_value, is_correct,
+            data.get('problem_name', ''), data.get('difficulty'), label
+        ))
+        s3_url = put_session_archive(question, session_uuid, compressed_body, is_correct)
+    finally:
+        if archive:
+            archive.close()
+
+    return {
+        "question": question,
+        "is_correct": is_correct,
+        "session_uuid": session_uuid,
+        "s3_url": s3_url,
+        "visible": visible,
+        "claimed": client_session_uuid is not None,
+    }
+
+
+def verify_streamed_solution(request):
+    """
+    verify_solution의 스트리밍 처리 경로 (INGEST_STREAMING_MIN_BYTES 이상인 요청)
+
+    요청/응답 형식은 verify_solution과 같습니다. Mathpix 전송용 가시 스트로크는
+    본문에 남겨두지 않고 적재가 끝난 뒤 DB에서 id로 다시 읽습니다.
+
+    Args:
+        request: Django HttpRequest 객체 (POST)
+
+    Returns:
+        JsonResponse: 검증 결과 및 저장된 세션 ID
+    """
+    try:
+        result = save_streamed_submission(request)
+    except (RequestBodyError, SubmissionRejected) as e:
+        return JsonResponse({
+            "success": False,
+            "error": str(e)
+        }, status=e.status, json_dumps_params={'ensure_ascii': False})
+    except DuplicateSubmission as e:
+        return build_duplicate_response(e)
+    except Exception as e:
+        return JsonResponse({
+            "success": False,
+            "error": f"데이터 저장 실패: {str(e)}"
+        }, status=500, json_dumps_params={'ensure_ascii': False})
+
+    question = result["question"]
+    session_uuid = result["session_uuid"]
+    s3_url = result["s3_url"]
+    store_receipt = result["claimed"]
+
+    # 오답인 경우 Mathpix/OpenAI 검증 스킵
+    if not result["is_correct"]:
+        print(f"[오답] 문제ID: {question.id} - Mathpix/OpenAI 검증 스킵, 즉시 응답 반환")
+        return build_verification_response(session_uuid, False, None, s3_url, store_receipt)
+
+    # 가시 스트로크만 Mathpix로 전송 (visibleStrokes가 없으면 전체)
+    visible = result["visible"]
+    if visible is None:
+        strokes_for_mathpix = export_visible_strokes(session_uuid)
+    else:
+        strokes_for_mathpix = export_visible_strokes(session_uuid, visible["ids"]) + visible["strokes"]
+    if strokes_for_mathpix:
+        print(f"[Mathpix 전송] 가시 스트로크: {len(strokes_for_mathpix)}")
+    try:
+        return respond_with_verification(question, strokes_for_mathpix, session_uuid, s3_url, store_receipt)
+    except Exception:
+        if store_receipt:
+            release_submission(session_uuid)
+        raise
+
+
+def validate_session_data(session_data):
+    """
+    session_data의 구조와 canvasData 스트로크 / 이벤트 형식 검증
+
+    Args:
+        session_data: 요청 본문의 session_data (None 허용)
+
+    Returns:
+        str | None: 오류 메시지 (문제가 없으면 None)
+    """
+    if session_data is None:
+        return None
+    if not isinstance(session_data, dict):
+        return "session_data는 객체여야 합니다."
+
+    for key in ('metadata', 'deviceCapabilities', 'canvasData', 'statistics', 'deviceInfo', 'canvasInfo'):
+        if session_data.get(key) is not None and not isinstance(session_data[key], dict):
+            return f"session_data.{key}는 객체여야 합니다."
+
+    canvas_data = session_data.get('canvasData') or {}
+    for key, validate in (('strokes', validate_strokes), ('visibleStrokes', validate_strokes), ('events', validate_events)):
+        if canvas_data.get(key) is not None:
+            error_message = validate(canvas_data[key], f"canvasData.{key}")
+            if error_message:
+                return error_message
+    return None
+
+
+def validate_submission(data, require_session_data=True):
+    """
+    풀이 제출 요청의 필수 파라미터 검증
+
+    Args:
+        data (dict): 파싱된 요청 본문
+        require_session_data (bool): session_data 필수 여부 (finalize는 선택)
+
+    Returns:
+        str | None: 오류 메시지 (문제가 없으면 None)
+    """
+    if not isinstance(data, dict):
+        return "요청 본문은 JSON 객체여야 합니다."
+
+    if not data.get('question_id'):
+        return "question_id가 필요합니다."
+
+    if not data.get('user_answer'):
+        return "user_answer가 필요합니다."
+
+    session_data = data.get('session_data')
+    if require_session_data and not session_data:
+        return "session_data가 필요합니다."
+
+    # 적재 / 비동기 워커에서 실패할 형식 오류는 여기서 400으로 (대기열에 넣은 뒤 조용히 버려지지 않도록)
+    error_message = validate_session_data(session_data)
+    if error_message:
+        return error_message
+
+    # label 값 검증 (0, 1, None만 허용)
+    label = data.get('label')
+    if label is not None and label not in [0, 1]:
+        return "label은 0(정상), 1(치팅), 또는 null이어야 합니다."
+
+    return None
+
+
+def grade_answer(question, user_answer):
+    """
+    사용자 답안과 Question.answer를 비교하여 정답 여부 판정
+
+    Args:
+        question (Question): 문제 객체
+        user_answer (dict): 프론트엔드 user_answer
+            객관식: {"type": "multiple_choice", "selectedIndex": 2, "selectedValue": "3"}
+            주관식: {"type": "...", "answer": "12"}
+
+    Returns:
+        tuple: (is_correct, user_answer_value)
+    """
+    question_id = question.id
+    if user_answer.get('type') == 'multiple_choice':
+        # 객관식: selectedIndex를 1부터 시작하는 번호로 변환 (0 -> 1, 1 -> 2, ...)
+        # DB의 answer는 "1", "2", "3" 같은 문자열 형태의 번호
+        selected_index = user_answer.get('selectedIndex', -1)
+        user_answer_number = str(selected_index + 1)
+        user_answer_value = user_answer.get('selectedValue')  # 실제 보기 값 (로깅용)
+
+        # DB 정답 처리
+        db_answer_raw = question.answer
+        db_answer_stripped = str(db_answer_raw).strip()
+
+        # 정답 비교
+        is_correct = user_answer_number == db_answer_stripped
+
+        # 간소화된 로그 (정답일 때만 상세 로그)
+        if is_correct:
+            print(f"[정답 ✅] 문제ID: {question_id}, 사용자: {user_answer_number}번, 정답: {db_answer_stripped}번")
+        else:
+            print(f"[오답 ❌] 문제ID: {question_id}, 사용자: {user_answer_number}번, 정답: {db_answer_stripped}번")
+    else:
+        # 주관식: 입력값 그대로 비교
+        user_answer_value = user_answer.get('answer', '').strip()
+        is_correct = user_answer_value == str(question.answer).strip()
+
+        # 간소화된 로그
+        if is_correct:
+            print(f"[정답 ✅] 문제ID: {question_id} (주관식), 사용자: '{user_answer_value}', 정답: '{question.answer}'")
+        else:
+            print(f"[오답 ❌] 문제ID: {question_id} (주관식), 사용자: '{user_answer_value}', 정답: '{question.answer}'")
+
+    return is_correct, user_answer_value
+
+
+def run_solution_verification(question, strokes_for_mathpix, is_correct, session_id):
+    """
+    Mathpix로 필기를 변환하고 OpenAI로 풀이를 검증
+
+    Args:
+        question (Question): 문제 객체
+        strokes_for_mathpix (list): 화면에 보이는 스트로크 배열
+        is_correct (bool): 정답 여부
+        session_id (UUID): 로그용 세션 UUID
+
+    Returns:
+        dict | None: 검증 결과 (스트로크가 없으면 None, 실패 시 0점 결과)
+    """
+    if not strokes_for_mathpix:
+        return None
+
+    try:
+        # Mathpix로 필기 변환 (화면에 보이는 스트로크만)
+        converted_text = convert_strokes_to_text(strokes_for_mathpix)
+
+        # OpenAI로 풀이 검증
+        return verify_solution_with_openai(
+            question=question,
+            user_solution=converted_text
         )
+    except Exception as e:
+        # 검증 실패해도 데이터는 저장되었으므로 경고만 로깅
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"풀이 검증 실패 (세션 {session_id}): {str(e)}")
+        print(f"상세 에러:\n{error_detail}")
+        return {
+            "total_score": 0,
+            "logic_score": 0,
+            "accuracy_score": 0,
+            "process_score": 0,
+            "is_correct": is_correct,
+            "comment": "풀이 검증에 실패했습니다.",
+            "detailed_feedback": f"에러: {str(e)}\n\n상세 정보:\n{error_detail}"
+        }
+
+
+def build_verification_data(session_id, is_correct, verification_result, s3_url=""):
+    """
+    풀이 검증 결과 응답의 data 부분 생성
+
+    Args:
+        session_id (UUID): 세션 UUID
+        is_correct (bool): 정답 여부
+        verification_result (dict | None): 검증 결과 (None이면 기본값 사용)
+        s3_url (str): S3 백업 URL
+
+    Returns:
+        dict: {"session_id", "is_correct", "verification", "s3_url"}
+    """
+    if not is_correct:
+        # 오답은 Mathpix/OpenAI 검증 없이 고정 결과
+        verification_result = {
+            "total_score": 0,
+            "logic_score": 0,
+            "accuracy_score": 0,
+            "process_score": 0,
+            "is_correct": False,
+            "comment": "오답입니다.",
+            "detailed_feedback": ""
+        }
+
+    return {
+        "session_id": str(session_id),
+        "is_correct": is_correct,
+        "verification": verification_result or {
+            "total_score": 100 if is_correct else 0,
+            "logic_score": 0,
+            "accuracy_score": 0,
+            "process_score": 0,
+            "is_correct": is_correct,
+            "comment": "정답" if is_correct else "오답",
+            "detailed_feedback": "필기 데이터가 없어 자동 검증되지 않았습니다."
+        },
+        "s3_url": s3_url
+    }
+
+
+def build_verification_response(session_id, is_correct, verification_result, s3_url, store_receipt=False, verification_job=None):
+    """
+    풀이 검증 API의 성공 응답 생성
+
+    Args:
+        session_id (UUID): 세션 UUID
+        is_correct (bool): 정답 여부
+        verification_result (dict | None): 검증 결과 (None이면 기본값 사용)
+        s3_url (str): S3 백업 URL
+        store_receipt (bool): 재전송 시 그대로 돌려주도록 응답을 제출 영수증에 저장
+        verification_job (VerificationJob, optional): 비동기 검증 작업
+            (있으면 verification은 null이고 verification_job에 결과 조회 경로를 담음)
+
+    Returns:
+        JsonResponse: 성공 응답
+    """
+    response_data = build_verification_data(session_id, is_correct, verification_result, s3_url)
+    if verification_job is not None:
+        response_data["verification"] = None
+        response_data["verification_job"] = describe_verification_job(verification_job)
+    if store_receipt:
+        complete_submission(session_id, response_data)
+
+    return JsonResponse({
+        "success": True,
+        "data": response_data
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+def respond_with_verification(question, strokes_for_mathpix, session_id, s3_url, store_receipt=False):
+    """
+    정답 제출의 풀이 검증 후 응답 생성
+
+    VERIFY_ASYNC이면 검증 작업만 대기열에 넣고 바로 응답합니다 (api.verification_queue).
+    필기가 없으면 외부 API 호출이 없으므로 항상 바로 응답합니다.
+
+    Args:
+        question (Question): 문제 객체
+        strokes_for_mathpix (list): 화면에 보이는 스트로크 배열
+        session_id (UUID): 세션 UUID
+        s3_url (str): S3 백업 URL
+        store_receipt (bool): 응답을 제출 영수증에 저장
+
+    Returns:
+        JsonResponse: 성공 응답
+    """
+    if strokes_for_mathpix and is_async_verification_enabled():
+        job = enqueue_verification_job(session_id, question.id, strokes_for_mathpix)
+        print(f"[검증 대기열] 세션 {session_id} - 작업 {job.id}")
+        return build_verification_response(session_id, True, None, s3_url, store_receipt, verification_job=job)
+
+    verification_result = run_solution_verification(question, strokes_for_mathpix, True, session_id)
+    return build_verification_response(session_id, True, verification_result, s3_url, store_receipt)
+
+
+def build_duplicate_response(error):
+    """
+    이미 제출된 세션 UUID로 다시 요청한 경우의 응답
+
+    같은 본문의 재전송이면 저장된 응답을 그대로 반환하고,
+    처리 중이거나 다른 본문이면 409를 반환합니다.
+
+    Args:
+        error (DuplicateSubmission): claim_submission()이 발생시킨 예외
+
+    Returns:
+        JsonResponse: 저장된 성공 응답 또는 409 응답
+    """
+    if error.is_replay:
+        print(f"[재전송] 세션 {error.receipt.session_uuid} - 저장된 응답 반환")
+        response = JsonResponse({
+            "success": True,
+            "data": error.receipt.response_data
+        }, json_dumps_params={'ensure_ascii': False})
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    if error.in_progress:
+        response = JsonResponse({
+            "success": False,
+            "error": "같은 제출을 처리하는 중입니다. 잠시 후 다시 시도하세요."
+        }, status=409, json_dumps_params={'ensure_ascii': False})
+        response['Retry-After'] = '2'
+        return response
+
+    return JsonResponse({
+        "success": False,
+        "error": "같은 세션 ID로 다른 내용이 이미 제출되었습니다."
+    }, status=409, json_dumps_params={'ensure_ascii': False})
+
+
+def server_error_response(view_name, e):
+    """
+    예상치 못한 에러를 로깅하고 500 응답 생성
+
+    Args:
+        view_name (str): 로그에 표시할 뷰 이름
+        e (Exception): 발생한 예외
+
+    Returns:
+        JsonResponse: 500 에러 응답
+    """
+    import traceback
+    error_traceback = traceback.format_exc()
+
+    # 서버 콘솔에 상세 에러 출력
+    print("=" * 80)
+    print(f"❌ {view_name} API 에러 발생!")
+    print("=" * 80)
+    print(f"에러 타입: {type(e).__name__}")
+    print(f"에러 메시지: {str(e)}")
+    print("\n상세 스택 트레이스:")
+    print(error_traceback)
+    print("=" * 80)
+
+    # 클라이언트에게 상세 에러 메시지 반환
+    return JsonResponse({
+        "success": False,
+        "error": f"서버 오류가 발생했습니다: {str(e)}",
+        "error_type": type(e).__name__,
+        "error_detail": error_traceback if os.getenv('DEBUG', 'False') == 'True' else None
+    }, status=500, json_dumps_params={'ensure_ascii': False})
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def verify_solution(request):
+    """
+    사용자의 문제 풀이를 검증하고 데이터를 저장하는 API
+
+    프론트엔드에서 전송된 세션 데이터(필기 기록)를 DB에 저장하고,
+    원본 JSON을 S3에 업로드한 후, 사용자 답안의 정확성을 검증합니다.
+
+    **엔드포인트**: POST /api/verify-solution/
+
+    **요청 본문**:
+    ```json
+    {
+        "question_id": 1,
+        "problem_name": "2025_고1_3월 모의고사_9번",
+        "category_id": 4,
+        "category_name": "이차방정식과 이차함수",
+        "difficulty": 65,
+        "user_answer": {
+            "type": "multiple_choice",
+            "selectedIndex": 2,
+            "selectedValue": "3"
+        },
+        "session_data": {
+            "metadata": {...},
+            "deviceCapabilities": {...},
+            "canvasData": {
+                "strokes": [...],
+                "events": [...]
+            },
+            "statistics": {...}
+        }
+    }
+    ```
+
+    **성공 응답** (200):
+    ```json
+    {
+        "success": true,
+        "data": {
+            "session_id": "uuid",
+            "is_correct": true,
+            "verification": {
+                "total_score": 85,
+                "logic_score": 90,
+                "accuracy_score": 80,
+                "process_score": 85,
+                "is_correct": true,
+                "comment": "전반적인 평가",
+                "detailed_feedback": "상세 피드백"
+            },
+            "s3_url": "https://..."
+        }
+    }
+    ```
+
+    Args:
+        request: Django HttpRequest 객체 (POST)
+
+    Returns:
+        JsonResponse: 검증 결과 및 저장된 세션 ID
+    """
+    claimed_session_uuid = None
+    try:
+        # 0. 대용량 본문은 스트리밍으로 파싱하며 바로 적재 (비동기 모드는 원본 본문이 필요하므로 제외)
+        if should_stream_request(request) and not is_async_ingest_enabled():
+            return verify_streamed_solution(request)
+
+        # 1. 요청 데이터 파싱 (Content-Encoding: gzip / zstd 압축 본문 지원)
+        try:
+            body = read_request_body(request)
+            data = json.loads(body)
+        except RequestBodyError as e:
+            return JsonResponse({
+                "success": False,
+                "error": str(e)
+            }, status=e.status, json_dumps_params={'ensure_ascii': False})
+        except ValueError:
+            return JsonResponse({
+                "success": False,
+                "error": "유효하지 않은 JSON 형식입니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
+
+        # 2. 필수 파라미터 검증
+        error_message = validate_submission(data)
+        if error_message:
+            return JsonResponse({
+                "success": False,
+                "error": error_message
+            }, status=400, json_dumps_params={'ensure_ascii': False})
+
+        question_id = data.get('question_id')
+        user_answer = data.get('user_answer')
+        session_data = data.get('session_data')
+        label = data.get('label')  # 치팅 여부 라벨 (0: 정상, 1: 치팅, None: 미분류)
+
+        # 3. 문제 조회
+        try:
+            question = Question.objects.select_related('category').get(id=question_id)
+        except Question.DoesNotExist:
+            return JsonResponse({
+                "success": False,
+                "error": f"ID {question_id}에 해당하는 문제를 찾을 수 없습니다."
+            }, status=404, json_dumps_params={'ensure_ascii': False})
+
+        # 4. 정답 여부 확인 (Question 모델의 answer 필드와 비교)
+        is_correct, user_answer_value = grade_answer(question, user_answer)
+
+        # 4-1. 재전송 확인: 같은 세션 UUID + 같은 본문이면 저장된 응답 반환
+        client_session_uuid = get_client_session_uuid(session_data)
+        if client_session_uuid:
+            try:
+                claim_submission(client_session_uuid, compute_payload_hash(body))
+            except DuplicateSubmission as e:
+                return build_duplicate_response(e)
+            claimed_session_uuid = client_session_uuid
+
+        # 5. DB에 세션 데이터 저장 및 S3 업로드
+        try:
+            if is_async_ingest_enabled():
+                # 비동기 모드: 원본 본문만 대기열에 저장하고 적재는 워커에 맡김
+                # (S3 URL은 워커가 업로드한 뒤에 정해지므로 빈 문자열 반환)
+                session_id = resolve_session_uuid(session_data)
+                enqueue_ingest_job(session_id, body, {
+                    "question_id": question.id,
+                    "user_answer": user_answer_value,
+                    "is_correct": is_correct,
+                    "problem_name": data.get('problem_name', ''),
+                    "category_id": data.get('category_id'),
+                    "difficulty": data.get('difficulty'),
+                    "label": label,
+                })
+                s3_url = ""
+            else:
+                session_id, s3_url = save_session_to_db_and_s3(
+                    question=question,
+                    session_data=session_data,
+                    user_answer=user_answer_value,
+                    is_correct=is_correct,
+                    problem_name=data.get('problem_name', ''),
+                    category_id=data.get('category_id'),
+                    difficulty=data.get('difficulty'),
+                    label=label  # 치팅 여부 라벨 전달
+                )
+        except Exception as e:
+            if claimed_session_uuid:
+                release_submission(claimed_session_uuid)
+            return JsonResponse({
+                "success": False,
+                "error": f"데이터 저장 실패: {str(e)}"
+            }, status=500, json_dumps_params={'ensure_ascii': False})
+
+        store_receipt = claimed_session_uuid is not None
+
+        # 5-1. 오답인 경우 Mathpix/OpenAI 검증 스킵하고 즉시 응답 반환
+        if not is_correct:
+            print(f"[오답] 문제ID: {question_id} - Mathpix/OpenAI 검증 스킵, 즉시 응답 반환")
+            return build_verification_response(session_id, False, None, s3_url, store_receipt)
+
+        # 6. 정답인 경우에만 OpenAI로 풀이 검증 (선택적 - strokes가 있는 경우만)
+        # 화면에 보이는 스트로크만 Mathpix로 전송 (visibleStrokes 우선, 없으면 전체 strokes)
+        # DB에는 전체 strokes가 저장됨 (위 save_session_to_db_and_s3에서 처리)
+        visible_strokes = session_data.get('canvasData', {}).get('visibleStrokes')
+        all_strokes = session_data.get('canvasData', {}).get('strokes', [])
+
+        # visibleStrokes가 있으면 사용, 없으면 전체 strokes 사용 (하위 호환성)
+        strokes_for_mathpix = visible_strokes if visible_strokes is not None else all_strokes
+        if strokes_for_mathpix:
+            print(f"[Mathpix 전송] 전체 스트로크: {len(all_strokes)}, 가시 스트로크: {len(strokes_for_mathpix)}")
+
+        # 7. 성공 응답 반환 (재전송 대비 응답 저장, VERIFY_ASYNC이면 검증 작업 id만 반환)
+        return respond_with_verification(question, strokes_for_mathpix, session_id, s3_url, store_receipt)
+
+    except Exception as e:
+        # 예상치 못한 에러 - 재시도할 수 있도록 영수증을 풀고 상세 정보 로깅 및 반환
+        if claimed_session_uuid:
+            release_submission(claimed_session_uuid)
+        return server_error_response("verify_solution", e)
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def upload_session_chunk(request, session_uuid):
+    """
+    풀이 중인 세션의 스트로크/이벤트 청크를 미리 업로드하는 API
+
+    학생이 필기하는 동안 주기적으로 호출하여, 제출 시점에는
+    메타데이터와 답안만 보내면 되도록 합니다. 같은 seq를 같은 본문으로 다시 보내면
+    (네트워크 재전송) 중복 저장하지 않고 이전 결과를 반환하며, 다른 본문이면 409를 반환합니다.
+
+    **엔드포인트**: POST /api/sessions/<session_uuid>/chunks/
+
+    **요청 본문**:
+    ```json
+    {
+        "question_id": 1,
+        "seq": 0,
+        "strokes": [...],
+        "events": [...]
+    }
+    ```
+
+    **성공 응답** (200):
+    ```json
+    {
+        "success": true,
+        "data": {
+            "session_id": "uuid",
+            "seq": 0,
+            "stroke_count": 12,
+            "point_count": 840,
+            "event_count": 30,
+            "duplicate": false
+        }
+    }
+    ```
+
+    **에러 응답**: 400 (잘못된 요청), 404 (문제 없음), 409 (이미 제출된 세션 / 같은 seq에 다른 내용)
+
+    Args:
+        request: Django HttpRequest 객체 (POST)
+        session_uuid (UUID): 프론트엔드 세션 UUID
+
+    Returns:
+        JsonResponse: 저장된 청크 정보
+    """
+    try:
+        # 1. 요청 데이터 파싱 (Content-Encoding: gzip / zstd 압축 본문 지원)
+        try:
+            body = read_request_body(request)
+            data = json.loads(body)
+        except RequestBodyError as e:
+            return JsonResponse({
+                "success": False,
+                "error": str(e)
+            }, status=e.status, json_dumps_params={'ensure_ascii': False})
+        except ValueError:
+            return JsonResponse({
+                "success": False,
+                "error": "유효하지 않은 JSON 형식입니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        # 2-2. Stroke 데이터 저장
-        strokes_list = canvas_data.get('strokes', [])
-        for stroke_data in strokes_list:
-            # 스트로크 UUID 생성 또는 추출
-            stroke_uuid = uuid.uuid4()
-
-            # 포인트 데이터 추출
-            points = stroke_data.get('points', [])
-
-            # bbox 계산
-            if points:
-                x_coords = [p.get('x', 0) for p in points]
-                y_coords = [p.get('y', 0) for p in points]
-                bbox_min_x = int(min(x_coords))
-                bbox_min_y = int(min(y_coords))
-                bbox_max_x = int(max(x_coords))
-                bbox_max_y = int(max(y_coords))
-            else:
-                bbox_min_x = bbox_min_y = bbox_max_x = bbox_max_y = 0
-
-            # 스트로크 생성
-            stroke = Stroke.objects.create(
-                stroke_uuid=stroke_uuid,
-                session=session,
-                tool=stroke_data.get('tool', 'pen'),
-                color=stroke_data.get('color', '#000000'),
-                stroke_width=int(stroke_data.get('strokeWidth', 3)),
-                start_ms=int(stroke_data.get('startTime', 0)),
-                end_ms=int(stroke_data.get('endTime', 0)),
-                pointer_type=stroke_data.get('pointerType', 'pen'),
-                is_coalesced=stroke_data.get('coalesced', False),
-                total_distance_px=float(stroke_data.get('totalDistance', 0.0)),
-                average_speed_pxps=stroke_data.get('averageSpeed'),
-                average_pressure=stroke_data.get('averagePressure'),
-                bbox_min_x=bbox_min_x,
-                bbox_min_y=bbox_min_y,
-                bbox_max_x=bbox_max_x,
-                bbox_max_y=bbox_max_y
-            )
+        # 2. 필수 파라미터 검증
+        if not isinstance(data, dict):
+            return JsonResponse({
+                "success": False,
+                "error": "요청 본문은 JSON 객체여야 합니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
 
-            # 2-3. StrokePoint 데이터 저장 (bulk_create 사용으로 성능 최적화)
-            point_objects = []
-            # 스트로크 시작 시간을 기준점으로 사용
-            stroke_start_ms = int(stroke_data.get('startTime', 0))
-
-            for idx, point in enumerate(points):
-                # 포인트의 타임스탬프를 스트로크 시작 기준 상대 시간으로 변환
-                # 프론트엔드에서는 세션 기준 절대 시간을 보내므로, 스트로크 시작 시간을 빼서 상대 시간으로 변환
-                point_timestamp_session = int(point.get('timestamp', 0))
-                point_timestamp_relative = point_timestamp_session - stroke_start_ms
-
-                point_objects.append(StrokePoint(
-                    session=session,
-                    stroke=stroke,
-                    idx=idx,
-                    t_ms=point_timestamp_relative,  # 스트로크 시작 기준 상대 ms
-                    x=int(point.get('x', 0)),
-                    y=int(point.get('y', 0)),
-                    pressure=point.get('pressure'),
-                    tilt_x=point.get('tiltX'),
-                    tilt_y=point.get('tiltY'),
-                    twist=point.get('twist'),
-                    pointer_type=point.get('pointerType', 'pen'),
-                    pointer_id=point.get('pointerId'),
-                    buttons=point.get('buttons', 0),
-                    width=point.get('width'),
-                    height=point.get('height')
-                ))
-
-            if point_objects:
-                StrokePoint.objects.bulk_create(point_objects)
-
-        # 2-4. Event 데이터 저장
-        events_list = canvas_data.get('events', [])
-        event_objects = []
-        for event_data in events_list:
-            event_objects.append(Event(
-                session=session,
-                ts_ms=int(event_data.get('timestamp', 0)),
-                type=event_data.get('type', 'unknown'),
-                details=event_data.get('details') or {}
-            ))
-
-        if event_objects:
-            Event.objects.bulk_create(event_objects)
+        question_id = data.get('question_id')
+        seq = data.get('seq')
+        strokes = data.get('strokes') or []
+        events = data.get('events') or []
 
-    # 3. S3에 원본 JSON 업로드 (gzip 압축)
-    try:
-        # AWS 환경 변수 확인 (.env 파일의 변수명과 일치시킴)
-        aws_region = os.getenv('AWS_S3_REGION_NAME')  # problems 업로드와 동일한 변수명 사용
-        aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-        aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-        bucket_name = os.getenv('AWS_STORAGE_BUCKET_NAME')
-
-        if not all([aws_region, aws_access_key, aws_secret_key, bucket_name]):
-            # 환경 변수 누락 시 상세 정보 출력
-            print(f"❌ AWS 환경 변수 누락!")
-            print(f"  - AWS_S3_REGION_NAME: {'✅' if aws_region else '❌ 없음'}")
-            print(f"  - AWS_ACCESS_KEY_ID: {'✅' if aws_access_key else '❌ 없음'}")
-            print(f"  - AWS_SECRET_ACCESS_KEY: {'✅' if aws_secret_key else '❌ 없음'}")
-            print(f"  - AWS_STORAGE_BUCKET_NAME: {'✅' if bucket_name else '❌ 없음'}")
-            raise ValueError("AWS 환경 변수가 설정되지 않았습니다.")
-
-        # S3 클라이언트 생성
-        s3_client = boto3.client(
-            's3',
-            region_name=aws_region,
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key
-        )
+        if not question_id:
+            return JsonResponse({
+                "success": False,
+                "error": "question_id가 필요합니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        # 전체 세션 데이터에 메타 정보 추가
-        upload_data = {
-            **session_data,
-            "db_session_id": str(session_uuid),
-            "problem_id": question.id,
-            "problem_name": problem_name,
-            "category_name": question.category.name,
-            "difficulty": difficulty,
-            "user_answer": user_answer,
-            "is_correct": is_correct,
-            "label": label,  # 치팅 여부 라벨 추가
-            "uploaded_at": datetime.utcnow().isoformat()
-        }
+        if not isinstance(seq, int) or isinstance(seq, bool) or seq < 0:
+            return JsonResponse({
+                "success": False,
+                "error": "seq는 0 이상의 정수여야 합니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        # JSON을 gzip으로 압축
-        json_bytes = json.dumps(upload_data, ensure_ascii=False, indent=2).encode('utf-8')
-        compressed_data = gzip.compress(json_bytes)
-
-        # S3 키 생성: answers/{problem_id}_{session_uuid}.json.gz
-        s3_key = f"answers/{question.id}_{session_uuid}.json.gz"
-
-        # S3 업로드
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=compressed_data,
-            ContentType='application/gzip',
-            ContentEncoding='gzip',
-            Metadata={
-                'problem-id': str(question.id),
-                'session-id': str(session_uuid),
-                'is-correct': str(is_correct)
-            }
-        )
+        error_message = validate_strokes(strokes) or validate_events(events)
+        if error_message:
+            return JsonResponse({
+                "success": False,
+                "error": error_message
+            }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        # S3 URL 생성
-        s3_url = f"https://{bucket_name}.s3.{aws_region}.amazonaws.com/{s3_key}"
+        # 3. 문제 조회
+        try:
+            question = Question.objects.get(id=question_id)
+        except Question.DoesNotExist:
+            return JsonResponse({
+                "success": False,
+                "error": f"ID {question_id}에 해당하는 문제를 찾을 수 없습니다."
+            }, status=404, json_dumps_params={'ensure_ascii': False})
 
-        print(f"세션 {session_uuid} 저장 완료 - S3: {s3_url}")
+        # 4. 청크 적재
+        try:
+            chunk, duplicate = append_session_chunk(
+                session_uuid, question, seq, strokes, events, payload_hash=compute_payload_hash(body)
+            )
+        except (SessionAlreadyFinalized, ChunkConflict) as e:
+            return JsonResponse({
+                "success": False,
+                "error": str(e)
+            }, status=409, json_dumps_params={'ensure_ascii': False})
 
-        return session_uuid, s3_url
+        return JsonResponse({
+            "success": True,
+            "data": {
+                "session_id": str(session_uuid),
+                "seq": chunk.seq,
+                "stroke_count": chunk.stroke_count,
+                "point_count": chunk.point_count,
+                "event_count": chunk.event_count,
+                "duplicate": duplicate
+            }
+        }, json_dumps_params={'ensure_ascii': False})
 
     except Exception as e:
-        # S3 업로드 실패해도 DB 데이터는 유지 (경고만 로깅)
-        print(f"S3 업로드 실패 (세션 {session_uuid}): {str(e)}")
-        return session_uuid, ""
+        return server_error_response("upload_session_chunk", e)
 
 
 @require_http_methods(["POST"])
 @csrf_exempt
-def verify_solution(request):
+def finalize_session(request, session_uuid):
     """
-    사용자의 문제 풀이를 검증하고 데이터를 저장하는 API
+    분할 업로드된 세션을 제출(finalize)하고 풀이를 검증하는 API
 
-    프론트엔드에서 전송된 세션 데이터(필기 기록)를 DB에 저장하고,
-    원본 JSON을 S3에 업로드한 후, 사용자 답안의 정확성을 검증합니다.
+    스트로크/이벤트는 청크로 이미 저장되어 있으므로 요청에는 메타데이터, 통계,
+    답안만 포함합니다. 응답 형식은 /api/verify-solution/과 같습니다.
 
-    **엔드포인트**: POST /api/verify-solution/
+    **엔드포인트**: POST /api/sessions/<session_uuid>/finalize/
 
     **요청 본문**:
     ```json
@@ -526,92 +1413,62 @@ def verify_solution(request):
         "question_id": 1,
         "problem_name": "2025_고1_3월 모의고사_9번",
         "category_id": 4,
-        "category_name": "이차방정식과 이차함수",
         "difficulty": 65,
-        "user_answer": {
-            "type": "multiple_choice",
-            "selectedIndex": 2,
-            "selectedValue": "3"
-        },
+        "user_answer": {...},
+        "label": 0,
         "session_data": {
             "metadata": {...},
             "deviceCapabilities": {...},
             "canvasData": {
-                "strokes": [...],
-                "events": [...]
+                "visibleStrokeIds": ["stroke-id", ...]
             },
             "statistics": {...}
         }
     }
     ```
 
-    **성공 응답** (200):
-    ```json
-    {
-        "success": true,
-        "data": {
-            "session_id": "uuid",
-            "is_correct": true,
-            "verification": {
-                "total_score": 85,
-                "logic_score": 90,
-                "accuracy_score": 80,
-                "process_score": 85,
-                "is_correct": true,
-                "comment": "전반적인 평가",
-                "detailed_feedback": "상세 피드백"
-            },
-            "s3_url": "https://..."
-        }
-    }
-    ```
+    - `visibleStrokeIds`: 화면에 보이는 스트로크의 id 목록 (Mathpix 전송 대상).
+      생략하면 저장된 전체 스트로크를 사용합니다.
+
+    같은 본문으로 다시 finalize하면 저장된 응답을 그대로 반환합니다 (verify_solution과 동일).
+
+    **에러 응답**: 400 (잘못된 요청), 404 (문제 또는 세션 없음), 409 (이미 제출된 세션)
 
     Args:
         request: Django HttpRequest 객체 (POST)
+        session_uuid (UUID): 프론트엔드 세션 UUID
 
     Returns:
-        JsonResponse: 검증 결과 및 저장된 세션 ID
+        JsonResponse: 검증 결과 (verify_solution과 동일한 형식)
     """
+    claimed = False
     try:
-        # 1. 요청 데이터 파싱
+        # 1. 요청 데이터 파싱 (Content-Encoding: gzip / zstd 압축 본문 지원)
         try:
-            data = json.loads(request.body)
-        except json.JSONDecodeError:
-            return JsonResponse({
-                "success": False,
-                "error": "유효하지 않은 JSON 형식입니다."
-            }, status=400, json_dumps_params={'ensure_ascii': False})
-
-        # 2. 필수 파라미터 검증
-        question_id = data.get('question_id')
-        user_answer = data.get('user_answer')
-        session_data = data.get('session_data')
-        label = data.get('label')  # 치팅 여부 라벨 (0: 정상, 1: 치팅, None: 미분류)
-
-        if not question_id:
+            body = read_request_body(request)
+            data = json.loads(body)
+        except RequestBodyError as e:
             return JsonResponse({
                 "success": False,
-                "error": "question_id가 필요합니다."
-            }, status=400, json_dumps_params={'ensure_ascii': False})
-
-        if not user_answer:
+                "error": str(e)
+            }, status=e.status, json_dumps_params={'ensure_ascii': False})
+        except ValueError:
             return JsonResponse({
                 "success": False,
-                "error": "user_answer가 필요합니다."
+                "error": "유효하지 않은 JSON 형식입니다."
             }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        if not session_data:
+        # 2. 필수 파라미터 검증 (session_data는 선택)
+        error_message = validate_submission(data, require_session_data=False)
+        if error_message:
             return JsonResponse({
                 "success": False,
-                "error": "session_data가 필요합니다."
+                "error": error_message
             }, status=400, json_dumps_params={'ensure_ascii': False})
 
-        # label 값 검증 (0, 1, None만 허용)
-        if label is not None and label not in [0, 1]:
-            return JsonResponse({
-                "success": False,
-                "error": "label은 0(정상), 1(치팅), 또는 null이어야 합니다."
-            }, status=400, json_dumps_params={'ensure_ascii': False})
+        question_id = data.get('question_id')
+        session_data = data.get('session_data') or {}
+        label = data.get('label')
 
         # 3. 문제 조회
         try:
@@ -622,155 +1479,230 @@ def verify_solution(request):
                 "error": f"ID {question_id}에 해당하는 문제를 찾을 수 없습니다."
             }, status=404, json_dumps_params={'ensure_ascii': False})
 
-        # 4. 정답 여부 확인 (Question 모델의 answer 필드와 비교)
-        if user_answer.get('type') == 'multiple_choice':
-            # 객관식: selectedIndex를 1부터 시작하는 번호로 변환 (0 -> 1, 1 -> 2, ...)
-            # DB의 answer는 "1", "2", "3" 같은 문자열 형태의 번호
-            selected_index = user_answer.get('selectedIndex', -1)
-            user_answer_number = str(selected_index + 1)
-            user_answer_value = user_answer.get('selectedValue')  # 실제 보기 값 (로깅용)
-
-            # DB 정답 처리
-            db_answer_raw = question.answer
-            db_answer_stripped = str(db_answer_raw).strip()
-
-            # 정답 비교
-            is_correct = user_answer_number == db_answer_stripped
-
-            # 간소화된 로그 (정답일 때만 상세 로그)
-            if is_correct:
-                print(f"[정답 ✅] 문제ID: {question_id}, 사용자: {user_answer_number}번, 정답: {db_answer_stripped}번")
-            else:
-                print(f"[오답 ❌] 문제ID: {question_id}, 사용자: {user_answer_number}번, 정답: {db_answer_stripped}번")
-        else:
-            # 주관식: 입력값 그대로 비교
-            user_answer_value = user_answer.get('answer', '').strip()
-            is_correct = user_answer_value == str(question.answer).strip()
+        # 4. 정답 여부 확인
+        is_correct, user_answer_value = grade_answer(question, data.get('user_answer'))
 
-            # 간소화된 로그
-            if is_correct:
-                print(f"[정답 ✅] 문제ID: {question_id} (주관식), 사용자: '{user_answer_value}', 정답: '{question.answer}'")
-            else:
-                print(f"[오답 ❌] 문제ID: {question_id} (주관식), 사용자: '{user_answer_value}', 정답: '{question.answer}'")
+        # 4-1. 재전송 확인 (청크로 세션 행이 이미 있으므로 세션 존재 여부는 보지 않음)
+        try:
+            claim_submission(session_uuid, compute_payload_hash(body), allow_existing_session=True)
+        except DuplicateSubmission as e:
+            return build_duplicate_response(e)
+        claimed = True
 
-        # 5. DB에 세션 데이터 저장 및 S3 업로드
+        # 5. 세션 요약치 갱신 및 S3 백업
         try:
-            session_id, s3_url = save_session_to_db_and_s3(
+            s3_url, canvas_data = finalize_chunked_session(
                 question=question,
+                session_uuid=session_uuid,
                 session_data=session_data,
                 user_answer=user_answer_value,
                 is_correct=is_correct,
                 problem_name=data.get('problem_name', ''),
                 category_id=data.get('category_id'),
                 difficulty=data.get('difficulty'),
-                label=label  # 치팅 여부 라벨 전달
+                label=label
             )
-        except Exception as e:
+        except Session.DoesNotExist:
+            release_submission(session_uuid)
             return JsonResponse({
                 "success": False,
-                "error": f"데이터 저장 실패: {str(e)}"
-            }, status=500, json_dumps_params={'ensure_ascii': False})
+                "error": f"업로드된 세션 {session_uuid}을 찾을 수 없습니다."
+            }, status=404, json_dumps_params={'ensure_ascii': False})
+        except SessionAlreadyFinalized as e:
+            release_submission(session_uuid)
+            return JsonResponse({
+                "success": False,
+                "error": str(e)
+            }, status=409, json_dumps_params={'ensure_ascii': False})
 
-        # 5-1. 오답인 경우 Mathpix/OpenAI 검증 스킵하고 즉시 응답 반환
+        # 5-1. 오답인 경우 Mathpix/OpenAI 검증 스킵
         if not is_correct:
             print(f"[오답] 문제ID: {question_id} - Mathpix/OpenAI 검증 스킵, 즉시 응답 반환")
-            return JsonResponse({
-                "success": True,
-                "data": {
-                    "session_id": str(session_id),
-                    "is_correct": False,
-                    "verification": {
-                        "total_score": 0,
-                        "logic_score": 0,
-                        "accuracy_score": 0,
-                        "process_score": 0,
-                        "is_correct": False,
-                        "comment": "오답입니다.",
-                        "detailed_feedback": ""
-                    },
-                    "s3_url": s3_url
-                }
-            }, json_dumps_params={'ensure_ascii': False})
+            return build_verification_response(session_uuid, False, None, s3_url, store_receipt=True)
+
+        # 6. 가시 스트로크만 Mathpix로 전송 (visibleStrokeIds가 없으면 전체)
+        all_strokes = canvas_data['strokes']
+        visible_ids = session_data.get('canvasData', {}).get('visibleStrokeIds')
+        if visible_ids is not None:
+            visible_ids = {str(stroke_id) for stroke_id in visible_ids}
+            strokes_for_mathpix = [s for s in all_strokes if s['id'] in visible_ids]
+        else:
+            strokes_for_mathpix = all_strokes
+        if strokes_for_mathpix:
+            print(f"[Mathpix 전송] 전체 스트로크: {len(all_strokes)}, 가시 스트로크: {len(strokes_for_mathpix)}")
 
-        # 6. 정답인 경우에만 OpenAI로 풀이 검증 (선택적 - strokes가 있는 경우만)
-        verification_result = None
+        # 7. 성공 응답 반환 (재전송 대비 응답 저장, VERIFY_ASYNC이면 검증 작업 id만 반환)
+        return respond_with_verification(question, strokes_for_mathpix, session_uuid, s3_url, store_receipt=True)
 
-        # 화면에 보이는 스트로크만 Mathpix로 전송 (visibleStrokes 우선, 없으면 전체 strokes)
-        # DB에는 전체 strokes가 저장됨 (위 save_session_to_db_and_s3에서 처리)
-        visible_strokes = session_data.get('canvasData', {}).get('visibleStrokes')
-        all_strokes = session_data.get('canvasData', {}).get('strokes', [])
+    except Exception as e:
+        if claimed:
+            release_submission(session_uuid)
+        return server_error_response("finalize_session", e)
 
-        # visibleStrokes가 있으면 사용, 없으면 전체 strokes 사용 (하위 호환성)
-        strokes_for_mathpix = visible_strokes if visible_strokes is not None else all_strokes
 
-        if strokes_for_mathpix:
-            try:
-                # Mathpix로 필기 변환 (화면에 보이는 스트로크만)
-                print(f"[Mathpix 전송] 전체 스트로크: {len(all_strokes)}, 가시 스트로크: {len(strokes_for_mathpix)}")
-                converted_text = convert_strokes_to_text(strokes_for_mathpix)
+@require_http_methods(["GET"])
+@csrf_exempt
+def get_session_replay(request, session_uuid):
+    """
+    저장된 세션의 필기 데이터 조회 (replay / 검토용)
 
-                # OpenAI로 풀이 검증
-                verification_result = verify_solution_with_openai(
-                    question=question,
-                    user_solution=converted_text
-                )
-            except Exception as e:
-                # 검증 실패해도 데이터는 저장되었으므로 경고만 로깅
-                import traceback
-                error_detail = traceback.format_exc()
-                print(f"풀이 검증 실패 (세션 {session_id}): {str(e)}")
-                print(f"상세 에러:\n{error_detail}")
-                verification_result = {
-                    "total_score": 0,
-                    "logic_score": 0,
-                    "accuracy_score": 0,
-                    "process_score": 0,
-                    "is_correct": is_correct,
-                    "comment": "풀이 검증에 실패했습니다.",
-                    "detailed_feedback": f"에러: {str(e)}\n\n상세 정보:\n{error_detail}"
-                }
+    lod를 지정하면 적재 시 만든 RDP 단순화 포인트(api.simplify)를 스트로크 행에서 바로 읽으므로
+    stroke_points를 조회하지 않습니다. 세션 목록 썸네일 등에는 lod=2~3을 권장합니다.
+
+    **엔드포인트**: GET /api/sessions/<session_uuid>/replay/?lod=2
+
+    **쿼리 파라미터**:
+    - lod (int, 선택): 0 = 원본(기본값), 1 이상 = STROKE_LOD_TOLERANCES 순서의 단순화 level
+      (저장된 level 수보다 크면 가장 거친 level)
+
+    **성공 응답** (200):
+    ```json
+    {
+        "success": true,
+        "data": {
+            "session_id": "550e8400-...",
+            "problem_id": 1,
+            "lod": 2,
+            "canvasData": {"strokes": [...], "events": [...]}
+        }
+    }
+    ```
+
+    **에러 응답**: 400 (lod 형식 오류), 404 (세션 없음)
+
+    Args:
+        request: Django HttpRequest 객체
+        session_uuid (UUID): 세션 UUID
+
+    Returns:
+        JsonResponse: 세션 canvasData
+    """
+    try:
+        try:
+            lod = int(request.GET.get('lod', 0))
+        except ValueError:
+            lod = -1
+        if lod < 0:
+            return JsonResponse({
+                "success": False,
+                "error": "lod는 0 이상의 정수여야 합니다."
+            }, status=400, json_dumps_params={'ensure_ascii': False})
+
+        session = Session.objects.filter(session_uuid=session_uuid).only('session_uuid', 'problem_id').first()
+        if session is None:
+            return JsonResponse({
+                "success": False,
+                "error": "세션을 찾을 수 없습니다."
+            }, status=404, json_dumps_params={'ensure_ascii': False})
 
-        # 7. 성공 응답 반환
         return JsonResponse({
             "success": True,
             "data": {
-                "session_id": str(session_id),
-                "is_correct": is_correct,
-                "verification": verification_result or {
-                    "total_score": 100 if is_correct else 0,
-                    "logic_score": 0,
-                    "accuracy_score": 0,
-                    "process_score": 0,
-                    "is_correct": is_correct,
-                    "comment": "정답" if is_correct else "오답",
-                    "detailed_feedback": "필기 데이터가 없어 자동 검증되지 않았습니다."
-                },
-                "s3_url": s3_url
+                "session_id": str(session.session_uuid),
+                "problem_id": session.problem_id,
+                "lod": lod,
+                "canvasData": export_canvas_data(session.session_uuid, lod=lod),
             }
         }, json_dumps_params={'ensure_ascii': False})
+    except Exception as e:
+        return server_error_response("get_session_replay", e)
+
+
+@require_http_methods(["GET"])
+@csrf_exempt
+def get_verification_status(request, job_id):
+    """
+    비동기 풀이 검증 결과 조회 (VERIFY_ASYNC, 폴링용)
+
+    **엔드포인트**: GET /api/verifications/<job_id>/
+
+    **성공 응답** (200):
+    ```json
+    {
+        "success": true,
+        "data": {
+            "id": "uuid",
+            "session_id": "uuid",
+            "status": "done",
+            "verification": {"total_score": 85, ...},
+            "error": null
+        }
+    }
+    ```
+    status는 pending / processing / done / failed이며, done 전에는 verification이 null입니다.
+    처리 중이면 Retry-After 헤더로 다음 조회 간격(초, VERIFY_POLL_INTERVAL_SECONDS)을 알려줍니다.
+
+    **에러 응답**: 404 (작업 없음)
+
+    Args:
+        request: Django HttpRequest 객체
+        job_id (UUID): 제출 응답의 verification_job.id
+
+    Returns:
+        JsonResponse: 검증 작업 상태 및 결과
+    """
+    try:
+        job = VerificationJob.objects.filter(id=job_id).defer('strokes').first()
+        if job is None:
+            return JsonResponse({
+                "success": False,
+                "error": "검증 작업을 찾을 수 없습니다."
+            }, status=404, json_dumps_params={'ensure_ascii': False})
 
+        response = JsonResponse({
+            "success": True,
+            "data": serialize_verification_job(job)
+        }, json_dumps_params={'ensure_ascii': False})
+        if job.status not in (VerificationJob.STATUS_DONE, VerificationJob.STATUS_FAILED):
+            response['Retry-After'] = str(get_poll_interval())
+        return response
     except Exception as e:
-        # 예상치 못한 에러 - 상세 정보 로깅 및 반환
-        import traceback
-        error_traceback = traceback.format_exc()
-
-        # 서버 콘솔에 상세 에러 출력
-        print("=" * 80)
-        print("❌ verify_solution API 에러 발생!")
-        print("=" * 80)
-        print(f"에러 타입: {type(e).__name__}")
-        print(f"에러 메시지: {str(e)}")
-        print("\n상세 스택 트레이스:")
-        print(error_traceback)
-        print("=" * 80)
-
-        # 클라이언트에게 상세 에러 메시지 반환
+        return server_error_response("get_verification_status", e)
+
+
+@require_http_methods(["GET"])
+@csrf_exempt
+def stream_verification_events(request, job_id):
+    """
+    비동기 풀이 검증 결과 구독 (Server-Sent Events)
+
+    **엔드포인트**: GET /api/verifications/<job_id>/events/
+
+    상태가 바뀔 때마다 `status` 이벤트, 끝나면 `result` 이벤트(data는 폴링 응답의 data와 같음)를
+    보내고 연결을 닫습니다. VERIFY_SSE_TIMEOUT_SECONDS 안에 끝나지 않으면 `timeout` 이벤트 후 종료합니다.
+
+    ```javascript
+    const source = new EventSource(verificationJob.events_url);
+    source.addEventListener('result', (e) => { show(JSON.parse(e.data)); source.close(); });
+    ```
+
+    연결이 유지되는 동안 웹 워커 하나를 사용하므로 VERIFY_SSE_ENABLED(기본 False)일 때만 제공합니다.
+    꺼져 있으면 404를 돌려주며, 클라이언트는 폴링(GET /api/verifications/<job_id>/)을 사용합니다.
+
+    Args:
+        request: Django HttpRequest 객체
+        job_id (UUID): 제출 응답의 verification_job.id
+
+    Returns:
+        StreamingHttpResponse: text/event-stream
+    """
+    if not is_sse_enabled():
         return JsonResponse({
             "success": False,
-            "error": f"서버 오류가 발생했습니다: {str(e)}",
-            "error_type": type(e).__name__,
-            "error_detail": error_traceback if os.getenv('DEBUG', 'False') == 'True' else None
-        }, status=500, json_dumps_params={'ensure_ascii': False})
+            "error": "SSE 결과 구독이 비활성화되어 있습니다. status_url을 폴링하세요."
+        }, status=404, json_dumps_params={'ensure_ascii': False})
+
+    if not VerificationJob.objects.filter(id=job_id).exists():
+        return JsonResponse({
+            "success": False,
+            "error": "검증 작업을 찾을 수 없습니다."
+        }, status=404, json_dumps_params={'ensure_ascii': False})
+
+    response = StreamingHttpResponse(iter_verification_events(job_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Nginx가 이벤트를 모아서 보내지 않도록 버퍼링 해제
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 def mask_sensitive_data(value, show_chars=4):
@@ -814,7 +1746,7 @@ def convert_strokes_to_text(strokes):
                     "points": [
                         {"x": 10, "y": 20, "timestamp": 100, ...},
                         ...
-                    ]
+                    ]  # 또는 v2 형식의 "columns"
                 },
                 ...
             ]
@@ -823,7 +1755,7 @@ def convert_strokes_to_text(strokes):
         str: 변환된 텍스트 (LaTeX 및 일반 텍스트 포함)
 
     Raises:
-        Exception: Mathpix API 호출 실패 시
+        Exception: Mathpix API 호출 실패 시 (core.mathpix_client.MathpixError 포함)
     """
     # Mathpix API 자격 증명 (.env 파일에서 로드)
     app_id = os.getenv('MATHPIX_APP_ID')
@@ -836,7 +1768,8 @@ def convert_strokes_to_text(strokes):
         raise Exception("Mathpix API 자격 증명이 설정되지 않았습니다. .env 파일을 확인하세요.")
 
     # Frontend의 strokes 데이터를 Mathpix API 형식으로 변환
-    # Frontend: {"points": [{"x": 10, "y": 20, "timestamp": 100}, ...]}
+    # Frontend v1: {"points": [{"x": 10, "y": 20, "timestamp": 100}, ...]}
+    # Frontend v2: {"columns": {"x": [...], "y": [...], "t": [...]}} (delta 인코딩, api.wire 참고)
     # Mathpix: {"strokes": {"x": [[x1, x2, ...]], "y": [[y1, y2, ...]], "t": [[t1, t2, ...]]}}
     x_arrays = []
     y_arrays = []
@@ -847,18 +1780,7 @@ def convert_strokes_to_text(strokes):
         if stroke.get('tool') == 'eraser':
             continue
 
-        points = stroke.get('points', [])
-        if not points:
-            continue
-
-        x_coords = []
-        y_coords = []
-        t_coords = []
-
-        for point in points:
-            x_coords.append(point.get('x', 0))
-            y_coords.append(point.get('y', 0))
-            t_coords.append(point.get('timestamp', 0))
+        x_coords, y_coords, t_coords = decode_stroke_xyt(stroke)
 
         if x_coords:  # 포인트가 있는 경우만 추가
             x_arrays.append(x_coords)
@@ -869,15 +1791,16 @@ def convert_strokes_to_text(strokes):
     if not x_arrays:
         raise Exception("변환할 필기 데이터가 없습니다.")
 
-    # Mathpix Strokes API 엔드포인트
-    url = "https://api.mathpix.com/v3/strokes"
+    # 같은 필기(x/y 배열)는 이전 변환 결과 재사용 (api.ocr_cache)
+    fingerprint = strokes_fingerprint(x_arrays, y_arrays)
+    cached_text = get_cached_text(fingerprint)
+    if cached_text is not None:
+        print(f"[Mathpix 캐시 적중] {fingerprint[:12]} - 변환된 텍스트 길이: {len(cached_text)} 문자")
+        return cached_text
 
-    # 요청 헤더
-    headers = {
-        'app_id': app_id,
-        'app_key': app_key,
-        'Content-Type': 'application/json'
-    }
+    # Mathpix Strokes API (연결 풀 / 재시도 / 서킷 브레이커는 core.mathpix_client)
+    mathpix_client = get_mathpix_client()
+    url = mathpix_client.base_url + "strokes"
 
     # 요청 본문 - Mathpix 공식 문서 형식에 맞춤
     # 중요: strokes가 2중 중첩 구조여야 함
@@ -906,8 +1829,8 @@ def convert_strokes_to_text(strokes):
         print(f"  - 첫 번째 stroke t 샘플: {t_arrays[0][:5]}")
     # 전체 payload는 너무 크므로 구조만 출력 (보안 및 가독성)
 
-    # API 호출
-    response = requests.post(url, headers=headers, json=payload, timeout=30)
+    # API 호출 (429 / 5xx는 재시도, Mathpix 장애로 브레이커가 열려 있으면 바로 MathpixUnavailable)
+    response = mathpix_client.post("strokes", json=payload)
 
     # 디버깅: 응답 상태 출력
     print(f"\n[Mathpix API 응답]")
@@ -940,6 +1863,7 @@ def convert_strokes_to_text(strokes):
         raise Exception("Mathpix API가 텍스트를 변환하지 못했습니다.")
 
     print(f"[성공] 변환된 텍스트 길이: {len(converted_text)} 문자")
+    store_text(fingerprint, converted_text)
     return converted_text
 
 
@@ -1027,6 +1951,13 @@ def verify_solution_with_openai(question, user_solution):
     Raises:
         Exception: OpenAI API 호출 실패 시
     """
+    # 같은 문제(내용 포함)의 같은 풀이는 이전 채점 결과 재사용 (api.verdict_cache)
+    cache_key = verdict_cache_key(question, user_solution)
+    cached_verdict = get_cached_verdict(cache_key)
+    if cached_verdict is not None:
+        print(f"[채점 캐시 적중] 문제 {question.id} - 총점 {cached_verdict.get('total_score')}")
+        return cached_verdict
+
     # 시스템 프롬프트: AI의 역할 정의
     system_prompt = """
 당신은 수학 문제 풀이를 평가하는 전문 교사입니다.
@@ -1097,6 +2028,7 @@ def verify_solution_with_openai(question, user_solution):
 
     # 결과 파싱 및 반환
     result = response.output_parsed.model_dump()
+    store_verdict(cache_key, result)
     return result
 
 
@@ -1126,3 +2058,66 @@ def health_check(request):
         "status": "ok",
         "service": "Question API"
     })
+
+
+@require_http_methods(["GET"])
+@csrf_exempt
+def ingest_stats(request):
+    """
+    비동기 적재 / S3 백업 / 풀이 검증 대기열 지표 조회
+
+    **엔드포인트**: GET /api/ingest/stats/
+
+    **응답 형식**:
+    ```json
+    {
+        "success": true,
+        "data": {
+            "async_enabled": true,
+            "depth": 3,
+            "pending": 2,
+            "processing": 1,
+            "failed": 0,
+            "lag_seconds": 1.52,
+            "archive": {"async_enabled": false, "format": "json", "depth": 0, "pending": 0, ...},
+            "verification": {"async_enabled": false, "depth": 0, "pending": 0, ...},
+            "mathpix_cache": {"enabled": true, "backend": "LocMemCache", "hits": 12, "misses": 30, ...},
+            "verdict_cache": {"enabled": true, "backend": "LocMemCache", "hits": 8, "misses": 22, ...},
+            "mathpix_client": {"read_timeout": 30.0, "breaker": {"state": "closed", "consecutive_failures": 0}, ...}
+        }
+    }
+    ```
+
+    Args:
+        request: Django HttpRequest 객체
+
+    Returns:
+        JsonResponse: 대기열 깊이 및 지연 시간
+    """
+    try:
+        return JsonResponse({
+            "success": True,
+            "data": {
+                "async_enabled": is_async_ingest_enabled(),
+                **queue_stats(),
+                # S3 백업 대기열 (api.archive)
+                "archive": {
+                    "async_enabled": is_async_archive_enabled(),
+                    "format": get_archive_format(),
+                    **archive_stats(),
+                },
+                # 풀이 검증 대기열 (api.verification_queue)
+                "verification": {"async_enabled": is_async_verification_enabled(), **verification_stats()},
+                # Mathpix 변환 결과 캐시 적중률 (api.ocr_cache)
+                "mathpix_cache": ocr_cache_stats(),
+                # OpenAI 채점 결과 캐시 적중률 (api.verdict_cache)
+                "verdict_cache": verdict_cache_stats(),
+                # Mathpix 클라이언트 서킷 브레이커 상태 (core.mathpix_client)
+                "mathpix_client": get_mathpix_client().stats(),
+            }
+        }, json_dumps_params={'ensure_ascii': False})
+    except Exception as e:
+        return JsonResponse({
+            "success": False,
+            "error": str(e)
+        }, status=500, json_dumps_params={'ensure_ascii': False})
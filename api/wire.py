@@ -0,0 +1,407 @@
+"""
+스트로크 페이로드 wire 형식 (v1 / v2) 디코더
+
+v1 (기존): 포인트마다 dict
+    {"startTime": 1000, "points": [{"x": 10, "y": 20, "timestamp": 1000, "pressure": 0.5, ...}, ...]}
+
+v2 (columnar): 스트로크별 컬럼 배열 (struct-of-arrays)
+    {
+        "startTime": 1000,
+        "pointerType": "pen",      # 스트로크의 모든 포인트에 공통
+        "columns": {
+            "t":  [0, 8, 8, ...],      # 첫 값은 startTime 기준 ms, 이후는 직전 포인트와의 차이
+            "x":  [120, 1, 2, ...],    # 첫 값은 절대 좌표, 이후는 차이 (정수)
+            "y":  [340, 0, -1, ...],   # x와 동일
+            "p":  [512, 530, ...],     # pressure × PRESSURE_SCALE 반올림 (정수)
+            "tx": [...], "ty": [...],  # tiltX / tiltY (정수 도)
+            "tw": [...],               # twist (정수 도)
+            "pid": [...], "b": [...],  # pointerId / buttons
+            "w": [...], "h": [...]     # width / height
+        }
+    }
+
+- t / x / y는 필수이고 길이가 같아야 합니다. 나머지 컬럼은 생략 가능(전부 NULL)하며,
+  값 안의 null도 허용합니다. buttons가 없으면 0으로 간주합니다.
+- 스트로크에 "columns"가 있으면 v2, 없으면 v1로 처리하므로 한 요청 안에서 섞여도 됩니다.
+
+서버는 두 형식을 모두 같은 컬럼 배열(필드명은 StrokePoint와 동일, pressure는 적재 시
+pressure_q로 양자화)로 디코딩하여 적재(api.ingest)와 Mathpix 변환에 사용합니다. v2는 포인트 dict를 만들지 않습니다.
+"""
+
+import math
+from itertools import accumulate
+
+WIRE_VERSION_V1 = 1
+WIRE_VERSION_V2 = 2
+
+# v2 pressure 양자화 단위 (0.0 ~ 1.0 → 0 ~ 1024)
+PRESSURE_SCALE = 1024
+
+# 정수 컬럼(int4)에 저장할 수 있는 범위 (-2 ** 31은 packed 형식의 NULL 센티넬이므로 제외)
+INT32_MIN = -2 ** 31 + 1
+INT32_MAX = 2 ** 31 - 1
+
+# 차이(delta)로 인코딩되는 v2 컬럼
+DELTA_COLUMNS = ('t', 'x', 'y')
+
+# (v2 컬럼 키, StrokePoint 필드명, v1 포인트 키) - delta 컬럼 제외
+VALUE_COLUMNS = (
+    ('p', 'pressure', 'pressure'),
+    ('tx', 'tilt_x', 'tiltX'),
+    ('ty', 'tilt_y', 'tiltY'),
+    ('tw', 'twist', 'twist'),
+    ('pid', 'pointer_id', 'pointerId'),
+    ('b', 'buttons', 'buttons'),
+    ('w', 'width', 'width'),
+    ('h', 'height', 'height'),
+)
+
+
+def quantize_pressure(values):
+    """
+    pressure(0.0 ~ 1.0) 배열을 PRESSURE_SCALE 단위 정수로 양자화 (StrokePoint.pressure_q)
+
+    Args:
+        values (list): pressure 배열 (None 허용)
+
+    Returns:
+        list: 0 ~ PRESSURE_SCALE 정수 배열 (None은 그대로)
+    """
+    return [None if p is None else int(round(p * PRESSURE_SCALE)) for p in values]
+
+
+def dequantize_pressure(value):
+    """
+    양자화된 pressure 정수를 0.0 ~ 1.0 실수로 복원
+
+    Args:
+        value (int): StrokePoint.pressure_q (None 허용)
+
+    Returns:
+        float: pressure (None이면 None)
+    """
+    return None if value is None else value / PRESSURE_SCALE
+
+
+def get_stroke_version(stroke):
+    """
+    스트로크의 wire 형식 버전 판별
+
+    Args:
+        stroke (dict): canvasData.strokes의 원소
+
+    Returns:
+        int: WIRE_VERSION_V2 ("columns"가 있는 경우) 또는 WIRE_VERSION_V1
+    """
+    return WIRE_VERSION_V2 if isinstance(stroke.get('columns'), dict) else WIRE_VERSION_V1
+
+
+def _decode_delta(values):
+    """
+    delta 인코딩된 정수 배열을 절대값 배열로 복원
+
+    Args:
+        values (list): [첫 값, 차이, 차이, ...]
+
+    Returns:
+        list: 누적합 배열
+    """
+    return list(accumulate(int(v) for v in values))
+
+
+def _get_v2_columns(stroke):
+    """
+    v2 스트로크의 columns 검증 후 반환
+
+    Args:
+        stroke (dict): v2 스트로크
+
+    Returns:
+        tuple: (columns, count)
+
+    Raises:
+        ValueError: 필수 컬럼이 없거나 컬럼 길이가 다른 경우
+    """
+    columns = stroke['columns']
+    count = len(columns.get('t') or ())
+    for key in DELTA_COLUMNS:
+        if len(columns.get(key) or ()) != count:
+            raise ValueError(f"v2 스트로크의 '{key}' 컬럼 길이가 올바르지 않습니다.")
+    for key, _, _ in VALUE_COLUMNS:
+        values = columns.get(key)
+        if values is not None and len(values) != count:
+            raise ValueError(f"v2 스트로크의 '{key}' 컬럼 길이가 올바르지 않습니다.")
+    return columns, count
+
+
+def _is_number(value):
+    """JSON 숫자(유한한 int / float) 여부"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _check_int32(values, label):
+    """정수 컬럼에 저장할 값(디코딩 후)이 int4 범위인지 확인"""
+    if values and (min(values) < INT32_MIN or max(values) > INT32_MAX):
+        raise ValueError(f"{label} 값이 허용 범위를 벗어났습니다.")
+
+
+def _check_numbers(values, label, nullable=True, integral=False):
+    """배열의 모든 값이 숫자(nullable이면 null 허용, integral이면 정수값만)인지 확인"""
+    for value in values:
+        if value is None and nullable:
+            continue
+        if not _is_number(value):
+            raise ValueError(f"{label}에 숫자가 아닌 값이 있습니다.")
+        if integral and isinstance(value, float) and not value.is_integer():
+            # 소수 delta를 int()로 자르면 누적합이 포인트마다 어긋나므로 거부
+            raise ValueError(f"{label}에 정수가 아닌 값이 있습니다.")
+
+
+def validate_stroke(stroke):
+    """
+    스트로크 한 개의 wire 형식 검증 (요청 처리 시점, 적재 전)
+
+    적재(api.ingest)와 Mathpix 변환 중에 실패할 형식 오류를 미리 찾아
+    400으로 돌려주기 위한 검사입니다. 비동기 적재(INGEST_ASYNC)에서는 요청을 받은 뒤에
+    워커가 실패하면 데이터가 조용히 버려지므로 대기열에 넣기 전에 호출해야 합니다.
+
+    Args:
+        stroke: canvasData.strokes의 원소
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우 (메시지는 응답에 그대로 사용)
+    """
+    if not isinstance(stroke, dict):
+        raise ValueError("스트로크는 객체여야 합니다.")
+    for key in ('startTime', 'endTime', 'strokeWidth'):
+        value = stroke.get(key)
+        if value is not None:
+            if not _is_number(value):
+                raise ValueError(f"스트로크의 '{key}'는 숫자여야 합니다.")
+            _check_int32([int(value)], f"스트로크의 '{key}'")
+    pointer_type = stroke.get('pointerType')
+    if pointer_type is not None and not isinstance(pointer_type, str):
+        raise ValueError("스트로크의 'pointerType'은 문자열이어야 합니다.")
+
+    if 'columns' in stroke:
+        columns = stroke['columns']
+        if not isinstance(columns, dict):
+            raise ValueError("v2 스트로크의 'columns'는 객체여야 합니다.")
+        for key in (*DELTA_COLUMNS, *(key for key, _, _ in VALUE_COLUMNS)):
+            values = columns.get(key)
+            if values is not None and not isinstance(values, list):
+                raise ValueError(f"v2 스트로크의 '{key}' 컬럼은 배열이어야 합니다.")
+        _get_v2_columns(stroke)
+        for key in DELTA_COLUMNS:
+            values = columns.get(key) or []
+            _check_numbers(values, f"v2 스트로크의 '{key}' 컬럼", nullable=False, integral=True)
+            _check_int32(_decode_delta(values), f"v2 스트로크의 '{key}' 컬럼")
+        for key, field, _ in VALUE_COLUMNS:
+            values = columns.get(key)
+            if values is None:
+                continue
+            _check_numbers(values, f"v2 스트로크의 '{key}' 컬럼")
+            if field != 'pressure':
+                _check_int32([int(v) for v in values if v is not None], f"v2 스트로크의 '{key}' 컬럼")
+        return
+
+    points = stroke.get('points') or []
+    if not isinstance(points, list):
+        raise ValueError("스트로크의 'points'는 배열이어야 합니다.")
+    start_ms = int(stroke.get('startTime', 0))
+    for point in points:
+        if not isinstance(point, dict):
+            raise ValueError("스트로크의 포인트는 객체여야 합니다.")
+        for key in ('x', 'y', 'timestamp'):
+            value = point.get(key, 0)
+            if not _is_number(value):
+                raise ValueError(f"포인트의 '{key}'는 숫자여야 합니다.")
+        for _, field, key in VALUE_COLUMNS:
+            value = point.get(key)
+            if value is not None and not _is_number(value):
+                raise ValueError(f"포인트의 '{key}'는 숫자여야 합니다.")
+    _check_int32([int(p.get('x', 0)) for p in points], "포인트의 'x'")
+    _check_int32([int(p.get('y', 0)) for p in points], "포인트의 'y'")
+    _check_int32([int(p.get('timestamp', 0)) - start_ms for p in points], "포인트의 'timestamp'")
+
+
+def validate_strokes(strokes, label='strokes', start=0):
+    """
+    스트로크 배열 검증
+
+    Args:
+        strokes: canvasData.strokes / visibleStrokes / 청크의 strokes
+        label (str): 오류 메시지에 쓸 이름
+        start (int): 오류 메시지의 첫 인덱스 (스트리밍 배치 단위 검증용)
+
+    Returns:
+        str | None: 오류 메시지 (문제가 없으면 None)
+    """
+    if not isinstance(strokes, list):
+        return f"{label}는 배열이어야 합니다."
+    for index, stroke in enumerate(strokes, start=start):
+        try:
+            validate_stroke(stroke)
+        except ValueError as e:
+            return f"{label}[{index}]: {e}"
+    return None
+
+
+def validate_events(events, label='events', start=0):
+    """
+    이벤트 배열 검증 (적재 시 정수로 변환하는 필드만)
+
+    Args:
+        events: canvasData.events / 청크의 events
+        label (str): 오류 메시지에 쓸 이름
+        start (int): 오류 메시지의 첫 인덱스 (스트리밍 배치 단위 검증용)
+
+    Returns:
+        str | None: 오류 메시지 (문제가 없으면 None)
+    """
+    if not isinstance(events, list):
+        return f"{label}는 배열이어야 합니다."
+    for index, event in enumerate(events, start=start):
+        if not isinstance(event, dict):
+            return f"{label}[{index}]: 이벤트는 객체여야 합니다."
+        for key in ('timestamp', 'endTimestamp', 'count'):
+            value = event.get(key)
+            if value is not None and not (_is_number(value) and INT32_MIN <= value <= INT32_MAX):
+                return f"{label}[{index}]: 이벤트의 '{key}'는 정수 범위의 숫자여야 합니다."
+    return None
+
+
+def decode_stroke_columns(stroke):
+    """
+    v1/v2 스트로크의 포인트를 컬럼 배열로 디코딩 (적재용)
+
+    Args:
+        stroke (dict): canvasData.strokes의 원소
+
+    Returns:
+        tuple: (count, columns)
+            columns = {"t_ms": [...], "x": [...], "y": [...], "pressure": [...],
+                       "tilt_x", "tilt_y", "twist", "pointer_type", "pointer_id",
+                       "buttons", "width", "height"}
+            t_ms는 스트로크 시작(startTime) 기준 상대 ms, x/y는 정수
+
+    Raises:
+        ValueError: v2 컬럼이 올바르지 않은 경우
+    """
+    if get_stroke_version(stroke) == WIRE_VERSION_V2:
+        encoded, count = _get_v2_columns(stroke)
+        columns = {
+            't_ms': _decode_delta(encoded['t']),
+            'x': _decode_delta(encoded['x']),
+            'y': _decode_delta(encoded['y']),
+        }
+        for key, field, _ in VALUE_COLUMNS:
+            values = encoded.get(key)
+            if values is None:
+                values = [0 if field == 'buttons' else None] * count
+            elif field == 'pressure':
+                values = [None if q is None else q / PRESSURE_SCALE for q in values]
+            columns[field] = values
+        columns['pointer_type'] = [stroke.get('pointerType') or 'pen'] * count
+        return count, columns
+
+    points = stroke.get('points') or []
+    start_ms = int(stroke.get('startTime', 0))
+    columns = {
+        # 프론트엔드는 세션 기준 절대 시간을 보내므로 스트로크 시작 기준 상대 시간으로 변환
+        't_ms': [int(p.get('timestamp', 0)) - start_ms for p in points],
+        'x': [int(p.get('x', 0)) for p in points],
+        'y': [int(p.get('y', 0)) for p in points],
+        'pointer_type': [p.get('pointerType', 'pen') for p in points],
+    }
+    for _, field, key in VALUE_COLUMNS:
+        default = 0 if field == 'buttons' else None
+        columns[field] = [p.get(key, default) for p in points]
+    return len(points), columns
+
+
+def decode_stroke_xyt(stroke):
+    """
+    Mathpix 변환에 필요한 x / y / t 배열만 디코딩
+
+    t는 세션 기준 절대 ms입니다 (v1의 point.timestamp와 같은 기준).
+
+    Args:
+        stroke (dict): canvasData.strokes의 원소
+
+    Returns:
+        tuple: (x_coords, y_coords, t_coords)
+
+    Raises:
+        ValueError: v2 컬럼이 올바르지 않은 경우
+    """
+    if get_stroke_version(stroke) == WIRE_VERSION_V2:
+        encoded, _ = _get_v2_columns(stroke)
+        start_ms = int(stroke.get('startTime', 0))
+        return (
+            _decode_delta(encoded['x']),
+            _decode_delta(encoded['y']),
+            [start_ms + t for t in _decode_delta(encoded['t'])],
+        )
+
+    points = stroke.get('points') or []
+    return (
+        [p.get('x', 0) for p in points],
+        [p.get('y', 0) for p in points],
+        [p.get('timestamp', 0) for p in points],
+    )
+
+
+def _encode_delta(values):
+    """
+    정수 배열을 delta 인코딩
+
+    Args:
+        values (list): 절대값 배열
+
+    Returns:
+        list: [첫 값, 차이, 차이, ...]
+    """
+    encoded = []
+    prev = 0
+    for v in values:
+        v = int(round(v))
+        encoded.append(v - prev)
+        prev = v
+    return encoded
+
+
+def encode_stroke_v2(stroke):
+    """
+    v1 스트로크를 v2 형식으로 변환 (저장된 데이터 재전송 / 벤치마크용)
+
+    좌표·시간·기울기는 정수로 반올림되고 pressure는 1/PRESSURE_SCALE 단위로 양자화됩니다.
+
+    Args:
+        stroke (dict): v1 스트로크 (points 포함)
+
+    Returns:
+        dict: points 대신 columns를 가진 v2 스트로크
+    """
+    points = stroke.get('points') or []
+    start_ms = int(stroke.get('startTime', 0))
+
+    columns = {
+        't': _encode_delta(p.get('timestamp', 0) - start_ms for p in points),
+        'x': _encode_delta(p.get('x', 0) for p in points),
+        'y': _encode_delta(p.get('y', 0) for p in points),
+    }
+    for key, field, point_key in VALUE_COLUMNS:
+        values = [p.get(point_key) for p in points]
+        if all(v is None for v in values):
+            continue
+        if field == 'pressure':
+            columns[key] = [None if v is None else round(v * PRESSURE_SCALE) for v in values]
+        else:
+            columns[key] = [None if v is None else int(round(v)) for v in values]
+
+    encoded = {k: v for k, v in stroke.items() if k != 'points'}
+    if points and 'pointerType' not in encoded:
+        encoded['pointerType'] = points[0].get('pointerType', 'pen')
+    encoded['columns'] = columns
+    return encoded
@@ -126,6 +126,9 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 커버링 인덱스(Index.include)는 PostgreSQL 전용 - SQLite 개발 DB에서는 키 컬럼만 생성됨
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
+
 # =====================================================
 # CORS (Cross-Origin Resource Sharing) 설정
 # 정적 프론트엔드에서 API 호출을 허용하기 위한 설정
@@ -160,6 +163,7 @@ CORS_ALLOW_HEADERS = [
     'accept',
     'accept-encoding',
     'authorization',
+    'content-encoding',  # gzip/zstd 압축 요청 본문
     'content-type',
     'dnt',
     'origin',
@@ -167,3 +171,207 @@ CORS_ALLOW_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
 ]
+
+# =====================================================
+# 파일 저장소 설정 (세션 백업 / 문제 이미지, core/storage.py)
+# =====================================================
+
+# 저장소 백엔드: 's3' | 'local'
+# local: STORAGE_LOCAL_ROOT 아래 파일로 저장 (개발 / 벤치마크용)
+STORAGE_BACKEND = env("STORAGE_BACKEND", default="s3")
+STORAGE_LOCAL_ROOT = env("STORAGE_LOCAL_ROOT", default=str(BASE_DIR / "local_storage"))
+# local 백엔드 URL 접두사 (비어 있으면 file:// URI)
+STORAGE_LOCAL_BASE_URL = env("STORAGE_LOCAL_BASE_URL", default="")
+
+AWS_S3_REGION_NAME = env("AWS_S3_REGION_NAME", default=None)
+AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME", default=None)
+# 키를 비워 두면 boto3 기본 자격 증명 체인(IAM 역할 등) 사용
+AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID", default=None)
+AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY", default=None)
+
+# 프로세스 공용 S3 클라이언트의 최대 연결 수 (동시 업로드 스레드 수 이상으로)
+AWS_S3_MAX_POOL_CONNECTIONS = env.int("AWS_S3_MAX_POOL_CONNECTIONS", default=32)
+# S3 연결 / 응답 대기 시간(초)과 botocore 재시도 횟수 (첫 시도 포함)
+AWS_S3_CONNECT_TIMEOUT = env.int("AWS_S3_CONNECT_TIMEOUT", default=5)
+AWS_S3_READ_TIMEOUT = env.int("AWS_S3_READ_TIMEOUT", default=60)
+AWS_S3_MAX_ATTEMPTS = env.int("AWS_S3_MAX_ATTEMPTS", default=3)
+# 스트리밍 업로드(세션 백업)의 멀티파트 파트 크기(바이트, 최소 5 MiB) - 업로드 중 메모리 사용량 상한
+AWS_S3_MULTIPART_CHUNKSIZE = env.int("AWS_S3_MULTIPART_CHUNKSIZE", default=8 * 1024 * 1024)
+
+# 세션 백업 업로드 방식 (api.archive)
+# True : 요청 중에는 archive_jobs 대기열에만 저장하고 `python manage.py run_archive_worker`가 업로드
+# False: 요청 중에 바로 업로드하고, 실패한 경우에만 대기열에 재시도 작업으로 남김
+ARCHIVE_ASYNC = env.bool("ARCHIVE_ASYNC", default=False)
+
+# 백업 업로드 재시도: 실패 확정 전 최대 시도 횟수와 지수 백오프(초) 기준값 / 상한
+ARCHIVE_MAX_ATTEMPTS = env.int("ARCHIVE_MAX_ATTEMPTS", default=8)
+ARCHIVE_RETRY_BASE_SECONDS = env.int("ARCHIVE_RETRY_BASE_SECONDS", default=30)
+ARCHIVE_RETRY_MAX_SECONDS = env.int("ARCHIVE_RETRY_MAX_SECONDS", default=3600)
+
+# 세션 백업 형식 (api.archive / api.shards)
+# 'json'   : 세션마다 answers/{problem_id}_{session_uuid}.json.gz 업로드 (기본)
+# 'parquet': 세션별 JSON은 만들지 않고 `python manage.py build_archive_shards`가 구간별 Parquet 샤드로만 백업
+# 'both'   : 둘 다
+ARCHIVE_FORMAT = env("ARCHIVE_FORMAT", default="json")
+
+# Parquet 샤드: 시간 구간 길이(시간, UTC 기준 정렬) / 구간이 끝난 뒤 기다릴 시간(분) / 압축 코덱
+ARCHIVE_SHARD_WINDOW_HOURS = env.int("ARCHIVE_SHARD_WINDOW_HOURS", default=24)
+ARCHIVE_SHARD_DELAY_MINUTES = env.int("ARCHIVE_SHARD_DELAY_MINUTES", default=30)
+ARCHIVE_SHARD_COMPRESSION = env("ARCHIVE_SHARD_COMPRESSION", default="zstd")
+
+# =====================================================
+# 세션 데이터 적재(ingest) 설정
+# =====================================================
+
+# bulk_create 한 번에 INSERT할 최대 행 수
+# 스트로크 수와 무관하게 테이블별 (행 수 / 배치 크기)번의 쿼리만 실행됨
+INGEST_BATCH_SIZE = env.int("INGEST_BATCH_SIZE", default=2000)
+
+# stroke_points 적재 백엔드: 'auto' | 'orm' | 'copy'
+# auto: PostgreSQL + psycopg3이면 COPY ... FROM STDIN, 그 외(SQLite 등)는 ORM bulk_create
+INGEST_POINT_BACKEND = env("INGEST_POINT_BACKEND", default="auto")
+
+# 포인트 저장 방식: 'rows' | 'packed' | 'both'
+# rows  : 포인트마다 stroke_points 행 1개
+# packed: 스트로크별로 포인트를 컬럼 배열 바이너리로 묶어 strokes.points_packed에 저장
+# both  : 두 방식 모두 저장 (packed 전환 검증 기간용)
+STROKE_POINT_STORAGE = env("STROKE_POINT_STORAGE", default="rows")
+
+# 스트로크 LOD(level-of-detail) 피라미드의 RDP tolerance(px), 세밀한 순 (빈 값이면 LOD를 만들지 않음)
+# 조회 API의 lod=1,2,3...이 순서대로 대응 (lod=0은 원본)
+STROKE_LOD_TOLERANCES = env.list("STROKE_LOD_TOLERANCES", cast=float, default=[1.0, 4.0, 16.0])
+
+# 비동기 적재 모드
+# True이면 verify_solution은 원본 요청을 ingest_jobs 대기열에 저장하고 즉시 응답하며,
+# DB 적재와 S3 백업은 `python manage.py run_ingest_worker` 프로세스가 처리
+INGEST_ASYNC = env.bool("INGEST_ASYNC", default=False)
+
+# 비동기 적재 재시도: 실패한 작업은 지수 백오프(초) 후 다시 처리 (기준값 / 상한)
+INGEST_RETRY_BASE_SECONDS = env.int("INGEST_RETRY_BASE_SECONDS", default=10)
+INGEST_RETRY_MAX_SECONDS = env.int("INGEST_RETRY_MAX_SECONDS", default=600)
+
+# 요청 본문 최대 크기 (Content-Encoding 해제 후 기준, bytes)
+# gzip/zstd 압축 폭탄 방지를 위해 해제 도중 이 크기를 넘으면 413 반환
+INGEST_MAX_BODY_BYTES = env.int("INGEST_MAX_BODY_BYTES", default=64 * 1024 * 1024)
+
+# 스트리밍 파싱 기준 크기 (Content-Length 기준, bytes)
+# 이 크기 이상인 verify_solution 요청은 본문 전체를 json.loads하지 않고
+# ijson으로 읽으면서 스트로크/이벤트를 INGEST_BATCH_SIZE 단위로 바로 적재 (0이면 사용 안 함)
+INGEST_STREAMING_MIN_BYTES = env.int("INGEST_STREAMING_MIN_BYTES", default=1024 * 1024)
+
+# 제출 영수증(submission_receipts) 선점 유효 시간(초)
+# metadata.sessionId가 같은 재전송은 저장된 응답을 반환하며, 응답 없이 이 시간이 지난 영수증은
+# 처리 도중 중단된 것으로 보고 다시 선점할 수 있음
+SUBMISSION_CLAIM_TIMEOUT = env.int("SUBMISSION_CLAIM_TIMEOUT", default=300)
+
+# 적재 시 연속된 같은 타입 이벤트를 구간 이벤트 하나로 병합할 타입 (빈 값이면 병합 안 함)
+# 원본 시퀀스는 S3 백업에 남으며, 분할 업로드(chunk) 세션은 병합하지 않음
+EVENT_COALESCE_TYPES = env.list(
+    "EVENT_COALESCE_TYPES", default=["zoom", "zoom_in", "zoom_out", "pinch_zoom", "pan", "canvas_pan"]
+)
+
+# 같은 구간으로 합칠 최대 이벤트 간격(ms) - 이보다 멀면 별개의 제스처로 봄
+EVENT_COALESCE_GAP_MS = env.int("EVENT_COALESCE_GAP_MS", default=300)
+
+# =====================================================
+# Mathpix API 클라이언트 설정 (core.mathpix_client)
+# =====================================================
+
+# 프로세스 공용 keep-alive 연결 풀 크기 (검증 워커 --concurrency 이상 권장)
+MATHPIX_POOL_MAXSIZE = env.int("MATHPIX_POOL_MAXSIZE", default=32)
+# 연결 / 응답 대기 타임아웃(초)
+MATHPIX_CONNECT_TIMEOUT = env.float("MATHPIX_CONNECT_TIMEOUT", default=5.0)
+MATHPIX_READ_TIMEOUT = env.float("MATHPIX_READ_TIMEOUT", default=30.0)
+# 429 / 5xx / 연결 오류 재시도 횟수와 지수 백오프(초, 지터 적용) 기준값 / 최대값
+MATHPIX_MAX_RETRIES = env.int("MATHPIX_MAX_RETRIES", default=2)
+MATHPIX_RETRY_BACKOFF = env.float("MATHPIX_RETRY_BACKOFF", default=0.5)
+MATHPIX_RETRY_BACKOFF_MAX = env.float("MATHPIX_RETRY_BACKOFF_MAX", default=8.0)
+# 서킷 브레이커: 연속 실패(재시도 포함) 횟수와 차단 시간(초)
+# 차단 중에는 Mathpix를 호출하지 않고 바로 "풀이 검증에 실패했습니다." 결과로 응답
+MATHPIX_BREAKER_FAILURES = env.int("MATHPIX_BREAKER_FAILURES", default=5)
+MATHPIX_BREAKER_RESET_SECONDS = env.float("MATHPIX_BREAKER_RESET_SECONDS", default=30.0)
+
+# =====================================================
+# 캐시 설정 (django-environ cache URL)
+# =====================================================
+
+# Mathpix 필기 변환 결과 캐시 (api.ocr_cache) - 같은 필기(x/y 배열)의 재제출 / 재채점은 Mathpix를 다시 호출하지 않음
+MATHPIX_CACHE_ENABLED = env.bool("MATHPIX_CACHE_ENABLED", default=True)
+# 항목 보존 시간(초)과 최대 항목 수 (초과 시 오래된 항목부터 정리, locmem / db 백엔드)
+MATHPIX_CACHE_TTL_SECONDS = env.int("MATHPIX_CACHE_TTL_SECONDS", default=30 * 24 * 3600)
+MATHPIX_CACHE_MAX_ENTRIES = env.int("MATHPIX_CACHE_MAX_ENTRIES", default=10000)
+
+# OpenAI 풀이 채점 결과 캐시 (api.verdict_cache) - 같은 문제의 같은 풀이(정규화 텍스트)는 다시 채점하지 않음
+# 문제의 정답 / 모범 풀이 등이 바뀌면 키가 달라져 자동으로 무효화
+VERDICT_CACHE_ENABLED = env.bool("VERDICT_CACHE_ENABLED", default=True)
+VERDICT_CACHE_TTL_SECONDS = env.int("VERDICT_CACHE_TTL_SECONDS", default=7 * 24 * 3600)
+VERDICT_CACHE_MAX_ENTRIES = env.int("VERDICT_CACHE_MAX_ENTRIES", default=10000)
+
+# 캐시 저장소
+# locmemcache://mathpix        : 프로세스별 메모리 (기본, 워커 간 공유 안 됨)
+# dbcache://mathpix_ocr_cache  : DB 테이블 (`python manage.py createcachetable` 필요, 워커 간 공유)
+# rediscache://host:6379/1     : Redis (redis 패키지 필요)
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="locmemcache://"),
+    "mathpix": {
+        **env.cache_url("MATHPIX_CACHE_URL", default="locmemcache://mathpix"),
+        "TIMEOUT": MATHPIX_CACHE_TTL_SECONDS,
+    },
+    "verdicts": {
+        **env.cache_url("VERDICT_CACHE_URL", default="locmemcache://verdicts"),
+        "TIMEOUT": VERDICT_CACHE_TTL_SECONDS,
+    },
+}
+for _alias, _max_entries in (("mathpix", MATHPIX_CACHE_MAX_ENTRIES), ("verdicts", VERDICT_CACHE_MAX_ENTRIES)):
+    if not CACHES[_alias]["BACKEND"].endswith(("RedisCache", "PyMemcacheCache", "PyLibMCCache")):
+        # Redis / Memcached는 자체 메모리 한도(maxmemory 등)로 정리
+        CACHES[_alias]["OPTIONS"] = {**CACHES[_alias].get("OPTIONS", {}), "MAX_ENTRIES": _max_entries}
+
+# =====================================================
+# 풀이 검증(Mathpix + OpenAI) 설정 (api.verification_queue)
+# =====================================================
+
+# 비동기 풀이 검증 모드
+# True이면 정답 제출 응답은 검증 작업 id만 바로 돌려주고, Mathpix / OpenAI 검증은
+# `python manage.py run_verification_worker`가 처리 (결과는 /api/verifications/<id>/ 폴링, VERIFY_SSE_ENABLED이면 /events/ SSE)
+VERIFY_ASYNC = env.bool("VERIFY_ASYNC", default=False)
+
+# 클라이언트 폴링 간격(초) - 제출 응답의 verification_job.poll_interval 및 Retry-After 헤더
+VERIFY_POLL_INTERVAL_SECONDS = env.int("VERIFY_POLL_INTERVAL_SECONDS", default=2)
+
+# 워커 비정상 종료 등으로 다시 가져간 작업의 최대 시도 횟수
+VERIFY_MAX_ATTEMPTS = env.int("VERIFY_MAX_ATTEMPTS", default=3)
+
+# SSE 결과 구독 (/api/verifications/<id>/events/) 사용 여부
+# 연결이 열려 있는 동안 웹 워커(스레드) 하나를 차지하므로 gunicorn sync 워커 배포에서는 끔 (기본 False).
+# gthread / ASGI 워커처럼 긴 연결을 견딜 수 있는 배포에서만 켜세요.
+VERIFY_SSE_ENABLED = env.bool("VERIFY_SSE_ENABLED", default=False)
+
+# SSE 연결 유지 시간(초)과 작업 상태 확인 주기(초)
+VERIFY_SSE_TIMEOUT_SECONDS = env.int("VERIFY_SSE_TIMEOUT_SECONDS", default=60)
+VERIFY_SSE_POLL_SECONDS = env.float("VERIFY_SSE_POLL_SECONDS", default=1.0)
+
+# =====================================================
+# stroke_points / events 파티션 설정 (PostgreSQL, `python manage.py manage_partitions`)
+# =====================================================
+
+# 미리 만들어 둘 미래 월 파티션 수 (이번 달 + N개월)
+PARTITION_MONTHS_AHEAD = env.int("PARTITION_MONTHS_AHEAD", default=3)
+
+# 파티션 보존 개월 수 (이번 달 포함, 0이면 정리하지 않음)
+# 범위가 끝난 지 이 기간이 지난 파티션은 DETACH (--drop이면 DROP) - 세션 요약 행과 S3 백업은 유지
+PARTITION_RETENTION_MONTHS = env.int("PARTITION_RETENTION_MONTHS", default=0)
+
+# =====================================================
+# 세션 보존 기간 설정 (`python manage.py purge_sessions`)
+# =====================================================
+
+# 세션 보존 일수 (Session.created_at 기준, 0이면 정리하지 않음)
+RETENTION_DAYS = env.int("RETENTION_DAYS", default=0)
+
+# True: 포인트/이벤트 원본만 삭제하고 sessions / strokes 요약 행은 유지
+# False: 세션과 모든 하위 행 삭제
+RETENTION_KEEP_SUMMARY = env.bool("RETENTION_KEEP_SUMMARY", default=True)
+
+# 범위 전체가 만료된 stroke_points / events 파티션 처리: 'drop' | 'detach' (보관) | 'none' (행 단위 삭제만)
+RETENTION_PARTITION_ACTION = env("RETENTION_PARTITION_ACTION", default="drop")
@@ -0,0 +1,284 @@
+"""
+Mathpix API 클라이언트 (필기 변환 / 문제 이미지 OCR)
+
+api(정답 제출의 필기 → 텍스트 변환)와 mathpix.py(문제 이미지 OCR)가 함께 쓰는 모듈입니다.
+호출마다 requests.post()를 쓰면 TLS 연결을 매번 새로 맺고, 재시도 정책 없이 한 번의 429 / 5xx로
+검증이 실패합니다. 프로세스당 클라이언트 하나를 처음 사용할 때 만들어 keep-alive 연결 풀을 재사용합니다.
+
+- 타임아웃: (MATHPIX_CONNECT_TIMEOUT, MATHPIX_READ_TIMEOUT)
+- 재시도: 429 / 5xx / 연결 오류 / 타임아웃 등 전송 오류를 지터를 준 지수 백오프로 최대 MATHPIX_MAX_RETRIES번
+  (429 / 503의 Retry-After 헤더가 더 길면 그만큼 대기)
+- 서킷 브레이커: 연속 MATHPIX_BREAKER_FAILURES번 실패하면 MATHPIX_BREAKER_RESET_SECONDS 동안
+  호출하지 않고 바로 MathpixUnavailable을 발생시킵니다. 그 뒤 한 요청만 시험 삼아 보내고
+  성공하면 다시 닫습니다. Mathpix 장애 중에도 워커가 타임아웃 대기에 묶이지 않고
+  기존 "풀이 검증에 실패했습니다." 결과로 바로 응답합니다.
+
+Django 설정이 없는 환경(`python mathpix.py ...`)에서는 같은 이름의 환경 변수를 읽습니다.
+
+사용 예:
+    response = get_mathpix_client().post("strokes", json=payload)
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class MathpixError(Exception):
+    """재시도 후에도 Mathpix 호출이 실패한 경우"""
+
+
+class MathpixUnavailable(MathpixError):
+    """서킷 브레이커가 열려 있어 호출하지 않은 경우"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커 (스레드 안전)
+
+    closed    : 정상 호출
+    open      : reset_timeout초 동안 호출 거부
+    half_open : reset_timeout이 지난 뒤 시험 요청 하나만 허용 (성공 → closed, 실패 → open)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """현재 상태 (open 상태에서 reset_timeout이 지났으면 half_open으로 표시)"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        호출 가능 여부 확인
+
+        Raises:
+            MathpixUnavailable: 브레이커가 열려 있거나 다른 스레드가 시험 요청 중인 경우
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if self._state == self.OPEN and remaining <= 0:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise MathpixUnavailable(
+            f"Mathpix API 일시 차단 중 (연속 실패 {self._failures}회, {max(remaining, 0):.0f}초 후 재시도)"
+        )
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """요청을 보내지 못하고 끝난 경우 시험 요청 슬롯만 반납 (실패로 세지 않음)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"[Mathpix] 서킷 브레이커 열림 - 연속 실패 {self._failures}회, {self.reset_timeout:.0f}초 동안 호출 차단")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        """브레이커 상태 지표"""
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures}
+
+
+class MathpixClient:
+    """
+    keep-alive 연결 풀을 재사용하는 Mathpix v3 API 클라이언트
+
+    requests.Session은 처음 요청할 때 한 번만 만듭니다. 연결 풀(urllib3)은 스레드 안전하므로
+    검증 워커의 스레드 풀(run_verification_worker --concurrency)이 같은 세션을 공유합니다.
+    """
+
+    base_url = "https://api.mathpix.com/v3/"
+
+    def __init__(self, app_id=None, app_key=None, pool_maxsize=32, connect_timeout=5.0, read_timeout=30.0,
+                 max_retries=2, backoff=0.5, backoff_max=8.0, breaker=None):
+        self.app_id = app_id
+        self.app_key = app_key
+        self._pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """프로세스 공용 requests.Session (처음 접근할 때 생성)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # 재시도는 post()에서 직접 처리 (브레이커가 모든 실패를 세도록 urllib3 재시도는 끔)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize, max_retries=0)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _retry_delay(self, attempt, response=None):
+        """attempt번째 재시도 전 대기 시간 (full jitter, Retry-After가 더 길면 그 값)"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass  # HTTP 날짜 형식은 무시
+        return delay
+
+    def post(self, path, *, json=None, data=None, files=None, timeout=None):
+        """
+        Mathpix API POST (자격 증명 헤더 포함)
+
+        429 / 5xx / requests 전송 오류는 재시도하고, 그 외 응답(200 / 4xx)은 그대로 돌려줍니다.
+        files의 내용은 재시도할 수 있도록 파일 객체가 아닌 bytes로 넘겨야 합니다.
+
+        Args:
+            path (str): API 경로 (예: "strokes", "text")
+            json (dict, optional): JSON 본문
+            data (dict, optional): form 필드
+            files (dict, optional): multipart 파일 {"file": bytes}
+            timeout (tuple, optional): (connect, read) 초 (None이면 설정값)
+
+        Returns:
+            requests.Response: 응답
+
+        Raises:
+            MathpixUnavailable: 서킷 브레이커가 열려 있는 경우
+            MathpixError: 재시도 후에도 실패한 경우
+        """
+        url = self.base_url + path.lstrip('/')
+        headers = {'app_id': self.app_id or '', 'app_key': self.app_key or ''}
+
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            response = None
+            try:
+                response = self.session.post(
+                    url, headers=headers, json=json, data=data, files=files, timeout=timeout or self.timeout
+                )
+            except requests.RequestException as e:
+                # 연결 오류 / 타임아웃 외에 ChunkedEncodingError 등 전송 중 오류도 재시도
+                error = f"{type(e).__name__}: {e}"
+            except BaseException:
+                # 잘못된 인자 등 Mathpix와 무관한 예외 - half_open 시험 슬롯이 잠기지 않도록 반납
+                self.breaker.release_trial()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                error = f"status {response.status_code}"
+
+            self.breaker.record_failure()
+            if attempt >= self.max_retries:
+                break
+            delay = self._retry_delay(attempt, response)
+            print(f"[Mathpix] {path} 실패 ({error}) - {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+        raise MathpixError(f"Mathpix API 호출 실패 ({error}, 시도 {self.max_retries + 1}회)")
+
+    def stats(self):
+        """클라이언트 설정 및 브레이커 상태"""
+        return {
+            "connect_timeout": self.timeout[0],
+            "read_timeout": self.timeout[1],
+            "max_retries": self.max_retries,
+            "breaker": self.breaker.stats(),
+        }
+
+
+def _config(name, default, cast=float):
+    """Django 설정값 (설정이 없는 독립 실행에서는 같은 이름의 환경 변수)"""
+    if settings.configured:
+        return getattr(settings, name, default)
+    value = os.getenv(name)
+    return cast(value) if value not in (None, '') else default
+
+
+def build_mathpix_client():
+    """
+    설정값으로 Mathpix 클라이언트 생성
+
+    Returns:
+        MathpixClient
+    """
+    return MathpixClient(
+        app_id=os.getenv('MATHPIX_APP_ID'),
+        app_key=os.getenv('MATHPIX_APP_KEY'),
+        pool_maxsize=_config('MATHPIX_POOL_MAXSIZE', 32, int),
+        connect_timeout=_config('MATHPIX_CONNECT_TIMEOUT', 5.0),
+        read_timeout=_config('MATHPIX_READ_TIMEOUT', 30.0),
+        max_retries=_config('MATHPIX_MAX_RETRIES', 2, int),
+        backoff=_config('MATHPIX_RETRY_BACKOFF', 0.5),
+        backoff_max=_config('MATHPIX_RETRY_BACKOFF_MAX', 8.0),
+        breaker=CircuitBreaker(
+            failure_threshold=_config('MATHPIX_BREAKER_FAILURES', 5, int),
+            reset_timeout=_config('MATHPIX_BREAKER_RESET_SECONDS', 30.0),
+        ),
+    )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_mathpix_client():
+    """
+    프로세스 공용 Mathpix 클라이언트 (처음 호출할 때 생성)
+
+    Returns:
+        MathpixClient
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_mathpix_client()
+    return _client
+
+
+def reset_mathpix_client():
+    """공용 클라이언트 초기화 (자격 증명 / 설정을 바꾼 뒤)"""
+    global _client
+    with _client_lock:
+        _client = None
@@ -0,0 +1,402 @@
+"""
+파일 저장소 (세션 백업 / 문제 이미지)
+
+api(세션 gzip 백업)와 core(문제 이미지 업로드)가 함께 쓰는 저장소 모듈입니다.
+요청마다 boto3.client()를 새로 만들면 자격 증명 탐색, 엔드포인트 설정, TLS 연결 풀 생성을
+매번 다시 하므로, 프로세스당 저장소 객체 하나를 처음 사용할 때 만들어 재사용합니다.
+boto3 클라이언트는 스레드 안전하므로 여러 요청 스레드가 같은 연결 풀을 공유합니다.
+
+settings.STORAGE_BACKEND로 백엔드를 고릅니다.
+
+    s3    : AWS S3 (AWS_STORAGE_BUCKET_NAME / AWS_S3_REGION_NAME / 자격 증명)
+    local : STORAGE_LOCAL_ROOT 아래 파일로 저장 (개발 / 벤치마크용, 네트워크 없음)
+
+사용 예:
+    storage = get_storage()
+    url = storage.put("answers/1_<uuid>.json.gz", body, content_type="application/gzip")
+
+    # 크기를 미리 모르는 내용을 만들면서 바로 올릴 때 (메모리에는 파트 하나만 보관)
+    with storage.open_writer("answers/1_<uuid>.json.gz", content_type="application/gzip") as writer:
+        writer.write(chunk)
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+
+class StorageConfigError(ValueError):
+    """저장소 설정(환경 변수)이 올바르지 않은 경우"""
+
+
+class S3Storage:
+    """
+    연결 풀을 재사용하는 S3 저장소
+
+    boto3 클라이언트는 처음 업로드할 때 한 번만 만듭니다.
+    """
+
+    name = 's3'
+
+    def __init__(self, bucket, region, access_key=None, secret_key=None,
+                 max_pool_connections=32, connect_timeout=5, read_timeout=60, max_attempts=3,
+                 multipart_chunksize=8 * 1024 * 1024):
+        self.bucket = bucket
+        self.region = region
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._max_pool_connections = max_pool_connections
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._max_attempts = max_attempts
+        # S3 멀티파트 업로드의 파트 최소 크기는 5 MiB (마지막 파트 제외)
+        self.multipart_chunksize = max(multipart_chunksize, 5 * 1024 * 1024)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """프로세스 공용 boto3 S3 클라이언트 (처음 접근할 때 생성)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = boto3.session.Session().client(
+                        's3',
+                        region_name=self.region,
+                        # 키가 없으면 boto3 기본 자격 증명 체인 (IAM 역할 등)
+                        aws_access_key_id=self._access_key or None,
+                        aws_secret_access_key=self._secret_key or None,
+                        config=Config(
+                            max_pool_connections=self._max_pool_connections,
+                            connect_timeout=self._connect_timeout,
+                            read_timeout=self._read_timeout,
+                            retries={'max_attempts': self._max_attempts, 'mode': 'standard'},
+                            tcp_keepalive=True,
+                        ),
+                    )
+        return self._client
+
+    def url(self, key):
+        """객체의 공개 URL"""
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    def put(self, key, body, content_type=None, content_encoding=None, metadata=None):
+        """
+        바이트 또는 파일 객체를 한 번의 PUT으로 업로드
+
+        Args:
+            key (str): 객체 키
+            body (bytes | file): 내용 (파일 객체는 현재 위치부터 읽음)
+            content_type (str, optional): Content-Type
+            content_encoding (str, optional): Content-Encoding (예: 'gzip')
+            metadata (dict, optional): 사용자 메타데이터 (x-amz-meta-*)
+
+        Returns:
+            str: 객체 URL
+        """
+        params = {'Bucket': self.bucket, 'Key': key, 'Body': body}
+        if content_type:
+            params['ContentType'] = content_type
+        if content_encoding:
+            params['ContentEncoding'] = content_encoding
+        if metadata:
+            params['Metadata'] = metadata
+        self.client.put_object(**params)
+        return self.url(key)
+
+    def upload_file(self, key, fileobj, content_type=None):
+        """
+        파일 객체 업로드 (크기가 크면 boto3가 멀티파트로 나눠 병렬 전송)
+
+        Args:
+            key (str): 객체 키
+            fileobj (file): 바이너리 파일 객체
+            content_type (str, optional): Content-Type
+
+        Returns:
+            str: 객체 URL
+        """
+        extra_args = {'ContentType': content_type} if content_type else None
+        self.client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs=extra_args)
+        return self.url(key)
+
+    def open_writer(self, key, content_type=None, content_encoding=None, metadata=None):
+        """
+        순차 기록용 writer (S3MultipartWriter) - with 블록이 정상 종료되면 업로드 완료
+
+        Args:
+            key (str): 객체 키
+            content_type (str, optional): Content-Type
+            content_encoding (str, optional): Content-Encoding (예: 'gzip')
+            metadata (dict, optional): 사용자 메타데이터 (x-amz-meta-*)
+
+        Returns:
+            S3MultipartWriter
+        """
+        params = {'Bucket': self.bucket, 'Key': key}
+        if content_type:
+            params['ContentType'] = content_type
+        if content_encoding:
+            params['ContentEncoding'] = content_encoding
+        if metadata:
+            params['Metadata'] = metadata
+        return S3MultipartWriter(self.client, params, self.multipart_chunksize)
+
+    def exists(self, key):
+        """객체 존재 여부 (HEAD 요청)"""
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+
+class S3MultipartWriter:
+    """
+    write()로 받은 바이트를 파트 크기만큼 모아 S3 멀티파트 업로드로 전송
+
+    메모리에는 전송 전 파트 하나만 보관하므로 전체 크기와 무관하게 사용량이 일정합니다.
+    전체가 파트 하나보다 작으면 멀티파트 대신 PUT 한 번으로 올립니다.
+    with 블록에서 예외가 나면 진행 중인 멀티파트 업로드를 취소합니다 (불완전한 객체를 남기지 않음).
+    """
+
+    def __init__(self, client, params, part_size):
+        self._client = client
+        self._params = params
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self._part_size:
+            self._upload_part()
+        return len(data)
+
+    def flush(self):
+        # 파트 크기 미만으로는 보낼 수 없으므로 close() 전까지 보관
+        pass
+
+    def _upload_part(self):
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(**self._params)['UploadId']
+        number = len(self._parts) + 1
+        body, self._buffer = bytes(self._buffer), bytearray()
+        response = self._client.upload_part(
+            Bucket=self._params['Bucket'], Key=self._params['Key'],
+            UploadId=self._upload_id, PartNumber=number, Body=body,
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': number})
+
+    def close(self):
+        """남은 데이터를 보내고 업로드 완료"""
+        if self._upload_id is None:
+            self._client.put_object(Body=bytes(self._buffer), **self._params)
+        else:
+            if self._buffer:
+                self._upload_part()
+            self._client.complete_multipart_upload(
+                Bucket=self._params['Bucket'], Key=self._params['Key'],
+                UploadId=self._upload_id, MultipartUpload={'Parts': self._parts},
+            )
+        self._buffer = bytearray()
+
+    def abort(self):
+        """진행 중인 멀티파트 업로드 취소 (이미 올라간 파트 삭제)"""
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self._params['Bucket'], Key=self._params['Key'], UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            try:
+                self.abort()
+            except Exception as e:
+                print(f"멀티파트 업로드 취소 실패 ({self._params['Key']}): {e}")
+        return False
+
+
+class LocalFileWriter:
+    """
+    LocalStorage의 순차 기록용 writer
+
+    같은 디렉터리의 임시 파일(.part)에 바로 쓰고 close()에서 최종 경로로 이름을 바꿉니다.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._temp_path = path.with_name(path.name + '.part')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._temp_path, 'wb')
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        os.replace(self._temp_path, self._path)
+
+    def abort(self):
+        self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class LocalStorage:
+    """
+    로컬 파일 시스템 저장소 (S3 대신 개발 / 벤치마크에 사용)
+
+    키를 root 아래 상대 경로로 저장합니다. Content-Type / 메타데이터는 저장하지 않습니다.
+    """
+
+    name = 'local'
+
+    def __init__(self, root, base_url=''):
+        self.root = Path(root).resolve()
+        self.base_url = base_url
+
+    def path(self, key):
+        """키에 해당하는 파일 경로 (root 밖을 가리키는 키는 거부)"""
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"잘못된 저장소 키입니다: {key}")
+        return path
+
+    def url(self, key):
+        """객체 URL (base_url이 없으면 file:// URI)"""
+        if self.base_url:
+            return f"{self.base_url.rstrip('/')}/{key}"
+        return self.path(key).as_uri()
+
+    def put(self, key, body, content_type=None, content_encoding=None, metadata=None):
+        """S3Storage.put()과 같은 인터페이스로 파일 저장"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            if isinstance(body, (bytes, bytearray, memoryview)):
+                f.write(body)
+            else:
+                shutil.copyfileobj(body, f)
+        return self.url(key)
+
+    def upload_file(self, key, fileobj, content_type=None):
+        """S3Storage.upload_file()과 같은 인터페이스로 파일 저장"""
+        return self.put(key, fileobj, content_type=content_type)
+
+    def open_writer(self, key, content_type=None, content_encoding=None, metadata=None):
+        """S3Storage.open_writer()와 같은 인터페이스의 파일 writer"""
+        return LocalFileWriter(self.path(key))
+
+    def exists(self, key):
+        """파일 존재 여부"""
+        return self.path(key).is_file()
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def _build_s3_storage():
+    """settings의 AWS_* 값으로 S3Storage 생성"""
+    region = getattr(settings, 'AWS_S3_REGION_NAME', None)
+    bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
+    access_key = getattr(settings, 'AWS_ACCESS_KEY_ID', None)
+    secret_key = getattr(settings, 'AWS_SECRET_ACCESS_KEY', None)
+
+    if not all([region, bucket]) or bool(access_key) != bool(secret_key):
+        # 환경 변수 누락 시 상세 정보 출력
+        print("❌ AWS 환경 변수 누락!")
+        print(f"  - AWS_S3_REGION_NAME: {'✅' if region else '❌ 없음'}")
+        print(f"  - AWS_ACCESS_KEY_ID: {'✅' if access_key else '❌ 없음'}")
+        print(f"  - AWS_SECRET_ACCESS_KEY: {'✅' if secret_key else '❌ 없음'}")
+        print(f"  - AWS_STORAGE_BUCKET_NAME: {'✅' if bucket else '❌ 없음'}")
+        raise StorageConfigError("AWS 환경 변수가 설정되지 않았습니다.")
+
+    return S3Storage(
+        bucket=bucket,
+        region=region,
+        access_key=access_key,
+        secret_key=secret_key,
+        max_pool_connections=getattr(settings, 'AWS_S3_MAX_POOL_CONNECTIONS', 32),
+        connect_timeout=getattr(settings, 'AWS_S3_CONNECT_TIMEOUT', 5),
+        read_timeout=getattr(settings, 'AWS_S3_READ_TIMEOUT', 60),
+        max_attempts=getattr(settings, 'AWS_S3_MAX_ATTEMPTS', 3),
+        multipart_chunksize=getattr(settings, 'AWS_S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024),
+    )
+
+
+def build_storage(backend=None):
+    """
+    설정값으로 새 저장소 객체 생성 (캐시하지 않음)
+
+    Args:
+        backend (str, optional): 's3' | 'local' (None이면 settings.STORAGE_BACKEND)
+
+    Returns:
+        S3Storage | LocalStorage
+
+    Raises:
+        StorageConfigError: 알 수 없는 백엔드이거나 필요한 설정이 없는 경우
+    """
+    backend = backend or getattr(settings, 'STORAGE_BACKEND', 's3')
+    if backend == 's3':
+        return _build_s3_storage()
+    if backend == 'local':
+        return LocalStorage(
+            getattr(settings, 'STORAGE_LOCAL_ROOT', Path(settings.BASE_DIR) / 'local_storage'),
+            base_url=getattr(settings, 'STORAGE_LOCAL_BASE_URL', ''),
+        )
+    raise StorageConfigError(f"알 수 없는 STORAGE_BACKEND입니다: {backend}")
+
+
+def get_storage():
+    """
+    프로세스 공용 저장소 (처음 호출할 때 생성)
+
+    설정이 잘못되어 생성에 실패하면 캐시하지 않으므로 다음 호출에서 다시 시도합니다.
+
+    Returns:
+        S3Storage | LocalStorage
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = build_storage()
+    return _storage
+
+
+def reset_storage():
+    """공용 저장소 캐시 초기화 (설정을 바꾼 뒤 / 벤치마크에서 백엔드 전환 시)"""
+    global _storage
+    with _storage_lock:
+        _storage = None
@@ -1,3 +1,175 @@
-from django.test import TestCase
+"""
+core.mathpix_client 서킷 브레이커 / 재시도 테스트
+"""
 
-# Create your tests here.
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from core.mathpix_client import CircuitBreaker, MathpixClient, MathpixError, MathpixUnavailable
+
+
+class FakeClock:
+    """time.monotonic() 대체 (초 단위로 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    """순서대로 응답하거나 예외를 발생시키는 requests.Session 대체"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        return response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('core.mathpix_client.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+
+    def open_breaker(self):
+        for _ in range(2):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(MathpixUnavailable):
+            self.breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_single_trial_then_closes(self):
+        self.open_breaker()
+        self.clock.now += 30
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+        # 시험 요청이 진행 중이면 다른 호출은 거부
+        with self.assertRaises(MathpixUnavailable):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_trial_reopens(self):
+        self.open_breaker()
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(MathpixUnavailable):
+            self.breaker.before_call()
+        self.clock.now += 30
+        self.breaker.before_call()
+
+    def test_release_trial_frees_slot_without_counting_failure(self):
+        self.open_breaker()
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.breaker.release_trial()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+
+
+class MathpixClientTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for target, value in (('core.mathpix_client.time.monotonic', self.clock),
+                              ('core.mathpix_client.time.sleep', lambda seconds: None)):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_client(self, *outcomes, max_retries=0, failure_threshold=1):
+        breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=30.0)
+        client = MathpixClient(max_retries=max_retries, breaker=breaker)
+        client._session = FakeSession(*outcomes)
+        return client
+
+    def test_retries_retryable_status_then_returns(self):
+        client = self.make_client(503, 200, max_retries=2, failure_threshold=5)
+
+        self.assertEqual(client.post('strokes', json={}).status_code, 200)
+        self.assertEqual(client._session.calls, 2)
+
+    def test_client_error_is_returned_without_retry(self):
+        client = self.make_client(400, max_retries=2)
+
+        self.assertEqual(client.post('strokes', json={}).status_code, 400)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_half_open_closed_through_post(self):
+        client = self.make_client(requests.ConnectionError('down'), 200)
+        with self.assertRaises(MathpixError):
+            client.post('strokes', json={})
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(MathpixUnavailable):
+            client.post('strokes', json={})
+        self.assertEqual(client._session.calls, 1)
+
+        self.clock.now += 30
+        self.assertEqual(client.post('strokes', json={}).status_code, 200)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_other_request_exceptions_do_not_leak_trial_slot(self):
+        client = self.make_client(requests.ConnectionError('down'), requests.exceptions.ChunkedEncodingError('cut'), 200)
+        with self.assertRaises(MathpixError):
+            client.post('strokes', json={})
+        self.clock.now += 30
+
+        # half_open 시험 요청이 ChunkedEncodingError로 실패 → 다시 open
+        with self.assertRaises(MathpixError):
+            client.post('strokes', json={})
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now += 30
+        self.assertEqual(client.post('strokes', json={}).status_code, 200)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_exception_releases_trial_slot(self):
+        client = self.make_client(requests.ConnectionError('down'), TypeError('bad payload'), 200)
+        with self.assertRaises(MathpixError):
+            client.post('strokes', json={})
+        self.clock.now += 30
+
+        with self.assertRaises(TypeError):
+            client.post('strokes', json={})
+        # 실패로 세지 않고 슬롯만 반납 → 다음 요청이 시험 요청으로 나감
+        self.assertEqual(client.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(client.post('strokes', json={}).status_code, 200)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
@@ -5,9 +5,8 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.db import transaction, IntegrityError
 import os
 import tempfile
-import boto3
-from botocore.exceptions import ClientError
 from .models import Category, Question
+from .storage import get_storage
 from mathpix import process_problem
 
 
@@ -159,39 +158,23 @@ def problem_upload(request):
 
         # 7. S3 업로드
         try:
-            # 환경 변수 검증
-            aws_region = os.getenv('AWS_S3_REGION_NAME')
-            aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-            aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-            bucket_name = os.getenv('AWS_STORAGE_BUCKET_NAME')
-
-            if not all([aws_region, aws_access_key, aws_secret_key, bucket_name]):
-                raise ValueError("AWS 환경 변수가 설정되지 않았습니다.")
-
-            s3_client = boto3.client(
-                's3',
-                region_name=aws_region,
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key
-            )
+            # 프로세스 공용 저장소 (연결 풀 재사용)
+            storage = get_storage()
 
             # 원본 이미지 업로드
             original_key = f"questions/{question_id}_original{os.path.splitext(uploaded_file.name)[1]}"
             with open(temp_file_path, 'rb') as f:
-                s3_client.upload_fileobj(f, bucket_name, original_key)
-            original_url = f"https://{bucket_name}.s3.{aws_region}.amazonaws.com/{original_key}"
+                original_url = storage.upload_file(original_key, f)
 
             # 분리된 이미지 업로드 (있는 경우)
             separate_url = ""
             if processed_data.get("seperate_img"):
                 separate_key = f"questions/{question_id}_separate.png"
-                s3_client.put_object(
-                    Bucket=bucket_name,
-                    Key=separate_key,
-                    Body=processed_data["seperate_img"],
-                    ContentType='image/png'
+                separate_url = storage.put(
+                    separate_key,
+                    processed_data["seperate_img"],
+                    content_type='image/png'
                 )
-                separate_url = f"https://{bucket_name}.s3.{aws_region}.amazonaws.com/{separate_key}"
 
         except Exception as e:
             # S3 업로드 실패 시 DB 레코드 삭제
@@ -2,7 +2,6 @@
 import os
 import json
 import sys
-import requests
 from dotenv import load_dotenv
 from PIL import Image
 from io import BytesIO
@@ -10,14 +9,14 @@ from openai import OpenAI
 from pydantic import BaseModel
 from typing import List, Optional
 
+from core.mathpix_client import get_mathpix_client
+
 # -------------------------
 # 환경 변수 로드
 # -------------------------
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-MATHPIX_APP_ID = os.getenv("MATHPIX_APP_ID")
-MATHPIX_APP_KEY = os.getenv("MATHPIX_APP_KEY")
+# MATHPIX_APP_ID / MATHPIX_APP_KEY는 core.mathpix_client가 처음 호출할 때 읽음
 
 # -------------------------
 # Pydantic 스키마 정의
@@ -54,9 +53,14 @@ class ProblemData(BaseModel):
 # Mathpix OCR 함수
 # -------------------------
 def extract_from_mathpix(image_path: str):
-    r = requests.post(
-        "https://api.mathpix.com/v3/text",
-        files={"file": open(image_path, "rb")},
+    # 재시도할 때 다시 보낼 수 있도록 파일 내용을 bytes로 전달
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    # 연결 풀 / 타임아웃 / 재시도 / 서킷 브레이커는 core.mathpix_client
+    r = get_mathpix_client().post(
+        "text",
+        files={"file": (os.path.basename(image_path), image_bytes)},
         data={
             "options_json": json.dumps({
                 "ocr": ["math", "text"],
@@ -69,7 +73,6 @@ def extract_from_mathpix(image_path: str):
                 "include_line_data": True
             }, ensure_ascii=False)
         },
-        headers={"app_id": MATHPIX_APP_ID, "app_key": MATHPIX_APP_KEY}
     )
 
     result = r.json()